@@ -0,0 +1,58 @@
+# app/api/v1/routes/admin_router.py
+"""
+운영 관리 API 라우터
+
+[엔드포인트]
+- GET /admin/llm-cache: LLM 응답 캐시 적중률 / 버전별 항목 수
+- POST /admin/llm-cache/invalidate: 프롬프트 버전 단위 캐시 무효화
+
+[인증]
+X-Admin-Token 헤더가 ADMIN_TOKEN 환경 변수와 일치해야 합니다.
+ADMIN_TOKEN이 설정되지 않은 서버에서는 관리 API를 사용할 수 없습니다 (503).
+"""
+import hmac
+import os
+from typing import Optional
+
+from fastapi import APIRouter, Header, HTTPException
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+
+def _check_admin_token(token: Optional[str]):
+    expected = os.getenv("ADMIN_TOKEN")
+    if not expected:
+        raise HTTPException(status_code=503, detail="Admin API disabled (ADMIN_TOKEN not set)")
+    if not token or not hmac.compare_digest(token, expected):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+@router.get("/llm-cache")
+def llm_cache_stats(x_admin_token: Optional[str] = Header(None)):
+    _check_admin_token(x_admin_token)
+    from ai.app.services.common.llm_service import get_llm_cache_metrics
+    return get_llm_cache_metrics()
+
+
+@router.post("/llm-cache/invalidate")
+def invalidate_llm_cache(
+    function_name: Optional[str] = None,
+    version: Optional[str] = None,
+    stale_only: bool = False,
+    x_admin_token: Optional[str] = Header(None)
+):
+    """
+    캐시 무효화
+
+    - function_name + version: 해당 함수의 특정 프롬프트 버전 항목 삭제
+    - function_name만: 해당 함수의 모든 항목 삭제
+    - stale_only=true: 현재 PROMPT_VERSIONS가 아닌 항목만 삭제 (프롬프트 변경 배포 후 정리용)
+    - 조건 없음: 전체 삭제
+    """
+    _check_admin_token(x_admin_token)
+    from ai.app.services.common.llm_service import PROMPT_VERSIONS
+    from ai.app.services.common.llm_cache import get_llm_cache
+
+    keep_versions = PROMPT_VERSIONS if stale_only else None
+    deleted = get_llm_cache().invalidate(function_name, version, keep_versions=keep_versions)
+    return {"deleted": deleted, "function_name": function_name, "version": version, "stale_only": stale_only}
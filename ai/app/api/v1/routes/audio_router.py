@@ -15,7 +15,7 @@ async def analyze_audio(
     엔진/부품 소리 2단계 정밀 분석 (AST + LLM)
     
     1. **S3 URL**: 분석할 오디오 파일의 주소
-    2. **AST (1차)**: 엔진 소음 여부 및 기초 분류
+    2. **AST (1차)**: 엔진 소음 여부 및 기초 분류 (경량 CNN이 확신하면 AST 생략)
     3. **LLM (2차)**: 미세 소음 정밀 진단 및 정비 권고
     """
     s3_url = request_body.audioUrl
@@ -25,8 +25,9 @@ async def analyze_audio(
     
     # Safe Access (Lazy Loading)
     ast_model = request.app.state.get_ast_model()
+    lite_model = request.app.state.get_lite_audio_model()
         
-    return await service.predict_audio_smart(s3_url, ast_model=ast_model)
+    return await service.predict_audio_smart(s3_url, ast_model=ast_model, lite_model=lite_model)
 
 
 
@@ -5,3 +5,31 @@ router = APIRouter()
 @router.get("/health")
 def health():
     return {"status": "ok"}
+
+@router.get("/health/llm")
+def health_llm():
+    """LLM 복원력 계층 메트릭 (Circuit Breaker 상태, in-flight, 재시도/헤지 횟수, 지연) + 응답 캐시 적중률"""
+    from ai.app.services.common.llm_service import get_llm_metrics, get_llm_cache_metrics
+    from ai.app.services.common.request_context import get_llm_call_totals
+
+    return {
+        "resilience": get_llm_metrics(),
+        "request_dedup": get_llm_call_totals(),
+        "response_cache": get_llm_cache_metrics(),
+    }
+
+
+@router.get("/health/object-writer")
+def health_object_writer():
+    """Active Learning 업로드 큐 메트릭 (큐 깊이, 대기 시간, 업로드 지연, 재시도/저널 건수)"""
+    from ai.app.services.common.object_store_writer import get_object_writer
+
+    return get_object_writer().metrics()
+
+
+@router.get("/health/active-learning")
+def health_active_learning():
+    """Active Learning 후보 파이프라인 메트릭 (상태별 후보 수, Oracle 호출/예산, 라벨 저장 건수)"""
+    from ai.app.services.common.active_learning_pipeline import get_al_pipeline
+
+    return get_al_pipeline().metrics()
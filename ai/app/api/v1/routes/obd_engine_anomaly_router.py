@@ -1,28 +1,68 @@
-from fastapi import APIRouter
+import asyncio
+
+import numpy as np
+from fastapi import APIRouter, HTTPException
+
+from ai.app.schemas.obd_engine_anomaly_schema import (
+    ObdAnomalyRequest, ObdAnomalyResponse, ObdStreamRequest, ObdStreamResponse
+)
+from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import (
+    get_obd_anomaly_service, get_streaming_scorer
+)
 
 router = APIRouter(tags=["obd-engine-anomaly"])
 
 
-@router.post("/predict/anomaly")
-def predict_anomaly(payload: dict):
+@router.post("/predict/anomaly", response_model=ObdAnomalyResponse)
+async def predict_anomaly(request: ObdAnomalyRequest):
+    """
+    OBD 60초 윈도우 엔진 이상 탐지 (LSTM Autoencoder)
+
+    1. **windows**: 윈도우 1개 이상 ({"signals": {...}} 단일 형태도 허용)
+    2. 채점 가능한 윈도우를 모아 한 번의 배치 forward로 재구성 오차 계산
+    3. 윈도우별 score / is_anomaly / top_signals / data_quality 반환
+    """
+    try:
+        # 첫 호출 시 모델 로드 + TorchScript 컴파일 (이벤트 루프 블로킹 방지)
+        service = await asyncio.to_thread(get_obd_anomaly_service)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[OBD Anomaly] 모델 로드 실패: {e}")
+        raise HTTPException(status_code=503, detail="OBD 이상 탐지 모델이 준비되지 않았습니다.")
+    return await service.predict(request.windows)
+
+
+@router.post("/predict/anomaly/stream", response_model=ObdStreamResponse)
+async def predict_anomaly_stream(request: ObdStreamRequest):
     """
-    임시(부트스트랩) 엔드포인트:
-    - 라우터 마운트/경로/서버 기동 확인용
-    - 다음 단계에서 schema + service 연결로 교체
+    OBD 연속 샘플 스트리밍 채점
+
+    1. 차량별 링 버퍼에 새 샘플만 추가 (60초 윈도우를 다시 보내지 않음)
+    2. stride(기본 5초)가 채워진 차량만, 같은 시간창에 모인 다른 차량과 한 번의 배치 forward로 채점
+    3. 채점하지 않은 요청은 scored=false로 즉시 반환
     """
-    return {
-        "core": {
-            "score": 0.0,
-            "threshold": 0.5,
-            "is_anomaly": False,
-            "data_quality": {"status": "BOOTSTRAP"},
-            "top_signals": [],
-        },
-        "extensions": {
-            "electrical": "SKIPPED",
-            "brake": "SKIPPED",
-            "tire": "SKIPPED",
-            "idle": "SKIPPED",
-        },
-        "debug": {"received_keys": list(payload.keys())},
-    }
+    try:
+        scorer = await asyncio.to_thread(get_streaming_scorer)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[OBD Anomaly] 모델 로드 실패: {e}")
+        raise HTTPException(status_code=503, detail="OBD 이상 탐지 모델이 준비되지 않았습니다.")
+
+    spec = scorer.service.spec
+    if request.sampling_hz != spec.sampling_hz:
+        raise HTTPException(status_code=422, detail=f"sampling_hz는 {spec.sampling_hz}Hz여야 합니다.")
+    lengths = {len(v) for v in request.signals.values()}
+    if len(lengths) != 1:
+        raise HTTPException(status_code=422, detail="신호별 샘플 수가 다릅니다.")
+    n = lengths.pop()
+    # 요청에 없는 신호는 결측(NaN)으로 → 결측 비율이 높으면 채점하지 않음
+    samples = np.array(
+        [request.signals.get(s, [None] * n) for s in spec.signals], dtype=np.float32
+    ).T
+
+    scored, result = await scorer.submit(request.vehicle_id, samples)
+    response = ObdStreamResponse(vehicle_id=request.vehicle_id, scored=scored, threshold=scorer.service.threshold)
+    if result is not None:
+        response.score = result.score
+        response.is_anomaly = result.is_anomaly
+        response.missing_ratio = result.missing_ratio
+        response.top_signals = result.top_signals
+    return response
@@ -4,12 +4,15 @@
 
 [엔드포인트]
 - POST /visual: 통합 분석 (Router가 자동 분기)
+- POST /visual/stream: 통합 분석 SSE 스트리밍 (단계별 결과를 준비되는 대로 전달)
 - POST /engine: 엔진룸 전용 분석 (직접 호출용, 하위 호환)
 
 [흐름]
 Image → Router(MobileNetV3) → 장면 분류 → 전문 파이프라인
 """
 from fastapi import APIRouter, Request, HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
 from typing import Dict, Any
 
 from ai.app.schemas.visual_schema import (
@@ -20,10 +23,24 @@ from ai.app.schemas.visual_schema import (
 )
 from ai.app.services.visual.visual_service import get_smart_visual_diagnosis
 from ai.app.services.visual.domains.engine.engine_anomaly_service import EngineAnomalyPipeline
+from ai.app.services.common.request_context import llm_request_scope
+from ai.app.services.common.progress_events import run_with_events, format_sse
 
 router = APIRouter(prefix="/predict", tags=["Visual Analysis"])
 
 
+def _load_visual_models(request: Request) -> Dict[str, Any]:
+    # 모델들을 Getter를 통해 지연 로딩 (필요할 때만 로드)
+    return {
+        "router": request.app.state.get_router(),
+        "engine_yolo": request.app.state.get_engine_yolo(),
+        "dashboard_yolo": request.app.state.get_dashboard_yolo(),
+        "exterior_yolo": request.app.state.get_exterior_yolo(),
+        "tire_yolo": request.app.state.get_tire_yolo(),
+        "anomaly_detector": request.app.state.get_anomaly_detector(),
+    }
+
+
 @router.post("/visual")
 async def analyze_visual(request_body: VisualRequest, request: Request):
     """
@@ -44,15 +61,7 @@ async def analyze_visual(request_body: VisualRequest, request: Request):
     s3_url = request_body.imageUrl
     print(f"[Visual API] 요청 수신: {s3_url}")
     
-    # 모델들을 Getter를 통해 지연 로딩 (필요할 때만 로드)
-    models = {
-        "router": request.app.state.get_router(),
-        "engine_yolo": request.app.state.get_engine_yolo(),
-        "dashboard_yolo": request.app.state.get_dashboard_yolo(),
-        "exterior_yolo": request.app.state.get_exterior_yolo(),
-        "tire_yolo": request.app.state.get_tire_yolo(),
-        "anomaly_detector": request.app.state.get_anomaly_detector(),
-    }
+    models = _load_visual_models(request)
     
     try:
         # =================================================================
@@ -60,7 +69,9 @@ async def analyze_visual(request_body: VisualRequest, request: Request):
         # get_smart_visual_diagnosis()는 Router를 통해 장면을 분류하고,
         # 각 도메인 전문 파이프라인(ENGINE/DASHBOARD/EXTERIOR/TIRE)으로 분기함
         # =================================================================
-        result = await get_smart_visual_diagnosis(s3_url, models)
+        # [Optimization] 요청 단위 LLM 중복 호출 제거 (같은 인자의 GPT 호출은 1회만 발행)
+        async with llm_request_scope("visual"):
+            result = await get_smart_visual_diagnosis(s3_url, models)
         
         # =================================================================
         # [응답 반환]
@@ -75,6 +86,43 @@ async def analyze_visual(request_body: VisualRequest, request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/visual/stream")
+async def analyze_visual_stream(request_body: VisualRequest, request: Request):
+    """
+    통합 시각 분석 SSE 스트리밍 (/visual과 같은 분석, 단계별 이벤트 전달)
+    
+    [이벤트 순서]
+    - scene: Router 장면 분류 결과 {"scene_type", "confidence", "llm_fallback"}
+    - detections: YOLO(또는 LLM) 감지 결과 및 BBox {"source", "detections"}
+    - part: 부품별 PatchCore 결과 (엔진룸, 완료되는 순서대로)
+    - llm_token: LLM 서술(description) 텍스트 조각 {"function", "delta"} (캐시 적중 시 전체 텍스트 1건, "cached": true)
+    - result: 최종 결과 (/visual JSON 응답과 동일)
+    - error: 분석 실패 {"message"}
+    - done: 스트림 종료 (result/error 다음 항상 마지막)
+    """
+    s3_url = request_body.imageUrl
+    print(f"[Visual API] 스트리밍 요청 수신: {s3_url}")
+    models = _load_visual_models(request)
+
+    async def _diagnose():
+        async with llm_request_scope("visual_stream"):
+            return await get_smart_visual_diagnosis(s3_url, models)
+
+    async def event_source():
+        event_id = 0
+        async for event, data in run_with_events(_diagnose()):
+            if event == "result":
+                data = jsonable_encoder(data)
+            yield format_sse(event, data, event_id)
+            event_id += 1
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.post("/engine", response_model=EngineAnalysisResponse)
 async def analyze_engine(request_body: EngineAnalysisRequest, request: Request):
     """
@@ -87,10 +135,11 @@ async def analyze_engine(request_body: EngineAnalysisRequest, request: Request):
     pipeline = EngineAnomalyPipeline()
     
     try:
-        result = await pipeline.analyze(
-            s3_url=request_body.imageUrl,
-            yolo_model=engine_model
-        )
+        async with llm_request_scope("engine"):
+            result = await pipeline.analyze(
+                s3_url=request_body.imageUrl,
+                yolo_model=engine_model
+            )
         
         return EngineAnalysisResponse(
             status=result.get("status", "NORMAL"),
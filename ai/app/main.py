@@ -37,6 +37,7 @@ from ai.app.api.v1.routes.router import router as predict_router
 from ai.app.api.v1.routes.visual_router import router as visual_router
 from ai.app.api.v1.routes.audio_router import router as audio_router
 from ai.app.api.v1.routes.obd_engine_anomaly_router import router as obd_engine_anomaly_router
+from ai.app.api.v1.routes.admin_router import router as admin_router
 
 # =============================================================================
 # Model Loading Functions
@@ -63,6 +64,13 @@ def load_ast_model():
     return {"model": model, "feature_extractor": feature_extractor}
 
 
+def load_lite_audio_model():
+    """AST를 증류한 경량 CNN 오디오 모델 로드 (CPU Fast Path, 없으면 None)"""
+    print("[Model] Loading Lite Audio CNN (Distilled from AST)...")
+    from ai.app.services.audio.lite_audio_service import load_lite_audio_model as _load
+    return _load()
+
+
 def load_router_model():
     """MobileNetV3-Small 라우터 모델 로드"""
     print("[Model] Loading Router Model (MobileNetV3-Small)...")
@@ -170,6 +178,8 @@ async def lifespan(app: FastAPI):
     """
     # 초기 상태 설정 (None으로 초기화해야 Getter에서 인식 가능)
     app.state.ast_model = None
+    app.state.lite_audio_model = None
+    app.state.lite_audio_loaded = False
     app.state.router_model = None
     app.state.engine_yolo_model = None
     app.state.dashboard_yolo_model = None
@@ -187,18 +197,34 @@ async def lifespan(app: FastAPI):
             app.state.get_router()
             app.state.get_engine_yolo()
             app.state.get_ast_model() # [Add] AST 모델도 Eager Loading에 포함
-            print("[Warmup] 주요 모델(Router, Engine YOLO, AST) 로드 완료!")
+            app.state.get_lite_audio_model()
+            from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import get_obd_anomaly_service
+            try:
+                get_obd_anomaly_service()  # LSTM-AE TorchScript 컴파일 포함
+            except FileNotFoundError as e:
+                # 가중치/meta/scaler가 아직 없는 배포: OBD 이상 탐지만 비활성, 나머지 워밍업은 계속
+                print(f"[OBD Anomaly] 워밍업 건너뜀: {e}")
+            print("[Warmup] 주요 모델(Router, Engine YOLO, AST, LSTM-AE) 로드 완료!")
         except Exception as e:
             print(f"[Warmup Error] 모델 로딩 중 오류 발생: {e}")
             import traceback
             traceback.print_exc()
 
+    # [Active Learning] 백그라운드 라벨링 워커 시작 (이전 실행에서 남은 후보 이어서 처리)
+    from ai.app.services.common.active_learning_pipeline import get_al_pipeline
+    await get_al_pipeline().start()
+
     try:
         yield
     except asyncio.CancelledError:
         print("[Info] Server shutdown cancelled (Normal behavior during forced exit)")
     finally:
         print("🛑 AI Server 종료 중...")
+        await get_al_pipeline().stop()
+        from ai.app.services.common.manifest_service import flush_all_manifests
+        from ai.app.services.common.object_store_writer import close_object_writer
+        flush_all_manifests()
+        close_object_writer()
 
 
 # =============================================================================
@@ -227,6 +253,7 @@ def create_app() -> FastAPI:
     app.include_router(predict_router, prefix="/api/v1", tags=["predict"])
     app.include_router(visual_router, prefix="/api/v1", tags=["visual"])
     app.include_router(audio_router, prefix="/api/v1", tags=["audio"])
+    app.include_router(admin_router, prefix="/api/v1", tags=["admin"])
 
     # 테스트 라우터
     from ai.app.api.v1.routes.test_router import router as test_router
@@ -274,6 +301,13 @@ def _setup_model_getters(app: FastAPI):
             app.state.ast_model = load_ast_model()
         return app.state.ast_model
 
+    def get_lite_audio_model():
+        # 가중치가 없으면 None이 정상 상태이므로 별도 플래그로 재시도 방지
+        if not app.state.lite_audio_loaded:
+            app.state.lite_audio_model = load_lite_audio_model()
+            app.state.lite_audio_loaded = True
+        return app.state.lite_audio_model
+
     def get_anomaly_detector():
         if app.state.anomaly_detector_model is None:
             app.state.anomaly_detector_model = load_anomaly_detector()
@@ -285,6 +319,7 @@ def _setup_model_getters(app: FastAPI):
     app.state.get_exterior_yolo = get_exterior_yolo
     app.state.get_tire_yolo = get_tire_yolo
     app.state.get_ast_model = get_ast_model
+    app.state.get_lite_audio_model = get_lite_audio_model
     app.state.get_anomaly_detector = get_anomaly_detector
 
 
@@ -0,0 +1,75 @@
+from pydantic import BaseModel, Field, model_validator
+from typing import Any, Dict, List, Optional
+
+
+class ObdWindow(BaseModel):
+    """60초 OBD 윈도우 (신호별 등간격 샘플, 결측은 null)"""
+    window_id: Optional[str] = Field(None, description="클라이언트 측 윈도우 식별자 (응답에 그대로 반환)")
+    signals: Dict[str, List[Optional[float]]] = Field(..., description="신호명 → 샘플 배열 (예: rpm, speed, coolant, map)")
+    sampling_hz: float = Field(10.0, gt=0, description="샘플링 주기 (Hz)")
+
+
+class ObdAnomalyRequest(BaseModel):
+    """OBD 엔진 이상 탐지 요청 (윈도우 1개 또는 여러 개)"""
+    windows: List[ObdWindow] = Field(..., min_length=1, max_length=1024)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _single_window(cls, data: Any) -> Any:
+        # 윈도우 1개는 {"signals": {...}} 형태로도 허용
+        if isinstance(data, dict) and "windows" not in data and "signals" in data:
+            return {"windows": [data]}
+        return data
+
+
+class DataQuality(BaseModel):
+    status: str = Field(..., description="OK / DEGRADED (보정 후 채점) / INSUFFICIENT (채점 불가)")
+    missing_ratio: Dict[str, float] = Field(default_factory=dict, description="신호별 결측 비율")
+    missing_signals: List[str] = Field(default_factory=list, description="요청에 없는 필수 신호")
+    length: int = Field(0, description="입력 샘플 수")
+    expected_length: int = Field(0, description="모델 윈도우 길이")
+    reasons: List[str] = Field(default_factory=list)
+
+
+class SignalContribution(BaseModel):
+    signal: str
+    error: float = Field(..., description="신호별 평균 재구성 오차 (정규화 단위)")
+    contribution: float = Field(..., description="전체 오차 중 비중 (0~1)")
+
+
+class AnomalyCore(BaseModel):
+    score: Optional[float] = Field(None, description="평균 재구성 오차 (채점 불가 시 null)")
+    threshold: float
+    is_anomaly: Optional[bool] = None
+    data_quality: DataQuality
+    top_signals: List[SignalContribution] = Field(default_factory=list)
+
+
+class WindowResult(BaseModel):
+    window_id: Optional[str] = None
+    core: AnomalyCore
+    extensions: Dict[str, Any] = Field(default_factory=dict)
+
+
+class ObdAnomalyResponse(BaseModel):
+    results: List[WindowResult]
+    model_version: str
+    batch_size: int = Field(..., description="한 번의 forward로 채점한 윈도우 수")
+    latency_ms: float = Field(..., description="전처리 + 추론 시간")
+
+
+class ObdStreamRequest(BaseModel):
+    """차량 1대의 새 OBD 샘플 (직전 요청 이후 분량만, spec.sampling_hz 격자)"""
+    vehicle_id: str
+    signals: Dict[str, List[Optional[float]]] = Field(..., description="신호명 → 새 샘플 배열 (결측은 null)")
+    sampling_hz: float = Field(10.0, gt=0)
+
+
+class ObdStreamResponse(BaseModel):
+    vehicle_id: str
+    scored: bool = Field(..., description="이번 요청으로 stride가 채워져 채점했는지 여부")
+    score: Optional[float] = None
+    threshold: float
+    is_anomaly: Optional[bool] = None
+    missing_ratio: Optional[float] = Field(None, description="채점 윈도우에서 앞값으로 채운 샘플 비율")
+    top_signals: List[SignalContribution] = Field(default_factory=list)
@@ -8,7 +8,7 @@ AST 기반 기계 소음 분석 서비스 (Audio Spectrogram Transformer)
 3. 자동 카테고리 매핑: 라벨 이름 패턴을 기반으로 부품 카테고릴 자동 분류합니다.
 
 [주요 기능]
-- AST 모델 추론 (run_ast_inference)
+- AST 모델 추론 (run_ast_inference) - 경량 CNN → AST Cascade 지원
 - 라벨 기반 카테고리 자동 추출 (get_category_from_label)
 """
 import torch
@@ -17,6 +17,8 @@ import os
 import librosa
 import torch.nn.functional as F
 from ai.app.schemas.audio_schema import AudioResponse, AudioDetail
+from ai.app.services.audio.lite_audio_service import predict_lite, LITE_CONFIDENCE_THRESHOLD
+from ai.app.services.common.active_learning_selector import normalized_entropy, record_uncertainty_signal
 
 # =============================================================================
 # [설정] 모델 경로
@@ -99,8 +101,46 @@ def get_category_from_label(label_name: str) -> str:
 # =============================================================================
 # 추론 함수
 # =============================================================================
-async def run_ast_inference(processed_audio_buffer, ast_model_payload=None) -> AudioResponse:
-    """16kHz WAV 버퍼를 받아 AST 모델로 소리 분류 (Async Wrapper)"""
+def _build_audio_response(label_name: str, confidence: float, analysis_type: str) -> AudioResponse:
+    """라벨/신뢰도로부터 AudioResponse 생성 (AST와 경량 CNN이 동일한 판정 규칙 사용)"""
+    category = get_category_from_label(label_name)
+    label_lower = label_name.lower()
+
+    if confidence < 0.5:
+        status = "UNKNOWN"
+        is_critical = False
+        category = "UNKNOWN_AUDIO"
+        label_name = "unknown"
+        description = "분류할 수 없는 소리입니다. 차량 관련 소리인지 확인해주세요."
+    elif label_lower in NORMAL_LABELS or "normal" in label_lower:
+        status = "NORMAL"
+        is_critical = False
+        description = "정상적인 소리입니다."
+    else:
+        status = "FAULTY"
+        is_critical = True
+        description = f"{label_name} 소음이 감지되었습니다. 점검이 필요합니다."
+
+    return AudioResponse(
+        status=status,
+        analysis_type=analysis_type,
+        category=category,
+        detail=AudioDetail(
+            diagnosed_label=label_name,
+            description=description
+        ),
+        confidence=round(confidence, 4),
+        is_critical=is_critical
+    )
+
+
+async def run_ast_inference(processed_audio_buffer, ast_model_payload=None, lite_model_payload=None) -> AudioResponse:
+    """
+    16kHz WAV 버퍼를 받아 소리 분류 (Async Wrapper)
+
+    lite_model_payload가 주어지면 경량 CNN → AST 순서의 Cascade로 동작합니다.
+    (경량 모델이 LITE_CONFIDENCE_THRESHOLD 이상 확신하면 AST를 실행하지 않음)
+    """
     import asyncio
     loop = asyncio.get_running_loop()
 
@@ -132,13 +172,27 @@ async def run_ast_inference(processed_audio_buffer, ast_model_payload=None) -> A
     # =========================================================================
     # 실제 추론 로직 (동기 함수)
     # =========================================================================
+    # executor 스레드에서는 요청 ContextVar에 기록할 수 없으므로 여기 담았다가 추론 후 기록
+    signals = {}
+
     def _sync_inference(audio_buffer):
         try:
             # 1. BytesIO 버퍼에서 오디오 데이터 로드 (이미 16kHz로 변환됨)
             audio_buffer.seek(0)
             audio_array, sr = librosa.load(audio_buffer, sr=16000)
-            
-            # 2. Feature Extractor로 전처리
+
+            # 2. [Cascade] 경량 CNN이 확신하면 AST 생략 (CPU Fast Path)
+            if lite_model_payload is not None:
+                try:
+                    lite_label, lite_conf = predict_lite(audio_array, lite_model_payload)
+                    if lite_conf >= LITE_CONFIDENCE_THRESHOLD:
+                        print(f"[AST Service] Lite CNN Fast Path 적용 ({lite_label}, {lite_conf:.2f}). AST 생략.")
+                        return _build_audio_response(lite_label, lite_conf, analysis_type="AST_LITE")
+                    print(f"[AST Service] Lite CNN 신뢰도 부족 ({lite_conf:.2f}). AST로 전환.")
+                except Exception as e:
+                    print(f"[AST Service] Lite CNN 추론 실패, AST로 전환: {e}")
+
+            # 3. Feature Extractor로 전처리
             inputs = feature_extractor(
                 audio_array, 
                 sampling_rate=16000, 
@@ -146,7 +200,7 @@ async def run_ast_inference(processed_audio_buffer, ast_model_payload=None) -> A
                 padding="max_length"
             )
             
-            # 3. 모델 추론
+            # 4. 모델 추론
             with torch.no_grad():
                 outputs = model(**inputs)
                 logits = outputs.logits
@@ -155,40 +209,11 @@ async def run_ast_inference(processed_audio_buffer, ast_model_payload=None) -> A
                 probs = F.softmax(logits, dim=-1)
                 confidence = probs.max().item()
                 predicted_id = logits.argmax(-1).item()
+                signals["ast_entropy"] = normalized_entropy(probs[0].cpu().numpy())
             
-            # 4. 라벨 이름 변환
+            # 5. 라벨 이름 변환 및 상태 결정
             label_name = model.config.id2label[predicted_id]
-            category = get_category_from_label(label_name)
-            
-            # 5. 상태 결정
-            label_lower = label_name.lower()
-            
-            if confidence < 0.5:
-                status = "UNKNOWN"
-                is_critical = False
-                category = "UNKNOWN_AUDIO"
-                label_name = "unknown"
-                description = "분류할 수 없는 소리입니다. 차량 관련 소리인지 확인해주세요."
-            elif label_lower in NORMAL_LABELS or "normal" in label_lower:
-                status = "NORMAL"
-                is_critical = False
-                description = "정상적인 소리입니다."
-            else:
-                status = "FAULTY"
-                is_critical = True
-                description = f"{label_name} 소음이 감지되었습니다. 점검이 필요합니다."
-            
-            return AudioResponse(
-                status=status,
-                analysis_type="AST",
-                category=category,
-                detail=AudioDetail(
-                    diagnosed_label=label_name,
-                    description=description
-                ),
-                confidence=round(confidence, 4),
-                is_critical=is_critical
-            )
+            return _build_audio_response(label_name, confidence, analysis_type="AST")
             
         except Exception as e:
             print(f"[AST Inference Error] {e}")
@@ -205,4 +230,7 @@ async def run_ast_inference(processed_audio_buffer, ast_model_payload=None) -> A
             )
 
     # 별도 스레드에서 실행
-    return await loop.run_in_executor(None, _sync_inference, processed_audio_buffer)
+    result = await loop.run_in_executor(None, _sync_inference, processed_audio_buffer)
+    # Active Learning 선별용 불확실성 (후보 등록 시 자동 첨부)
+    record_uncertainty_signal("ast_entropy", signals.get("ast_entropy"))
+    return result
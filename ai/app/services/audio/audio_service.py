@@ -15,7 +15,8 @@
 import os
 from ai.app.services.audio.hertz import process_to_16khz
 from ai.app.services.audio.ast_service import run_ast_inference
-from ai.app.services.common.llm_service import analyze_audio_with_llm
+from ai.app.services.common.llm_service import analyze_and_label_audio_with_llm
+from ai.app.services.common.active_learning_pipeline import ALCandidate, submit_al_candidate
 from ai.app.services.audio.audio_enhancement import denoise_audio
 from ai.app.schemas.audio_schema import AudioResponse, AudioDetail
 import httpx
@@ -89,12 +90,12 @@ class AudioService:
             except Exception as e:
                 raise ValueError(f"Failed to download audio: {e}")
 
-    async def predict_audio_smart(self, s3_url: str, ast_model=None) -> AudioResponse:
+    async def predict_audio_smart(self, s3_url: str, ast_model=None, lite_model=None) -> AudioResponse:
         """
         통합 오디오 분석 흐름
         1. 안전하게 다운로드 (중앙화)
         2. 16kHz 전처리
-        3. AST/LLM 추론
+        3. 경량 CNN → AST → LLM 순차 추론 (확신하는 단계에서 종료)
         """
         # Threshold 상수 적용
         FAST_PATH_AUDIO_CONF = 0.85
@@ -118,7 +119,7 @@ class AudioService:
         
         # 3. 1차 진단: AST 모델
         try:
-            ast_result = await run_ast_inference(audio_buffer, ast_model_payload=ast_model)
+            ast_result = await run_ast_inference(audio_buffer, ast_model_payload=ast_model, lite_model_payload=lite_model)
         except Exception as e:
             print(f"[Audio Service] AST Inference Error: {e}")
             from ai.app.schemas.audio_schema import AudioResponse, AudioDetail
@@ -132,53 +133,37 @@ class AudioService:
             )
         
         # 4. 2차 진단 판단 (Threshold 적용)
+        # [Optimization] 진단 + AL 라벨을 한 번의 LLM 호출로 받고, 트리밍/압축한 오디오만 업로드
+        oracle_labels = None
         if ast_result.confidence < FAST_PATH_AUDIO_CONF or ast_result.status == "UNKNOWN":
             print(f"[Audio Service] AST 결과 미흡 (또는 에러). LLM으로 전환.")
-            wav_bytes = audio_buffer.getvalue() if audio_buffer else audio_bytes
-            final_result = await analyze_audio_with_llm(s3_url, audio_bytes=wav_bytes)
+            from ai.app.services.audio.hertz import compress_for_llm
+            compressed = await compress_for_llm(audio_buffer if audio_buffer else audio_bytes)
+            if compressed:
+                llm_bytes, llm_format = compressed
+            else:
+                llm_bytes, llm_format = (audio_buffer.getvalue() if audio_buffer else audio_bytes), "wav"
+            final_result, oracle_labels = await analyze_and_label_audio_with_llm(
+                s3_url, audio_bytes=llm_bytes, audio_format=llm_format
+            )
         else:
             final_result = ast_result
 
         # =================================================================
         # [Active Learning] 공통 서비스 활용
         # =================================================================
+        # 2차 진단에서 이미 받은 라벨은 그대로 넘기고, 없으면 백그라운드 파이프라인이 Oracle 호출
         if final_result.confidence < 0.85:
-            try:
-                from ai.app.services.common.llm_service import generate_audio_labels
-                from ai.app.services.common.active_learning_service import get_active_learning_service
-
-                print(f"[Active Learning] 저신뢰 오디오 감지 ({final_result.confidence:.2f}). LLM 라벨링 시작...")
-                
-                # Step 1: LLM Oracle
-                oracle_labels = await generate_audio_labels(s3_url, audio_bytes=audio_bytes)
-                status = oracle_labels.get("status", "")
-                
-                # Step 2: Quality Check
-                if status == "RE_RECORD_REQUIRED" or status in ["UNKNOWN", "ERROR"] or not oracle_labels.get("label"):
-                    print(f"[Active Learning] 배제: 품질 미달 ({status})")
-                    return final_result
-
-                # Step 3: Save & Manifest (via Common Service)
-                al_service = get_active_learning_service()
-                label_key = al_service.save_oracle_label(
-                    s3_url=s3_url, 
-                    label_data=oracle_labels, 
-                    domain="audio"
-                )
-                
-                if label_key:
-                    al_service.record_manifest(
-                        s3_url=s3_url,
-                        category=final_result.category,
-                        label_key=label_key,
-                        status=status,
-                        confidence=final_result.confidence,
-                        analysis_type=oracle_labels.get("label", "Unknown_Audio"), # 실제 라벨 전달
-                        domain="audio"
-                    )
-
-            except Exception as e:
-                print(f"[Active Learning Audio] 기록 실패 (무시): {e}")
+            await submit_al_candidate(ALCandidate(
+                s3_url=s3_url,
+                domain="audio",
+                category=final_result.category,
+                confidence=final_result.confidence,
+                status=final_result.status,
+                analysis_type=final_result.analysis_type,
+                model_output={"labels": [final_result.detail.diagnosed_label]},
+                oracle_labels=oracle_labels,
+            ))
             
         return final_result
 
@@ -64,4 +64,68 @@ async def convert_bytes_to_16khz(audio_bytes: bytes):
             print(f"[hertz.py] 바이트 변환 중 오류: {e}")
             return None
 
-    return await loop.run_in_executor(None, _sync_convert, audio_bytes)
\ No newline at end of file
+    return await loop.run_in_executor(None, _sync_convert, audio_bytes)
+
+# LLM 업로드용 압축 설정 (진단에 필요한 구간만 전송)
+LLM_AUDIO_MAX_SECONDS = 10.0
+LLM_AUDIO_SAMPLE_RATE = 16000
+LLM_AUDIO_TOP_DB = 40
+
+async def compress_for_llm(audio_input, max_seconds: float = LLM_AUDIO_MAX_SECONDS):
+    """
+    LLM 오디오 입력용 경량 표현 생성 (Async Wrapper)
+
+    1. 앞뒤 무음 제거 (librosa.effects.trim)
+    2. 에너지(RMS)가 가장 큰 max_seconds 구간만 잘라냄
+    3. MP3로 인코딩 (libsndfile 미지원 시 16bit PCM WAV)
+
+    Args:
+        audio_input: 16kHz WAV BytesIO 또는 원본 bytes
+
+    Returns:
+        (encoded_bytes, format) 또는 실패 시 None
+    """
+    import asyncio
+    import numpy as np
+    loop = asyncio.get_running_loop()
+
+    def _sync_compress(inp):
+        try:
+            if isinstance(inp, (bytes, bytearray)):
+                inp = io.BytesIO(inp)
+            inp.seek(0)
+            y, sr = librosa.load(inp, sr=LLM_AUDIO_SAMPLE_RATE)
+            original_sec = len(y) / sr
+
+            trimmed, _ = librosa.effects.trim(y, top_db=LLM_AUDIO_TOP_DB)
+            if len(trimmed) > 0:
+                y = trimmed
+
+            window = int(max_seconds * sr)
+            if len(y) > window:
+                # 1초 hop으로 RMS 합이 최대인 구간 선택
+                hop = sr
+                rms = librosa.feature.rms(y=y, frame_length=2048, hop_length=512)[0]
+                frames_per_window = max(1, window // 512)
+                energy = np.convolve(rms, np.ones(frames_per_window), mode="valid")
+                starts = np.arange(0, len(y) - window + 1, hop)
+                best = max(starts, key=lambda s: energy[min(s // 512, len(energy) - 1)])
+                y = y[best:best + window]
+
+            buffer = io.BytesIO()
+            try:
+                sf.write(buffer, y, sr, format='MP3')
+                fmt = "mp3"
+            except Exception:
+                buffer = io.BytesIO()
+                sf.write(buffer, y, sr, format='WAV', subtype='PCM_16')
+                fmt = "wav"
+
+            encoded = buffer.getvalue()
+            print(f"[hertz.py] LLM용 압축 완료: {original_sec:.1f}s → {len(y) / sr:.1f}s ({fmt}, {len(encoded) // 1024}KB)")
+            return encoded, fmt
+        except Exception as e:
+            print(f"[hertz.py] LLM용 압축 중 오류: {e}")
+            return None
+
+    return await loop.run_in_executor(None, _sync_compress, audio_input)
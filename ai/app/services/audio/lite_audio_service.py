@@ -0,0 +1,156 @@
+# ai/app/services/audio/lite_audio_service.py
+"""
+경량 CNN 기반 오디오 분류 서비스 (Distilled Log-Mel CNN)
+
+[역할]
+1. CPU Fast Path: AST(ViT 규모 Transformer)를 증류(Distillation)한 소형 CNN으로 먼저 분류합니다.
+2. Cascade 1단계: 경량 모델이 충분히 확신할 때만 결과를 확정하고, 애매한 소리는 AST로 넘깁니다.
+3. 학습/서빙 전처리 일치: Log-Mel 특징 추출 함수를 학습 스크립트와 서빙이 함께 사용합니다.
+
+[주요 기능]
+- Log-Mel 특징 추출 (compute_log_mel)
+- 경량 CNN 모델 정의 (LiteAudioCNN)
+- 가중치 로드 (load_lite_audio_model) 및 추론 (predict_lite)
+
+[가중치 구조]
+ai/weights/audio/lite_cnn/
+  ├── model.pt      (state_dict)
+  └── config.json   (id2label, 특징 추출 파라미터)
+"""
+import os
+import json
+from typing import Dict, Any, Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+# =============================================================================
+# [설정] 경로 및 특징 추출 파라미터 (학습 스크립트와 반드시 동일해야 함)
+# =============================================================================
+LITE_MODEL_DIR = os.path.join("ai", "weights", "audio", "lite_cnn")
+
+SAMPLE_RATE = 16000
+N_FFT = 400          # 25ms window
+HOP_LENGTH = 160     # 10ms hop (AST와 동일한 프레임 간격)
+N_MELS = 64
+MAX_FRAMES = 1024    # AST 입력 길이(10.24초)와 동일하게 맞춤
+
+# 이 값 이상이면 AST를 호출하지 않고 경량 모델 결과로 확정
+LITE_CONFIDENCE_THRESHOLD = float(os.getenv("LITE_AUDIO_CONF", "0.9"))
+
+
+def compute_log_mel(audio_array: np.ndarray, sr: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    16kHz 모노 파형 → 고정 길이 Log-Mel 스펙트로그램 (N_MELS, MAX_FRAMES)
+
+    길이가 짧으면 0(무음에 해당하는 최소 dB)으로 패딩하고, 길면 앞부분만 사용합니다.
+    """
+    import librosa
+
+    if sr != SAMPLE_RATE:
+        audio_array = librosa.resample(audio_array, orig_sr=sr, target_sr=SAMPLE_RATE)
+
+    mel = librosa.feature.melspectrogram(
+        y=audio_array.astype(np.float32),
+        sr=SAMPLE_RATE,
+        n_fft=N_FFT,
+        hop_length=HOP_LENGTH,
+        n_mels=N_MELS,
+    )
+    log_mel = librosa.power_to_db(mel, ref=1.0, top_db=80.0).astype(np.float32)
+
+    frames = log_mel.shape[1]
+    if frames < MAX_FRAMES:
+        pad_value = float(log_mel.min()) if frames > 0 else -80.0
+        log_mel = np.pad(log_mel, ((0, 0), (0, MAX_FRAMES - frames)), constant_values=pad_value)
+    else:
+        log_mel = log_mel[:, :MAX_FRAMES]
+
+    # 클립 단위 정규화 (녹음 기기별 게인 차이 완화)
+    mean = log_mel.mean()
+    std = log_mel.std() + 1e-6
+    return (log_mel - mean) / std
+
+
+# =============================================================================
+# 모델 정의
+# =============================================================================
+class LiteAudioCNN(nn.Module):
+    """
+    Log-Mel 입력용 4-Block CNN (약 0.1M 파라미터)
+    입력: (B, 1, N_MELS, MAX_FRAMES) → 출력: (B, num_labels) logits
+    """
+    def __init__(self, num_labels: int, base_channels: int = 16, dropout: float = 0.2):
+        super(LiteAudioCNN, self).__init__()
+
+        channels = [1, base_channels, base_channels * 2, base_channels * 4, base_channels * 8]
+        blocks = []
+        for in_ch, out_ch in zip(channels[:-1], channels[1:]):
+            blocks.append(self.conv_block(in_ch, out_ch))
+        self.features = nn.Sequential(*blocks)
+
+        self.pool = nn.AdaptiveAvgPool2d(1)
+        self.dropout = nn.Dropout(dropout)
+        self.classifier = nn.Linear(channels[-1], num_labels)
+
+    def conv_block(self, in_ch, out_ch):
+        return nn.Sequential(
+            nn.Conv2d(in_ch, out_ch, kernel_size=3, padding=1, bias=False),
+            nn.BatchNorm2d(out_ch),
+            nn.ReLU(inplace=True),
+            nn.MaxPool2d(2),
+        )
+
+    def forward(self, x):
+        x = self.features(x)
+        x = self.pool(x).flatten(1)
+        return self.classifier(self.dropout(x))
+
+
+# =============================================================================
+# 로드 및 추론
+# =============================================================================
+def load_lite_audio_model(model_dir: str = LITE_MODEL_DIR) -> Optional[Dict[str, Any]]:
+    """
+    증류된 경량 CNN 로드
+    가중치가 없으면 None을 반환하여 AST 단독 경로로 동작하게 합니다.
+    """
+    weights_path = os.path.join(model_dir, "model.pt")
+    config_path = os.path.join(model_dir, "config.json")
+
+    if not os.path.exists(weights_path) or not os.path.exists(config_path):
+        print(f"[Lite Audio] 경량 모델 없음: {model_dir} (AST 단독 사용)")
+        return None
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        config = json.load(f)
+
+    id2label = {int(k): v for k, v in config["id2label"].items()}
+    model = LiteAudioCNN(num_labels=len(id2label), base_channels=config.get("base_channels", 16))
+    model.load_state_dict(torch.load(weights_path, map_location="cpu"))
+    model.eval()
+
+    print(f"[Lite Audio] 경량 CNN 로드 완료: {model_dir} ({len(id2label)} classes)")
+    return {"model": model, "id2label": id2label, "config": config}
+
+
+def predict_lite(audio_array: np.ndarray, lite_model_payload: Dict[str, Any]) -> Tuple[str, float]:
+    """
+    경량 CNN 단일 클립 추론 (동기 함수, executor 내부에서 호출)
+
+    Returns:
+        (label_name, confidence)
+    """
+    model = lite_model_payload["model"]
+    id2label = lite_model_payload["id2label"]
+
+    features = compute_log_mel(audio_array)
+    inputs = torch.from_numpy(features).unsqueeze(0).unsqueeze(0)
+
+    with torch.no_grad():
+        probs = F.softmax(model(inputs), dim=-1)
+        confidence, predicted_id = probs.max(dim=-1)
+
+    return id2label[int(predicted_id.item())], float(confidence.item())
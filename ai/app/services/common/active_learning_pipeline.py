@@ -0,0 +1,617 @@
+# ai/app/services/common/active_learning_pipeline.py
+"""
+Active Learning 백그라운드 라벨링 파이프라인 (Candidate → Oracle → Label)
+
+[역할]
+요청 처리 코드는 가벼운 후보(Candidate) 이벤트만 남기고 바로 응답합니다.
+LLM Oracle 호출과 라벨 저장은 별도 워커 풀이 처리하므로 사용자 응답 지연에 포함되지 않습니다.
+
+[흐름]
+1. submit_al_candidate(): 후보(URL, 도메인, 신뢰도, 모델 출력 + 요청 중 불확실성 신호)를 SQLite 큐에 기록
+   (중복 후보는 무시, 요청 중 이미 LLM 라벨(oracle_labels)을 받은 후보는 바로 처리 대상)
+2. 선별 (AL_SELECT_WINDOW_SEC마다): Oracle이 필요한 대기 후보를
+   - ActiveLearningPolicy.should_collect로 1차 선별, AL_CANDIDATE_MAX_AGE_SEC가 지난 후보는 만료
+   - 불확실성 + 다양성 순으로 이번 구간 몫의 일일 예산만큼 선택 (active_learning_selector)
+   - 선택하지 못한 후보는 다음 구간에 다시 경쟁, 모든 결정은 al_selection manifest에 기록 (오프라인 재현용)
+3. 워커: 선택된 후보를 하나씩 가져와
+   - 최근 라벨링한 이미지와 근접 중복이면 제외 (near_duplicate_index, pHash + Router 임베딩)
+   - LLM 분당 예산이 남아 있을 때만 Oracle 호출 (소진 시 선택 상태로 되돌려 대기)
+   - 도메인별 품질 필터 → save_oracle_label + record_manifest
+4. 서버가 중간에 종료되어도 처리 중이던 후보는 다음 시작 시 다시 대기열로 돌아갑니다.
+
+[환경 변수]
+- AL_PIPELINE_ENABLED (기본 true)
+- AL_PIPELINE_PATH (기본 ai/data/cache/al_candidates.sqlite3)
+- AL_PIPELINE_WORKERS (기본 2)
+- AL_ORACLE_PER_MINUTE (기본 10), AL_ORACLE_DAILY_BUDGET (기본 500)
+- AL_SELECT_WINDOW_SEC (기본 900), AL_DIVERSITY_WEIGHT (기본 0.5), AL_CANDIDATE_MAX_AGE_SEC (기본 86400)
+- AL_DEDUP_PATH (기본 ai/data/cache/al_dedup_index.npz), AL_DEDUP_CAPACITY (도메인별, 기본 2000)
+"""
+import asyncio
+import contextvars
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from ai.app.services.common.active_learning_selector import (
+    DEFAULT_DIVERSITY_WEIGHT, SelectionItem, request_signals, select_candidates, uncertainty_score, window_budget
+)
+from ai.app.services.common.near_duplicate_index import NearDuplicateIndex, decode_embedding
+
+MAX_ATTEMPTS = 3
+POLL_INTERVAL_SEC = 5.0
+SELECTION_MANIFEST = "al_selection"
+
+
+@dataclass
+class ALCandidate:
+    """재학습 후보 이벤트 (요청 경로에서 생성)"""
+    s3_url: str
+    domain: str                     # engine | dashboard | tire | exterior | audio
+    category: str                   # Manifest 카테고리 (ENGINE, DASHBOARD, ...)
+    confidence: float
+    status: str                     # 모델이 판정한 상태
+    analysis_type: str              # Manifest analysis_type
+    model_output: Dict[str, Any] = field(default_factory=dict)   # 모델 출력 요약 (labels 등)
+    oracle_labels: Optional[Dict[str, Any]] = None               # 요청 중 이미 받은 LLM 결과 (있으면 Oracle 생략)
+    fingerprint: Dict[str, Any] = field(default_factory=dict)    # 근접 중복 판정용 {"phash", "embedding"}
+    label_suffix: str = ""                                       # 한 이미지에서 여러 라벨을 만들 때 구분자 (엔진 부품명)
+    created_at: float = field(default_factory=time.time)
+
+    def dedupe_key(self) -> str:
+        return hashlib.sha1(f"{self.domain}|{self.analysis_type}|{self.s3_url}|{self.label_suffix}".encode()).hexdigest()
+
+    def uncertainty(self) -> Tuple[float, Dict[str, float]]:
+        return uncertainty_score(self.model_output, self.confidence)
+
+
+# =============================================================================
+# LLM 예산 (분당 Token Bucket + 일일 상한)
+# =============================================================================
+class OracleBudget:
+    def __init__(self, per_minute: float, per_day: int):
+        self.per_minute = per_minute
+        self.per_day = per_day
+        self._tokens = float(per_minute)
+        self._refilled_at = time.monotonic()
+        self._day = date.today()
+        self._used_today = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.per_minute, self._tokens + (now - self._refilled_at) * self.per_minute / 60.0)
+        self._refilled_at = now
+        if date.today() != self._day:
+            self._day = date.today()
+            self._used_today = 0
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._used_today >= self.per_day or self._tokens < 1.0:
+            return False
+        self._tokens -= 1.0
+        self._used_today += 1
+        return True
+
+    def retry_after(self) -> float:
+        """다음 호출이 가능해질 때까지 대기 시간 (초, 최대 60)"""
+        self._refill()
+        if self._used_today >= self.per_day:
+            return 60.0
+        return min(60.0, max(0.0, (1.0 - self._tokens) * 60.0 / self.per_minute))
+
+    def remaining_today(self) -> int:
+        self._refill()
+        return max(0, self.per_day - self._used_today)
+
+    def metrics(self) -> Dict[str, Any]:
+        self._refill()
+        return {"per_minute": self.per_minute, "per_day": self.per_day, "used_today": self._used_today}
+
+
+# =============================================================================
+# 후보 저장소 (SQLite, 재시작 후에도 유지)
+# =============================================================================
+class CandidateStore:
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=5.0, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS al_candidates (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                dedupe_key TEXT NOT NULL UNIQUE,
+                payload TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                outcome TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_al_candidates_state ON al_candidates (state, id)")
+        self._conn.commit()
+
+    def add(self, candidate: ALCandidate) -> bool:
+        """
+        후보 추가 (같은 dedupe_key가 이미 있으면 False)
+        Oracle이 필요한 후보는 pending(선별 대기), 라벨을 이미 받은 후보는 바로 selected
+        """
+        now = time.time()
+        state = "pending" if candidate.oracle_labels is None else "selected"
+        with self._lock:
+            cur = self._conn.execute(
+                "INSERT OR IGNORE INTO al_candidates (dedupe_key, payload, state, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (candidate.dedupe_key(), json.dumps(asdict(candidate), ensure_ascii=False, default=str), state, now, now)
+            )
+            self._conn.commit()
+            return cur.rowcount == 1
+
+    def pending(self) -> List[Tuple[int, ALCandidate]]:
+        """선별 대기 중인 후보 전체"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload FROM al_candidates WHERE state = 'pending' ORDER BY id"
+            ).fetchall()
+        return [(row_id, ALCandidate(**json.loads(payload))) for row_id, payload in rows]
+
+    def prefetched_since(self, since: float) -> List[ALCandidate]:
+        """since 이후 등록된, 라벨을 이미 받은 후보 (선별 시 다양성 기준 집합)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT payload FROM al_candidates WHERE created_at >= ? "
+                "AND json_extract(payload, '$.oracle_labels') IS NOT NULL ORDER BY id", (since,)
+            ).fetchall()
+        return [ALCandidate(**json.loads(payload)) for (payload,) in rows]
+
+    def mark(self, row_ids: List[int], state: str, outcome: Optional[str] = None):
+        with self._lock:
+            self._conn.executemany(
+                "UPDATE al_candidates SET state = ?, outcome = ?, updated_at = ? WHERE id = ?",
+                [(state, outcome, time.time(), row_id) for row_id in row_ids]
+            )
+            self._conn.commit()
+
+    def outstanding_oracle(self) -> int:
+        """선택되었지만 아직 Oracle을 호출하지 않은 후보 수 (이번 구간 예산에서 차감)"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM al_candidates WHERE state IN ('selected', 'processing') "
+                "AND json_extract(payload, '$.oracle_labels') IS NULL"
+            ).fetchone()[0]
+
+    def claim(self) -> Optional[Tuple[int, ALCandidate]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT id, payload FROM al_candidates WHERE state = 'selected' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute(
+                "UPDATE al_candidates SET state = 'processing', attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (time.time(), row[0])
+            )
+            self._conn.commit()
+        return row[0], ALCandidate(**json.loads(row[1]))
+
+    def finish(self, row_id: int, state: str, outcome: str = ""):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE al_candidates SET state = ?, outcome = ?, updated_at = ? WHERE id = ?",
+                (state, outcome, time.time(), row_id)
+            )
+            self._conn.commit()
+
+    def release(self, row_id: int, count_attempt: bool = True):
+        """다시 처리 대기 상태로 (예산 부족 등으로 처리하지 못한 경우 attempts 복구)"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE al_candidates SET state = 'selected', attempts = attempts - ?, updated_at = ? WHERE id = ?",
+                (0 if count_attempt else 1, time.time(), row_id)
+            )
+            self._conn.commit()
+
+    def attempts(self, row_id: int) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT attempts FROM al_candidates WHERE id = ?", (row_id,)).fetchone()[0]
+
+    def recover(self) -> int:
+        """비정상 종료로 processing에 남은 후보를 처리 대기 상태로 되돌림"""
+        with self._lock:
+            count = self._conn.execute(
+                "UPDATE al_candidates SET state = 'selected' WHERE state = 'processing'"
+            ).rowcount
+            self._conn.commit()
+        return count
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT state, COUNT(*) FROM al_candidates GROUP BY state").fetchall()
+        return {state: count for state, count in rows}
+
+
+# =============================================================================
+# 도메인별 Oracle / 품질 필터
+# =============================================================================
+async def _call_oracle(candidate: ALCandidate) -> Dict[str, Any]:
+    if candidate.domain == "audio":
+        from ai.app.services.common.llm_service import generate_audio_labels
+        return await generate_audio_labels(candidate.s3_url)
+    from ai.app.services.common.llm_service import generate_training_labels
+    return await generate_training_labels(candidate.s3_url, candidate.domain)
+
+
+def _quality_check(candidate: ALCandidate, labels: Dict[str, Any]) -> Tuple[bool, str, str]:
+    """
+    Returns:
+        (통과 여부, manifest status, 사유)
+    """
+    if not labels:
+        return False, "", "empty"
+    if candidate.analysis_type == "LLM_TIRE_ANALYSIS":
+        if labels.get("wear_level_pct") is None:
+            return False, "", "wear_level_missing"
+        if labels.get("wear_status") == "UNKNOWN":
+            return False, "", "wear_status_unknown"
+        return True, labels["wear_status"], ""
+    if candidate.analysis_type == "LLM_ORACLE_ENGINE":
+        # PatchCore 오탐을 LLM이 정상으로 정정한 경우도 이상 분류 재학습에 필요하므로 NORMAL 허용
+        # (Router Fallback 통합 진단의 엔진 후보는 anomaly_label이 없으므로 아래 일반 규칙)
+        status = labels.get("status") or ""
+        if status in ("", "UNKNOWN", "ERROR") or not labels.get("anomaly_label"):
+            return False, "", f"quality:{status}"
+        return True, status, ""
+    if candidate.domain == "audio":
+        status = labels.get("status", "")
+        if status in ("RE_RECORD_REQUIRED", "UNKNOWN", "ERROR") or not labels.get("label"):
+            return False, "", f"quality:{status}"
+        return True, status, ""
+    status = labels.get("status", "")
+    if status not in ("WARNING", "CRITICAL") or not labels.get("labels"):
+        return False, "", f"quality:{status}"
+    return True, status, ""
+
+
+# =============================================================================
+# Pipeline
+# =============================================================================
+class ActiveLearningPipeline:
+    def __init__(self, path: str, workers: int = 2, budget: Optional[OracleBudget] = None,
+                 dedup: Optional[NearDuplicateIndex] = None, enabled: bool = True,
+                 window_sec: float = 900.0, diversity_weight: float = DEFAULT_DIVERSITY_WEIGHT,
+                 max_age_sec: float = 24 * 3600):
+        self.enabled = enabled
+        self.store = CandidateStore(path) if enabled else None
+        self.num_workers = workers
+        self.budget = budget or OracleBudget(per_minute=10, per_day=500)
+        self.dedup = dedup or NearDuplicateIndex()
+        self.window_sec = window_sec
+        self.diversity_weight = diversity_weight
+        self.max_age_sec = max_age_sec
+        self._tasks: List[asyncio.Task] = []
+        self._wake: Optional[asyncio.Event] = None
+        self._last_selection_at: Optional[float] = None
+        self._last_selection: Dict[str, Any] = {}
+        self._stats = {"submitted": 0, "duplicates": 0, "oracle_calls": 0, "labeled": 0,
+                       "skipped": 0, "failed": 0, "budget_waits": 0,
+                       "windows": 0, "selected": 0, "not_selected": 0, "expired": 0}
+
+    # -------------------------------------------------------------------------
+    # 수명 주기
+    # -------------------------------------------------------------------------
+    async def start(self):
+        if not self.enabled or self._tasks:
+            return
+        recovered = await asyncio.to_thread(self.store.recover)
+        if recovered:
+            print(f"[AL Pipeline] 처리 중단된 후보 {recovered}개 재대기")
+        self._wake = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for _ in range(self.num_workers):
+            # 요청 컨텍스트(스트리밍 싱크, in-request 메모이즈)를 물려받지 않도록 빈 Context에서 실행
+            self._tasks.append(loop.create_task(self._worker(), context=contextvars.Context()))
+        self._tasks.append(loop.create_task(self._selector(), context=contextvars.Context()))
+        print(f"[AL Pipeline] 워커 {self.num_workers}개 시작 (선별 구간 {self.window_sec:.0f}초)")
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await asyncio.to_thread(self.dedup.save)
+
+    async def submit(self, candidate: ALCandidate) -> bool:
+        """후보 등록 (Oracle 호출 없음, 로컬 SQLite 기록만)"""
+        if not self.enabled:
+            return False
+        try:
+            added = await asyncio.to_thread(self.store.add, candidate)
+        except sqlite3.Error as e:
+            print(f"[AL Pipeline] 후보 기록 실패 (무시): {e}")
+            return False
+        self._stats["submitted" if added else "duplicates"] += 1
+        if not self._tasks:
+            await self.start()
+        if added and candidate.oracle_labels is not None:
+            self._wake.set()
+        return added
+
+    # -------------------------------------------------------------------------
+    # 선별 (구간 단위)
+    # -------------------------------------------------------------------------
+    async def _selector(self):
+        while True:
+            await asyncio.sleep(self.window_sec)
+            try:
+                await self.run_selection()
+            except Exception as e:
+                print(f"[AL Pipeline] 선별 실패 (다음 구간에 재시도): {e}")
+
+    def _seconds_left_today(self, now: float) -> float:
+        tomorrow = datetime.combine(date.fromtimestamp(now) + timedelta(days=1), datetime.min.time())
+        return tomorrow.timestamp() - now
+
+    async def run_selection(self, now: Optional[float] = None) -> Dict[str, Any]:
+        """
+        대기 후보 중 이번 구간에 Oracle을 호출할 후보 선택
+
+        Returns:
+            {"window_id", "budget", "candidates", "selected", "expired", "policy_rejected"}
+        """
+        from ai.app.services.common.active_learning_service import get_active_learning_policy
+
+        now = now or time.time()
+        since = self._last_selection_at or now - self.window_sec
+        policy = get_active_learning_policy()
+
+        pending = await asyncio.to_thread(self.store.pending)
+        expired, rejected = [], []
+        rows: Dict[str, Tuple[Optional[int], ALCandidate]] = {}
+        for row_id, candidate in pending:
+            if candidate.created_at < now - self.max_age_sec:
+                expired.append(row_id)
+            elif not policy.should_collect(candidate.status, candidate.confidence,
+                                           labels=candidate.model_output.get("labels")):
+                rejected.append(row_id)
+            else:
+                rows[candidate.dedupe_key()] = (row_id, candidate)
+        # 이번 구간에 라벨과 함께 들어온 후보는 예산 없이 저장되므로 다양성 기준 집합으로만 사용
+        for candidate in await asyncio.to_thread(self.store.prefetched_since, since):
+            rows.setdefault(candidate.dedupe_key(), (None, candidate))
+
+        outstanding = await asyncio.to_thread(self.store.outstanding_oracle)
+        budget = window_budget(self.budget.remaining_today() - outstanding, self._seconds_left_today(now), self.window_sec)
+
+        items, uncertainty = [], {}
+        for key, (_, candidate) in rows.items():
+            score, components = candidate.uncertainty()
+            uncertainty[key] = (score, components)
+            items.append(SelectionItem(key, score, candidate.oracle_labels is None,
+                                       candidate.fingerprint.get("phash"), components))
+        decisions = select_candidates(items, budget, self.diversity_weight)
+
+        selected = [rows[d.key][0] for d in decisions if d.reason == "selected"]
+        await asyncio.to_thread(self.store.mark, expired, "skipped", "expired")
+        await asyncio.to_thread(self.store.mark, rejected, "skipped", "policy")
+        await asyncio.to_thread(self.store.mark, selected, "selected")
+
+        window_id = f"{int(now)}"
+        entries = []
+        for d in decisions:
+            candidate = rows[d.key][1]
+            score, components = uncertainty[d.key]
+            entries.append({
+                "category": candidate.domain.upper(),
+                "status": d.reason.upper(),
+                "window_id": window_id,
+                "candidate_key": d.key,
+                "original_url": candidate.s3_url,
+                "analysis_type": candidate.analysis_type,
+                "confidence": candidate.confidence,
+                "needs_oracle": candidate.oracle_labels is None,
+                "uncertainty": score,
+                "components": components,
+                "phash": candidate.fingerprint.get("phash"),
+                "rank": d.rank,
+                "gain": d.gain,
+                "budget": budget,
+                "diversity_weight": self.diversity_weight,
+            })
+        await asyncio.to_thread(self._record_selection, entries)
+
+        self._last_selection_at = now
+        self._stats["windows"] += 1
+        self._stats["selected"] += len(selected)
+        self._stats["not_selected"] += sum(1 for d in decisions if not d.selected)
+        self._stats["expired"] += len(expired)
+        self._stats["skipped"] += len(expired) + len(rejected)
+        self._last_selection = {
+            "window_id": window_id,
+            "budget": budget,
+            "candidates": sum(1 for item in items if item.needs_oracle),
+            "selected": len(selected),
+            "expired": len(expired),
+            "policy_rejected": len(rejected),
+        }
+        if selected:
+            print(f"[AL Pipeline] 구간 {window_id}: 후보 {self._last_selection['candidates']}개 중 {len(selected)}개 선택 (예산 {budget})")
+            if self._wake is not None:
+                self._wake.set()
+        return dict(self._last_selection)
+
+    def _record_selection(self, entries: List[Dict[str, Any]]):
+        from ai.app.services.common.manifest_service import get_manifest
+        try:
+            manifest = get_manifest(SELECTION_MANIFEST)
+            for entry in entries:
+                manifest.append(entry)
+        except Exception as e:
+            print(f"[AL Pipeline] 선별 기록 실패 (무시): {e}")
+
+    # -------------------------------------------------------------------------
+    # Worker
+    # -------------------------------------------------------------------------
+    async def _worker(self):
+        while True:
+            claimed = await asyncio.to_thread(self.store.claim)
+            if claimed is None:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=POLL_INTERVAL_SEC)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            row_id, candidate = claimed
+            try:
+                state, outcome = await self.process(candidate)
+            except Exception as e:
+                print(f"[AL Pipeline] 처리 실패 ({candidate.s3_url}): {e}")
+                attempts = await asyncio.to_thread(self.store.attempts, row_id)
+                if attempts >= MAX_ATTEMPTS:
+                    self._stats["failed"] += 1
+                    await asyncio.to_thread(self.store.finish, row_id, "failed", str(e)[:200])
+                else:
+                    await asyncio.to_thread(self.store.release, row_id)
+                continue
+
+            if state == "deferred":
+                # 예산 소진: 시도 횟수에 포함하지 않고 되돌린 뒤 대기
+                self._stats["budget_waits"] += 1
+                await asyncio.to_thread(self.store.release, row_id, False)
+                await asyncio.sleep(self.budget.retry_after() or 1.0)
+                continue
+            await asyncio.to_thread(self.store.finish, row_id, state, outcome)
+
+    async def process(self, candidate: ALCandidate) -> Tuple[str, str]:
+        """
+        후보 하나 처리
+
+        Returns:
+            (state, outcome): ("done", label_key) / ("skipped", 사유) / ("deferred", "budget")
+        """
+        from ai.app.services.common.active_learning_service import get_active_learning_policy
+
+        needs_oracle = candidate.oracle_labels is None
+        if needs_oracle:
+            policy = get_active_learning_policy()
+            if not policy.should_collect(candidate.status, candidate.confidence,
+                                         labels=candidate.model_output.get("labels")):
+                self._stats["skipped"] += 1
+                return "skipped", "policy"
+
+        # 근접 중복 검사 + 등록 (라벨이 저장되지 않으면 등록 취소)
+        entry_id, duplicate = await asyncio.to_thread(
+            self.dedup.admit,
+            candidate.domain,
+            candidate.fingerprint.get("phash"),
+            decode_embedding(candidate.fingerprint.get("embedding")),
+            needs_oracle=needs_oracle,
+        )
+        if duplicate:
+            self._stats["skipped"] += 1
+            return "skipped", f"near_duplicate:{duplicate}"
+
+        state, outcome = "skipped", ""
+        try:
+            state, outcome = await self._label_and_save(candidate)
+        finally:
+            if state != "done":
+                self.dedup.release(candidate.domain, entry_id)
+        return state, outcome
+
+    async def _label_and_save(self, candidate: ALCandidate) -> Tuple[str, str]:
+        from ai.app.services.common.active_learning_service import get_active_learning_service
+
+        labels = candidate.oracle_labels
+        if labels is None:
+            if not self.budget.try_acquire():
+                return "deferred", "budget"
+            self._stats["oracle_calls"] += 1
+            labels = await _call_oracle(candidate)
+
+        ok, status, reason = _quality_check(candidate, labels)
+        if not ok:
+            print(f"[AL Pipeline] 배제: {reason} ({candidate.s3_url})")
+            self._stats["skipped"] += 1
+            return "skipped", reason
+
+        al_service = get_active_learning_service()
+        label_key = al_service.save_oracle_label(candidate.s3_url, labels, candidate.domain, candidate.label_suffix)
+        if not label_key:
+            raise RuntimeError("save_oracle_label failed")
+        await asyncio.to_thread(
+            al_service.record_manifest,
+            s3_url=candidate.s3_url,
+            category=candidate.category,
+            label_key=label_key,
+            status=status,
+            confidence=candidate.confidence,
+            analysis_type=labels.get("label", candidate.analysis_type) if candidate.domain == "audio" else candidate.analysis_type,
+            detections=candidate.model_output.get("labels"),
+            domain="audio" if candidate.domain == "audio" else "visual"
+        )
+        self._stats["labeled"] += 1
+        return "done", label_key
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+    def metrics(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            "workers": len(self._tasks),
+            "stats": dict(self._stats),
+            "candidates": self.store.counts(),
+            "budget": self.budget.metrics(),
+            "selection": dict(self._last_selection, window_sec=self.window_sec, diversity_weight=self.diversity_weight),
+            "dedup": self.dedup.metrics(),
+        }
+
+
+_pipeline: Optional[ActiveLearningPipeline] = None
+
+
+def get_al_pipeline() -> ActiveLearningPipeline:
+    global _pipeline
+    if _pipeline is None:
+        _pipeline = ActiveLearningPipeline(
+            path=os.getenv("AL_PIPELINE_PATH", "ai/data/cache/al_candidates.sqlite3"),
+            workers=int(os.getenv("AL_PIPELINE_WORKERS", "2")),
+            budget=OracleBudget(
+                per_minute=float(os.getenv("AL_ORACLE_PER_MINUTE", "10")),
+                per_day=int(os.getenv("AL_ORACLE_DAILY_BUDGET", "500")),
+            ),
+            dedup=NearDuplicateIndex(
+                path=os.getenv("AL_DEDUP_PATH", "ai/data/cache/al_dedup_index.npz"),
+                capacity_per_domain=int(os.getenv("AL_DEDUP_CAPACITY", "2000")),
+            ),
+            enabled=os.getenv("AL_PIPELINE_ENABLED", "true").lower() == "true",
+            window_sec=float(os.getenv("AL_SELECT_WINDOW_SEC", "900")),
+            diversity_weight=float(os.getenv("AL_DIVERSITY_WEIGHT", str(DEFAULT_DIVERSITY_WEIGHT))),
+            max_age_sec=float(os.getenv("AL_CANDIDATE_MAX_AGE_SEC", str(24 * 3600))),
+        )
+    return _pipeline
+
+
+async def submit_al_candidate(candidate: ALCandidate) -> bool:
+    """요청 경로용: 후보만 남기고 즉시 반환 (실패해도 예외를 올리지 않음)"""
+    try:
+        # 요청 중 Router/AST가 남긴 불확실성 신호를 후보에 첨부 (선별 점수용)
+        signals = request_signals()
+        if signals:
+            candidate.model_output = {**candidate.model_output, "signals": {**signals, **candidate.model_output.get("signals", {})}}
+        return await get_al_pipeline().submit(candidate)
+    except Exception as e:
+        print(f"[AL Pipeline] 후보 등록 실패 (무시): {e}")
+        return False
@@ -0,0 +1,201 @@
+# ai/app/services/common/active_learning_selector.py
+"""
+Active Learning 후보 선별기 (Uncertainty + Diversity, 일일 Oracle 예산 배분)
+
+[역할]
+요청마다 "신뢰도 < 0.85면 수집" 식으로 바로 Oracle을 호출하면 먼저 들어온 후보가 예산을 다 쓰고,
+비슷한 사진이 한꺼번에 들어오면 같은 종류의 라벨만 쌓입니다.
+파이프라인은 후보를 일정 구간(window) 동안 모아 두고, 구간이 끝날 때 이 모듈로
+"모델이 가장 헷갈려 하면서 서로 다른" 후보만 골라 그 구간 몫의 예산만 씁니다.
+
+[불확실성 점수 (0 ~ 1, 클수록 라벨 가치 높음)]
+- router_entropy / ast_entropy: Router(MobileNetV3) / AST softmax의 정규화 엔트로피 (H / log K)
+- box_margin: YOLO 박스 신뢰도가 0.5에 가까울수록 1 (1 - |2c - 1|, 박스 중 최대)
+- anomaly_margin: PatchCore 점수가 임계값에 가까울수록 1 (1 - |score - threshold| / threshold)
+- 위 신호가 하나도 없으면 1 - confidence
+여러 신호가 있으면 최댓값을 사용합니다. (어느 모델이든 헷갈렸으면 배울 것이 있음)
+
+[다양성 (MMR, Maximal Marginal Relevance)]
+가치 = 불확실성 - diversity_weight x (이미 고른 후보와의 최대 유사도)
+유사도는 pHash 해밍 거리 기반 (1 - d / 32, 무관한 사진끼리는 평균 32bit 차이 → 0).
+Router 임베딩은 같은 도메인 사진끼리 모두 가까워 다양성 척도로 쓰지 않습니다. (near_duplicate_index 참고)
+요청 중 이미 LLM 라벨을 받은 후보는 예산을 쓰지 않으므로 항상 선택되며, 먼저 "고른 집합"에 들어갑니다.
+
+[재현성]
+난수를 쓰지 않고, 동점은 후보 key 순으로 정합니다.
+같은 입력(후보 목록, 예산, 가중치)이면 항상 같은 결과가 나오므로,
+파이프라인이 al_selection manifest에 남긴 기록만으로 오프라인 재현/비교가 가능합니다.
+(ai/scripts/utils/replay_al_selection.py)
+"""
+import math
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai.app.services.common.near_duplicate_index import popcount64
+
+DEFAULT_DIVERSITY_WEIGHT = 0.5
+PHASH_SIMILARITY_BITS = 32
+
+# 요청 안에서 모델이 계산한 불확실성 신호 (Router/AST → submit_al_candidate에서 후보에 첨부)
+_request_signals: ContextVar[Dict[str, float]] = ContextVar("al_request_signals", default={})
+
+
+# =============================================================================
+# 요청 단위 신호
+# =============================================================================
+def record_uncertainty_signal(name: str, value: Optional[float]):
+    if value is None:
+        return
+    _request_signals.set({**_request_signals.get(), name: round(float(value), 6)})
+
+
+def request_signals() -> Dict[str, float]:
+    return dict(_request_signals.get())
+
+
+def normalized_entropy(probs: Sequence[float]) -> float:
+    """softmax 확률의 정규화 엔트로피 (균등 분포 = 1, 한 클래스 확신 = 0)"""
+    p = np.asarray(probs, dtype=np.float64).ravel()
+    k = p.size
+    if k < 2:
+        return 0.0
+    p = p[p > 0]
+    return float(-(p * np.log(p)).sum() / math.log(k))
+
+
+# =============================================================================
+# 불확실성 점수
+# =============================================================================
+def uncertainty_components(model_output: Dict[str, Any], confidence: float) -> Dict[str, float]:
+    components: Dict[str, float] = {}
+    signals = model_output.get("signals") or {}
+    for name in ("router_entropy", "ast_entropy"):
+        if signals.get(name) is not None:
+            components[name] = float(signals[name])
+
+    box_confidences = [lbl["confidence"] for lbl in model_output.get("labels") or []
+                       if isinstance(lbl, dict) and lbl.get("confidence") is not None]
+    if box_confidences:
+        components["box_margin"] = max(1.0 - abs(2.0 * float(c) - 1.0) for c in box_confidences)
+
+    score, threshold = model_output.get("anomaly_score"), model_output.get("anomaly_threshold")
+    if score is not None and threshold:
+        components["anomaly_margin"] = max(0.0, 1.0 - abs(float(score) - float(threshold)) / float(threshold))
+
+    if not components:
+        components["confidence"] = 1.0 - float(confidence)
+    return {name: round(min(1.0, max(0.0, value)), 6) for name, value in components.items()}
+
+
+def uncertainty_score(model_output: Dict[str, Any], confidence: float) -> Tuple[float, Dict[str, float]]:
+    components = uncertainty_components(model_output, confidence)
+    return max(components.values()), components
+
+
+# =============================================================================
+# 선별 (MMR)
+# =============================================================================
+@dataclass
+class SelectionItem:
+    key: str                        # 후보 dedupe_key (동점 정렬 기준)
+    uncertainty: float
+    needs_oracle: bool = True
+    phash: Optional[str] = None
+    components: Dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class SelectionDecision:
+    key: str
+    selected: bool
+    reason: str                     # selected | prefetched | budget
+    rank: Optional[int] = None      # 선택 순서 (0부터, 예산 후보만)
+    gain: Optional[float] = None    # 선택 시점의 MMR 가치
+
+
+def _phash_similarity(phashes: np.ndarray, has_phash: np.ndarray, value: Optional[int]) -> np.ndarray:
+    if value is None:
+        return np.zeros(len(phashes))
+    distances = popcount64(phashes ^ np.uint64(value)).astype(np.float64)
+    return np.where(has_phash, np.clip(1.0 - distances / PHASH_SIMILARITY_BITS, 0.0, 1.0), 0.0)
+
+
+def select_candidates(
+    items: Sequence[SelectionItem],
+    budget: int,
+    diversity_weight: float = DEFAULT_DIVERSITY_WEIGHT
+) -> List[SelectionDecision]:
+    """
+    구간 내 후보 중 Oracle 예산(budget)만큼 선택 (결정적)
+
+    Returns:
+        key 순으로 정렬된 후보별 결정
+    """
+    items = sorted(items, key=lambda item: item.key)
+    n = len(items)
+    phashes = np.array([int(item.phash, 16) if item.phash else 0 for item in items], dtype=np.uint64)
+    has_phash = np.array([item.phash is not None for item in items], dtype=bool)
+    uncertainty = np.array([item.uncertainty for item in items], dtype=np.float64)
+    open_ = np.array([item.needs_oracle for item in items], dtype=bool)
+    max_similarity = np.zeros(n)
+
+    decisions: Dict[int, SelectionDecision] = {}
+    for i, item in enumerate(items):
+        if not item.needs_oracle:
+            decisions[i] = SelectionDecision(item.key, True, "prefetched")
+            if item.phash:
+                max_similarity = np.maximum(max_similarity, _phash_similarity(phashes, has_phash, int(item.phash, 16)))
+
+    for rank in range(max(0, budget)):
+        if not open_.any():
+            break
+        gains = np.where(open_, uncertainty - diversity_weight * max_similarity, -np.inf)
+        best = int(np.argmax(gains))  # 동점이면 가장 앞(key 순) 후보
+        decisions[best] = SelectionDecision(items[best].key, True, "selected", rank, round(float(gains[best]), 6))
+        open_[best] = False
+        if items[best].phash:
+            max_similarity = np.maximum(max_similarity, _phash_similarity(phashes, has_phash, int(items[best].phash, 16)))
+
+    return [decisions.get(i) or SelectionDecision(item.key, False, "budget") for i, item in enumerate(items)]
+
+
+def window_budget(remaining_today: int, seconds_left_today: float, window_sec: float) -> int:
+    """남은 일일 예산을 오늘 남은 구간 수로 나눈 이번 구간 몫 (올림, 마지막 구간에 남은 예산 전부)"""
+    if remaining_today <= 0:
+        return 0
+    windows_left = max(1, math.ceil(seconds_left_today / window_sec))
+    return math.ceil(remaining_today / windows_left)
+
+
+# =============================================================================
+# 오프라인 재현
+# =============================================================================
+def replay_window(
+    entries: Sequence[Dict[str, Any]],
+    budget: Optional[int] = None,
+    diversity_weight: Optional[float] = None
+) -> List[SelectionDecision]:
+    """
+    al_selection manifest에 기록된 한 구간의 항목으로 선별을 다시 실행
+    (budget / diversity_weight를 생략하면 기록 당시 값 사용 → 기록과 동일한 결과)
+    """
+    if not entries:
+        return []
+    items = [
+        SelectionItem(
+            key=e["candidate_key"],
+            uncertainty=e["uncertainty"],
+            needs_oracle=e["needs_oracle"],
+            phash=e.get("phash"),
+            components=e.get("components", {}),
+        )
+        for e in entries
+    ]
+    return select_candidates(
+        items,
+        entries[0]["budget"] if budget is None else budget,
+        entries[0]["diversity_weight"] if diversity_weight is None else diversity_weight,
+    )
@@ -7,15 +7,14 @@ Active Learning 데이터 수집 서비스
 '저신뢰 데이터'나 'LLM 오라클 데이터'를 중앙 집중적으로 수집하여 S3에 저장합니다.
 
 [기능]
-1. 정답 라벨(Oracle) JSON 저장
+1. 정답 라벨(Oracle) JSON 저장 (ObjectStoreWriter 큐에 넣기만 하고 업로드는 백그라운드에서 처리)
 2. Manifest 파일 업데이트
-3. S3 클라이언트 재사용 관리
 """
 import os
-import json
-import boto3
 import time
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+from ai.app.services.common.object_store_writer import get_object_writer
 
 class ActiveLearningService:
     _instance = None
@@ -23,9 +22,6 @@ class ActiveLearningService:
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(ActiveLearningService, cls).__new__(cls)
-            # S3 클라이언트 초기화 (Singleton)
-            cls._instance.s3 = boto3.client('s3')
-            cls._instance.bucket = os.getenv("S3_BUCKET_NAME", "car-sentry-data")
         return cls._instance
 
     def save_oracle_label(self, s3_url: str, label_data: Dict[str, Any], domain: str, file_suffix: str = "") -> str:
@@ -39,7 +35,7 @@ class ActiveLearningService:
             file_suffix: 파일명 뒤에 붙일 식별자 (예: _Battery)
             
         Returns:
-            저장된 S3 Key
+            저장될 S3 Key (업로드는 비동기로 진행)
         """
         try:
             # 파일 ID 추출
@@ -61,14 +57,9 @@ class ActiveLearningService:
                 label_data["source_url"] = s3_url
             label_data["labeled_by"] = "LLM_ORACLE"
             
-            # S3 업로드
-            self.s3.put_object(
-                Bucket=self.bucket,
-                Key=key,
-                Body=json.dumps(label_data, ensure_ascii=False, indent=2),
-                ContentType='application/json'
-            )
-            print(f"[Active Learning] 정답지 저장 완료: {key}")
+            # S3 업로드 예약 (요청 처리를 막지 않음)
+            get_object_writer().enqueue(key, label_data)
+            print(f"[Active Learning] 정답지 업로드 예약: {key}")
             return key
             
         except Exception as e:
@@ -91,7 +82,7 @@ class ActiveLearningService:
         """
         try:
             # 필요한 모듈 지연 로딩 (순환 참조 방지)
-            from ai.app.services.manifest_service import add_visual_entry, add_audio_entry
+            from ai.app.services.common.manifest_service import add_visual_entry, add_audio_entry
             
             # [Fix] 문자열 추측 대신 명시적 domain 파라미터 사용
             if domain == "audio":
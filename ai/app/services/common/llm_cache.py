@@ -0,0 +1,267 @@
+# ai/app/services/common/llm_cache.py
+"""
+텍스트 전용 LLM 리포트 응답 캐시 (Persistent Prompt/Response Cache)
+
+[역할]
+1. 입력 정규화: 작은 구조화 입력(경고등/파손/타이어 상태 목록)을 정렬/정규화하여 같은 의미의 입력을 같은 키로 만듭니다.
+   (예: [헤드라이트 파손, 앞범퍼 스크래치] == [앞범퍼 스크래치, 헤드라이트 파손])
+2. 디스크 저장: SQLite 파일에 TTL과 프롬프트 버전 태그를 함께 저장하여 재시작 후에도 재사용합니다.
+3. 버전 무효화: 프롬프트를 수정하면 llm_service.PROMPT_VERSIONS를 올리며, 이전 버전 항목은 조회되지 않고
+   관리자 API로 일괄 삭제할 수 있습니다.
+4. 메트릭: 함수별 hit / miss / store 횟수와 적중률을 집계합니다.
+
+[환경 변수]
+- LLM_CACHE_ENABLED (기본 true)
+- LLM_CACHE_PATH (기본 ai/data/cache/llm_responses.sqlite3)
+- LLM_CACHE_TTL_SEC (기본 7일)
+"""
+import asyncio
+import functools
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from ai.app.services.common.progress_events import emit, is_streaming
+
+
+def canonicalize_records(records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    dict 목록 정규화: 문자열 공백 정리, 실수 소수 2자리 반올림, 키 정렬, 목록 정렬
+    (정규화된 값은 캐시 키뿐 아니라 프롬프트 생성에도 그대로 사용되어 키와 응답이 항상 일치)
+    """
+    def _norm(value):
+        if isinstance(value, str):
+            return re.sub(r"\s+", " ", value).strip()
+        if isinstance(value, float):
+            return round(value, 2)
+        if isinstance(value, dict):
+            return {k: _norm(value[k]) for k in sorted(value)}
+        if isinstance(value, (list, tuple)):
+            return [_norm(v) for v in value]
+        return value
+
+    normalized = [_norm(r) for r in (records or [])]
+    return sorted(normalized, key=lambda r: json.dumps(r, ensure_ascii=False, sort_keys=True))
+
+
+def make_cache_key(function_name: str, version: str, canonical: Any, backend: str = "") -> str:
+    payload = json.dumps([function_name, version, backend, canonical], ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """SQLite 기반 응답 캐시 (스레드 안전, 호출은 asyncio.to_thread로 오프로딩)"""
+
+    def __init__(self, path: str, ttl_sec: float, enabled: bool = True):
+        self.path = path
+        self.ttl_sec = ttl_sec
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    function_name TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_responses_fn_ver ON llm_responses (function_name, prompt_version)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _record(self, function_name: str, field: str):
+        entry = self._stats.setdefault(function_name, {"hits": 0, "misses": 0, "stores": 0})
+        entry[field] += 1
+
+    # -------------------------------------------------------------------------
+    # 조회 / 저장
+    # -------------------------------------------------------------------------
+    def get(self, function_name: str, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(
+                "SELECT response FROM llm_responses WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+            if row is None:
+                self._record(function_name, "misses")
+                return None
+            conn.execute("UPDATE llm_responses SET hits = hits + 1 WHERE key = ?", (key,))
+            conn.commit()
+        self._record(function_name, "hits")
+        return json.loads(row[0])
+
+    def put(self, function_name: str, version: str, key: str, response: Dict[str, Any]):
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_responses "
+                "(key, function_name, prompt_version, response, created_at, expires_at, hits) VALUES (?, ?, ?, ?, ?, ?, 0)",
+                (key, function_name, version, json.dumps(response, ensure_ascii=False), now, now + self.ttl_sec)
+            )
+            conn.commit()
+        self._record(function_name, "stores")
+
+    # -------------------------------------------------------------------------
+    # 무효화
+    # -------------------------------------------------------------------------
+    def invalidate(self, function_name: Optional[str] = None, version: Optional[str] = None,
+                   keep_versions: Optional[Dict[str, str]] = None) -> int:
+        """
+        조건에 맞는 항목 삭제 후 삭제 건수 반환
+
+        - function_name / version: 지정한 함수·버전 항목 삭제 (둘 다 없으면 전체)
+        - keep_versions: {함수: 현재 버전}이 주어지면 현재 버전이 아닌(오래된) 항목만 삭제
+        """
+        clauses, params = [], []
+        if function_name:
+            clauses.append("function_name = ?")
+            params.append(function_name)
+        if version:
+            clauses.append("prompt_version = ?")
+            params.append(version)
+        if keep_versions:
+            keep = " OR ".join("(function_name = ? AND prompt_version = ?)" for _ in keep_versions)
+            clauses.append(f"NOT ({keep})")
+            for fn, ver in keep_versions.items():
+                params.extend([fn, ver])
+
+        sql = "DELETE FROM llm_responses" + (f" WHERE {' AND '.join(clauses)}" if clauses else "")
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute(sql, params).rowcount
+            conn.commit()
+        print(f"[LLM Cache] {deleted}개 항목 무효화 (function={function_name}, version={version})")
+        return deleted
+
+    def delete(self, key: str) -> bool:
+        """항목 1개 삭제 (호출 측 검수에서 거절된 응답 제거용)"""
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,)).rowcount
+            conn.commit()
+        return deleted > 0
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            conn = self._connection()
+            deleted = conn.execute("DELETE FROM llm_responses WHERE expires_at <= ?", (time.time(),)).rowcount
+            conn.commit()
+        return deleted
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+    def metrics(self) -> Dict[str, Any]:
+        functions = {}
+        for name, s in self._stats.items():
+            lookups = s["hits"] + s["misses"]
+            functions[name] = dict(s, hit_rate=round(s["hits"] / lookups, 4) if lookups else None)
+
+        entries: Dict[str, Dict[str, int]] = {}
+        if self.enabled:
+            with self._lock:
+                rows = self._connection().execute(
+                    "SELECT function_name, prompt_version, COUNT(*) FROM llm_responses "
+                    "WHERE expires_at > ? GROUP BY function_name, prompt_version",
+                    (time.time(),)
+                ).fetchall()
+            for fn, ver, count in rows:
+                entries.setdefault(fn, {})[ver] = count
+
+        return {
+            "enabled": self.enabled,
+            "path": self.path,
+            "ttl_sec": self.ttl_sec,
+            "functions": functions,
+            "entries": entries,
+        }
+
+
+_cache: Optional[LLMResponseCache] = None
+
+
+def get_llm_cache() -> LLMResponseCache:
+    global _cache
+    if _cache is None:
+        _cache = LLMResponseCache(
+            path=os.getenv("LLM_CACHE_PATH", "ai/data/cache/llm_responses.sqlite3"),
+            ttl_sec=float(os.getenv("LLM_CACHE_TTL_SEC", str(7 * 24 * 3600))),
+            enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true",
+        )
+    return _cache
+
+
+def cached_llm_response(function_name: str, version: str, canonicalize: Callable = canonicalize_records,
+                        backend: Optional[Callable[[], str]] = None) -> Callable:
+    """
+    첫 번째 인자(구조화 입력 목록)를 정규화하여 캐시 키를 만들고, 적중 시 네트워크 호출 없이 반환합니다.
+
+    - backend: 호출 시점의 '제공자:모델'을 돌려주는 함수 → 키에 포함 (라우팅/모델이 바뀌면 다른 모델 응답을 재사용하지 않음)
+
+    - 함수에는 정규화된 입력이 전달됩니다 (같은 키 → 같은 프롬프트)
+    - is_mock 표시가 있는 응답(Mock/오류 Fallback)은 저장하지 않습니다.
+    - 캐시 I/O 오류는 무시하고 원래 함수를 호출합니다.
+    - 호출 측 검수에서 거절한 응답은 `await func.invalidate(records)`로 지워 다음 호출이 다시 생성하게 합니다.
+    - 스트리밍 요청에서 적중하면 저장된 description을 llm_token 이벤트 하나로 보냅니다. (토큰 스트림 대신)
+    """
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(records, *args, **kwargs):
+            cache = get_llm_cache()
+            if not cache.enabled:
+                return await func(records, *args, **kwargs)
+
+            canonical = canonicalize(records)
+            key = make_cache_key(function_name, version, canonical, backend() if backend else "")
+            try:
+                hit = await asyncio.to_thread(cache.get, function_name, key)
+            except sqlite3.Error as e:
+                print(f"[LLM Cache] 조회 실패 (무시): {e}")
+                hit = None
+            if hit is not None:
+                print(f"[LLM Cache] 적중: {function_name}")
+                if is_streaming() and isinstance(hit, dict) and hit.get("description"):
+                    emit("llm_token", {"function": function_name, "delta": hit["description"], "cached": True})
+                return hit
+
+            result = await func(canonical, *args, **kwargs)
+            if isinstance(result, dict) and not result.get("is_mock"):
+                try:
+                    await asyncio.to_thread(cache.put, function_name, version, key, result)
+                except sqlite3.Error as e:
+                    print(f"[LLM Cache] 저장 실패 (무시): {e}")
+            return result
+
+        async def invalidate(records) -> bool:
+            cache = get_llm_cache()
+            if not cache.enabled:
+                return False
+            key = make_cache_key(function_name, version, canonicalize(records), backend() if backend else "")
+            try:
+                return await asyncio.to_thread(cache.delete, key)
+            except sqlite3.Error as e:
+                print(f"[LLM Cache] 삭제 실패 (무시): {e}")
+                return False
+
+        wrapper.invalidate = invalidate
+        return wrapper
+    return decorator
@@ -1,45 +1,152 @@
-from typing import Dict, Any, List, Optional
+# ai/app/services/common/llm_guard.py
+"""
+LLM 응답 스키마 검증 (LLM Output Guard)
 
-def validate_llm_label_result(result: Optional[Dict[str, Any]]) -> bool:
+[역할]
+1. 스키마 정의: 구조화 출력(response_format=json_schema)에 그대로 전달하는 JSON Schema를 정의합니다.
+2. 스키마 검증: 제공자가 스키마를 강제하지 못하는 경우(로컬 모델, json_object 모드)에도 같은 스키마로 응답을 검증합니다.
+3. 정규화: 검증을 통과한 BBox를 [0, 1] 범위로 자르고 좌표 순서를 맞추며, 출처(source)와 confidence를 부여합니다.
+
+[지원하는 스키마 키워드]
+type, enum, properties, required, additionalProperties, items
+(OpenAI Structured Outputs strict 모드에서 공통으로 지원되는 키워드만 사용)
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+VISUAL_CATEGORIES = ["DASHBOARD", "EXTERIOR", "TIRE", "ENGINE", "ETC"]
+VISUAL_STATUSES = ["NORMAL", "WARNING", "CRITICAL"]
+
+# =============================================================================
+# 통합 진단 + BBox 스키마 (diagnose_and_localize)
+# =============================================================================
+FUSED_DIAGNOSIS_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "relevance": {"type": "string", "enum": ["VEHICLE", "IRRELEVANT"]},
+        "category": {"type": "string", "enum": VISUAL_CATEGORIES},
+        "status": {"type": "string", "enum": VISUAL_STATUSES},
+        "description": {"type": "string"},
+        "recommendation": {"type": "string"},
+        "objects": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "class": {"type": "string"},
+                    "bbox": {"type": "array", "items": {"type": "number"}},
+                    "confidence": {"type": "number"},
+                },
+                "required": ["class", "bbox", "confidence"],
+                "additionalProperties": False,
+            },
+        },
+    },
+    "required": ["relevance", "category", "status", "description", "recommendation", "objects"],
+    "additionalProperties": False,
+}
+
+# 최상위 필드만 검증 (objects는 항목별로 따로 검증, 모델이 덧붙인 여분 필드는 무시)
+_TOP_LEVEL_SCHEMA: Dict[str, Any] = {
+    "type": "object",
+    "properties": {k: v for k, v in FUSED_DIAGNOSIS_SCHEMA["properties"].items() if k != "objects"},
+    "required": [k for k in FUSED_DIAGNOSIS_SCHEMA["required"] if k != "objects"],
+}
+
+_TYPE_CHECKS = {
+    "object": lambda v: isinstance(v, dict),
+    "array": lambda v: isinstance(v, list),
+    "string": lambda v: isinstance(v, str),
+    "number": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "integer": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "boolean": lambda v: isinstance(v, bool),
+}
+
+
+def validate_against_schema(value: Any, schema: Dict[str, Any], path: str = "$") -> List[str]:
     """
-    generate_training_labels 결과가 유효한지 검증하는 Guard 함수
-    
-    Args:
-        result: LLM 응답 Dict (generate_training_labels 반환값)
-        
-    Result:
-        True: 유효함 (labels를 사용해도 됨)
-        False: 유효하지 않음 (FAILED, EMPTY, Error 등)
+    JSON Schema(부분 집합) 검증
+
+    Returns:
+        오류 메시지 목록 (빈 리스트면 유효)
     """
-    # 1. None 체크
-    if not result:
-        return False
-        
-    # 2. Status 체크
-    # "FAILED"나 "ERROR"가 명시되어 있으면 무효
-    status = result.get("status", "FAILED")
-    if status in ["FAILED", "ERROR"]:
-        return False
-        
-    # 3. Label 형식 체크
-    labels = result.get("labels")
-    if not isinstance(labels, list):
-        return False
-        
-    # 4. 빈 라벨 허용 여부
-    # labels가 비어있어도 "NORMAL" 상태라면 "정상(문제없음)"이라는 유효한 판단일 수 있음.
-    # 하지만 "박스를 그려야 하는" 로직 입장에서는 박스가 없으면 의미 없으므로
-    # 호출하는 쪽에서 has_detections = len(validate(result)) > 0 로 체크해야 함.
-    # 여기서는 "형식적 유효성"만 판단.
-    
-    return True
-
-def sanitize_confidence(bbox_item: Dict[str, Any], heuristic_conf: float = 0.9) -> Dict[str, Any]:
+    errors = []
+    expected = schema.get("type")
+    if expected and not _TYPE_CHECKS[expected](value):
+        return [f"{path}: expected {expected}, got {type(value).__name__}"]
+
+    if "enum" in schema and value not in schema["enum"]:
+        errors.append(f"{path}: {value!r} not in {schema['enum']}")
+
+    if expected == "object":
+        properties = schema.get("properties", {})
+        for key in schema.get("required", []):
+            if key not in value:
+                errors.append(f"{path}.{key}: required")
+        for key, item in value.items():
+            if key in properties:
+                errors.extend(validate_against_schema(item, properties[key], f"{path}.{key}"))
+            elif schema.get("additionalProperties", True) is False:
+                errors.append(f"{path}.{key}: unexpected property")
+
+    if expected == "array" and "items" in schema:
+        for i, item in enumerate(value):
+            errors.extend(validate_against_schema(item, schema["items"], f"{path}[{i}]"))
+
+    return errors
+
+
+def _normalize_bbox(bbox: List[float]) -> Optional[List[float]]:
+    """정규화 좌표 [x1, y1, x2, y2] → [0, 1] 클리핑 + 순서 정렬 (면적 0이면 None)"""
+    if len(bbox) != 4:
+        return None
+    x1, y1, x2, y2 = (min(max(float(v), 0.0), 1.0) for v in bbox)
+    x1, x2 = sorted((x1, x2))
+    y1, y2 = sorted((y1, y2))
+    if x2 - x1 <= 0 or y2 - y1 <= 0:
+        return None
+    return [x1, y1, x2, y2]
+
+
+def validate_fused_diagnosis(result: Any, default_confidence: float = 0.9) -> Tuple[Optional[Dict[str, Any]], List[str]]:
     """
-    LLM이 생성한 BBox에 대해 가상의 Confidence를 부여하거나 출처를 명시
+    diagnose_and_localize 응답 검증 + 정규화
+
+    - 최상위 필드 오류: 결과 전체를 버림 → (None, errors)
+    - objects 항목 오류: 해당 항목만 버리고 나머지는 사용 → (result, errors)
+
+    Returns:
+        (정규화된 결과 또는 None, 오류 메시지 목록)
     """
-    if "confidence" not in bbox_item:
-        bbox_item["confidence"] = heuristic_conf
-    
-    bbox_item["source"] = "LLM_GENERATED"
-    return bbox_item
+    if not isinstance(result, dict):
+        return None, ["$: expected object"]
+
+    top_errors = validate_against_schema({k: v for k, v in result.items() if k != "objects"}, _TOP_LEVEL_SCHEMA)
+    if top_errors:
+        return None, top_errors
+
+    errors = []
+    objects = result.get("objects", [])
+    if not isinstance(objects, list):
+        errors.append("$.objects: expected array")
+        objects = []
+
+    item_schema = FUSED_DIAGNOSIS_SCHEMA["properties"]["objects"]["items"]
+    clean_objects = []
+    for i, obj in enumerate(objects):
+        if isinstance(obj, dict) and "confidence" not in obj:
+            obj = dict(obj, confidence=default_confidence)
+        item_errors = validate_against_schema(obj, item_schema, f"$.objects[{i}]")
+        bbox = _normalize_bbox(obj["bbox"]) if not item_errors else None
+        if bbox is None:
+            errors.extend(item_errors or [f"$.objects[{i}].bbox: invalid box {obj.get('bbox')}"])
+            continue
+        clean_objects.append({
+            "class": obj["class"],
+            "bbox": bbox,
+            "confidence": min(max(float(obj["confidence"]), 0.0), 1.0),
+            "source": "LLM_GENERATED",
+        })
+
+    clean = {k: result[k] for k in FUSED_DIAGNOSIS_SCHEMA["required"] if k != "objects"}
+    clean["objects"] = clean_objects
+    return clean, errors
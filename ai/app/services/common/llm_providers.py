@@ -0,0 +1,344 @@
+# ai/app/services/common/llm_providers.py
+"""
+LLM 제공자 추상화 및 함수별 라우팅 (LLM Providers)
+
+[역할]
+1. 제공자 구현: OpenAI / OpenAI 호환 로컬 서버(Ollama, vLLM 등) / Mock
+2. 함수별 라우팅: llm_service 함수 이름 → 제공자 (환경 변수로 설정)
+3. 요청 배칭: 로컬 모델로 가는 텍스트 전용 호출을 짧은 시간창 동안 모아 한 번의 요청으로 처리
+4. 제공자별 지연 리포트: p50/p95 및 복원력 계층(Breaker, in-flight) 메트릭
+
+[환경 변수]
+- LLM_DEFAULT_PROVIDER: openai | local | mock (기본 openai)
+- LLM_ROUTES: "함수명=제공자" 콤마 구분
+    예) interpret_dashboard_warnings=local,generate_exterior_report=local,interpret_tire_status=local
+- LOCAL_LLM_BASE_URL: OpenAI 호환 엔드포인트 (기본 http://localhost:11434/v1, DTC 번역 스크립트와 같은 Ollama)
+- LOCAL_LLM_MODEL: 로컬 모델명 (기본 qwen2.5:3b)
+- LOCAL_LLM_BATCH: 로컬 텍스트 호출 배칭 여부 (기본 true)
+- LOCAL_LLM_BATCH_MAX / LOCAL_LLM_BATCH_WAIT_MS: 배치 최대 크기(8) / 최대 대기(25ms)
+"""
+import asyncio
+import json
+import os
+import re
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from openai import AsyncOpenAI
+
+from ai.app.services.common.llm_resilience import ResilientClient
+
+
+def make_completion_response(content: str) -> SimpleNamespace:
+    """chat.completions 응답과 같은 접근 경로(choices[0].message.content)를 갖는 객체"""
+    message = SimpleNamespace(role="assistant", content=content, audio=None)
+    return SimpleNamespace(choices=[SimpleNamespace(index=0, message=message, finish_reason="stop")])
+
+
+# =============================================================================
+# Providers
+# =============================================================================
+class LLMProvider:
+    """제공자 공통 인터페이스"""
+    name = "base"
+    is_mock = False
+
+    def is_ready(self) -> bool:
+        return True
+
+    def is_circuit_open(self) -> bool:
+        return False
+
+    def model_id(self, requested: Optional[str] = None) -> Optional[str]:
+        """실제로 호출되는 모델 id (기본: 호출부 model 파라미터 그대로)"""
+        return requested
+
+    async def create(self, function_name: str, **kwargs):
+        raise NotImplementedError
+
+    def metrics(self) -> Dict[str, Any]:
+        return {}
+
+
+class OpenAIProvider(LLMProvider):
+    """OpenAI 공식 API (호출부의 model 파라미터 그대로 사용)"""
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        self.api_key = api_key
+        self.client = ResilientClient(
+            AsyncOpenAI(api_key=api_key or "MISSING_KEY", base_url=base_url, max_retries=0)
+        )
+
+    def is_ready(self) -> bool:
+        key = self.api_key
+        return key is not None and key.startswith("sk-") and len(key) > 20
+
+    def is_circuit_open(self) -> bool:
+        return self.client.breaker.is_open()
+
+    async def create(self, function_name: str, **kwargs):
+        return await self.client.create(function_name, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        return self.client.metrics()
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    OpenAI 호환 로컬 서버 (Ollama /v1, vLLM, llama.cpp server 등)
+    model은 제공자 설정으로 덮어쓰고, 로컬 서버가 모르는 파라미터는 변환/제거합니다.
+    """
+    name = "local"
+
+    UNSUPPORTED_KWARGS = ("modalities", "audio")
+
+    def __init__(self, base_url: str, model: str, api_key: str = "local", batch: bool = True,
+                 batch_max: int = 8, batch_wait_ms: float = 25.0):
+        self.base_url = base_url
+        self.model = model
+        self.client = ResilientClient(AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0))
+        self.batcher = TextBatcher(self, batch_max, batch_wait_ms) if batch else None
+
+    def is_circuit_open(self) -> bool:
+        return self.client.breaker.is_open()
+
+    def model_id(self, requested: Optional[str] = None) -> Optional[str]:
+        return self.model
+
+    def _adapt(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        kwargs = {k: v for k, v in kwargs.items() if k not in self.UNSUPPORTED_KWARGS}
+        kwargs["model"] = self.model
+        if "max_completion_tokens" in kwargs:
+            kwargs["max_tokens"] = kwargs.pop("max_completion_tokens")
+        return kwargs
+
+    async def create(self, function_name: str, **kwargs):
+        if self.batcher is not None and TextBatcher.is_batchable(kwargs):
+            return await self.batcher.submit(function_name, kwargs)
+        return await self.create_direct(function_name, **kwargs)
+
+    async def create_direct(self, function_name: str, **kwargs):
+        return await self.client.create(function_name, **self._adapt(kwargs))
+
+    def metrics(self) -> Dict[str, Any]:
+        data = self.client.metrics()
+        data["model"] = self.model
+        if self.batcher is not None:
+            data["batching"] = self.batcher.metrics()
+        return data
+
+
+class MockProvider(LLMProvider):
+    """
+    Mock 제공자: 이 제공자로 라우팅된 함수는 should_use_fallback()이 True가 되어
+    llm_service의 기존 Mock 응답을 반환합니다. (실제 create는 호출되지 않음)
+    """
+    name = "mock"
+    is_mock = True
+
+    async def create(self, function_name: str, **kwargs):
+        raise RuntimeError(f"MockProvider does not call a model ({function_name})")
+
+
+# =============================================================================
+# 텍스트 요청 배칭 (로컬 모델용)
+# =============================================================================
+class TextBatcher:
+    """
+    짧은 시간창(batch_wait_ms) 동안 들어온 텍스트 전용 JSON 요청을 하나의 프롬프트로 합칩니다.
+    응답의 results 배열 길이가 맞지 않으면 개별 요청으로 재시도하여 결과를 보장합니다.
+    """
+
+    BATCH_PROMPT = """다음 {n}개의 작업에 각각 독립적으로 답하십시오.
+각 작업의 지시에 따른 JSON 객체를 순서대로 results 배열에 넣어, 반드시 아래 형식의 JSON 하나로만 응답하십시오.
+{{"results": [작업1의 JSON, 작업2의 JSON, ...]}}
+
+{tasks}"""
+
+    def __init__(self, provider: OpenAICompatibleProvider, batch_max: int, batch_wait_ms: float):
+        self.provider = provider
+        self.batch_max = batch_max
+        self.batch_wait = batch_wait_ms / 1000.0
+        self._queue: List[tuple] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self.batches = 0
+        self.batched_requests = 0
+        self.split_fallbacks = 0
+
+    @staticmethod
+    def is_batchable(kwargs: Dict[str, Any]) -> bool:
+        """단일 user 텍스트 메시지 + JSON 응답 요청만 배칭"""
+        if kwargs.get("stream"):
+            return False
+        messages = kwargs.get("messages", [])
+        if len(messages) != 1 or messages[0].get("role") != "user":
+            return False
+        if not isinstance(messages[0].get("content"), str):
+            return False
+        return (kwargs.get("response_format") or {}).get("type") == "json_object"
+
+    async def submit(self, function_name: str, kwargs: Dict[str, Any]):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._queue.append((function_name, kwargs, future))
+
+        if len(self._queue) >= self.batch_max:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        batch, self._queue = self._queue[:self.batch_max], self._queue[self.batch_max:]
+        if self._queue:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_wait, self._flush)
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch: List[tuple]):
+        if len(batch) == 1:
+            function_name, kwargs, future = batch[0]
+            await self._run_single(function_name, kwargs, future)
+            return
+
+        self.batches += 1
+        self.batched_requests += len(batch)
+        tasks = "\n\n".join(
+            f"[작업 {i + 1}]\n{kwargs['messages'][0]['content'].strip()}" for i, (_, kwargs, _) in enumerate(batch)
+        )
+        max_tokens = sum(kw.get("max_completion_tokens", kw.get("max_tokens", 600)) for _, kw, _ in batch)
+        batch_kwargs = {
+            "model": batch[0][1].get("model"),
+            "messages": [{"role": "user", "content": self.BATCH_PROMPT.format(n=len(batch), tasks=tasks)}],
+            "response_format": {"type": "json_object"},
+            "max_completion_tokens": max_tokens,
+        }
+
+        try:
+            response = await self.provider.create_direct("batch:" + "+".join(sorted({b[0] for b in batch})), **batch_kwargs)
+            content = response.choices[0].message.content or ""
+            match = re.search(r'\{.*\}', content, re.DOTALL)
+            results = json.loads(match.group()).get("results") if match else None
+            if not isinstance(results, list) or len(results) != len(batch):
+                raise ValueError(f"results 길이 불일치: {len(results) if isinstance(results, list) else None} != {len(batch)}")
+        except Exception as e:
+            print(f"[LLM Batch] 배치 응답 분리 실패, 개별 요청으로 재시도: {e}")
+            self.split_fallbacks += 1
+            await asyncio.gather(*[self._run_single(*item) for item in batch])
+            return
+
+        for (_, _, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(make_completion_response(json.dumps(result, ensure_ascii=False)))
+
+    async def _run_single(self, function_name: str, kwargs: Dict[str, Any], future: asyncio.Future):
+        try:
+            response = await self.provider.create_direct(function_name, **kwargs)
+            if not future.done():
+                future.set_result(response)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "batched_requests": self.batched_requests,
+            "avg_batch_size": round(self.batched_requests / self.batches, 2) if self.batches else None,
+            "split_fallbacks": self.split_fallbacks,
+        }
+
+
+# =============================================================================
+# Router
+# =============================================================================
+class ProviderRouter:
+    """함수 이름 → 제공자 라우팅 + 제공자별 지연 집계"""
+
+    def __init__(self, providers: Dict[str, LLMProvider], routes: Dict[str, str], default: str):
+        self.providers = providers
+        self.routes = routes
+        self.default = default
+        self._latencies: Dict[str, deque] = {name: deque(maxlen=500) for name in providers}
+        self._errors: Dict[str, int] = {name: 0 for name in providers}
+
+    def provider_for(self, function_name: str) -> LLMProvider:
+        name = self.routes.get(function_name, self.default)
+        return self.providers.get(name) or self.providers[self.default]
+
+    def resolve(self, function_name: str, requested_model: Optional[str] = None) -> str:
+        """함수가 지금 라우팅되는 '제공자:모델' (응답 캐시 키 재료)"""
+        provider = self.provider_for(function_name)
+        return f"{provider.name}:{provider.model_id(requested_model)}"
+
+    async def create(self, function_name: str, **kwargs):
+        provider = self.provider_for(function_name)
+        start = time.monotonic()
+        try:
+            response = await provider.create(function_name, **kwargs)
+        except Exception:
+            self._errors[provider.name] += 1
+            raise
+        self._latencies[provider.name].append(time.monotonic() - start)
+        return response
+
+    def metrics(self) -> Dict[str, Any]:
+        providers = {}
+        for name, provider in self.providers.items():
+            lat = list(self._latencies[name])
+            providers[name] = {
+                "routes": sorted(fn for fn, p in self.routes.items() if p == name),
+                "is_default": name == self.default,
+                "calls": len(lat),
+                "errors": self._errors[name],
+                "p50_ms": round(float(np.percentile(lat, 50)) * 1000, 1) if lat else None,
+                "p95_ms": round(float(np.percentile(lat, 95)) * 1000, 1) if lat else None,
+                "resilience": provider.metrics(),
+            }
+        return {"default": self.default, "providers": providers}
+
+
+def parse_routes(spec: str) -> Dict[str, str]:
+    """'fn_a=local,fn_b=mock' → {"fn_a": "local", "fn_b": "mock"}"""
+    routes = {}
+    for item in (spec or "").split(","):
+        if "=" in item:
+            fn, provider = item.split("=", 1)
+            routes[fn.strip()] = provider.strip()
+    return routes
+
+
+def build_provider_router() -> ProviderRouter:
+    """환경 변수로부터 제공자/라우팅 구성"""
+    providers: Dict[str, LLMProvider] = {
+        "openai": OpenAIProvider(api_key=os.getenv("OPENAI_API_KEY"), base_url=os.getenv("OPENAI_BASE_URL")),
+        "local": OpenAICompatibleProvider(
+            base_url=os.getenv("LOCAL_LLM_BASE_URL", "http://localhost:11434/v1"),
+            model=os.getenv("LOCAL_LLM_MODEL", "qwen2.5:3b"),
+            batch=os.getenv("LOCAL_LLM_BATCH", "true").lower() == "true",
+            batch_max=int(os.getenv("LOCAL_LLM_BATCH_MAX", "8")),
+            batch_wait_ms=float(os.getenv("LOCAL_LLM_BATCH_WAIT_MS", "25")),
+        ),
+        "mock": MockProvider(),
+    }
+    default = os.getenv("LLM_DEFAULT_PROVIDER", "openai")
+    if default not in providers:
+        print(f"[LLM Providers] 알 수 없는 기본 제공자: {default} → openai 사용")
+        default = "openai"
+
+    routes = parse_routes(os.getenv("LLM_ROUTES", ""))
+    for fn, provider in list(routes.items()):
+        if provider not in providers:
+            print(f"[LLM Providers] 알 수 없는 제공자 무시: {fn}={provider}")
+            routes.pop(fn)
+
+    if routes:
+        print(f"[LLM Providers] 기본={default}, 라우팅={routes}")
+    return ProviderRouter(providers, routes, default)
@@ -0,0 +1,347 @@
+# ai/app/services/common/llm_resilience.py
+"""
+LLM 호출 복원력 계층 (Resilience Layer)
+
+[역할]
+1. 동시성 제한: 전역 / 함수별 세마포어로 동시 호출 수를 묶고, 대기 시간이 길면 즉시 포기합니다.
+2. Circuit Breaker: 연속 실패 또는 지연 급증 시 회로를 열어 llm_service의 Mock/Fallback 응답으로 바로 보냅니다.
+3. 재시도: 일시적 오류(타임아웃, 429, 5xx, 연결 오류)만 지수 백오프 + Full Jitter로 제한 횟수 재시도합니다.
+4. Hedging (선택): 함수별 p95 지연을 넘기면 같은 요청을 한 번 더 보내고 먼저 끝난 응답을 사용합니다.
+5. 메트릭: 회로 상태, in-flight 수, 재시도/헤지/거절 횟수, 함수별 지연을 노출합니다.
+
+[사용법]
+    client = ResilientClient(AsyncOpenAI(max_retries=0))
+    response = await client.create("analyze_general_image", model=..., messages=...)
+
+[환경 변수]
+- LLM_MAX_CONCURRENCY (16), LLM_MAX_CONCURRENCY_PER_FN (4), LLM_QUEUE_TIMEOUT_SEC (10)
+- LLM_ATTEMPT_TIMEOUT_SEC (20), LLM_MAX_RETRIES (2), LLM_RETRY_BASE_SEC (0.5)
+- LLM_BREAKER_FAILURES (5), LLM_BREAKER_SLOW_SEC (15), LLM_BREAKER_COOLDOWN_SEC (30)
+- LLM_HEDGE (false), LLM_HEDGE_MIN_SAMPLES (20)
+"""
+import asyncio
+import os
+import random
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+
+def _env_float(name: str, default: float) -> float:
+    return float(os.getenv(name, str(default)))
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+class CircuitOpenError(Exception):
+    """회로가 열려 있어 호출하지 않음"""
+
+
+class LLMOverloadedError(Exception):
+    """동시성 슬롯 대기 시간 초과"""
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    """일시적 오류만 재시도 (인증/요청 형식 오류는 즉시 실패)"""
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError)):
+        return True
+    try:
+        import openai
+        if isinstance(exc, (openai.APITimeoutError, openai.APIConnectionError, openai.RateLimitError)):
+            return True
+        if isinstance(exc, openai.APIStatusError):
+            return exc.status_code >= 500
+    except ImportError:
+        pass
+    return False
+
+
+# =============================================================================
+# Circuit Breaker
+# =============================================================================
+class CircuitBreaker:
+    """
+    CLOSED → (연속 실패 N회 또는 최근 p95 지연 > 임계값) → OPEN
+    OPEN → (cooldown 경과) → HALF_OPEN (시험 호출 1회 허용)
+    HALF_OPEN → 성공 시 CLOSED / 실패 시 다시 OPEN
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "CLOSED", "OPEN", "HALF_OPEN"
+
+    def __init__(self, failure_threshold: int, slow_call_sec: float, cooldown_sec: float, window: int = 20):
+        self.failure_threshold = failure_threshold
+        self.slow_call_sec = slow_call_sec
+        self.cooldown_sec = cooldown_sec
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.open_count = 0
+        self.latencies = deque(maxlen=window)
+        self._probe_in_flight = False
+        self._probe_id = 0
+
+    def _maybe_half_open(self):
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown_sec:
+            self.state = self.HALF_OPEN
+            self._probe_in_flight = False
+
+    def is_open(self) -> bool:
+        """Fallback 판정용 (시험 호출이 진행 중인 HALF_OPEN은 열린 것으로 취급, 비어 있으면 시험 호출 허용)"""
+        self._maybe_half_open()
+        return self.state == self.OPEN or (self.state == self.HALF_OPEN and self._probe_in_flight)
+
+    def allow(self) -> bool:
+        self._maybe_half_open()
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.HALF_OPEN and not self._probe_in_flight:
+            self._probe_in_flight = True
+            self._probe_id += 1
+            return True
+        return False
+
+    def probe_token(self) -> Optional[int]:
+        """allow() 직후 호출: 이번 호출이 시험 호출을 잡았으면 그 번호"""
+        return self._probe_id if self.state == self.HALF_OPEN and self._probe_in_flight else None
+
+    def release_probe(self, token: Optional[int]):
+        """성공/실패 기록 없이 끝난 시험 호출(취소, 과부하 거절 등) 반납 → 다음 호출이 다시 시험"""
+        if token is not None and self.state == self.HALF_OPEN and self._probe_in_flight and token == self._probe_id:
+            self._probe_in_flight = False
+
+    def record_success(self, latency_sec: float):
+        self.latencies.append(latency_sec)
+        self.consecutive_failures = 0
+        if self.state == self.HALF_OPEN:
+            print("[LLM Breaker] 시험 호출 성공 → CLOSED")
+            self.state = self.CLOSED
+            self.latencies.clear()
+            return
+        # 지연 급증: 최근 창의 p95가 임계값 초과
+        if len(self.latencies) >= self.latencies.maxlen // 2:
+            p95 = float(np.percentile(list(self.latencies), 95))
+            if p95 > self.slow_call_sec:
+                self._open(f"p95 지연 {p95:.1f}s > {self.slow_call_sec}s")
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            self._open(f"연속 실패 {self.consecutive_failures}회")
+
+    def _open(self, reason: str):
+        if self.state != self.OPEN:
+            print(f"[LLM Breaker] OPEN ({reason}) - {self.cooldown_sec}s 동안 Fallback 응답 사용")
+            self.open_count += 1
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self._probe_in_flight = False
+        self.latencies.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._maybe_half_open()
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_count": self.open_count,
+        }
+
+
+# =============================================================================
+# Resilient Client
+# =============================================================================
+class _FunctionStats:
+    def __init__(self, window: int = 200):
+        self.latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self.calls = 0
+        self.failures = 0
+        self.retries = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.rejected = 0
+        self.short_circuited = 0
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        return float(np.percentile(list(self.latencies), q))
+
+
+class ResilientClient:
+    """AsyncOpenAI 래퍼: chat.completions.create 호출에 복원력 정책 적용"""
+
+    def __init__(self, client):
+        self._client = client
+        self.max_concurrency = _env_int("LLM_MAX_CONCURRENCY", 16)
+        self.max_concurrency_per_fn = _env_int("LLM_MAX_CONCURRENCY_PER_FN", 4)
+        self.queue_timeout = _env_float("LLM_QUEUE_TIMEOUT_SEC", 10.0)
+        self.attempt_timeout = _env_float("LLM_ATTEMPT_TIMEOUT_SEC", 20.0)
+        self.max_retries = _env_int("LLM_MAX_RETRIES", 2)
+        self.retry_base = _env_float("LLM_RETRY_BASE_SEC", 0.5)
+        self.hedge_enabled = os.getenv("LLM_HEDGE", "false").lower() == "true"
+        self.hedge_min_samples = _env_int("LLM_HEDGE_MIN_SAMPLES", 20)
+
+        self.breaker = CircuitBreaker(
+            failure_threshold=_env_int("LLM_BREAKER_FAILURES", 5),
+            slow_call_sec=_env_float("LLM_BREAKER_SLOW_SEC", 15.0),
+            cooldown_sec=_env_float("LLM_BREAKER_COOLDOWN_SEC", 30.0),
+        )
+        self._global_sem = asyncio.Semaphore(self.max_concurrency)
+        self._fn_sems: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, _FunctionStats] = {}
+        self.in_flight = 0
+
+    def _stats_for(self, name: str) -> _FunctionStats:
+        if name not in self._stats:
+            self._stats[name] = _FunctionStats()
+            self._fn_sems[name] = asyncio.Semaphore(self.max_concurrency_per_fn)
+        return self._stats[name]
+
+    # -------------------------------------------------------------------------
+    # 호출 흐름: Breaker → 세마포어 → (재시도 x (Hedge)) → 기록
+    # -------------------------------------------------------------------------
+    async def create(self, name: str, **kwargs):
+        stats = self._stats_for(name)
+        stats.calls += 1
+
+        if not self.breaker.allow():
+            stats.short_circuited += 1
+            raise CircuitOpenError(f"LLM circuit open ({name})")
+        probe = self.breaker.probe_token()
+
+        # 시험 호출이 성공/실패 기록 없이 끝나면(취소, 과부하 거절) 반납해 HALF_OPEN에 갇히지 않게 함
+        try:
+            last_exc: Optional[BaseException] = None
+            for attempt in range(self.max_retries + 1):
+                if attempt > 0:
+                    stats.retries += 1
+                    # Full Jitter: [0, base * 2^attempt)
+                    await asyncio.sleep(random.uniform(0, self.retry_base * (2 ** attempt)))
+                    if not self.breaker.allow():
+                        stats.short_circuited += 1
+                        raise CircuitOpenError(f"LLM circuit open ({name})")
+                    probe = self.breaker.probe_token() or probe
+
+                start = time.monotonic()
+                try:
+                    response = await self._attempt(name, stats, kwargs)
+                except LLMOverloadedError:
+                    stats.rejected += 1
+                    raise
+                except Exception as e:
+                    stats.failures += 1
+                    self.breaker.record_failure()
+                    last_exc = e
+                    if not _is_retryable(e) or self.breaker.is_open():
+                        raise
+                    print(f"[LLM Resilience] {name} 재시도 {attempt + 1}/{self.max_retries}: {type(e).__name__}")
+                    continue
+
+                latency = time.monotonic() - start
+                stats.latencies.append(latency)
+                self.breaker.record_success(latency)
+                return response
+
+            raise last_exc
+        finally:
+            self.breaker.release_probe(probe)
+
+    async def _attempt(self, name: str, stats: _FunctionStats, kwargs: Dict[str, Any]):
+        # 호출자가 지정한 timeout보다 길게 기다리지 않음
+        timeout = min(float(kwargs.pop("timeout", self.attempt_timeout)), self.attempt_timeout)
+        kwargs["timeout"] = timeout
+
+        hedge_delay = None
+        p95 = stats.percentile(95)
+        if self.hedge_enabled and p95 is not None and len(stats.latencies) >= self.hedge_min_samples:
+            hedge_delay = p95
+
+        primary = asyncio.ensure_future(self._guarded_call(name, kwargs, wait=True))
+        if hedge_delay is None:
+            return await asyncio.wait_for(primary, timeout=timeout + self.queue_timeout)
+
+        done, _ = await asyncio.wait({primary}, timeout=hedge_delay)
+        if done:
+            return primary.result()
+
+        # p95를 넘김 → 슬롯이 남아 있을 때만 중복 요청
+        hedge = asyncio.ensure_future(self._guarded_call(name, kwargs, wait=False))
+        stats.hedges += 1
+        pending = {primary, hedge}
+        first_exc = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            stats.hedge_wins += 1
+                        return task.result()
+                    if isinstance(task.exception(), LLMOverloadedError) and task is hedge:
+                        continue
+                    first_exc = first_exc or task.exception()
+            raise first_exc
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _guarded_call(self, name: str, kwargs: Dict[str, Any], wait: bool):
+        fn_sem = self._fn_sems[name]
+        acquired = []
+        try:
+            for sem in (self._global_sem, fn_sem):
+                if wait:
+                    try:
+                        await asyncio.wait_for(sem.acquire(), timeout=self.queue_timeout)
+                    except asyncio.TimeoutError:
+                        raise LLMOverloadedError(f"LLM queue timeout ({name})")
+                elif sem.locked():
+                    raise LLMOverloadedError(f"No slot for hedge ({name})")
+                else:
+                    await sem.acquire()
+                acquired.append(sem)
+
+            self.in_flight += 1
+            self._stats[name].in_flight += 1
+            try:
+                return await self._client.chat.completions.create(**kwargs)
+            finally:
+                self.in_flight -= 1
+                self._stats[name].in_flight -= 1
+        finally:
+            for sem in acquired:
+                sem.release()
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+    def metrics(self) -> Dict[str, Any]:
+        functions = {}
+        for name, s in self._stats.items():
+            p50, p95 = s.percentile(50), s.percentile(95)
+            functions[name] = {
+                "in_flight": s.in_flight,
+                "calls": s.calls,
+                "failures": s.failures,
+                "retries": s.retries,
+                "hedges": s.hedges,
+                "hedge_wins": s.hedge_wins,
+                "rejected": s.rejected,
+                "short_circuited": s.short_circuited,
+                "p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+                "p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            }
+        return {
+            "breaker": self.breaker.snapshot(),
+            "in_flight": self.in_flight,
+            "limits": {
+                "global": self.max_concurrency,
+                "per_function": self.max_concurrency_per_fn,
+            },
+            "functions": functions,
+        }
+
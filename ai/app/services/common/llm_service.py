@@ -10,47 +10,169 @@ AI 분석 결과 해석 및 리포트 생성 서비스 (LLM)
 [주요 기능]
 - 엔진룸 이상 분석 (suggest_anomaly_label)
 - 범용 이미지 진단 (analyze_general_image)
+- 범용 진단 + BBox 통합 호출 (diagnose_and_localize)
 - 계기판 경고등 해석 (interpret_dashboard_warnings)
 - 외관 파손 리포트 생성 (generate_exterior_report)
 - 타이어 상태 정밀 진단 (interpret_tire_status)
 - 오디오 기반 기계음 진단 (analyze_audio_with_llm)
+- 오디오 진단 + 학습 라벨 통합 생성 (analyze_and_label_audio_with_llm)
 """
 import os
 import json
 import base64
 import httpx
 import re
-from typing import Optional, List, Dict, Any
-from openai import AsyncOpenAI
+from typing import Optional, List, Dict, Any, Tuple, Callable
 from ai.app.schemas.visual_schema import VisualResponse
 from ai.app.schemas.audio_schema import AudioResponse, AudioDetail
+from ai.app.services.common.request_context import memoize_in_request
+from ai.app.services.common.vision_input import prepare_image_content, VISION_PROFILES
+from ai.app.services.common.llm_guard import FUSED_DIAGNOSIS_SCHEMA, validate_fused_diagnosis
+from ai.app.services.common.llm_providers import ProviderRouter, build_provider_router, make_completion_response
+from ai.app.services.common.progress_events import emit, is_streaming
+from ai.app.services.common.llm_cache import cached_llm_response, get_llm_cache
 
-# OpenAI 클라이언트 생성 및 키 체크
-def _get_api_key():
-    return os.getenv("OPENAI_API_KEY")
-
-def is_llm_ready():
-    """API 키가 있고 유효한 형식인지 체크"""
-    key = _get_api_key()
-    return key is not None and key.startswith("sk-") and len(key) > 20
-
+# [Provider] 함수별 제공자 라우팅 (OpenAI / OpenAI 호환 로컬 서버 / Mock)
 client = None
-def _get_client():
+def _get_router() -> ProviderRouter:
     global client
     if client is None:
-        api_key = _get_api_key()
-        client = AsyncOpenAI(api_key=api_key or "MISSING_KEY")
+        client = build_provider_router()
     return client
 
-# 최종 Mock/Fallback 판정: 명시적 MOCK 설정 OR API 키 없음
-def should_use_fallback():
+# [Streaming] /predict/visual/stream 요청에서 토큰 단위로 전달하는 서술형 호출 (JSON 모드는 description 값만)
+STREAMED_FUNCTIONS = {
+    "analyze_general_image",
+    "diagnose_and_localize",
+    "call_openai_vision",
+    "interpret_dashboard_warnings",
+    "generate_exterior_report",
+    "interpret_tire_status",
+}
+
+# [Cache] 텍스트 전용 리포트 함수의 프롬프트 버전 (프롬프트 수정 시 올리면 이전 캐시는 조회되지 않음)
+PROMPT_VERSIONS = {
+    "interpret_dashboard_warnings": "v1",
+    "generate_exterior_report": "v1",
+    "interpret_tire_status": "v1",
+}
+
+def _cache_backend(function_name: str, model: str = "gpt-5") -> Callable[[], str]:
+    """캐시 키용 '제공자:모델' (LLM_ROUTES / LOCAL_LLM_MODEL이 바뀌면 다른 키)"""
+    return lambda: _get_router().resolve(function_name, model)
+
+class _FunctionClient:
+    """기존 호출 형태(client.chat.completions.create)를 유지하면서 함수 이름으로 라우팅"""
+    def __init__(self, router: ProviderRouter, function_name: str):
+        self._router = router
+        self._function_name = function_name
+        self.chat = self
+        self.completions = self
+
+    async def create(self, **kwargs):
+        if self._function_name in STREAMED_FUNCTIONS and is_streaming():
+            return await self._create_streaming(kwargs)
+        return await self._router.create(self._function_name, **kwargs)
+
+    async def _create_streaming(self, kwargs):
+        """
+        SSE 요청 중: 응답을 토큰 단위로 llm_token 이벤트로 흘려보내고, 완성된 응답을 기존 형태로 반환
+        JSON 모드 호출은 JSON 조각 대신 description 값만 흘려보냅니다. (없으면 토큰 이벤트 없음)
+        """
+        json_mode = (kwargs.get("response_format") or {}).get("type") in ("json_object", "json_schema")
+        field = _JsonStringField("description") if json_mode else None
+        stream = await self._router.create(self._function_name, stream=True, **kwargs)
+        parts = []
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                parts.append(delta)
+                text = field.feed(delta) if field is not None else delta
+                if text:
+                    emit("llm_token", {"function": self._function_name, "delta": text})
+        return make_completion_response("".join(parts))
+
+
+class _JsonStringField:
+    """스트리밍 JSON 조각에서 문자열 필드 하나의 값만 점진적으로 디코딩 (이스케이프 처리, 닫는 따옴표 이후 무시)"""
+
+    def __init__(self, name: str):
+        self._key = re.compile(r'"%s"\s*:\s*"' % re.escape(name))
+        self._buffer = ""
+        self._pos: Optional[int] = None   # 다음에 해석할 위치 (값 시작 전이면 None)
+        self._closed = False
+
+    def feed(self, delta: str) -> str:
+        """새 조각을 받아 이번에 새로 확정된 값 텍스트를 반환"""
+        self._buffer += delta
+        if self._closed:
+            return ""
+        if self._pos is None:
+            match = self._key.search(self._buffer)
+            if match is None:
+                return ""
+            self._pos = match.end()
+
+        buf, i, out = self._buffer, self._pos, []
+        while i < len(buf):
+            c = buf[i]
+            if c == '"':
+                self._closed = True
+                break
+            if c != "\\":
+                out.append(c)
+                i += 1
+                continue
+            # 이스케이프: 조각 경계에서 잘렸으면 다음 조각을 기다림 (\uD83D\uDE00 같은 서로게이트 쌍은 함께 해석)
+            end = i + 2
+            if buf[i + 1:i + 2] == "u":
+                end = i + 6
+                if buf[i + 2:i + 4].lower() in ("d8", "d9", "da", "db"):
+                    end = i + 12
+            if end > len(buf):
+                break
+            try:
+                out.append(json.loads('"' + buf[i:end] + '"'))
+            except ValueError:
+                self._closed = True
+                break
+            i = end
+        self._pos = i
+        return "".join(out)
+
+def _get_client(function_name: str = "default"):
+    """
+    함수별 제공자로 라우팅되는 클라이언트
+    각 제공자는 복원력 계층(동시성 제한 / Circuit Breaker / 재시도 / Hedging)을 거칩니다.
+    """
+    return _FunctionClient(_get_router(), function_name)
+
+def get_llm_metrics() -> Dict[str, Any]:
+    """제공자별 라우팅, 지연(p50/p95), Circuit Breaker 상태 및 in-flight 메트릭"""
+    return _get_router().metrics()
+
+def get_llm_cache_metrics() -> Dict[str, Any]:
+    """응답 캐시 적중률 및 버전별 저장 항목 수"""
+    data = get_llm_cache().metrics()
+    data["prompt_versions"] = dict(PROMPT_VERSIONS)
+    return data
+
+# 최종 Mock/Fallback 판정: 명시적 MOCK 설정 OR Mock 라우팅 OR 제공자 미설정(API 키 없음) OR 회로 열림
+def should_use_fallback(function_name: Optional[str] = None):
     explicit_mock = os.getenv("MOCK_LLM", "false").lower() == "true"
-    return explicit_mock or not is_llm_ready()
+    if explicit_mock:
+        return True
+    router = _get_router()
+    provider = router.provider_for(function_name) if function_name else router.providers[router.default]
+    return provider.is_mock or not provider.is_ready() or provider.is_circuit_open()
 
 # ---------------------------------------------------------
 # 1. 시각 전문 진단 (GPT-5 Vision)
 # ---------------------------------------------------------
 
+@memoize_in_request
 async def suggest_anomaly_label(
     heatmap_url: str,
     crop_url: str,
@@ -95,7 +217,7 @@ async def suggest_anomaly_label(
     }}
     """
     
-    if should_use_fallback():
+    if should_use_fallback("suggest_anomaly_label"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] suggest_anomaly_label (URL): {part_name}")
         return {
@@ -107,7 +229,7 @@ async def suggest_anomaly_label(
         }
     
     try:
-        response = await _get_client().chat.completions.create(
+        response = await _get_client("suggest_anomaly_label").chat.completions.create(
             model="gpt-5",
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -136,6 +258,7 @@ async def suggest_anomaly_label(
         }
 
 
+@memoize_in_request
 async def suggest_anomaly_label_with_base64(
     crop_base64: str,
     heatmap_base64: Optional[str], # Heatmap 재도입 (Optional)
@@ -186,7 +309,7 @@ async def suggest_anomaly_label_with_base64(
     }}
     """
     
-    if should_use_fallback():
+    if should_use_fallback("suggest_anomaly_label_with_base64"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] suggest_anomaly_label: {part_name}")
         return {
@@ -205,17 +328,17 @@ async def suggest_anomaly_label_with_base64(
         # 1. 원본 이미지 추가
         user_content.append({
             "type": "image_url",
-            "image_url": {"url": f"data:image/jpeg;base64,{crop_base64}"}
+            "image_url": {"url": f"data:image/jpeg;base64,{crop_base64}", "detail": VISION_PROFILES["engine_crop"].detail}
         })
         
         # 2. 히트맵 이미지 추가 (있을 때만)
         if heatmap_base64:
             user_content.append({
                 "type": "image_url",
-                "image_url": {"url": f"data:image/jpeg;base64,{heatmap_base64}"}
+                "image_url": {"url": f"data:image/jpeg;base64,{heatmap_base64}", "detail": VISION_PROFILES["heatmap"].detail}
             })
 
-        response = await _get_client().chat.completions.create(
+        response = await _get_client("suggest_anomaly_label_with_base64").chat.completions.create(
             model="gpt-5",
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
@@ -239,7 +362,13 @@ async def suggest_anomaly_label_with_base64(
         }
 
 
-async def call_openai_vision(s3_url: str, prompt: str) -> Dict[str, Any]:
+@memoize_in_request(ignore=("image",))
+async def call_openai_vision(
+    s3_url: str,
+    prompt: str,
+    profile: str = "tire_wear",
+    image: Optional[Any] = None
+) -> Dict[str, Any]:
     """
     [범용 Vision API 호출 함수]
     
@@ -249,6 +378,8 @@ async def call_openai_vision(s3_url: str, prompt: str) -> Dict[str, Any]:
     Args:
         s3_url: 분석할 이미지의 S3 URL
         prompt: LLM에게 전달할 분석 지시 프롬프트
+        profile: 이미지 전송 프로필 (vision_input.VISION_PROFILES)
+        image: 이미 로드된 PIL 이미지 (있으면 재다운로드 생략)
     
     Returns:
         LLM이 반환한 JSON 파싱 결과 (dict)
@@ -260,7 +391,7 @@ async def call_openai_vision(s3_url: str, prompt: str) -> Dict[str, Any]:
         )
         # result: {"wear_level_pct": 45, "status": "FAIR", ...}
     """
-    if should_use_fallback():
+    if should_use_fallback("call_openai_vision"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] call_openai_vision")
         # 타이어 분석 등에서 공통으로 쓰이는 JSON 구조 대응
@@ -274,13 +405,14 @@ async def call_openai_vision(s3_url: str, prompt: str) -> Dict[str, Any]:
         }
 
     try:
-        response = await _get_client().chat.completions.create(
+        image_content = await prepare_image_content(s3_url, profile, image=image)
+        response = await _get_client("call_openai_vision").chat.completions.create(
             model="gpt-5",
             messages=[
                 {"role": "system", "content": prompt},
                 {"role": "user", "content": [
                     {"type": "text", "text": "이 이미지를 분석해주세요."},
-                    {"type": "image_url", "image_url": {"url": s3_url}}
+                    image_content
                 ]}
             ],
             response_format={"type": "json_object"},
@@ -299,12 +431,16 @@ async def call_openai_vision(s3_url: str, prompt: str) -> Dict[str, Any]:
         print(f"[LLM Vision Error] {e}")
         return {"status": "ERROR", "error": str(e)}
 
-async def analyze_general_image(s3_url: str) -> VisualResponse:
+@memoize_in_request(ignore=("image",))
+async def analyze_general_image(s3_url: str, image: Optional[Any] = None, profile: str = "general") -> VisualResponse:
     """
     [Path B: Fallback / 범용 분석]
     YOLO가 놓쳤거나, 별도 모델이 없는 이미지에 대한 LLM 분류.
     - DASHBOARD (계기판 경고등) 포함: 별도 YOLO 학습 없이 LLM이 분류
     - ENGINE 포함: Hard Mining용
+
+    image: 이미 로드된 PIL 이미지 (있으면 재다운로드 없이 축소/인코딩만 수행)
+    profile: 이미지 전송 프로필 (품질 비교 시 "original")
     """
     SYSTEM_PROMPT = """
     당신은 'Car-Sentry 시각 분석 팀'의 수석 검수관입니다. 
@@ -339,7 +475,7 @@ async def analyze_general_image(s3_url: str) -> VisualResponse:
         "recommendation": "조치 사항 (해당 없으면 빈 문자열)"
     }
     """
-    if should_use_fallback():
+    if should_use_fallback("analyze_general_image"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] analyze_general_image")
         return VisualResponse(
@@ -354,13 +490,15 @@ async def analyze_general_image(s3_url: str) -> VisualResponse:
         )
 
     try:
-        response = await _get_client().chat.completions.create(
+        # [Optimization] 원본 URL 대신 축소/인코딩한 inline 이미지 전송
+        image_content = await prepare_image_content(s3_url, profile, image=image)
+        response = await _get_client("analyze_general_image").chat.completions.create(
             model="gpt-5",  # [High Performance] Path B -> 4o prevents instruction following issues
             messages=[
                 {"role": "system", "content": SYSTEM_PROMPT},
                 {"role": "user", "content": [
                     {"type": "text", "text": "이 이미지를 분류하고 진단해주세요."},
-                    {"type": "image_url", "image_url": {"url": s3_url}}
+                    image_content
                 ]}
             ],
             response_format={"type": "json_object"},
@@ -415,9 +553,98 @@ async def analyze_general_image(s3_url: str) -> VisualResponse:
             }
         )
 
+@memoize_in_request(ignore=("image",))
+async def diagnose_and_localize(s3_url: str, image: Optional[Any] = None, profile: str = "general") -> dict:
+    """
+    [Path B: Router 저신뢰 Fallback / 통합 진단 + BBox]
+    analyze_general_image(분류/진단)와 generate_training_labels(BBox)를 한 번의 Vision 호출로 합친 버전.
+    JSON Schema(FUSED_DIAGNOSIS_SCHEMA)로 출력을 강제하고, 응답은 같은 스키마로 다시 검증합니다.
+
+    Returns:
+        {
+            "relevance": "VEHICLE" | "IRRELEVANT",
+            "category": "DASHBOARD" | "EXTERIOR" | "TIRE" | "ENGINE" | "ETC" | "ERROR",
+            "status": "NORMAL" | "WARNING" | "CRITICAL" | "ERROR",
+            "description": str, "recommendation": str,
+            "objects": [{"class": str, "bbox": [x1, y1, x2, y2] (0~1), "confidence": float, "source": "LLM_GENERATED"}]
+        }
+    """
+    SYSTEM_PROMPT = """
+    당신은 'Car-Sentry 시각 분석 팀'의 수석 검수관입니다.
+    제공된 이미지 한 장으로 (1) 차량 관련성 판단, (2) 장면 분류 및 상태 진단, (3) 문제 객체 위치 표시를 한 번에 수행하십시오.
+
+    [단계 1: 차량 관련성]
+    - 자동차의 외관, 내관, 부품, 타이어, 계기판 등 차량 맥락이 있으면 relevance="VEHICLE".
+    - 음식, 동물, 풍경, 사람 얼굴 등 차량과 무관하면 relevance="IRRELEVANT", category="ETC", objects=[] 로 응답하고 종료.
+
+    [단계 2: 분류 및 진단]
+    - category: DASHBOARD(계기판 경고등) / EXTERIOR(외관 파손) / TIRE(타이어·휠) / ENGINE(엔진룸) / ETC(실내, 트렁크, 하부 등)
+    - status: 특별한 이상이 없으면 NORMAL, 파손/경고가 있으면 WARNING, 즉시 조치가 필요하면 CRITICAL
+    - description: 한글 상태 설명, recommendation: 조치 사항 (해당 없으면 빈 문자열)
+
+    [단계 3: 객체 위치]
+    - ENGINE: 엔진룸 부품(Battery, Oil_Cap, Radiator 등)
+    - DASHBOARD: 켜진 경고등(Check_Engine, Low_Tire_Pressure 등)
+    - EXTERIOR: 파손 종류(scratch, dent, crack 등)
+    - TIRE: 타이어 상태(normal, worn, cracked, flat)
+    - bbox는 이미지 크기 대비 0.0 ~ 1.0로 정규화한 [x1, y1, x2, y2] (좌상단, 우하단) 좌표입니다.
+    - 찾은 객체가 없으면 objects=[] 입니다.
+    """
+    if should_use_fallback("diagnose_and_localize"):
+        reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
+        print(f"[LLM {reason}] diagnose_and_localize")
+        return {
+            "relevance": "VEHICLE",
+            "category": "ETC",
+            "status": "NORMAL",
+            "description": f"이미지 데이터가 양호합니다. ({reason} 분석 모드)",
+            "recommendation": "차량 관리 가이드에 따라 정기 점검을 권장합니다.",
+            "objects": [],
+            "is_mock": True
+        }
+
+    try:
+        image_content = await prepare_image_content(s3_url, profile, image=image)
+        response = await _get_client("diagnose_and_localize").chat.completions.create(
+            model="gpt-5",
+            messages=[
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {"role": "user", "content": [
+                    {"type": "text", "text": "이 이미지를 분류/진단하고 문제 객체의 위치를 표시해주세요."},
+                    image_content
+                ]}
+            ],
+            response_format={
+                "type": "json_schema",
+                "json_schema": {"name": "fused_visual_diagnosis", "strict": True, "schema": FUSED_DIAGNOSIS_SCHEMA}
+            },
+            max_completion_tokens=1200,
+            timeout=30.0
+        )
+
+        content = response.choices[0].message.content
+        result, errors = validate_fused_diagnosis(json.loads(content))
+        if errors:
+            print(f"[LLM Fused] 스키마 검증 오류 {len(errors)}건: {errors[:3]}")
+        if result is None:
+            raise ValueError(f"Schema validation failed: {errors[:3]}")
+        return result
+
+    except Exception as e:
+        print(f"[LLM Fused Error] {e}")
+        return {
+            "relevance": "VEHICLE",
+            "category": "ERROR",
+            "status": "ERROR",
+            "description": f"AI 분석 엔진 호출 실패: {e}",
+            "recommendation": "잠시 후 다시 시도해주세요.",
+            "objects": []
+        }
+
 # ---------------------------------------------------------
 # 2. 청각 전문 진단 (GPT-5 Audio)
 # ---------------------------------------------------------
+@memoize_in_request
 async def analyze_audio_with_llm(s3_url: str, audio_bytes: Optional[bytes] = None) -> AudioResponse:
     SYSTEM_PROMPT = """
     당신은 'Car-Sentry 소음·진동(NVH) 분석 팀'의 수석 엔지니어입니다. 
@@ -448,7 +675,7 @@ async def analyze_audio_with_llm(s3_url: str, audio_bytes: Optional[bytes] = Non
         "analysis_summary": "주요 근거 요약"
     }
     """
-    if should_use_fallback():
+    if should_use_fallback("analyze_audio_with_llm"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] analyze_audio_with_llm")
         return AudioResponse(
@@ -473,7 +700,7 @@ async def analyze_audio_with_llm(s3_url: str, audio_bytes: Optional[bytes] = Non
             audio_data = base64.b64encode(audio_bytes).decode('utf-8')
 
         # [Correct] Audio Input via 'chat.completions.create'
-        response = await _get_client().chat.completions.create(
+        response = await _get_client("analyze_audio_with_llm").chat.completions.create(
             model="gpt-5",
             modalities=["text", "audio"],
             audio={"voice": "alloy", "format": "wav"},
@@ -536,27 +763,31 @@ async def analyze_audio_with_llm(s3_url: str, audio_bytes: Optional[bytes] = Non
 # 3. 도메인 전용 자연어 해석 함수 (Pipelines)
 # ---------------------------------------------------------
 
+@memoize_in_request
+@cached_llm_response("interpret_dashboard_warnings", PROMPT_VERSIONS["interpret_dashboard_warnings"], backend=_cache_backend("interpret_dashboard_warnings"))
 async def interpret_dashboard_warnings(detections: List[Dict]) -> Dict[str, str]:
     """
     YOLO가 감지한 경고등 목록을 바탕으로 운전 가이드 생성
     """
-    if should_use_fallback():
+    if should_use_fallback("interpret_dashboard_warnings"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] interpret_dashboard_warnings")
         
         if not detections:
             return {
                 "description": f"계기판에 특별한 경고등이 감지되지 않았습니다. ({reason} 분석 모드)",
-                "recommendation": "안전 운행 하십시오."
+                "recommendation": "안전 운행 하십시오.",
+                "is_mock": True
             }
         
         # 동적 메시지 생성
-        warnings = [d.get("class", "경고등") for d in detections]
+        warnings = [d.get("name") or d.get("class", "경고등") for d in detections]
         desc = f"계기판에 {', '.join(warnings)} 등이 감지되었습니다. ({reason} 분석 모드)"
         
         return {
             "description": desc,
-            "recommendation": "안전 주행을 위해 가까운 시일 내에 전문가 점검을 받으십시오."
+            "recommendation": "안전 주행을 위해 가까운 시일 내에 전문가 점검을 받으십시오.",
+            "is_mock": True
         }
 
     PROMPT = f"""
@@ -572,7 +803,7 @@ async def interpret_dashboard_warnings(detections: List[Dict]) -> Dict[str, str]
     {{"description": "종합 설명", "recommendation": "권장 조치"}}
     """
     try:
-        response = await _get_client().chat.completions.create(
+        response = await _get_client("interpret_dashboard_warnings").chat.completions.create(
             model="gpt-5",
             messages=[{"role": "user", "content": PROMPT}],
             response_format={"type": "json_object"},
@@ -581,21 +812,24 @@ async def interpret_dashboard_warnings(detections: List[Dict]) -> Dict[str, str]
         return json.loads(response.choices[0].message.content)
     except Exception as e:
         print(f"[LLM Dashboard Error] {e}")
-        return {"description": "계기판 경고등 분석 중 오류가 발생했습니다.", "recommendation": "안전한 곳에 정차 후 수동 점검 바랍니다."}
+        return {"description": "계기판 경고등 분석 중 오류가 발생했습니다.", "recommendation": "안전한 곳에 정차 후 수동 점검 바랍니다.", "is_mock": True}
 
 
+@memoize_in_request
+@cached_llm_response("generate_exterior_report", PROMPT_VERSIONS["generate_exterior_report"], backend=_cache_backend("generate_exterior_report"))
 async def generate_exterior_report(mappings: List[Dict]) -> Dict[str, str]:
     """
     감지된 부위별 파손 정보를 자연스러운 한글 문장으로 변환
     """
-    if should_use_fallback():
+    if should_use_fallback("generate_exterior_report"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] generate_exterior_report")
         
         if not mappings:
             return {
                 "description": f"차량 외관 상태가 전반적으로 양호합니다. ({reason} 분석 모드)",
-                "recommendation": "안전 주행을 유지하며 정기적인 세차 및 외관 관리를 권장합니다."
+                "recommendation": "안전 주행을 유지하며 정기적인 세차 및 외관 관리를 권장합니다.",
+                "is_mock": True
             }
             
         # 동적 메시지 생성
@@ -609,7 +843,8 @@ async def generate_exterior_report(mappings: List[Dict]) -> Dict[str, str]:
         
         return {
             "description": desc,
-            "recommendation": "가까운 정비소에서 견적을 받아보시는 것을 권장합니다."
+            "recommendation": "가까운 정비소에서 견적을 받아보시는 것을 권장합니다.",
+            "is_mock": True
         }
 
     PROMPT = f"""
@@ -624,7 +859,7 @@ async def generate_exterior_report(mappings: List[Dict]) -> Dict[str, str]:
     JSON: {{"description": "...", "recommendation": "..."}}
     """
     try:
-        response = await _get_client().chat.completions.create(
+        response = await _get_client("generate_exterior_report").chat.completions.create(
             model="gpt-5",
             messages=[{"role": "user", "content": PROMPT}],
             response_format={"type": "json_object"},
@@ -633,14 +868,16 @@ async def generate_exterior_report(mappings: List[Dict]) -> Dict[str, str]:
         return json.loads(response.choices[0].message.content)
     except Exception as e:
         print(f"[LLM Exterior Error] {e}")
-        return {"description": "외관 파손 분석 결과를 처리할 수 없습니다.", "recommendation": "가까운 정비소에서 육안 검사를 권장합니다."}
+        return {"description": "외관 파손 분석 결과를 처리할 수 없습니다.", "recommendation": "가까운 정비소에서 육안 검사를 권장합니다.", "is_mock": True}
 
 
+@memoize_in_request
+@cached_llm_response("interpret_tire_status", PROMPT_VERSIONS["interpret_tire_status"], backend=_cache_backend("interpret_tire_status"))
 async def interpret_tire_status(status_list: List[Dict]) -> Dict[str, str]:
     """
     타이어의 마모, 균열, 펑크 등에 대한 전문가 조언 생성
     """
-    if should_use_fallback():
+    if should_use_fallback("interpret_tire_status"):
         reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
         print(f"[LLM {reason}] interpret_tire_status")
         
@@ -649,13 +886,15 @@ async def interpret_tire_status(status_list: List[Dict]) -> Dict[str, str]:
         if not issues:
              return {
                 "description": f"타이어의 상태가 마모 한계 내에 있으며 정상입니다. ({reason} 분석 모드)",
-                "recommendation": "공기압 체크와 타이어 위치 교환을 주기적으로 실시하십시오."
+                "recommendation": "공기압 체크와 타이어 위치 교환을 주기적으로 실시하십시오.",
+                "is_mock": True
             }
             
         desc = f"타이어에서 {', '.join(issues)} 상태가 감지되었습니다. ({reason} 분석 모드)"
         return {
             "description": desc,
-            "recommendation": "타이어 전문점에서 상세 점검을 받으십시오."
+            "recommendation": "타이어 전문점에서 상세 점검을 받으십시오.",
+            "is_mock": True
         }
 
     PROMPT = f"""
@@ -670,7 +909,7 @@ async def interpret_tire_status(status_list: List[Dict]) -> Dict[str, str]:
     JSON: {{"description": "...", "recommendation": "..."}}
     """
     try:
-        response = await _get_client().chat.completions.create(
+        response = await _get_client("interpret_tire_status").chat.completions.create(
             model="gpt-5",
             messages=[{"role": "user", "content": PROMPT}],
             response_format={"type": "json_object"},
@@ -679,20 +918,22 @@ async def interpret_tire_status(status_list: List[Dict]) -> Dict[str, str]:
         return json.loads(response.choices[0].message.content)
     except Exception as e:
         print(f"[LLM Tire Error] {e}")
-        return {"description": "타이어 상태 정보를 처리하는 도중 오류가 발생했습니다.", "recommendation": "공기압 및 트레드 상태를 수동으로 확인하십시오."}
+        return {"description": "타이어 상태 정보를 처리하는 도중 오류가 발생했습니다.", "recommendation": "공기압 및 트레드 상태를 수동으로 확인하십시오.", "is_mock": True}
 
 
 # ---------------------------------------------------------
 # 4. Active Learning용 라벨 생성 (Training Data Generation)
 # ---------------------------------------------------------
 
-async def generate_training_labels(s3_url: str, domain: str) -> dict:
+@memoize_in_request(ignore=("image",))
+async def generate_training_labels(s3_url: str, domain: str, image: Optional[Any] = None) -> dict:
     """
     [Active Learning] 저신뢰 이미지에 대해 LLM이 정답 라벨 생성
     
     Args:
         s3_url: 이미지 S3 URL
         domain: 도메인 (engine, dashboard, tire, exterior)
+        image: 이미 로드된 PIL 이미지 (선택)
     
     Returns:
         {"labels": [{"class": "...", "bbox": [...]}], "status": "..."}
@@ -733,13 +974,14 @@ async def generate_training_labels(s3_url: str, domain: str) -> dict:
     """
     
     try:
-        response = await _get_client().chat.completions.create(
+        image_content = await prepare_image_content(s3_url, "training_labels", image=image)
+        response = await _get_client("generate_training_labels").chat.completions.create(
             model="gpt-4o",
             messages=[
                 {"role": "system", "content": PROMPT},
                 {"role": "user", "content": [
                     {"type": "text", "text": "이미지 분석 및 라벨 생성"},
-                    {"type": "image_url", "image_url": {"url": s3_url}}
+                    image_content
                 ]}
             ],
             response_format={"type": "json_object"},
@@ -765,6 +1007,7 @@ async def generate_training_labels(s3_url: str, domain: str) -> dict:
         return {"labels": [], "status": "FAILED", "reason": str(e)}
 
 
+@memoize_in_request
 async def generate_audio_labels(s3_url: str, audio_bytes: Optional[bytes] = None) -> dict:
     """
     [Active Learning] 저신뢰 오디오에 대해 LLM이 정답 라벨 생성
@@ -805,7 +1048,7 @@ async def generate_audio_labels(s3_url: str, audio_bytes: Optional[bytes] = None
         else:
             audio_data = base64.b64encode(audio_bytes).decode('utf-8')
         
-        response = await _get_client().chat.completions.create(
+        response = await _get_client("generate_audio_labels").chat.completions.create(
             model="gpt-5",
             modalities=["text", "audio"],
             audio={"voice": "alloy", "format": "wav"},
@@ -831,4 +1074,144 @@ async def generate_audio_labels(s3_url: str, audio_bytes: Optional[bytes] = None
         
     except Exception as e:
         print(f"[LLM Audio Labels Error] {e}")
-        return {"label": "UNKNOWN", "category": "UNKNOWN", "status": "ERROR"}
\ No newline at end of file
+        return {"label": "UNKNOWN", "category": "UNKNOWN", "status": "ERROR"}
+
+@memoize_in_request
+async def analyze_and_label_audio_with_llm(
+    s3_url: str,
+    audio_bytes: Optional[bytes] = None,
+    audio_format: str = "wav"
+) -> Tuple[AudioResponse, dict]:
+    """
+    [Optimization] 오디오 진단 + Active Learning 라벨을 단일 호출로 생성
+
+    기존에는 analyze_audio_with_llm → generate_audio_labels 순으로 같은 오디오를 두 번 업로드했습니다.
+    하나의 JSON 응답에서 사용자용 진단(AudioResponse)과 학습용 라벨(oracle dict)을 함께 파생합니다.
+
+    Args:
+        s3_url: 오디오 S3 URL
+        audio_bytes: 압축/트리밍된 오디오 바이트 (hertz.compress_for_llm 결과 권장)
+        audio_format: "wav" | "mp3"
+
+    Returns:
+        (AudioResponse, {"label", "category", "status", "confidence"})
+    """
+    SYSTEM_PROMPT = """
+    당신은 'Car-Sentry 소음·진동(NVH) 분석 팀'의 수석 엔지니어입니다.
+    오디오 데이터에서 기계적인 이상 징후를 소리만으로 찾아내고, 동시에 AI 학습용 라벨을 생성하십시오.
+
+    [분석 가이드라인]
+    1. 분류(Category): 소리의 근원지가 되는 핵심 부품을 분류하십시오.
+       - ENGINE, SUSPENSION, BRAKES, EXHAUST, TIRES_WHEELS_AUDIO, BODY, UNKNOWN_AUDIO
+    2. 음향적 특징: 리듬, 피치, 질감 분석.
+    3. 기계적 연결: 소리와 부품 마찰의 상관관계 추론.
+
+    [데이터 품질 대응]
+    - 소음 과다 시 diagnosis.status를 "RE_RECORD_REQUIRED"로 설정하십시오.
+
+    [출력 형식 - JSON]
+    {
+        "diagnosis": {
+            "diagnosed_label": "진단명",
+            "category": "분류명(위 리스트 중 택1)",
+            "description": "상세 분석 및 조언",
+            "status": "NORMAL" | "FAULTY" | "RE_RECORD_REQUIRED",
+            "confidence": 0.0 ~ 1.0
+        },
+        "training_label": {
+            "label": "구체적_진단명 (예: Engine_Knock)",
+            "category": "ENGINE" | "BRAKES" | "SUSPENSION" | "EXHAUST" | "NORMAL",
+            "status": "NORMAL" | "FAULTY",
+            "confidence": 0.0 ~ 1.0
+        }
+    }
+    """
+    if should_use_fallback("analyze_and_label_audio_with_llm"):
+        reason = "MOCK" if os.getenv("MOCK_LLM", "false").lower() == "true" else "Local"
+        print(f"[LLM {reason}] analyze_and_label_audio_with_llm")
+        result = {
+            "diagnosis": {
+                "diagnosed_label": "정상 구동음",
+                "category": "ENGINE",
+                "description": f"엔진 구동음이 규칙적이고 정상입니다. ({reason} 분석 모드)",
+                "status": "NORMAL",
+                "confidence": 0.9
+            },
+            "training_label": {"label": "Normal", "category": "NORMAL", "status": "NORMAL", "confidence": 0.9}
+        }
+        return _split_audio_llm_result(result)
+
+    try:
+        if audio_bytes is None:
+            async with httpx.AsyncClient(timeout=10.0) as httpx_client:
+                audio_response = await httpx_client.get(s3_url)
+                audio_response.raise_for_status()
+                audio_bytes = audio_response.content
+        audio_data = base64.b64encode(audio_bytes).decode('utf-8')
+
+        # 텍스트(JSON)만 출력받음: 음성 응답 생성 비용 제거
+        response = await _get_client("analyze_and_label_audio_with_llm").chat.completions.create(
+            model="gpt-5",
+            modalities=["text"],
+            response_format={"type": "json_object"},
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {"type": "text", "text": SYSTEM_PROMPT + "\n\n이 소리를 진단하고 반드시 JSON 포맷으로 응답하세요."},
+                        {
+                            "type": "input_audio",
+                            "input_audio": {"data": audio_data, "format": audio_format}
+                        }
+                    ]
+                }
+            ],
+            timeout=30.0
+        )
+
+        content = response.choices[0].message.content or ""
+        match = re.search(r'\{.*\}', content, re.DOTALL)
+        if not match:
+            raise ValueError(f"JSON not found in response: {content[:100]}")
+        return _split_audio_llm_result(json.loads(match.group()))
+
+    except Exception as e:
+        print(f"[LLM Audio Combined Error] {e}")
+        return (
+            AudioResponse(
+                status="ERROR",
+                analysis_type="LLM_AUDIO",
+                category="UNKNOWN_AUDIO",
+                detail=AudioDetail(diagnosed_label="Error", description="오디오 분석 실패"),
+                confidence=0.0,
+                is_critical=False
+            ),
+            {"label": "UNKNOWN", "category": "UNKNOWN", "status": "ERROR"}
+        )
+
+
+def _split_audio_llm_result(result: dict) -> Tuple[AudioResponse, dict]:
+    """통합 응답 → (analyze_audio_with_llm 형식, generate_audio_labels 형식)"""
+    diagnosis = result.get("diagnosis", {})
+    oracle = dict(result.get("training_label", {}))
+
+    current_status = diagnosis.get("status", "FAULTY")
+    audio_response = AudioResponse(
+        status=current_status,
+        analysis_type="LLM_AUDIO",
+        category=diagnosis.get("category", "ENGINE"),
+        detail=AudioDetail(
+            diagnosed_label=diagnosis.get("diagnosed_label", "LLM 진단"),
+            description=diagnosis.get("description", "분석 완료")
+        ),
+        confidence=float(diagnosis.get("confidence", 0.8)),
+        is_critical=(current_status == "FAULTY")
+    )
+
+    # 재녹음 필요 판정은 라벨에도 전파 (Active Learning 품질 필터)
+    if current_status == "RE_RECORD_REQUIRED":
+        oracle["status"] = "RE_RECORD_REQUIRED"
+    oracle.setdefault("label", "UNKNOWN")
+    oracle.setdefault("category", "UNKNOWN")
+    oracle.setdefault("status", "ERROR")
+    return audio_response, oracle
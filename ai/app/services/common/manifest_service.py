@@ -1,19 +1,47 @@
-# ai/app/services/manifest_service.py
+# ai/app/services/common/manifest_service.py
 """
 Manifest 기반 Active Learning 데이터 수집 서비스
 
 이미지/오디오 파일을 복사하지 않고, 원본 위치만 기록하여 용량 절약!
+
+[저장 형식: Append-only Segment Log]
+기존에는 manifest.json 전체를 내려받아 한 줄 추가 후 다시 올렸기 때문에(Read-Modify-Write)
+데이터가 쌓일수록 항목 하나당 O(N) 전송이 발생했고, 동시에 쓰는 워커끼리 서로의 기록을 덮어썼습니다.
+이제는 배치 단위로 작은 불변(immutable) JSONL 세그먼트를 새로 쓰기만 합니다.
+
+    dataset/manifest/{visual|audio}/segments/{CATEGORY}/{min_id}-{max_id}-{token}.jsonl     # 항목 (1줄 1개)
+    dataset/manifest/{visual|audio}/segments/{CATEGORY}/{min_id}-{max_id}-{token}.idx.json  # 사이드카 인덱스
+
+- ID: 시간 기반 단조 증가 ID (ms 타임스탬프 | 워커 ID | 시퀀스) → 목록 길이와 무관, 워커 간 충돌 없음
+- 사이드카 인덱스: 세그먼트별 건수, status 분포, collected_at / id 범위 → status/기간 조회 시 세그먼트 건너뛰기
+- 카테고리 조회: 해당 카테고리 prefix의 세그먼트만 읽음
+- 컴팩션: 작은 세그먼트를 주기적으로 병합 (ai/scripts/utils/compact_manifest.py)
+  병합본을 먼저 쓰고 원본을 지우므로, 그 사이의 중복은 읽을 때 id로 제거합니다.
 """
 
 import boto3
 import json
 import os
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 BUCKET_NAME = os.getenv("S3_BUCKET_NAME", "car-sentry-data")
+MANIFEST_PREFIX = "dataset/manifest"
+
+# 기존 단일 파일 manifest (마이그레이션 전용)
 VISUAL_MANIFEST_KEY = "dataset/manifest/visual_manifest.json"
 AUDIO_MANIFEST_KEY = "dataset/manifest/audio_manifest.json"
+_MANIFEST_NAMES = {VISUAL_MANIFEST_KEY: "visual", AUDIO_MANIFEST_KEY: "audio"}
+
+BATCH_SIZE = int(os.getenv("MANIFEST_BATCH_SIZE", "50"))          # 이 개수가 모이면 세그먼트 기록
+FLUSH_INTERVAL_SEC = float(os.getenv("MANIFEST_FLUSH_SEC", "30"))  # 첫 항목 이후 이 시간이 지나면 기록
+COMPACT_TARGET_ENTRIES = 5000                                      # 컴팩션 후 세그먼트당 목표 항목 수
 
 
 def get_s3_client():
@@ -21,37 +49,315 @@ def get_s3_client():
     return boto3.client('s3')
 
 
-def load_manifest(manifest_key: str) -> Dict[str, Any]:
-    """S3에서 manifest.json 로드 (없으면 빈 구조 반환)"""
-    s3 = get_s3_client()
-    try:
-        response = s3.get_object(Bucket=BUCKET_NAME, Key=manifest_key)
-        content = response['Body'].read().decode('utf-8')
-        return json.loads(content)
-    except s3.exceptions.NoSuchKey:
-        # manifest가 없으면 빈 구조 생성
-        return {"training_data": [], "created_at": datetime.now().isoformat()}
-    except Exception as e:
-        print(f"[Manifest] 로드 실패: {e}")
-        return {"training_data": [], "created_at": datetime.now().isoformat()}
+# =============================================================================
+# 단조 증가 ID
+# =============================================================================
+class ManifestIdGenerator:
+    """
+    Snowflake 방식 ID: (epoch ms - 기준시각) << 22 | worker_id(10bit) << 12 | seq(12bit)
+    - 같은 프로세스 안에서는 항상 증가 (시계가 뒤로 가도 마지막 값 기준)
+    - 워커 ID는 MANIFEST_WORKER_ID 또는 임의 값 (워커 간 충돌 방지)
+    """
+    EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
 
+    def __init__(self, worker_id: Optional[int] = None):
+        if worker_id is None:
+            env_id = os.getenv("MANIFEST_WORKER_ID")
+            worker_id = int(env_id) if env_id else random.getrandbits(10)
+        self.worker_id = worker_id & 0x3FF
+        self._last_ms = -1
+        self._seq = 0
+        self._lock = threading.Lock()
 
-def save_manifest(manifest_key: str, manifest_data: Dict[str, Any]) -> bool:
-    """manifest.json을 S3에 저장"""
-    s3 = get_s3_client()
-    try:
-        manifest_data["updated_at"] = datetime.now().isoformat()
-        s3.put_object(
-            Bucket=BUCKET_NAME,
-            Key=manifest_key,
-            Body=json.dumps(manifest_data, ensure_ascii=False, indent=2),
-            ContentType='application/json'
-        )
-        print(f"[Manifest] 저장 완료: s3://{BUCKET_NAME}/{manifest_key}")
-        return True
-    except Exception as e:
-        print(f"[Manifest] 저장 실패: {e}")
-        return False
+    def next_id(self) -> int:
+        with self._lock:
+            now = max(int(time.time() * 1000) - self.EPOCH_MS, self._last_ms)
+            if now == self._last_ms:
+                self._seq = (self._seq + 1) & 0xFFF
+                if self._seq == 0:
+                    now += 1  # 같은 ms 안에서 4096개 초과 → 다음 ms로 넘김
+            else:
+                self._seq = 0
+            self._last_ms = now
+            return (now << 22) | (self.worker_id << 12) | self._seq
+
+
+def _category_dir(category: Optional[str]) -> str:
+    return re.sub(r"[^A-Z0-9_]+", "_", (category or "UNKNOWN").upper()).strip("_") or "UNKNOWN"
+
+
+# =============================================================================
+# Segmented Manifest
+# =============================================================================
+class SegmentedManifest:
+    """manifest 하나(visual / audio)의 세그먼트 로그"""
+
+    def __init__(
+        self,
+        name: str,
+        s3_client=None,
+        bucket: str = BUCKET_NAME,
+        prefix: str = MANIFEST_PREFIX,
+        batch_size: int = BATCH_SIZE,
+        flush_interval_sec: float = FLUSH_INTERVAL_SEC,
+        id_generator: Optional[ManifestIdGenerator] = None
+    ):
+        self.name = name
+        self.s3 = s3_client or get_s3_client()
+        self.bucket = bucket
+        self.root = f"{prefix}/{name}/segments"
+        self.batch_size = batch_size
+        self.flush_interval_sec = flush_interval_sec
+        self.ids = id_generator or ManifestIdGenerator()
+
+        self._pending: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self.stats = {"appended": 0, "segments_written": 0, "segments_read": 0, "flush_failures": 0}
+
+    # -------------------------------------------------------------------------
+    # 쓰기
+    # -------------------------------------------------------------------------
+    def append(self, entry: Dict[str, Any]) -> int:
+        """항목을 버퍼에 추가하고 ID 반환 (배치가 차거나 FLUSH_INTERVAL_SEC가 지나면 세그먼트 기록)"""
+        entry = dict(entry)
+        entry["id"] = self.ids.next_id()
+        entry.setdefault("collected_at", datetime.now().isoformat())
+
+        with self._lock:
+            self._pending.append(entry)
+            self.stats["appended"] += 1
+            full = len(self._pending) >= self.batch_size
+            if not full and self._timer is None and self.flush_interval_sec > 0:
+                self._timer = threading.Timer(self.flush_interval_sec, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if full:
+            self.flush()
+        return entry["id"]
+
+    def flush(self) -> int:
+        """버퍼의 항목을 카테고리별 세그먼트로 기록 (실패 시 버퍼에 되돌려 다음 flush에서 재시도)"""
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if not batch:
+            return 0
+
+        by_category: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in batch:
+            by_category.setdefault(_category_dir(entry.get("category")), []).append(entry)
+
+        written = 0
+        failed: List[Dict[str, Any]] = []
+        for category, entries in by_category.items():
+            try:
+                self._write_segment(category, entries)
+                written += len(entries)
+            except Exception as e:
+                print(f"[Manifest] 세그먼트 기록 실패 ({self.name}/{category}, {len(entries)}건): {e}")
+                self.stats["flush_failures"] += 1
+                failed.extend(entries)
+
+        if failed:
+            with self._lock:
+                self._pending = failed + self._pending
+        return written
+
+    def _write_segment(self, category: str, entries: List[Dict[str, Any]]) -> str:
+        entries = sorted(entries, key=lambda e: e["id"])
+        base = f"{self.root}/{category}/{entries[0]['id']:020d}-{entries[-1]['id']:020d}-{secrets.token_hex(4)}"
+        body = "\n".join(json.dumps(e, ensure_ascii=False) for e in entries) + "\n"
+        self.s3.put_object(Bucket=self.bucket, Key=f"{base}.jsonl", Body=body.encode("utf-8"),
+                           ContentType="application/x-ndjson")
+
+        collected = [e.get("collected_at", "") for e in entries]
+        sidecar = {
+            "segment": f"{base}.jsonl",
+            "category": category,
+            "count": len(entries),
+            "min_id": entries[0]["id"],
+            "max_id": entries[-1]["id"],
+            "min_collected_at": min(collected),
+            "max_collected_at": max(collected),
+            "statuses": dict(Counter(e.get("status") for e in entries)),
+        }
+        self.s3.put_object(Bucket=self.bucket, Key=f"{base}.idx.json",
+                           Body=json.dumps(sidecar, ensure_ascii=False).encode("utf-8"),
+                           ContentType="application/json")
+        self.stats["segments_written"] += 1
+        print(f"[Manifest] 세그먼트 기록: s3://{self.bucket}/{base}.jsonl ({len(entries)}건)")
+        return f"{base}.jsonl"
+
+    # -------------------------------------------------------------------------
+    # 읽기
+    # -------------------------------------------------------------------------
+    def _list_keys(self, prefix: str) -> List[str]:
+        keys, token = [], None
+        while True:
+            kwargs = {"Bucket": self.bucket, "Prefix": prefix}
+            if token:
+                kwargs["ContinuationToken"] = token
+            response = self.s3.list_objects_v2(**kwargs)
+            keys.extend(obj["Key"] for obj in response.get("Contents", []))
+            if not response.get("IsTruncated"):
+                return keys
+            token = response.get("NextContinuationToken")
+
+    def list_segments(self, category: Optional[str] = None) -> List[str]:
+        prefix = f"{self.root}/{_category_dir(category)}/" if category else f"{self.root}/"
+        return sorted(k for k in self._list_keys(prefix) if k.endswith(".jsonl"))
+
+    def _get_text(self, key: str) -> str:
+        return self.s3.get_object(Bucket=self.bucket, Key=key)["Body"].read().decode("utf-8")
+
+    def read_sidecar(self, segment_key: str) -> Dict[str, Any]:
+        return json.loads(self._get_text(segment_key[:-len(".jsonl")] + ".idx.json"))
+
+    def read_segment(self, segment_key: str) -> List[Dict[str, Any]]:
+        self.stats["segments_read"] += 1
+        return [json.loads(line) for line in self._get_text(segment_key).splitlines() if line.strip()]
+
+    def read(
+        self,
+        category: Optional[str] = None,
+        status: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        조건에 맞는 항목 (id 순, 중복 제거, 아직 기록 전인 버퍼 항목 포함)
+
+        - category: 해당 카테고리 세그먼트만 읽음
+        - status / since / until: 사이드카 인덱스로 세그먼트를 먼저 거른 뒤 항목 단위로 필터
+        """
+        def match(e: Dict[str, Any]) -> bool:
+            if category and _category_dir(e.get("category")) != _category_dir(category):
+                return False
+            if status and e.get("status") != status:
+                return False
+            collected = e.get("collected_at", "")
+            return (not since or collected >= since) and (not until or collected <= until)
+
+        entries: Dict[int, Dict[str, Any]] = {}
+        for key in self.list_segments(category):
+            if status or since or until:
+                try:
+                    idx = self.read_sidecar(key)
+                    if status and not idx["statuses"].get(status):
+                        continue
+                    if since and idx["max_collected_at"] < since:
+                        continue
+                    if until and idx["min_collected_at"] > until:
+                        continue
+                except Exception:
+                    pass  # 사이드카가 없거나 손상되면 세그먼트를 직접 읽음
+            for e in self.read_segment(key):
+                if match(e):
+                    entries[e["id"]] = e
+
+        with self._lock:
+            for e in self._pending:
+                if match(e):
+                    entries[e["id"]] = e
+        return [entries[i] for i in sorted(entries)]
+
+    # -------------------------------------------------------------------------
+    # 컴팩션 / 마이그레이션
+    # -------------------------------------------------------------------------
+    def compact(self, category: Optional[str] = None, target_entries: int = COMPACT_TARGET_ENTRIES) -> Dict[str, int]:
+        """
+        카테고리별로 작은 세그먼트(target_entries 미만)를 모아 target_entries 크기 이하로 병합
+        병합본(+사이드카)을 먼저 기록한 뒤 원본 세그먼트를 삭제합니다.
+        """
+        categories = [_category_dir(category)] if category else sorted({
+            key[len(self.root) + 1:].split("/", 1)[0] for key in self.list_segments()
+        })
+
+        result = {"merged_segments": 0, "written_segments": 0, "entries": 0}
+        for cat in categories:
+            small = []
+            for key in self.list_segments(cat):
+                try:
+                    count = self.read_sidecar(key)["count"]
+                except Exception:
+                    count = len(self.read_segment(key))
+                if count < target_entries:
+                    small.append((key, count))
+
+            groups, current, size = [], [], 0
+            for key, count in small:
+                if current and size + count > target_entries:
+                    groups.append(current)
+                    current, size = [], 0
+                current.append(key)
+                size += count
+            groups.append(current)
+
+            for group in groups:
+                if len(group) < 2:
+                    continue
+                merged: Dict[int, Dict[str, Any]] = {}
+                for key in group:
+                    for e in self.read_segment(key):
+                        merged[e["id"]] = e
+                self._write_segment(cat, list(merged.values()))
+                self._delete([k for key in group for k in (key, key[:-len(".jsonl")] + ".idx.json")])
+                result["merged_segments"] += len(group)
+                result["written_segments"] += 1
+                result["entries"] += len(merged)
+
+        print(f"[Manifest] 컴팩션 완료 ({self.name}): {result}")
+        return result
+
+    def _delete(self, keys: List[str]):
+        for i in range(0, len(keys), 1000):
+            self.s3.delete_objects(
+                Bucket=self.bucket,
+                Delete={"Objects": [{"Key": k} for k in keys[i:i + 1000]], "Quiet": True}
+            )
+
+    def migrate_legacy(self, legacy_key: str) -> int:
+        """기존 단일 manifest.json의 항목을 세그먼트로 옮김 (기존 id는 legacy_id로 보존)"""
+        try:
+            legacy = json.loads(self._get_text(legacy_key))
+        except Exception as e:
+            print(f"[Manifest] 기존 manifest 로드 실패: {e}")
+            return 0
+
+        entries = legacy.get("training_data", [])
+        for entry in entries:
+            entry = dict(entry)
+            entry["legacy_id"] = entry.pop("id", None)
+            self.append(entry)
+        self.flush()
+        print(f"[Manifest] 마이그레이션 완료: {legacy_key} → {self.root} ({len(entries)}건)")
+        return len(entries)
+
+
+# =============================================================================
+# 모듈 API (기존 호출부 호환)
+# =============================================================================
+_manifests: Dict[str, SegmentedManifest] = {}
+_manifests_lock = threading.Lock()
+
+
+def get_manifest(name: str) -> SegmentedManifest:
+    """manifest 이름(visual / audio) 또는 기존 manifest key로 싱글톤 반환"""
+    name = _MANIFEST_NAMES.get(name, name)
+    with _manifests_lock:
+        if name not in _manifests:
+            _manifests[name] = SegmentedManifest(name)
+        return _manifests[name]
+
+
+def flush_all_manifests():
+    """버퍼에 남은 항목 기록 (서버 종료 시 호출)"""
+    for manifest in list(_manifests.values()):
+        manifest.flush()
 
 
 def add_visual_entry(
@@ -65,7 +371,7 @@ def add_visual_entry(
 ) -> bool:
     """
     시각 데이터 manifest에 항목 추가
-    
+
     Args:
         original_url: 원본 이미지 S3 URL (복사 안 함!)
         category: DASHBOARD, EXTERIOR 등
@@ -75,22 +381,20 @@ def add_visual_entry(
         detections: 탐지된 객체 목록
         confidence: 신뢰도
     """
-    manifest = load_manifest(VISUAL_MANIFEST_KEY)
-    
-    entry = {
-        "id": len(manifest["training_data"]) + 1,
-        "original_image": original_url,  # 원본 위치만 기록!
-        "label": label_key,
-        "category": category,
-        "status": status,
-        "analysis_type": analysis_type,
-        "confidence": confidence,
-        "detection_count": len(detections) if detections else 0,
-        "collected_at": datetime.now().isoformat()
-    }
-    
-    manifest["training_data"].append(entry)
-    return save_manifest(VISUAL_MANIFEST_KEY, manifest)
+    try:
+        get_manifest("visual").append({
+            "original_image": original_url,  # 원본 위치만 기록!
+            "label": label_key,
+            "category": category,
+            "status": status,
+            "analysis_type": analysis_type,
+            "confidence": confidence,
+            "detection_count": len(detections) if detections else 0,
+        })
+        return True
+    except Exception as e:
+        print(f"[Manifest] 항목 추가 실패: {e}")
+        return False
 
 
 def add_audio_entry(
@@ -103,7 +407,7 @@ def add_audio_entry(
 ) -> bool:
     """
     오디오 데이터 manifest에 항목 추가
-    
+
     Args:
         original_url: 원본 오디오 S3 URL (복사 안 함!)
         category: ENGINE, BRAKES, SUSPENSION 등
@@ -112,29 +416,26 @@ def add_audio_entry(
         analysis_type: AST, LLM_AUDIO 등
         confidence: 신뢰도
     """
-    manifest = load_manifest(AUDIO_MANIFEST_KEY)
-    
-    entry = {
-        "id": len(manifest["training_data"]) + 1,
-        "original_audio": original_url,  # 원본 위치만 기록!
-        "category": category,
-        "diagnosed_label": diagnosed_label,
-        "status": status,
-        "analysis_type": analysis_type,
-        "confidence": confidence,
-        "collected_at": datetime.now().isoformat()
-    }
-    
-    manifest["training_data"].append(entry)
-    return save_manifest(AUDIO_MANIFEST_KEY, manifest)
-
-
-def get_training_data(manifest_key: str, category: Optional[str] = None) -> list:
-    """학습용 데이터 목록 조회"""
-    manifest = load_manifest(manifest_key)
-    data = manifest.get("training_data", [])
-    
-    if category:
-        data = [d for d in data if d.get("category") == category]
-    
-    return data
+    try:
+        get_manifest("audio").append({
+            "original_audio": original_url,  # 원본 위치만 기록!
+            "category": category,
+            "diagnosed_label": diagnosed_label,
+            "status": status,
+            "analysis_type": analysis_type,
+            "confidence": confidence,
+        })
+        return True
+    except Exception as e:
+        print(f"[Manifest] 항목 추가 실패: {e}")
+        return False
+
+
+def get_training_data(
+    manifest_key: str,
+    category: Optional[str] = None,
+    status: Optional[str] = None,
+    since: Optional[str] = None
+) -> list:
+    """학습용 데이터 목록 조회 (manifest_key: "visual" / "audio" 또는 기존 manifest key)"""
+    return get_manifest(manifest_key).read(category=category, status=status, since=since)
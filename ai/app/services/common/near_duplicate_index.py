@@ -0,0 +1,291 @@
+# ai/app/services/common/near_duplicate_index.py
+"""
+Active Learning 후보 근접 중복 필터 (Near-Duplicate Index)
+
+[역할]
+같은 세션에서 연속 촬영한 거의 같은 사진이 각각 Oracle(GPT) 호출과 S3 라벨을 소모하지 않도록,
+최근 라벨링한 이미지와 너무 비슷한 후보를 Oracle 호출 전에 걸러냅니다.
+
+[지문(Fingerprint)]
+1. pHash (64bit): 32x32 흑백 → 2D DCT → 저주파 8x8의 중앙값 기준 비트 (요청 경로에서 1ms 미만)
+2. Router 임베딩: MobileNetV3 분류기의 마지막 은닉층(1024차원)을 L2 정규화 → float16
+   (장면 분류 시 이미 계산되므로 추가 비용 없음, Mock 모드에서는 없음)
+
+[중복 판정]
+- pHash 해밍 거리 <= PHASH_STRICT_RADIUS → 중복 (거의 같은 사진)
+- pHash 해밍 거리 <= PHASH_LOOSE_RADIUS 이고 임베딩 코사인 유사도 >= EMBEDDING_MIN_COSINE → 중복 (약간 움직인 연사)
+  Router 임베딩은 장면 종류(계기판/엔진룸 등)만 구분하도록 학습되어 같은 도메인 사진끼리 모두 가깝기 때문에
+  임베딩 단독으로는 중복 판정하지 않습니다. (데이터 다양성 유지)
+
+[메모리]
+도메인별 고정 크기 링 버퍼 (기본 2,000개, 항목당 8 + 2x1024 bytes ≈ 4MB/도메인)
+주기적으로 .npz 스냅샷을 저장하고 시작 시 다시 불러옵니다.
+"""
+import base64
+import os
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+PHASH_STRICT_RADIUS = 4
+PHASH_LOOSE_RADIUS = 12
+EMBEDDING_MIN_COSINE = 0.97
+EMBEDDING_DIM = 1024
+
+# 요청 안에서 Router가 계산한 임베딩 (visual_service → 도메인 서비스의 후보 등록까지 전달)
+_request_embedding: ContextVar[Optional[np.ndarray]] = ContextVar("al_request_embedding", default=None)
+
+
+# =============================================================================
+# Fingerprint
+# =============================================================================
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    return np.cos(np.pi * (2 * i + 1) * k / (2 * n))
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def compute_phash(image: Image.Image) -> int:
+    """64bit perceptual hash"""
+    pixels = np.asarray(image.convert("L").resize((32, 32), Image.BILINEAR), dtype=np.float64)
+    low = (_DCT32 @ pixels @ _DCT32.T)[:8, :8].flatten()
+    bits = low > np.median(low[1:])  # DC 성분은 중앙값 계산에서 제외
+    return int(np.packbits(bits).view(">u8")[0])
+
+
+def popcount64(x: np.ndarray) -> np.ndarray:
+    """uint64 배열의 원소별 1 비트 수 (pHash 해밍 거리, numpy<2에는 bitwise_count가 없어 바이트 분해로 대체)"""
+    x = np.ascontiguousarray(x, dtype=np.uint64)
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(x)
+    return np.unpackbits(x.view(np.uint8)).reshape(*x.shape, 64).sum(axis=-1, dtype=np.uint8)
+
+
+def set_request_embedding(embedding: Optional[np.ndarray]):
+    _request_embedding.set(embedding)
+
+
+def encode_embedding(embedding: Optional[np.ndarray]) -> Optional[str]:
+    if embedding is None:
+        return None
+    return base64.b64encode(np.asarray(embedding, dtype=np.float16).tobytes()).decode("ascii")
+
+
+def decode_embedding(encoded: Optional[str]) -> Optional[np.ndarray]:
+    if not encoded:
+        return None
+    return np.frombuffer(base64.b64decode(encoded), dtype=np.float16)
+
+
+def image_fingerprint(image: Optional[Image.Image], with_embedding: bool = True) -> Dict[str, Any]:
+    """
+    ALCandidate에 넣을 지문 (pHash는 16진 문자열, 임베딩은 요청에 Router 결과가 있을 때만)
+    with_embedding=False: 원본의 일부(엔진 부품 crop 등)처럼 Router 임베딩이 해당 이미지를 대표하지 않는 경우
+    """
+    if image is None:
+        return {}
+    fingerprint = {"phash": f"{compute_phash(image):016x}"}
+    embedding = encode_embedding(_request_embedding.get()) if with_embedding else None
+    if embedding:
+        fingerprint["embedding"] = embedding
+    return fingerprint
+
+
+# =============================================================================
+# Index
+# =============================================================================
+class _DomainRing:
+    """도메인 하나의 고정 크기 링 버퍼"""
+
+    def __init__(self, capacity: int, dim: int):
+        self.phashes = np.zeros(capacity, dtype=np.uint64)
+        self.embeddings = np.zeros((capacity, dim), dtype=np.float16)
+        self.has_embedding = np.zeros(capacity, dtype=bool)
+        self.added_at = np.zeros(capacity, dtype=np.float64)   # 0 = 빈 슬롯
+        self.entry_ids = np.zeros(capacity, dtype=np.int64)
+        self.cursor = 0
+
+
+class NearDuplicateIndex:
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity_per_domain: int = 2000,
+        window_sec: float = 7 * 24 * 3600,
+        snapshot_every: int = 50,
+        dim: int = EMBEDDING_DIM
+    ):
+        self.path = path
+        self.capacity = capacity_per_domain
+        self.window_sec = window_sec
+        self.snapshot_every = snapshot_every
+        self.dim = dim
+        self._rings: Dict[str, _DomainRing] = {}
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._dirty = 0
+        self._stats = {"checks": 0, "admitted": 0, "dropped_phash": 0, "dropped_embedding": 0,
+                       "saved_oracle_calls": 0, "saved_labels": 0, "released": 0}
+        if path:
+            self.load()
+
+    def _ring(self, domain: str) -> _DomainRing:
+        if domain not in self._rings:
+            self._rings[domain] = _DomainRing(self.capacity, self.dim)
+        return self._rings[domain]
+
+    # -------------------------------------------------------------------------
+    # 조회 / 등록
+    # -------------------------------------------------------------------------
+    def admit(
+        self,
+        domain: str,
+        phash: Optional[str],
+        embedding: Optional[np.ndarray] = None,
+        needs_oracle: bool = True
+    ) -> Tuple[Optional[int], str]:
+        """
+        중복 검사 후 중복이 아니면 바로 등록 (검사와 등록을 한 번에 하여 동시 워커 간 경합 방지)
+
+        Returns:
+            (entry_id, "") : 등록됨 (라벨 저장에 실패하면 release(entry_id)로 되돌림)
+            (None, reason) : 근접 중복 ("phash" / "embedding")
+            (None, "")     : 지문 없음 (검사 생략, 오디오 등)
+        """
+        if phash is None:
+            return None, ""
+        value = np.uint64(int(phash, 16))
+        if embedding is not None:
+            embedding = np.asarray(embedding, dtype=np.float32)
+            if embedding.shape != (self.dim,):
+                embedding = None
+
+        with self._lock:
+            self._stats["checks"] += 1
+            ring = self._ring(domain)
+            live = ring.added_at > time.time() - self.window_sec
+            distances = popcount64(ring.phashes ^ value)
+
+            reason = ""
+            if np.any(live & (distances <= PHASH_STRICT_RADIUS)):
+                reason = "phash"
+            elif embedding is not None:
+                near = live & ring.has_embedding & (distances <= PHASH_LOOSE_RADIUS)
+                if np.any(near):
+                    cosine = ring.embeddings[near].astype(np.float32) @ embedding
+                    if float(cosine.max()) >= EMBEDDING_MIN_COSINE:
+                        reason = "embedding"
+
+            if reason:
+                self._stats[f"dropped_{reason}"] += 1
+                self._stats["saved_labels"] += 1
+                if needs_oracle:
+                    self._stats["saved_oracle_calls"] += 1
+                return None, reason
+
+            slot = ring.cursor
+            ring.cursor = (ring.cursor + 1) % self.capacity
+            ring.phashes[slot] = value
+            ring.has_embedding[slot] = embedding is not None
+            if embedding is not None:
+                ring.embeddings[slot] = embedding
+            ring.added_at[slot] = time.time()
+            ring.entry_ids[slot] = entry_id = self._next_id
+            self._next_id += 1
+            self._stats["admitted"] += 1
+            self._dirty += 1
+            should_snapshot = self.path and self._dirty >= self.snapshot_every
+
+        if should_snapshot:
+            self.save()
+        return entry_id, ""
+
+    def release(self, domain: str, entry_id: Optional[int]):
+        """라벨이 저장되지 않은 후보의 등록 취소 (이후 비슷한 후보가 다시 기회를 얻도록)"""
+        if entry_id is None:
+            return
+        with self._lock:
+            ring = self._rings.get(domain)
+            if ring is None:
+                return
+            slots = np.nonzero(ring.entry_ids == entry_id)[0]
+            ring.added_at[slots] = 0.0
+            self._stats["released"] += len(slots)
+
+    # -------------------------------------------------------------------------
+    # 스냅샷
+    # -------------------------------------------------------------------------
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            arrays = {"next_id": np.array([self._next_id])}
+            for domain, ring in self._rings.items():
+                arrays[f"{domain}__phashes"] = ring.phashes
+                arrays[f"{domain}__embeddings"] = ring.embeddings
+                arrays[f"{domain}__has_embedding"] = ring.has_embedding
+                arrays[f"{domain}__added_at"] = ring.added_at
+                arrays[f"{domain}__entry_ids"] = ring.entry_ids
+                arrays[f"{domain}__cursor"] = np.array([ring.cursor])
+            self._dirty = 0
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp.{os.getpid()}.npz"
+            np.savez(tmp_path, **arrays)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"[AL Dedup] 스냅샷 저장 실패 (무시): {e}")
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            data = np.load(self.path)
+            for key in data.files:
+                if not key.endswith("__phashes"):
+                    continue
+                domain = key[:-len("__phashes")]
+                if data[key].shape[0] != self.capacity or data[f"{domain}__embeddings"].shape[1] != self.dim:
+                    print(f"[AL Dedup] 스냅샷 크기가 달라 '{domain}' 인덱스를 비웁니다.")
+                    continue
+                ring = self._ring(domain)
+                ring.phashes[:] = data[key]
+                ring.embeddings[:] = data[f"{domain}__embeddings"]
+                ring.has_embedding[:] = data[f"{domain}__has_embedding"]
+                ring.added_at[:] = data[f"{domain}__added_at"]
+                ring.entry_ids[:] = data[f"{domain}__entry_ids"]
+                ring.cursor = int(data[f"{domain}__cursor"][0])
+            self._next_id = int(data["next_id"][0])
+            print(f"[AL Dedup] 스냅샷 로드: {self.size()}")
+        except (OSError, ValueError, KeyError) as e:
+            print(f"[AL Dedup] 스냅샷 로드 실패 (빈 인덱스로 시작): {e}")
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+    def size(self) -> Dict[str, int]:
+        cutoff = time.time() - self.window_sec
+        return {domain: int(np.count_nonzero(ring.added_at > cutoff)) for domain, ring in self._rings.items()}
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            size = self.size()
+            memory = sum(r.phashes.nbytes + r.embeddings.nbytes + r.added_at.nbytes + r.entry_ids.nbytes
+                         for r in self._rings.values())
+        checks = stats["checks"]
+        dropped = stats["dropped_phash"] + stats["dropped_embedding"]
+        return dict(
+            stats,
+            drop_rate=round(dropped / checks, 4) if checks else None,
+            entries=size,
+            capacity_per_domain=self.capacity,
+            memory_bytes=memory,
+        )
@@ -0,0 +1,386 @@
+# ai/app/services/common/object_store_writer.py
+"""
+Active Learning 산출물 비동기 배치 업로더 (Non-blocking Object Store Writer)
+
+[역할]
+1. Enqueue 전용: 요청 처리 코드는 업로드할 객체를 메모리 큐에 넣기만 하고 즉시 반환합니다.
+   (async 핸들러 안에서 boto3 put_object가 이벤트 루프를 막던 문제 해결)
+2. 백그라운드 워커: 워커 스레드들이 하나의 S3 클라이언트(커넥션 풀 공유)로 업로드합니다.
+3. 배치 병합: 워커는 큐에서 최대 BATCH_SIZE개를 한 번에 꺼내고, 같은 Key는 마지막 값만 올립니다.
+4. 재시도: 지수 백오프(+지터)로 재시도하고, 끝내 실패하면 로컬 디스크 저널에 기록합니다.
+   큐가 가득 찬 경우에도 요청을 막지 않고 저널로 보냅니다.
+5. 복구: 시작 시(워커 스레드에서)와 업로드 성공 후 주기적으로 저널을 다시 큐에 넣습니다.
+   저널 파일은 .replaying으로 이름을 바꿔 선점하므로 여러 워커가 같은 파일을 중복 재업로드하지 않습니다.
+6. 종료: 서버 종료 시 큐를 비우고, 남은 항목은 저널에 남깁니다.
+7. 메트릭: 큐 깊이, 가장 오래된 대기 시간, enqueue→업로드 지연(p50/p95), 재시도/저널 건수
+
+[환경 변수]
+- OBJECT_WRITER_QUEUE_SIZE (기본 1000)
+- OBJECT_WRITER_WORKERS (기본 2)
+- OBJECT_WRITER_BATCH_SIZE (기본 20)
+- OBJECT_WRITER_MAX_RETRIES (기본 3)
+- OBJECT_WRITER_JOURNAL_DIR (기본 ai/data/cache/object_writer_journal)
+"""
+import base64
+import json
+import os
+import queue
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+
+_STOP = object()
+CLAIM_SUFFIX = ".replaying"
+
+
+class PendingObject:
+    __slots__ = ("key", "body", "content_type", "enqueued_at")
+
+    def __init__(self, key: str, body: bytes, content_type: str, enqueued_at: Optional[float] = None):
+        self.key = key
+        self.body = body
+        self.content_type = content_type
+        self.enqueued_at = enqueued_at or time.time()
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "key": self.key,
+            "body": base64.b64encode(self.body).decode("ascii"),
+            "content_type": self.content_type,
+            "enqueued_at": self.enqueued_at,
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict[str, Any]) -> "PendingObject":
+        return cls(data["key"], base64.b64decode(data["body"]), data["content_type"], data["enqueued_at"])
+
+
+class ObjectStoreWriter:
+    """bounded 큐 + 워커 스레드 기반 S3 업로더"""
+
+    def __init__(
+        self,
+        s3_client=None,
+        bucket: Optional[str] = None,
+        max_queue: int = 1000,
+        workers: int = 2,
+        batch_size: int = 20,
+        batch_wait_sec: float = 0.2,
+        max_retries: int = 3,
+        backoff_base_sec: float = 0.5,
+        journal_dir: str = "ai/data/cache/object_writer_journal",
+        journal_replay_sec: float = 60.0
+    ):
+        self._s3 = s3_client
+        self.bucket = bucket or os.getenv("S3_BUCKET_NAME", "car-sentry-data")
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self.num_workers = workers
+        self.batch_size = batch_size
+        self.batch_wait_sec = batch_wait_sec
+        self.max_retries = max_retries
+        self.backoff_base_sec = backoff_base_sec
+        self.journal_dir = journal_dir
+        self.journal_replay_sec = journal_replay_sec
+
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._inflight = 0
+        self._idle = threading.Condition(self._lock)
+        self._last_replay = 0.0
+        self._replay_lock = threading.Lock()
+        self._lags: deque = deque(maxlen=500)
+        self._stats = {"enqueued": 0, "uploaded": 0, "coalesced": 0, "retries": 0,
+                       "journaled": 0, "replayed": 0, "dropped": 0}
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            import boto3
+            from botocore.config import Config
+            self._s3 = boto3.client("s3", config=Config(max_pool_connections=max(10, self.num_workers * 2)))
+        return self._s3
+
+    # -------------------------------------------------------------------------
+    # 수명 주기
+    # -------------------------------------------------------------------------
+    def start(self):
+        with self._lock:
+            if self._threads:
+                return
+            for i in range(self.num_workers):
+                # 시작 시 저널 복구는 첫 워커가 수행 (enqueue를 부른 이벤트 루프를 막지 않음)
+                t = threading.Thread(target=self._worker, args=(i == 0,), name=f"object-writer-{i}", daemon=True)
+                t.start()
+                self._threads.append(t)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """큐와 진행 중인 업로드가 모두 끝날 때까지 대기 (타임아웃 시 False)"""
+        deadline = time.time() + timeout
+        with self._idle:
+            while self.queue.unfinished_tasks or self._inflight:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._idle.wait(min(remaining, 0.1))
+        return True
+
+    def close(self, timeout: float = 30.0):
+        """큐를 비우고 워커 종료. 시간 안에 못 올린 항목은 저널에 남깁니다."""
+        if not self._threads:
+            return
+        flushed = self.flush(timeout)
+        if not flushed:
+            leftovers = []
+            while True:
+                try:
+                    item = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                leftovers.append(item)
+                self.queue.task_done()
+            self._write_journal(leftovers)
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for t in self._threads:
+            t.join(timeout=5.0)
+        self._threads = []
+        print(f"[Object Writer] 종료 (flushed={flushed})")
+
+    # -------------------------------------------------------------------------
+    # Enqueue
+    # -------------------------------------------------------------------------
+    def enqueue(self, key: str, body: Union[Dict[str, Any], str, bytes],
+                content_type: str = "application/json") -> bool:
+        """
+        업로드 예약 (블로킹 없음)
+
+        Returns:
+            True: 큐에 들어감 / False: 큐가 가득 차 저널로 보냄
+        """
+        if isinstance(body, dict):
+            body = json.dumps(body, ensure_ascii=False, indent=2)
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        item = PendingObject(key, body, content_type)
+
+        if not self._threads:
+            self.start()
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            print(f"[Object Writer] 큐 가득 참 → 저널 기록: {key}")
+            self._write_journal([item])
+            return False
+        with self._lock:
+            self._stats["enqueued"] += 1
+        return True
+
+    # -------------------------------------------------------------------------
+    # Worker
+    # -------------------------------------------------------------------------
+    def _next_batch(self) -> Optional[List[PendingObject]]:
+        first = self.queue.get()
+        if first is _STOP:
+            self.queue.task_done()
+            return None
+        batch = [first]
+        deadline = time.time() + self.batch_wait_sec
+        while len(batch) < self.batch_size:
+            try:
+                item = self.queue.get(timeout=max(deadline - time.time(), 0.001))
+            except queue.Empty:
+                break
+            if item is _STOP:
+                self.queue.put(_STOP)  # 다른 워커 몫으로 되돌림
+                self.queue.task_done()
+                break
+            batch.append(item)
+        return batch
+
+    def _worker(self, replay_first: bool = False):
+        if replay_first:
+            self._recover_claims()
+            self.replay_journal()
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            with self._lock:
+                self._inflight += 1
+            try:
+                self._upload_batch(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+                with self._idle:
+                    self._inflight -= 1
+                    self._idle.notify_all()
+
+    def _upload_batch(self, batch: List[PendingObject]):
+        # 같은 Key는 마지막 값만 업로드
+        latest: Dict[str, PendingObject] = {}
+        for item in batch:
+            latest[item.key] = item
+        with self._lock:
+            self._stats["coalesced"] += len(batch) - len(latest)
+
+        failed = [item for item in latest.values() if not self._put_with_retry(item)]
+        if failed:
+            self._write_journal(failed)
+        elif time.time() - self._last_replay > self.journal_replay_sec:
+            self.replay_journal()
+
+    def _put_with_retry(self, item: PendingObject) -> bool:
+        for attempt in range(self.max_retries + 1):
+            try:
+                self.s3.put_object(Bucket=self.bucket, Key=item.key, Body=item.body, ContentType=item.content_type)
+                with self._lock:
+                    self._stats["uploaded"] += 1
+                    self._lags.append(time.time() - item.enqueued_at)
+                return True
+            except Exception as e:
+                if attempt == self.max_retries:
+                    print(f"[Object Writer] 업로드 실패 ({item.key}): {e}")
+                    return False
+                with self._lock:
+                    self._stats["retries"] += 1
+                time.sleep(self.backoff_base_sec * (2 ** attempt) * (0.5 + random.random()))
+        return False
+
+    # -------------------------------------------------------------------------
+    # 디스크 저널
+    # -------------------------------------------------------------------------
+    def _write_journal(self, items: List[PendingObject]):
+        if not items:
+            return
+        try:
+            os.makedirs(self.journal_dir, exist_ok=True)
+            path = os.path.join(self.journal_dir, f"{int(time.time() * 1000)}-{uuid.uuid4().hex[:8]}.jsonl")
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                for item in items:
+                    f.write(json.dumps(item.to_json()) + "\n")
+            os.replace(tmp_path, path)
+            with self._lock:
+                self._stats["journaled"] += len(items)
+        except OSError as e:
+            print(f"[Object Writer] 저널 기록 실패, {len(items)}개 유실: {e}")
+            with self._lock:
+                self._stats["dropped"] += len(items)
+
+    def journal_files(self) -> List[str]:
+        if not os.path.isdir(self.journal_dir):
+            return []
+        return sorted(os.path.join(self.journal_dir, f) for f in os.listdir(self.journal_dir) if f.endswith(".jsonl"))
+
+    def _recover_claims(self):
+        """이전 프로세스가 재업로드 도중 종료되어 남은 .replaying 파일을 저널로 되돌림"""
+        if not os.path.isdir(self.journal_dir):
+            return
+        for name in os.listdir(self.journal_dir):
+            if name.endswith(CLAIM_SUFFIX):
+                path = os.path.join(self.journal_dir, name)
+                try:
+                    os.rename(path, path[:-len(CLAIM_SUFFIX)])
+                except OSError as e:
+                    print(f"[Object Writer] 저널 복구 실패 ({path}): {e}")
+
+    def replay_journal(self) -> int:
+        """저널 항목을 큐에 다시 넣음 (큐가 차면 남은 파일은 다음 기회에, 다른 스레드가 재업로드 중이면 건너뜀)"""
+        if not self._replay_lock.acquire(blocking=False):
+            return 0
+        try:
+            self._last_replay = time.time()
+            replayed = 0
+            for path in self.journal_files():
+                # 파일 선점: rename은 원자적이므로 먼저 바꾼 쪽만 읽음
+                claimed = path + CLAIM_SUFFIX
+                try:
+                    os.rename(path, claimed)
+                except OSError:
+                    continue
+                try:
+                    with open(claimed, "r", encoding="utf-8") as f:
+                        items = [PendingObject.from_json(json.loads(line)) for line in f if line.strip()]
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"[Object Writer] 저널 읽기 실패 ({path}): {e}")
+                    self._release_claim(claimed, path)
+                    continue
+                if self.queue.maxsize and self.queue.qsize() + len(items) > self.queue.maxsize:
+                    self._release_claim(claimed, path)
+                    break
+                try:
+                    os.remove(claimed)
+                except OSError as e:
+                    print(f"[Object Writer] 저널 삭제 실패 ({claimed}): {e}")
+                for i, item in enumerate(items):
+                    try:
+                        self.queue.put_nowait(item)
+                    except queue.Full:
+                        self._write_journal(items[i:])  # 동시 enqueue로 큐가 찬 경우 나머지는 다시 저널로
+                        break
+                    replayed += 1
+        finally:
+            self._replay_lock.release()
+        if replayed:
+            with self._lock:
+                self._stats["replayed"] += replayed
+            print(f"[Object Writer] 저널 {replayed}개 재업로드 예약")
+        return replayed
+
+    def _release_claim(self, claimed: str, path: str):
+        try:
+            os.rename(claimed, path)
+        except OSError as e:
+            print(f"[Object Writer] 저널 선점 해제 실패 ({claimed}): {e}")
+
+    # -------------------------------------------------------------------------
+    # Metrics
+    # -------------------------------------------------------------------------
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            lags = list(self._lags)
+            stats = dict(self._stats)
+            inflight = self._inflight
+        with self.queue.mutex:
+            oldest = min((i.enqueued_at for i in self.queue.queue if i is not _STOP), default=None)
+        return dict(
+            stats,
+            queue_depth=self.queue.qsize(),
+            queue_capacity=self.queue.maxsize,
+            inflight_batches=inflight,
+            oldest_pending_sec=round(time.time() - oldest, 3) if oldest else 0.0,
+            lag_p50_ms=round(float(np.percentile(lags, 50)) * 1000, 1) if lags else None,
+            lag_p95_ms=round(float(np.percentile(lags, 95)) * 1000, 1) if lags else None,
+            journal_files=len(self.journal_files()),
+            workers=len(self._threads),
+        )
+
+
+_writer: Optional[ObjectStoreWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_object_writer() -> ObjectStoreWriter:
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ObjectStoreWriter(
+                max_queue=int(os.getenv("OBJECT_WRITER_QUEUE_SIZE", "1000")),
+                workers=int(os.getenv("OBJECT_WRITER_WORKERS", "2")),
+                batch_size=int(os.getenv("OBJECT_WRITER_BATCH_SIZE", "20")),
+                max_retries=int(os.getenv("OBJECT_WRITER_MAX_RETRIES", "3")),
+                journal_dir=os.getenv("OBJECT_WRITER_JOURNAL_DIR", "ai/data/cache/object_writer_journal"),
+            )
+        return _writer
+
+
+def close_object_writer(timeout: float = 30.0):
+    """서버 종료 시 호출 (생성된 적 없으면 무시)"""
+    if _writer is not None:
+        _writer.close(timeout)
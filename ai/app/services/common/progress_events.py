@@ -0,0 +1,97 @@
+# ai/app/services/common/progress_events.py
+"""
+분석 진행 이벤트 스트림 (Progressive Events for SSE)
+
+[역할]
+1. 이벤트 싱크: 스트리밍 요청 하나의 수명 동안 contextvars로 asyncio.Queue를 전파합니다.
+2. 단계별 발행: 서비스 코드는 emit()만 호출하며, 스트리밍 요청이 아니면 아무 일도 하지 않습니다.
+   (기존 JSON 엔드포인트 / 스크립트 / 테스트 동작에는 영향 없음)
+3. SSE 포맷: 라우터에서 이벤트를 text/event-stream 형식으로 변환합니다.
+
+[이벤트 순서 (/predict/visual/stream)]
+    scene → detections → part (부품별, 완료 순) → llm_token (description 텍스트 조각) → result (기존 JSON과 동일) → done
+    오류 시: error → done
+
+[사용법]
+    # 서비스
+    emit("scene", {"scene_type": "SCENE_ENGINE", "confidence": 0.97})
+
+    # 라우터
+    async def event_source():
+        async for event, data in run_with_events(get_smart_visual_diagnosis(s3_url, models)):
+            yield format_sse(event, data)
+"""
+import asyncio
+import json
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Awaitable, Optional, Tuple
+
+_DONE = object()
+
+_event_sink: ContextVar[Optional[asyncio.Queue]] = ContextVar("progress_event_sink", default=None)
+
+
+def is_streaming() -> bool:
+    """현재 컨텍스트가 스트리밍 요청 안인지 여부"""
+    return _event_sink.get() is not None
+
+
+def emit(event: str, data: Any):
+    """진행 이벤트 발행 (스트리밍 요청이 아니면 무시)"""
+    sink = _event_sink.get()
+    if sink is not None:
+        sink.put_nowait((event, data))
+
+
+async def run_with_events(coro: Awaitable[Any]) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    코루틴을 별도 Task로 실행하면서 발행된 이벤트를 순서대로 내보냅니다.
+    반환값을 담은 "result" (예외 시 "error") 다음에 스트림 종료를 알리는 "done"으로 끝납니다.
+    소비자가 중간에 끊기면(클라이언트 연결 종료) Task를 취소합니다.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _runner():
+        # Task는 생성 시점의 컨텍스트 복사본에서 실행되므로 싱크 설정이 호출자에게 새지 않음
+        _event_sink.set(queue)
+        try:
+            queue.put_nowait(("result", await coro))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"[Progress Events] 분석 오류: {e}")
+            queue.put_nowait(("error", {"message": str(e)}))
+        finally:
+            queue.put_nowait(_DONE)
+
+    task = asyncio.ensure_future(_runner())
+    try:
+        while True:
+            item = await queue.get()
+            if item is _DONE:
+                yield "done", {}
+                break
+            yield item
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+def format_sse(event: str, data: Any, event_id: Optional[int] = None) -> str:
+    """SSE 메시지 한 건 (data는 한 줄 JSON)"""
+    payload = json.dumps(_to_jsonable(data), ensure_ascii=False, default=str)
+    lines = [f"event: {event}"]
+    if event_id is not None:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {payload}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _to_jsonable(data: Any) -> Any:
+    # Pydantic 모델(VisualResponse 등)은 dict로 변환
+    if hasattr(data, "model_dump"):
+        return data.model_dump()
+    if hasattr(data, "dict") and not isinstance(data, dict):
+        return data.dict()
+    return data
+
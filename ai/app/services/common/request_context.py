@@ -0,0 +1,161 @@
+# ai/app/services/common/request_context.py
+"""
+요청 단위 LLM 호출 중복 제거 (Request-scoped Single-flight Memo)
+
+[역할]
+1. 요청 컨텍스트: API 요청 하나의 수명 동안 유지되는 컨텍스트를 contextvars로 전파합니다.
+2. 중복 호출 공유: 같은 요청 안에서 (함수, 정규화된 인자)가 같은 LLM 코루틴은
+   이미 진행 중인(in-flight) 결과를 함께 기다립니다. (예: generate_training_labels 2회 호출)
+3. 호출 통계: 요청별로 실제 발행(issued) / 중복 제거(deduped) 횟수를 집계합니다.
+
+[사용법]
+    # 라우터
+    async with llm_request_scope("visual"):
+        result = await get_smart_visual_diagnosis(...)
+
+    # llm_service
+    @memoize_in_request
+    async def generate_training_labels(s3_url, domain): ...
+
+컨텍스트 밖(스크립트, 테스트)에서 호출하면 메모이제이션 없이 원래 함수가 그대로 실행됩니다.
+"""
+import asyncio
+import copy
+import functools
+import hashlib
+import inspect
+import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
+
+
+class RequestContext:
+    """요청 하나의 LLM in-flight 테이블과 호출 카운터"""
+
+    def __init__(self, name: str = "request"):
+        self.name = name
+        self.inflight: Dict[tuple, asyncio.Future] = {}
+        self.issued = 0
+        self.deduped = 0
+        self.per_function: Dict[str, Dict[str, int]] = {}
+
+    def record(self, func_name: str, field: str):
+        entry = self.per_function.setdefault(func_name, {"issued": 0, "deduped": 0})
+        entry[field] += 1
+        if field == "issued":
+            self.issued += 1
+        else:
+            self.deduped += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "issued": self.issued,
+            "deduped": self.deduped,
+            "per_function": self.per_function,
+        }
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar("llm_request_context", default=None)
+
+# 프로세스 누적 통계 (운영 모니터링용)
+_totals = {"requests": 0, "issued": 0, "deduped": 0}
+
+
+def get_request_context() -> Optional[RequestContext]:
+    return _current_request.get()
+
+
+def get_llm_call_totals() -> Dict[str, int]:
+    return dict(_totals)
+
+
+@asynccontextmanager
+async def llm_request_scope(name: str = "request"):
+    """API 요청 하나를 감싸는 컨텍스트 (중첩 시 바깥 컨텍스트 재사용)"""
+    existing = _current_request.get()
+    if existing is not None:
+        yield existing
+        return
+
+    ctx = RequestContext(name)
+    token = _current_request.set(ctx)
+    try:
+        yield ctx
+    finally:
+        _current_request.reset(token)
+        _totals["requests"] += 1
+        _totals["issued"] += ctx.issued
+        _totals["deduped"] += ctx.deduped
+        if ctx.issued or ctx.deduped:
+            print(f"[LLM Calls] {ctx.name}: issued={ctx.issued}, deduped={ctx.deduped}")
+
+
+def _normalize(value: Any) -> Any:
+    """인자를 해시 가능한 키로 변환 (bytes는 해시, dict/list는 정렬된 JSON)"""
+    if isinstance(value, (bytes, bytearray)):
+        return ("bytes", hashlib.sha1(value).hexdigest())
+    if isinstance(value, (dict, list, tuple)):
+        return ("json", json.dumps(value, sort_keys=True, ensure_ascii=False, default=str))
+    if isinstance(value, str):
+        return value.strip()
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return ("repr", repr(value))
+
+
+def _make_key(func: Callable, signature: inspect.Signature, args: tuple, kwargs: dict, ignore: tuple = ()) -> tuple:
+    # 위치/키워드 인자 차이와 기본값 생략 여부를 없애기 위해 시그니처에 바인딩
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    return (func.__qualname__,) + tuple(
+        (k, _normalize(v)) for k, v in bound.arguments.items() if k not in ignore
+    )
+
+
+def memoize_in_request(func: Optional[Callable] = None, *, ignore: tuple = ()) -> Callable:
+    """
+    요청 컨텍스트 안에서 같은 인자의 코루틴 호출을 하나의 in-flight Task로 합칩니다.
+
+    - 결과는 호출자마다 deepcopy하여 전달 (호출자가 dict를 수정해도 서로 영향 없음)
+    - 예외로 끝난 호출은 테이블에서 제거하여 같은 요청 안에서 재시도 가능
+    - ignore: 키에서 제외할 인자 (예: URL에서 파생된 PIL 이미지)
+    """
+    if func is None:
+        return functools.partial(memoize_in_request, ignore=ignore)
+
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        ctx = _current_request.get()
+        if ctx is None:
+            return await func(*args, **kwargs)
+
+        try:
+            key = _make_key(func, signature, args, kwargs, ignore)
+        except TypeError:
+            return await func(*args, **kwargs)
+
+        task = ctx.inflight.get(key)
+        if task is None:
+            ctx.record(func.__name__, "issued")
+            task = asyncio.ensure_future(func(*args, **kwargs))
+            ctx.inflight[key] = task
+
+            def _drop_failed(t, key=key):
+                if t.cancelled() or t.exception() is not None:
+                    ctx.inflight.pop(key, None)
+            task.add_done_callback(_drop_failed)
+        else:
+            ctx.record(func.__name__, "deduped")
+            print(f"[LLM Calls] 중복 호출 공유: {func.__name__}")
+
+        # 한 호출자가 취소되어도 다른 호출자가 기다리는 Task는 유지
+        result = await asyncio.shield(task)
+        return copy.deepcopy(result)
+
+    return wrapper
@@ -0,0 +1,185 @@
+# ai/app/services/common/vision_input.py
+"""
+GPT Vision 입력 이미지 준비 (Vision Input Preparer)
+
+[역할]
+1. 호출 지점별 프로필: 진단 목적에 맞는 해상도(max_side)와 detail 수준을 호출 지점마다 고정합니다.
+2. 1회 인코딩: 프로세스 안에서 축소 후 JPEG으로 한 번만 인코딩하며, 용량 예산을 넘으면 품질 → 해상도 순으로 낮춥니다.
+3. Inline 전송: S3 URL 대신 data URL(base64)로 전송하여 제공자 측 원본(12MP) 다운로드/타일링을 없앱니다.
+4. 비용 리포트: 호출마다 예상 이미지 토큰과 업로드 바이트를 기록합니다.
+
+[토큰 추정 규칙 (OpenAI Vision)]
+- detail=low: 85 tokens 고정
+- detail=high: 2048x2048 안으로 축소 → 짧은 변 768로 축소 → 512px 타일 수 x 170 + 85
+"""
+import asyncio
+import base64
+import io
+import math
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Union
+
+import httpx
+from PIL import Image
+
+MAX_DOWNLOAD_SIZE = 10 * 1024 * 1024  # 10MB (visual_service와 동일)
+MIN_SIDE = 128                        # 용량 예산 맞출 때 더 줄이지 않는 긴 변 하한
+
+
+@dataclass(frozen=True)
+class VisionProfile:
+    """호출 지점별 이미지 전송 정책"""
+    max_side: int       # 긴 변 최대 픽셀
+    detail: str         # "low" | "high"
+    quality: int        # JPEG 시작 품질
+    max_bytes: int      # 인코딩 결과 용량 예산
+
+
+# 호출 지점 → 프로필
+# - general: 장면 분류 + 상태 진단 (1024px, 타일 4장 = 765 tokens)
+# - training_labels: BBox 라벨 생성 (좌표 정밀도 위해 general과 동일 해상도)
+# - tire_wear: 트레드 마모 판독 (1024px high)
+# - engine_crop / heatmap: YOLO Crop(224px 내외)은 low detail로 충분 (85 tokens)
+VISION_PROFILES: Dict[str, VisionProfile] = {
+    "general": VisionProfile(max_side=1024, detail="high", quality=85, max_bytes=300 * 1024),
+    "training_labels": VisionProfile(max_side=1024, detail="high", quality=85, max_bytes=300 * 1024),
+    "tire_wear": VisionProfile(max_side=1024, detail="high", quality=90, max_bytes=400 * 1024),
+    "engine_crop": VisionProfile(max_side=512, detail="low", quality=85, max_bytes=80 * 1024),
+    "heatmap": VisionProfile(max_side=512, detail="low", quality=75, max_bytes=60 * 1024),
+    # 품질 비교 기준선 (원본 해상도 그대로 전송, compare_vision_inputs.py 전용)
+    "original": VisionProfile(max_side=8192, detail="high", quality=95, max_bytes=20 * 1024 * 1024),
+}
+
+# 프로필별 누적 통계 (prepare_image는 asyncio.to_thread 워커에서 동시에 호출됨)
+_stats: Dict[str, Dict[str, int]] = {}
+_stats_lock = threading.Lock()
+
+
+@dataclass
+class PreparedImage:
+    """인코딩이 끝난 Vision 입력"""
+    base64_data: str
+    detail: str
+    width: int
+    height: int
+    original_size: tuple
+    num_bytes: int
+    est_tokens: int
+
+    @property
+    def data_url(self) -> str:
+        return f"data:image/jpeg;base64,{self.base64_data}"
+
+    def as_content(self) -> Dict[str, Any]:
+        """chat.completions 메시지의 image_url 파트"""
+        return {"type": "image_url", "image_url": {"url": self.data_url, "detail": self.detail}}
+
+
+def estimate_image_tokens(width: int, height: int, detail: str = "high") -> int:
+    """OpenAI Vision 이미지 토큰 추정"""
+    if detail == "low":
+        return 85
+
+    # 1. 2048x2048 안으로
+    scale = min(1.0, 2048 / max(width, height))
+    w, h = width * scale, height * scale
+    # 2. 짧은 변 768로
+    scale = min(1.0, 768 / min(w, h))
+    w, h = w * scale, h * scale
+
+    tiles = math.ceil(w / 512) * math.ceil(h / 512)
+    return 85 + 170 * tiles
+
+
+def prepare_image(image: Union[Image.Image, bytes], profile: str) -> PreparedImage:
+    """
+    이미지 축소 + JPEG 인코딩 (용량 예산 초과 시 품질을 낮춰 재인코딩)
+
+    Args:
+        image: PIL Image 또는 원본 바이트
+        profile: VISION_PROFILES 키
+    """
+    spec = VISION_PROFILES[profile]
+
+    if isinstance(image, (bytes, bytearray)):
+        image = Image.open(io.BytesIO(image))
+    image = image.convert("RGB")
+    original_size = image.size
+
+    if max(image.size) > spec.max_side:
+        image.thumbnail((spec.max_side, spec.max_side), Image.LANCZOS)
+
+    # 품질을 50까지 낮추고, 그래도 예산을 넘으면(노이즈가 많은 사진) 해상도를 줄여 재인코딩
+    quality = spec.quality
+    while True:
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG", quality=quality, optimize=True)
+        encoded = buffer.getvalue()
+        if len(encoded) <= spec.max_bytes or max(image.size) <= MIN_SIDE:
+            break
+        if quality > 50:
+            quality = max(50, quality - 10)
+        else:
+            side = max(MIN_SIDE, int(max(image.size) * 0.8))
+            image.thumbnail((side, side), Image.LANCZOS)
+
+    prepared = PreparedImage(
+        base64_data=base64.b64encode(encoded).decode("utf-8"),
+        detail=spec.detail,
+        width=image.width,
+        height=image.height,
+        original_size=original_size,
+        num_bytes=len(encoded),
+        est_tokens=estimate_image_tokens(image.width, image.height, spec.detail),
+    )
+    _record(profile, prepared)
+    return prepared
+
+
+async def prepare_image_content(
+    s3_url: str,
+    profile: str,
+    image: Optional[Image.Image] = None
+) -> Dict[str, Any]:
+    """
+    LLM 메시지용 image_url 파트 생성
+
+    이미 로드된 이미지가 있으면 재사용하고, 없으면 직접 다운로드합니다.
+    준비에 실패하면 기존처럼 URL을 그대로 전달합니다 (동작 보존).
+    """
+    try:
+        if image is None:
+            if s3_url.startswith("data:"):
+                image = base64.b64decode(s3_url.split(",", 1)[1])
+            else:
+                async with httpx.AsyncClient(timeout=10.0) as client:
+                    response = await client.get(s3_url)
+                    response.raise_for_status()
+                    if len(response.content) > MAX_DOWNLOAD_SIZE:
+                        raise ValueError("Image too large")
+                    image = response.content
+        # 축소/JPEG 인코딩은 CPU 작업 → 이벤트 루프 밖에서 실행
+        prepared = await asyncio.to_thread(prepare_image, image, profile)
+        return prepared.as_content()
+    except Exception as e:
+        print(f"[Vision Input] {profile} 준비 실패, URL 전달로 대체: {e}")
+        return {"type": "image_url", "image_url": {"url": s3_url}}
+
+
+def _record(profile: str, prepared: PreparedImage):
+    with _stats_lock:
+        entry = _stats.setdefault(profile, {"calls": 0, "bytes": 0, "tokens": 0})
+        entry["calls"] += 1
+        entry["bytes"] += prepared.num_bytes
+        entry["tokens"] += prepared.est_tokens
+
+    ow, oh = prepared.original_size
+    print(f"[Vision Input] {profile}: {ow}x{oh} → {prepared.width}x{prepared.height} "
+          f"({prepared.detail}), {prepared.num_bytes // 1024}KB, ~{prepared.est_tokens} tokens")
+
+
+def get_vision_input_stats() -> Dict[str, Dict[str, int]]:
+    """프로필별 누적 호출 수 / 업로드 바이트 / 예상 토큰"""
+    with _stats_lock:
+        return {k: dict(v) for k, v in _stats.items()}
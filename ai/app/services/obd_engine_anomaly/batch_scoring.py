@@ -0,0 +1,376 @@
+# ai/app/services/obd_engine_anomaly/batch_scoring.py
+"""
+OBD 이상 탐지 배치 채점 (TimescaleDB obd_logs → LSTM-AE → anomaly_records)
+
+[역할]
+obd_logs는 보존 기간(3일)이 지나면 삭제되므로, 주기적으로 최근 N분 데이터를 차량 전체에 대해 채점합니다.
+
+[처리 순서] (차량 파티션마다, 파티션끼리는 동시에)
+1. 조회: 서버에서 time_bucket(1 / sampling_hz)으로 격자 평균을 만든 뒤 COPY ... TO STDOUT (FORMAT binary)로 스트리밍
+   - 결측 평균은 'NaN'으로 채워 모든 행을 고정 폭으로 → numpy 구조체 배열 하나로 한 번에 해석
+   - 차량별 진행 위치(obd_anomaly_watermarks.scored_until) - window_sec 이후만 조회 (재실행 시 증분)
+2. 정렬 / 윈도우: 차량마다 time_aligner로 격자 정렬, 윈도우 끝 시각을 stride 배수에 고정(anchored)
+   → 진행 위치 이후에 끝나는 윈도우만 채점 (같은 윈도우를 두 번 채점하지 않음)
+3. 채점: 파티션의 모든 차량 윈도우를 모아 LSTMAEEngine으로 큰 배치 forward
+4. 저장: 임계값을 넘은 윈도우만 anomaly_records에 COPY(copy_records_to_table),
+   진행 위치 갱신과 같은 트랜잭션 → 중간에 실패한 파티션은 다음 실행에서 다시 채점
+
+[파티션]
+get_byte(uuid_send(vehicles_id), 15) % partitions (UUID 마지막 바이트, 최대 256개)
+
+[환경 변수]
+- OBD_BATCH_DSN (미지정 시 DB_HOST / DB_PORT / DB_NAME / DB_USER / DB_PASSWORD)
+- OBD_BATCH_LOOKBACK_MIN (기본 15), OBD_BATCH_PARTITIONS (기본 8), OBD_BATCH_CONCURRENCY (기본 4)
+
+[사용법]
+python -m ai.scripts.obd_engine.run_batch_scoring --lookback-min 15
+"""
+import asyncio
+import json
+import os
+import re
+import struct
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai.app.services.obd_engine_anomaly.feature_registry import canonical_signal
+from ai.app.services.obd_engine_anomaly.lstm_preprocess import PREPROCESS_YAML
+from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import ObdEngineAnomalyService
+from ai.app.services.obd_engine_anomaly.time_aligner import AlignConfig, Trip, align
+
+RETENTION = timedelta(days=3)           # db/schema.sql add_retention_policy('obd_logs', ...)
+ANOMALY_TYPE = "OBD_ENGINE_LSTM_AE"
+MAX_PARTITIONS = 256
+
+# 표준 신호명 → obd_logs 컬럼 (없는 신호는 json_extra의 같은 이름 키)
+OBD_LOG_COLUMNS: Dict[str, str] = {
+    "engine_rpm": "rpm",
+    "vehicle_speed_kmh": "speed",
+    "engine_coolant_temp_c": "coolant_temp",
+    "battery_voltage_v": "voltage",
+}
+
+# 점수 / 임계값 배율 → risk_level
+SEVERITY_RATIOS: Tuple[Tuple[float, str], ...] = ((3.0, "CRITICAL"), (2.0, "HIGH"), (1.5, "MID"), (0.0, "LOW"))
+
+RECORD_COLUMNS = ("vehicles_id", "recorded_at", "anomaly_type", "severity", "snapshot_data")
+
+WATERMARK_DDL = """
+CREATE TABLE IF NOT EXISTS obd_anomaly_watermarks (
+    vehicles_id UUID PRIMARY KEY REFERENCES vehicles (vehicles_id),
+    scored_until TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+)
+"""
+
+WATERMARK_UPSERT = """
+INSERT INTO obd_anomaly_watermarks (vehicles_id, scored_until, updated_at)
+SELECT v, t, NOW() FROM unnest($1::uuid[], $2::timestamptz[]) AS u(v, t)
+ON CONFLICT (vehicles_id) DO UPDATE
+SET scored_until = GREATEST(obd_anomaly_watermarks.scored_until, EXCLUDED.scored_until),
+    updated_at = NOW()
+"""
+
+_PG_EPOCH_US = 946_684_800_000_000      # 2000-01-01T00:00:00Z (PostgreSQL 바이너리 시각 기준)
+_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00"
+_IDENTIFIER = re.compile(r"^[a-z_][a-z0-9_]*$")
+
+
+# =============================================================================
+# 설정
+# =============================================================================
+def _default_dsn() -> str:
+    return os.getenv("OBD_BATCH_DSN") or "postgresql://{}:{}@{}:{}/{}".format(
+        os.getenv("DB_USER", "Ai-5-main-project"), os.getenv("DB_PASSWORD", "Ai5MainProjectPassword"),
+        os.getenv("DB_HOST", "localhost"), os.getenv("DB_PORT", "5432"), os.getenv("DB_NAME", "car_sentry"),
+    )
+
+
+@dataclass
+class BatchJobConfig:
+    dsn: str = field(default_factory=_default_dsn)
+    lookback_min: float = 15.0
+    partitions: int = 8
+    concurrency: int = 4
+    stride_sec: float = 5.0
+
+    @classmethod
+    def from_env(cls, **overrides) -> "BatchJobConfig":
+        fields = {
+            "lookback_min": float(os.getenv("OBD_BATCH_LOOKBACK_MIN", "15")),
+            "partitions": int(os.getenv("OBD_BATCH_PARTITIONS", "8")),
+            "concurrency": int(os.getenv("OBD_BATCH_CONCURRENCY", "4")),
+        }
+        fields.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**fields)
+
+    def validate(self):
+        if not 1 <= self.partitions <= MAX_PARTITIONS:
+            raise ValueError(f"partitions는 1~{MAX_PARTITIONS}이어야 합니다: {self.partitions}")
+        if timedelta(minutes=self.lookback_min) >= RETENTION:
+            raise ValueError(f"lookback({self.lookback_min}분)이 obd_logs 보존 기간({RETENTION})보다 깁니다.")
+
+
+# =============================================================================
+# 조회 (서버 집계 + 바이너리 COPY)
+# =============================================================================
+def source_expression(signal: str) -> str:
+    name = canonical_signal(signal)
+    if not _IDENTIFIER.match(name):
+        raise ValueError(f"신호명 형식 오류: {name}")
+    column = OBD_LOG_COLUMNS.get(name)
+    return f"l.{column}" if column else f"(l.json_extra->>'{name}')::float8"
+
+
+def build_fetch_query(signals: Sequence[str]) -> str:
+    """
+    파라미터: $1 bucket interval, $2 since, $3 until, $4 window interval, $5 partitions, $6 partition
+    행: (vehicles_id uuid, bucket timestamptz, 신호별 float8 ...) 고정 폭 (결측 평균은 NaN)
+    """
+    aggregates = ",\n       ".join(
+        f"COALESCE(avg({source_expression(s)}), 'NaN')::float8 AS s{j}" for j, s in enumerate(signals)
+    )
+    return f"""
+SELECT l.vehicles_id,
+       time_bucket($1::interval, l.time) AS bucket,
+       {aggregates}
+FROM obd_logs l
+LEFT JOIN obd_anomaly_watermarks w ON w.vehicles_id = l.vehicles_id
+WHERE l.time >= $2::timestamptz AND l.time < $3::timestamptz
+  AND (w.scored_until IS NULL OR l.time >= w.scored_until - $4::interval)
+  AND get_byte(uuid_send(l.vehicles_id), 15) % $5::int = $6::int
+GROUP BY l.vehicles_id, bucket
+ORDER BY l.vehicles_id, bucket
+"""
+
+
+def copy_row_dtype(num_signals: int) -> np.dtype:
+    """COPY BINARY 한 행 (필드 수 int16 + 필드마다 길이 int32 + 값, big-endian)"""
+    fields = [("nfields", ">i2"), ("len_vehicle", ">i4"), ("vehicle", "V16"), ("len_bucket", ">i4"), ("bucket", ">i8")]
+    for j in range(num_signals):
+        fields += [(f"len_s{j}", ">i4"), (f"s{j}", ">f8")]
+    return np.dtype(fields)
+
+
+def parse_copy_binary(buf: bytes, num_signals: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    COPY ... (FORMAT binary) 결과 → (vehicle UUID 바이트 (N,) V16, bucket epoch µs (N,) int64, 값 (N, F) float32)
+    """
+    if not buf.startswith(_COPY_SIGNATURE):
+        raise ValueError("COPY BINARY 시그니처가 아닙니다.")
+    ext_len = struct.unpack(">I", buf[15:19])[0]
+    body = memoryview(buf)[19 + ext_len:]
+    if bytes(body[-2:]) != b"\xff\xff":
+        raise ValueError("COPY BINARY 종료 표시가 없습니다.")
+    body = body[:-2]
+
+    dtype = copy_row_dtype(num_signals)
+    if len(body) % dtype.itemsize:
+        raise ValueError(f"행 길이가 고정 폭({dtype.itemsize}B)이 아닙니다. (NULL 필드 포함?)")
+    rows = np.frombuffer(body, dtype=dtype)
+    if rows.size and (rows["nfields"] != 2 + num_signals).any():
+        raise ValueError("필드 수가 조회 컬럼 수와 다릅니다.")
+
+    values = np.empty((rows.size, num_signals), dtype=np.float32)
+    for j in range(num_signals):
+        values[:, j] = rows[f"s{j}"]
+    return rows["vehicle"].copy(), rows["bucket"].astype(np.int64) + _PG_EPOCH_US, values
+
+
+def vehicle_groups(vehicles: np.ndarray) -> List[Tuple[int, int]]:
+    """차량 순으로 정렬된 행 → 차량별 [start, end)"""
+    if vehicles.size == 0:
+        return []
+    change = np.flatnonzero(vehicles[1:] != vehicles[:-1]) + 1
+    bounds = np.concatenate([[0], change, [vehicles.size]])
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+
+def _to_datetime(epoch_us: int) -> datetime:
+    return datetime(1970, 1, 1, tzinfo=timezone.utc) + timedelta(microseconds=int(epoch_us))
+
+
+def _to_epoch_us(value: datetime) -> int:
+    return (value - datetime(1970, 1, 1, tzinfo=timezone.utc)) // timedelta(microseconds=1)
+
+
+def severity_for(score: float, threshold: float) -> str:
+    ratio = score / max(threshold, 1e-12)
+    return next(level for bound, level in SEVERITY_RATIOS if ratio >= bound)
+
+
+# =============================================================================
+# 파티션 채점 (CPU)
+# =============================================================================
+@dataclass
+class PartitionResult:
+    vehicles: int = 0
+    rows: int = 0
+    windows: int = 0
+    skipped: int = 0                                   # 관측 비율 부족 (진행 위치는 넘김)
+    records: List[tuple] = field(default_factory=list)
+    watermarks: Dict[uuid.UUID, datetime] = field(default_factory=dict)
+
+
+class BatchScoringJob:
+    """
+    Usage:
+        job = BatchScoringJob(get_obd_anomaly_service(), BatchJobConfig.from_env())
+        stats = asyncio.run(job.run())
+    """
+
+    def __init__(self, service: ObdEngineAnomalyService, config: Optional[BatchJobConfig] = None):
+        self.service = service
+        self.spec = service.spec
+        self.config = config or BatchJobConfig.from_env()
+        self.config.validate()
+        self.align_config = AlignConfig.from_yaml(PREPROCESS_YAML, rate_hz=self.spec.sampling_hz)
+        self.window_us = int(round(self.spec.window_sec * 1e6))
+        self.stride_us = int(round(self.config.stride_sec * 1e6))
+        self.query = build_fetch_query(self.spec.signals)
+
+    def score_partition(self, buf: bytes, watermarks: Dict[uuid.UUID, int], origin_us: int, until_us: int) -> PartitionResult:
+        """
+        COPY 결과 → 차량별 정렬 / 윈도우 → 한 번의 배치 채점 → anomaly_records 행 + 새 진행 위치
+
+        Args:
+            watermarks: 차량별 scored_until (epoch µs)
+            origin_us: 격자 기준 시각 (stride 배수, 조회 시작 이전)
+            until_us: 이번 실행 상한 (stride 배수, 이 시각 이후에 끝나는 윈도우는 다음 실행에서)
+        """
+        vehicles, times_us, values = parse_copy_binary(buf, self.spec.num_signals)
+        result = PartitionResult(rows=int(times_us.size))
+        T = self.spec.window_len
+        windows, owners, ends, missing = [], [], [], []
+
+        for start, end in vehicle_groups(vehicles):
+            vehicle_id = uuid.UUID(bytes=vehicles[start].tobytes())
+            seconds = (times_us[start:end] - origin_us) / 1e6
+            aligned = align(Trip(seconds, values[start:end], list(self.spec.signals)), self.align_config)
+            starts, coverage, usable = aligned.windows(self.spec.window_sec, self.config.stride_sec, anchored=True)
+            if starts.size == 0:
+                continue
+            end_us = origin_us + np.round(aligned.grid[starts] * 1e6).astype(np.int64) + self.window_us
+            candidate = (end_us > watermarks.get(vehicle_id, -1)) & (end_us <= until_us)
+            if not candidate.any():
+                continue
+
+            result.vehicles += 1
+            result.skipped += int((candidate & ~usable).sum())
+            result.watermarks[vehicle_id] = _to_datetime(end_us[candidate].max())
+            for k in np.flatnonzero(candidate & usable):
+                windows.append(aligned.values[starts[k]:starts[k] + T])
+                owners.append(vehicle_id)
+                ends.append(int(end_us[k]))
+                missing.append(float(1.0 - coverage[k].mean()))
+
+        result.windows = len(windows)
+        if not windows:
+            return result
+
+        scores, signal_errors = self.service.engine.score(self.service.model_input(np.stack(windows)))
+        threshold = self.service.threshold
+        for k in np.flatnonzero(scores > threshold):
+            score = float(scores[k])
+            snapshot = {
+                "score": round(score, 6),
+                "threshold": threshold,
+                "window_start": _to_datetime(ends[k] - self.window_us).isoformat(),
+                "window_end": _to_datetime(ends[k]).isoformat(),
+                "missing_ratio": round(missing[k], 4),
+                "top_signals": [s.model_dump() for s in self.service._top_signals(signal_errors[k])],
+                "model_version": self.service.model_version,
+            }
+            result.records.append((
+                owners[k],
+                _to_datetime(ends[k]).replace(tzinfo=None),     # recorded_at TIMESTAMP (UTC)
+                ANOMALY_TYPE,
+                severity_for(score, threshold),
+                json.dumps(snapshot, ensure_ascii=False),
+            ))
+        return result
+
+    # -------------------------------------------------------------------------
+    # DB (asyncpg)
+    # -------------------------------------------------------------------------
+    async def _run_partition(self, pool, part: int, since: datetime, until: datetime, origin_us: int) -> PartitionResult:
+        bucket = timedelta(seconds=1.0 / self.spec.sampling_hz)
+        window = timedelta(seconds=self.spec.window_sec)
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT vehicles_id, scored_until FROM obd_anomaly_watermarks "
+                "WHERE get_byte(uuid_send(vehicles_id), 15) % $1::int = $2::int",
+                self.config.partitions, part,
+            )
+            watermarks = {uuid.UUID(str(r["vehicles_id"])): _to_epoch_us(r["scored_until"]) for r in rows}
+
+            chunks: List[bytes] = []
+
+            async def sink(chunk: bytes):
+                chunks.append(chunk)
+
+            await conn.copy_from_query(
+                self.query, bucket, since, until, window, self.config.partitions, part,
+                output=sink, format="binary",
+            )
+
+        # 정렬 + forward는 스레드에서 (다른 파티션의 조회/저장과 겹침, 엔진은 자체 lock으로 직렬화)
+        result = await asyncio.to_thread(
+            self.score_partition, b"".join(chunks), watermarks, origin_us, _to_epoch_us(until)
+        )
+
+        if result.watermarks:
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    if result.records:
+                        await conn.copy_records_to_table("anomaly_records", records=result.records, columns=RECORD_COLUMNS)
+                    await conn.execute(WATERMARK_UPSERT, list(result.watermarks), list(result.watermarks.values()))
+        return result
+
+    async def run(self, pool=None) -> Dict[str, float]:
+        """전체 파티션 1회 채점 (pool 미지정 시 config.dsn으로 생성)"""
+        import asyncpg
+
+        start = time.perf_counter()
+        own_pool = pool is None
+        if own_pool:
+            pool = await asyncpg.create_pool(self.config.dsn, min_size=1, max_size=self.config.concurrency)
+        try:
+            async with pool.acquire() as conn:
+                await conn.execute(WATERMARK_DDL)
+                now = await conn.fetchval("SELECT NOW()")
+
+            # 상한은 stride 배수로 내림 (진행 중인 마지막 버킷 / 윈도우는 다음 실행에서)
+            until_us = _to_epoch_us(now) // self.stride_us * self.stride_us
+            since_us = until_us - int(self.config.lookback_min * 60e6)
+            origin_us = since_us // self.stride_us * self.stride_us
+            until, since = _to_datetime(until_us), _to_datetime(since_us)
+
+            semaphore = asyncio.Semaphore(self.config.concurrency)
+
+            async def run_one(part: int) -> PartitionResult:
+                async with semaphore:
+                    return await self._run_partition(pool, part, since, until, origin_us)
+
+            results = await asyncio.gather(*(run_one(p) for p in range(self.config.partitions)))
+        finally:
+            if own_pool:
+                await pool.close()
+
+        stats = {
+            "partitions": self.config.partitions,
+            "vehicles": sum(r.vehicles for r in results),
+            "rows": sum(r.rows for r in results),
+            "windows": sum(r.windows for r in results),
+            "skipped_windows": sum(r.skipped for r in results),
+            "anomalies": sum(len(r.records) for r in results),
+            "until": until.isoformat(),
+            "elapsed_sec": round(time.perf_counter() - start, 2),
+        }
+        print(f"[OBD Batch] {stats}")
+        return stats
@@ -0,0 +1,12 @@
+# ai/app/services/obd_engine_anomaly/extensions/__init__.py
+"""
+OBD 확장 진단 규칙 모음 (규칙은 각 *_rules.py의 RULES에 데이터로 선언, 평가는 rule_engine.RuleEngine)
+"""
+from ai.app.services.obd_engine_anomaly.extensions import brake_rules, electrical_rules, idle_rules, tire_rules
+
+EXTENSION_RULES = {
+    "electrical": electrical_rules.RULES,
+    "brake": brake_rules.RULES,
+    "tire": tire_rules.RULES,
+    "idle": idle_rules.RULES,
+}
@@ -0,0 +1,50 @@
+# ai/app/services/obd_engine_anomaly/extensions/brake_rules.py
+"""
+제동(brake) 확장 진단 규칙
+
+제동 압력, ABS 작동 여부, 네 바퀴 속도 편차(제동 중 잠김 / 쏠림)를 봅니다.
+"""
+
+WHEEL_SPEEDS = ["wheel_speed_fl_kmh", "wheel_speed_fr_kmh", "wheel_speed_rl_kmh", "wheel_speed_rr_kmh"]
+BRAKING = [{"signal": "brake_pressure_kpa", "op": ">", "value": 1000}]
+
+RULES = [
+    {
+        "id": "abs_long_activation",
+        "signals": ["abs_active"],
+        "op": ">=", "value": 1,
+        "duration_sec": 3,
+        "when": [{"signal": "vehicle_speed_kmh", "op": ">", "value": 10}],
+        "severity": "WARNING",
+        "message": "ABS가 장시간 작동했습니다. (노면 / 휠 속도 센서 점검)",
+    },
+    {
+        "id": "wheel_lock_suspected",
+        "signals": WHEEL_SPEEDS,
+        "reduce": "spread",
+        "op": ">", "value": 15,
+        "duration_sec": 1,
+        "when": BRAKING + [{"signal": "vehicle_speed_kmh", "op": ">", "value": 20}],
+        "severity": "WARNING",
+        "message": "제동 중 바퀴 속도 편차가 큽니다. (바퀴 잠김 / 제동력 불균형 의심)",
+    },
+    {
+        "id": "brake_pressure_spike",
+        "signals": ["brake_pressure_kpa"],
+        "transform": "delta", "window_sec": 0.5,
+        "op": ">", "value": 6000,
+        "duration_sec": 0.1,
+        "severity": "INFO",
+        "message": "급제동이 감지되었습니다.",
+    },
+    {
+        "id": "brake_drag",
+        "signals": ["brake_pressure_kpa"],
+        "op": ">", "value": 500,
+        "duration_sec": 30,
+        "when": [{"signal": "vehicle_speed_kmh", "op": ">", "value": 40},
+                 {"signal": "throttle_pos_pct", "op": ">", "value": 20}],
+        "severity": "WARNING",
+        "message": "가속 중에도 제동 압력이 유지됩니다. (캘리퍼 고착 / 브레이크 끌림 의심)",
+    },
+]
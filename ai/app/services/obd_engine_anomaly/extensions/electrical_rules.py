@@ -0,0 +1,46 @@
+# ai/app/services/obd_engine_anomaly/extensions/electrical_rules.py
+"""
+전기(electrical) 확장 진단 규칙
+
+시동 상태(engine_rpm > 600)의 배터리 전압으로 충전 계통(발전기 / 레귤레이터)을 봅니다.
+"""
+
+RUNNING = [{"signal": "engine_rpm", "op": ">", "value": 600}]
+
+RULES = [
+    {
+        "id": "charging_voltage_low",
+        "signals": ["battery_voltage_v"],
+        "op": "<", "value": 13.0,
+        "duration_sec": 10,
+        "when": RUNNING,
+        "severity": "WARNING",
+        "message": "주행 중 충전 전압이 낮습니다. (발전기 / 벨트 점검)",
+    },
+    {
+        "id": "voltage_critical_low",
+        "signals": ["battery_voltage_v"],
+        "op": "<", "value": 11.8,
+        "duration_sec": 5,
+        "severity": "CRITICAL",
+        "message": "배터리 전압이 매우 낮습니다. (방전 / 배터리 교체 필요)",
+    },
+    {
+        "id": "over_voltage",
+        "signals": ["battery_voltage_v"],
+        "op": ">", "value": 15.0,
+        "duration_sec": 2,
+        "severity": "CRITICAL",
+        "message": "과충전 전압입니다. (레귤레이터 점검)",
+    },
+    {
+        "id": "voltage_unstable",
+        "signals": ["battery_voltage_v"],
+        "transform": "rolling_std", "window_sec": 5,
+        "op": ">", "value": 0.4,
+        "duration_sec": 5,
+        "when": RUNNING,
+        "severity": "WARNING",
+        "message": "충전 전압 변동이 큽니다. (접지 / 단자 접촉 점검)",
+    },
+]
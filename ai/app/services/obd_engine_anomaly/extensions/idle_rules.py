@@ -0,0 +1,52 @@
+# ai/app/services/obd_engine_anomaly/extensions/idle_rules.py
+"""
+공회전(idle) 확장 진단 규칙
+
+정차(vehicle_speed_kmh < 1) + 시동 상태(engine_rpm > 300)에서의 RPM 수준과 안정성을 봅니다.
+기본 수집 신호(feature_engine_common.json)만 사용하므로 현재 OBD 데이터로 바로 평가됩니다.
+"""
+
+STOPPED = [
+    {"signal": "vehicle_speed_kmh", "op": "<", "value": 1},
+    {"signal": "engine_rpm", "op": ">", "value": 300},
+]
+
+RULES = [
+    {
+        "id": "idle_rpm_high",
+        "signals": ["engine_rpm"],
+        "op": ">", "value": 1100,
+        "duration_sec": 20,
+        "when": STOPPED + [{"signal": "engine_coolant_temp_c", "op": ">=", "value": 70}],
+        "severity": "WARNING",
+        "message": "난기 후 공회전 RPM이 높습니다. (스로틀 바디 / 흡기 누설 점검)",
+    },
+    {
+        "id": "idle_rpm_low",
+        "signals": ["engine_rpm"],
+        "op": "<", "value": 550,
+        "duration_sec": 3,
+        "when": STOPPED,
+        "severity": "WARNING",
+        "message": "공회전 RPM이 낮습니다. (시동 꺼짐 위험)",
+    },
+    {
+        "id": "idle_rpm_unstable",
+        "signals": ["engine_rpm"],
+        "transform": "rolling_std", "window_sec": 5,
+        "op": ">", "value": 80,
+        "duration_sec": 10,
+        "when": STOPPED,
+        "severity": "WARNING",
+        "message": "공회전 RPM 변동이 큽니다. (점화 / 연료 계통 점검)",
+    },
+    {
+        "id": "long_idle",
+        "signals": ["vehicle_speed_kmh"],
+        "op": "<", "value": 1,
+        "duration_sec": 50,
+        "when": STOPPED,
+        "severity": "INFO",
+        "message": "장시간 공회전 중입니다.",
+    },
+]
@@ -0,0 +1,270 @@
+# ai/app/services/obd_engine_anomaly/extensions/rule_engine.py
+"""
+OBD 확장 진단 규칙 엔진 (Extensions Rule Engine)
+
+[역할]
+전기(electrical) / 제동(brake) / 타이어(tire) / 공회전(idle) 확장 진단은 각 *_rules.py에
+규칙을 "데이터"(dict)로만 선언하고, 이 엔진이 전체 규칙을 한 번에 컴파일하여
+윈도우 배열 (W, T, F)에 대해 벡터 연산으로 평가합니다.
+
+[규칙 형식]
+{
+    "id": "idle_rpm_high",
+    "signals": ["engine_rpm"],              # 대상 신호 (여러 개면 reduce로 하나의 시계열로 합침)
+    "transform": "value",                   # value | rolling_mean | rolling_std | delta (window_sec 구간)
+    "window_sec": 5,                        # rolling_* / delta 구간 (초)
+    "reduce": None,                         # 신호 여러 개: min | max | mean | spread(max - min)
+    "op": ">", "value": 1100,               # 비교 (>, >=, <, <=)
+    "duration_sec": 20,                     # 조건이 연속으로 유지되어야 하는 시간
+    "when": [{"signal": "vehicle_speed_kmh", "op": "<", "value": 1}],   # 전제 조건 (샘플 단위 AND)
+    "severity": "WARNING",                  # INFO | WARNING | CRITICAL
+    "message": "...",
+}
+
+[평가 순서]
+1. 파생 시계열: 규칙마다 (W, T) 시계열을 만듦 (rolling 통계는 누적합으로 윈도우 길이와 무관한 비용)
+2. 비교 + 전제 조건 + 지속 시간: 전체 규칙을 (R, W, T)로 쌓아 한 번에 계산
+   (연속 구간 길이 = 현재 위치 - 마지막으로 조건이 깨진 위치, maximum.accumulate)
+3. 신호 가용성: 윈도우별로 규칙이 필요로 하는 신호가 모두 있는지 (W, F) @ (F, R) 한 번의 행렬곱
+   → 필요한 신호가 없는 규칙은 그 윈도우에서 건너뜀 (확장의 모든 규칙이 건너뛰어지면 SKIPPED)
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ai.app.services.obd_engine_anomaly.feature_registry import canonical_signal
+
+SEVERITY_ORDER = {"INFO": 1, "WARNING": 2, "CRITICAL": 3}
+TRANSFORMS = ("value", "rolling_mean", "rolling_std", "delta")
+REDUCERS = ("min", "max", "mean", "spread")
+_OPS = {">": (1.0, True), ">=": (1.0, False), "<": (-1.0, True), "<=": (-1.0, False)}  # (부호, strict)
+
+
+@dataclass(frozen=True)
+class CompiledRule:
+    extension: str
+    id: str
+    signals: tuple
+    transform: str
+    window_len: int
+    reduce: Optional[str]
+    sign: float
+    strict: bool
+    value: float
+    duration_len: int
+    when: tuple             # ((signal, sign, strict, value), ...)
+    severity: str
+    message: str
+
+    @property
+    def required(self) -> set:
+        return set(self.signals) | {w[0] for w in self.when}
+
+
+def compile_rule(extension: str, rule: Dict, sampling_hz: float) -> CompiledRule:
+    transform = rule.get("transform", "value")
+    reduce = rule.get("reduce")
+    if transform not in TRANSFORMS:
+        raise ValueError(f"[{extension}/{rule.get('id')}] 지원하지 않는 transform: {transform}")
+    if reduce is not None and reduce not in REDUCERS:
+        raise ValueError(f"[{extension}/{rule.get('id')}] 지원하지 않는 reduce: {reduce}")
+    signals = tuple(canonical_signal(s) for s in rule["signals"])
+    if len(signals) > 1 and reduce is None:
+        raise ValueError(f"[{extension}/{rule['id']}] 신호가 여러 개면 reduce가 필요합니다.")
+    if rule["op"] not in _OPS or rule.get("severity", "WARNING") not in SEVERITY_ORDER:
+        raise ValueError(f"[{extension}/{rule['id']}] op/severity 오류: {rule['op']}, {rule.get('severity')}")
+
+    when = []
+    for cond in rule.get("when", []):
+        sign, strict = _OPS[cond["op"]]
+        when.append((canonical_signal(cond["signal"]), sign, strict, float(cond["value"])))
+    sign, strict = _OPS[rule["op"]]
+    return CompiledRule(
+        extension=extension,
+        id=rule["id"],
+        signals=signals,
+        transform=transform,
+        window_len=max(1, int(round(rule.get("window_sec", 0) * sampling_hz))),
+        reduce=reduce,
+        sign=sign,
+        strict=strict,
+        value=float(rule["value"]),
+        duration_len=max(1, int(round(rule.get("duration_sec", 0) * sampling_hz))),
+        when=tuple(when),
+        severity=rule.get("severity", "WARNING"),
+        message=rule.get("message", rule["id"]),
+    )
+
+
+def _compare(x: np.ndarray, sign, strict, value) -> np.ndarray:
+    diff = (x - value) * sign
+    return np.where(strict, diff > 0, diff >= 0)
+
+
+# =============================================================================
+# 엔진
+# =============================================================================
+class RuleEngine:
+    """
+    Usage:
+        engine = RuleEngine.from_extensions(sampling_hz=10.0)
+        result = engine.evaluate(windows, signals)     # windows: (W, T, F), signals: F개 신호명
+        extensions = engine.summarize(result, i)       # {"brake": {...}, "tire": {...}, ...}
+    """
+
+    def __init__(self, rules: Dict[str, Sequence[Dict]], sampling_hz: float = 10.0):
+        self.sampling_hz = sampling_hz
+        self.extensions: List[str] = list(rules)
+        self.rules: List[CompiledRule] = [
+            compile_rule(ext, rule, sampling_hz) for ext, ext_rules in rules.items() for rule in ext_rules
+        ]
+        ids = [f"{r.extension}/{r.id}" for r in self.rules]
+        if len(set(ids)) != len(ids):
+            raise ValueError("규칙 id가 중복됩니다.")
+        self.required_signals = sorted({s for r in self.rules for s in r.required})
+
+    @classmethod
+    def from_extensions(cls, sampling_hz: float = 10.0) -> "RuleEngine":
+        from ai.app.services.obd_engine_anomaly.extensions import EXTENSION_RULES
+        return cls(EXTENSION_RULES, sampling_hz)
+
+    # -------------------------------------------------------------------------
+    # 파생 시계열
+    # -------------------------------------------------------------------------
+    @staticmethod
+    def _rolling(x: np.ndarray, k: int, kind: str) -> np.ndarray:
+        """(W, T, S) → (W, T, S), 앞쪽 구간이 차지 않았거나 구간에 NaN(패딩)이 있는 샘플은 NaN"""
+        W, T, S = x.shape
+        out = np.full((W, T, S), np.nan, dtype=np.float32)
+        if k >= T:
+            return out
+        if kind == "delta":
+            out[:, k:] = x[:, k:] - x[:, :-k]
+            return out
+        nan = np.isnan(x)
+        x64 = np.where(nan, 0.0, x.astype(np.float64))  # 누적합에 NaN이 번지지 않도록 0으로 두고 구간 결측 수로 가림
+        cs = np.zeros((W, T + 1, S))
+        np.cumsum(nan, axis=1, out=cs[:, 1:])
+        gap = (cs[:, k:] - cs[:, :-k]) > 0
+        np.cumsum(x64, axis=1, out=cs[:, 1:])
+        mean = (cs[:, k:] - cs[:, :-k]) / k
+        if kind == "rolling_mean":
+            out[:, k - 1:] = mean
+        else:
+            np.cumsum(x64 ** 2, axis=1, out=cs[:, 1:])
+            out[:, k - 1:] = np.sqrt(np.maximum((cs[:, k:] - cs[:, :-k]) / k - mean ** 2, 0.0))
+        out[:, k - 1:][gap] = np.nan
+        return out
+
+    def _series(self, x: np.ndarray, index: Dict[str, int], rules: List[int]) -> np.ndarray:
+        """규칙별 파생 시계열 (R_active, W, T)"""
+        W, T, _ = x.shape
+        series = np.empty((len(rules), W, T), dtype=np.float32)
+
+        # 같은 (transform, 구간)을 쓰는 규칙의 신호를 모아 한 번에 계산
+        groups: Dict[tuple, List[int]] = {}
+        for r in rules:
+            rule = self.rules[r]
+            if rule.transform != "value":
+                cols = groups.setdefault((rule.transform, rule.window_len), [])
+                cols.extend(index[s] for s in rule.signals if index[s] not in cols)
+        derived = {key: (cols, self._rolling(x[:, :, cols], key[1], key[0])) for key, cols in groups.items()}
+
+        for k, r in enumerate(rules):
+            rule = self.rules[r]
+            if rule.transform == "value":
+                values = x[:, :, [index[s] for s in rule.signals]]
+            else:
+                cols, arr = derived[(rule.transform, rule.window_len)]
+                values = arr[:, :, [cols.index(index[s]) for s in rule.signals]]
+            if rule.reduce is None:
+                series[k] = values[:, :, 0]
+            elif rule.reduce == "spread":
+                series[k] = values.max(axis=2) - values.min(axis=2)
+            else:
+                series[k] = getattr(values, rule.reduce)(axis=2)
+        return series
+
+    # -------------------------------------------------------------------------
+    # 평가
+    # -------------------------------------------------------------------------
+    def evaluate(self, windows: np.ndarray, signals: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Args:
+            windows: (W, T, F) 원본 단위 (결측은 앞값으로 채운 상태, 짧은 윈도우 앞쪽 / 신호 전체가 없으면 NaN)
+            signals: F개 신호명 (짧은 이름 rpm 등도 허용)
+        Returns:
+            {"fired": (W, R) bool, "longest_sec": (W, R), "available": (W, R) bool}
+        """
+        windows = np.asarray(windows, dtype=np.float32)
+        W, T, F = windows.shape
+        index = {canonical_signal(s): j for j, s in enumerate(signals)}
+        R = len(self.rules)
+
+        # 신호 가용성 (윈도우 안에 값이 하나라도 있는 신호) → 규칙별 필요 신호 충족 여부
+        present = np.zeros((W, len(self.required_signals)), dtype=np.int32)
+        need = np.zeros((len(self.required_signals), R), dtype=np.int32)
+        for i, name in enumerate(self.required_signals):
+            if name in index:
+                present[:, i] = ~np.isnan(windows[:, :, index[name]]).all(axis=1)
+        for r, rule in enumerate(self.rules):
+            for name in rule.required:
+                need[self.required_signals.index(name), r] = 1
+        available = (present @ need) == need.sum(axis=0)
+
+        fired = np.zeros((W, R), dtype=bool)
+        longest = np.zeros((W, R), dtype=np.int64)
+        active = [r for r in range(R) if available[:, r].any()]  # 어떤 윈도우에서도 못 쓰는 규칙은 계산하지 않음
+        if active and T:
+            series = self._series(windows, index, active)
+            rules = [self.rules[r] for r in active]
+            shape = (len(active), 1, 1)
+            cond = _compare(
+                series,
+                np.array([r.sign for r in rules]).reshape(shape),
+                np.array([r.strict for r in rules]).reshape(shape),
+                np.array([r.value for r in rules], dtype=np.float32).reshape(shape),
+            )
+
+            # 전제 조건: 같은 조건은 한 번만 계산 (예: 정차 + 시동 상태를 여러 규칙이 공유)
+            masks: Dict[tuple, np.ndarray] = {}
+            for k, rule in enumerate(rules):
+                for key in rule.when:
+                    if key not in masks:
+                        masks[key] = _compare(windows[:, :, index[key[0]]], *key[1:])
+                    cond[k] &= masks[key]
+
+            # 최장 연속 구간 길이 (활성 규칙 전체를 한 번에)
+            pos = np.arange(T, dtype=np.int16 if T < 2**15 else np.int32)
+            last_break = np.maximum.accumulate(np.where(cond, np.int16(-1), pos), axis=2)
+            run = (pos - last_break).max(axis=2)  # (R_active, W)
+            longest[:, active] = run.T
+            durations = np.array([r.duration_len for r in rules])
+            fired[:, active] = run.T >= durations
+        fired &= available
+        return {"fired": fired, "longest_sec": longest / self.sampling_hz, "available": available}
+
+    def summarize(self, result: Dict[str, np.ndarray], i: int) -> Dict[str, Dict]:
+        """윈도우 i의 확장별 결과 {"status", "triggered", "skipped_rules"}"""
+        summary = {ext: {"status": "NORMAL", "triggered": [], "skipped_rules": []} for ext in self.extensions}
+        evaluated = {ext: 0 for ext in self.extensions}
+        for r, rule in enumerate(self.rules):
+            entry = summary[rule.extension]
+            if not result["available"][i, r]:
+                entry["skipped_rules"].append(rule.id)
+                continue
+            evaluated[rule.extension] += 1
+            if result["fired"][i, r]:
+                entry["triggered"].append({
+                    "rule": rule.id,
+                    "severity": rule.severity,
+                    "message": rule.message,
+                    "duration_sec": round(float(result["longest_sec"][i, r]), 1),
+                })
+                if SEVERITY_ORDER[rule.severity] > SEVERITY_ORDER.get(entry["status"], 0):
+                    entry["status"] = rule.severity
+        for ext, entry in summary.items():
+            if evaluated[ext] == 0:
+                entry["status"] = "SKIPPED"
+        return summary
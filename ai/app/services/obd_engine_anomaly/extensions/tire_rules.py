@@ -0,0 +1,60 @@
+# ai/app/services/obd_engine_anomaly/extensions/tire_rules.py
+"""
+타이어(tire) 확장 진단 규칙
+
+네 바퀴 공기압의 절대 수준, 바퀴 간 편차, 짧은 시간 내 저하(펑크), 주행 중 바퀴 속도 편차를 봅니다.
+"""
+
+TIRE_PRESSURES = ["tire_pressure_fl_kpa", "tire_pressure_fr_kpa", "tire_pressure_rl_kpa", "tire_pressure_rr_kpa"]
+WHEEL_SPEEDS = ["wheel_speed_fl_kmh", "wheel_speed_fr_kmh", "wheel_speed_rl_kmh", "wheel_speed_rr_kmh"]
+
+RULES = [
+    {
+        "id": "pressure_low",
+        "signals": TIRE_PRESSURES,
+        "reduce": "min",
+        "op": "<", "value": 180,
+        "duration_sec": 10,
+        "severity": "WARNING",
+        "message": "공기압이 낮은 타이어가 있습니다.",
+    },
+    {
+        "id": "pressure_critical",
+        "signals": TIRE_PRESSURES,
+        "reduce": "min",
+        "op": "<", "value": 140,
+        "duration_sec": 5,
+        "severity": "CRITICAL",
+        "message": "공기압이 매우 낮은 타이어가 있습니다. (즉시 점검)",
+    },
+    {
+        "id": "pressure_imbalance",
+        "signals": TIRE_PRESSURES,
+        "reduce": "spread",
+        "op": ">", "value": 30,
+        "duration_sec": 10,
+        "severity": "WARNING",
+        "message": "타이어 간 공기압 편차가 큽니다.",
+    },
+    {
+        "id": "pressure_drop",
+        "signals": TIRE_PRESSURES,
+        "transform": "delta", "window_sec": 30,
+        "reduce": "min",
+        "op": "<", "value": -20,
+        "duration_sec": 1,
+        "severity": "CRITICAL",
+        "message": "30초 안에 공기압이 급격히 떨어졌습니다. (펑크 의심)",
+    },
+    {
+        "id": "wheel_speed_mismatch",
+        "signals": WHEEL_SPEEDS,
+        "reduce": "spread",
+        "op": ">", "value": 8,
+        "duration_sec": 5,
+        "when": [{"signal": "vehicle_speed_kmh", "op": ">", "value": 30},
+                 {"signal": "brake_pressure_kpa", "op": "<", "value": 300}],
+        "severity": "WARNING",
+        "message": "정속 주행 중 바퀴 속도 편차가 큽니다. (공기압 / 마모 차이 의심)",
+    },
+]
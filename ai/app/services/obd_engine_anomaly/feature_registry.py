@@ -0,0 +1,136 @@
+# ai/app/services/obd_engine_anomaly/feature_registry.py
+"""
+OBD 이상 탐지 입력 명세 (Feature Registry)
+
+[역할]
+모델이 기대하는 신호 순서, 샘플링 주기, 윈도우 길이를 한 곳에서 정의합니다.
+학습 데이터셋 생성 시 저장한 meta.json을 그대로 읽어, 서빙 입력이 학습과 어긋나지 않게 합니다.
+
+[meta.json 주요 필드]
+signals, sampling_hz, window_sec, T(=window_sec * sampling_hz), F(=len(signals))
+
+[버전]
+feature_version: 모델 입력 신호 + 신호가 속한 수집 목록(feature_engine_common.json / feature_engine_full.json)의 해시
+→ scaler.json에 함께 기록하고, 서빙 로드 시 현재 목록과 다르면 거부합니다. (목록이 바뀌면 재학습 필요)
+registry_version: feature_version + 정규화 통계(scaler) → 모델 버전 문자열에 붙임
+"""
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+DEFAULT_SIGNALS: Tuple[str, ...] = ("rpm", "speed", "coolant", "map")
+
+# LSTM-AE / 서빙에서 쓰는 짧은 이름 → 표준 신호명 (ai/config/obd/feature_engine_*.json)
+SIGNAL_ALIASES: Dict[str, str] = {
+    "rpm": "engine_rpm",
+    "speed": "vehicle_speed_kmh",
+    "coolant": "engine_coolant_temp_c",
+    "map": "imap_kpa",
+}
+
+
+FEATURE_CONFIG_DIR = os.path.join("ai", "config", "obd")
+FEATURE_SETS: Tuple[str, ...] = ("common", "full")   # 기본 수집 → 확장 수집 순서
+
+
+def canonical_signal(name: str) -> str:
+    return SIGNAL_ALIASES.get(name, name)
+
+
+# =============================================================================
+# 수집 목록 + 버전
+# =============================================================================
+@lru_cache(maxsize=None)
+def load_feature_sets(config_dir: str = FEATURE_CONFIG_DIR) -> Dict[str, Tuple[str, ...]]:
+    """{"common": (...), "full": (...)} (ai/config/obd/feature_engine_{name}.json)"""
+    sets = {}
+    for name in FEATURE_SETS:
+        with open(os.path.join(config_dir, f"feature_engine_{name}.json"), "r", encoding="utf-8") as f:
+            sets[name] = tuple(json.load(f)["features"])
+    return sets
+
+
+def feature_set_for(signals: Sequence[str], config_dir: str = FEATURE_CONFIG_DIR) -> str:
+    """신호를 모두 포함하는 가장 작은 수집 목록 이름"""
+    names = {canonical_signal(s) for s in signals}
+    for set_name, features in load_feature_sets(config_dir).items():
+        if names <= set(features):
+            return set_name
+    raise ValueError(f"수집 목록(feature_engine_*.json)에 없는 신호: {sorted(names - set(load_feature_sets(config_dir)['full']))}")
+
+
+def _digest(payload: Dict) -> str:
+    return hashlib.sha1(json.dumps(payload, sort_keys=True).encode()).hexdigest()[:12]
+
+
+def feature_version(signals: Sequence[str], config_dir: str = FEATURE_CONFIG_DIR) -> str:
+    set_name = feature_set_for(signals, config_dir)
+    return _digest({
+        "signals": [canonical_signal(s) for s in signals],
+        "feature_set": set_name,
+        "features": list(load_feature_sets(config_dir)[set_name]),
+    })
+
+
+def registry_version(signals: Sequence[str], mean: Sequence[float], std: Sequence[float],
+                     config_dir: str = FEATURE_CONFIG_DIR) -> str:
+    """feature_version + 정규화 통계 (통계만 다시 맞춰도 버전이 바뀜)"""
+    return _digest({
+        "feature_version": feature_version(signals, config_dir),
+        "mean": [round(float(v), 6) for v in mean],
+        "std": [round(float(v), 6) for v in std],
+    })
+
+
+@dataclass(frozen=True)
+class FeatureSpec:
+    signals: Tuple[str, ...] = DEFAULT_SIGNALS
+    sampling_hz: float = 10.0
+    window_sec: int = 60
+    threshold: Optional[float] = None   # 학습 시 보정한 이상 판정 임계값 (없으면 서비스 기본값)
+    registry_version: Optional[str] = None   # 학습에 쓴 scaler 통계 버전 (meta.json, 없으면 검사 생략)
+
+    @property
+    def window_len(self) -> int:
+        return int(round(self.window_sec * self.sampling_hz))
+
+    @property
+    def num_signals(self) -> int:
+        return len(self.signals)
+
+
+def load_feature_spec(meta_path: str) -> FeatureSpec:
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    spec = FeatureSpec(
+        signals=tuple(meta["signals"]),
+        sampling_hz=float(meta["sampling_hz"]),
+        window_sec=int(meta["window_sec"]),
+        threshold=meta.get("threshold"),
+        registry_version=meta.get("registry_version"),
+    )
+    if meta.get("T") not in (None, spec.window_len):
+        raise ValueError(f"meta.json T({meta['T']})가 window_sec x sampling_hz({spec.window_len})와 다릅니다.")
+    return spec
+
+
+def check_scaler(spec: FeatureSpec, scaler) -> None:
+    """scaler.json 신호 / feature_version이 현재 수집 목록 기준 모델 입력과 같은지, 통계가 학습 때와 같은지 (다르면 ValueError)"""
+    if tuple(scaler.signals) != tuple(spec.signals):
+        raise ValueError(f"scaler 신호 순서 {scaler.signals}가 모델 입력 {spec.signals}와 다릅니다.")
+    expected = feature_version(spec.signals)
+    if scaler.feature_version is not None and scaler.feature_version != expected:
+        raise ValueError(
+            f"scaler feature_version({scaler.feature_version})이 현재 수집 목록({expected})과 다릅니다. "
+            "feature_engine_*.json이 바뀌었으면 데이터셋/모델을 다시 만드세요."
+        )
+    if spec.registry_version is not None:
+        actual = registry_version(scaler.signals, scaler.mean, scaler.std)
+        if actual != spec.registry_version:
+            raise ValueError(
+                f"scaler 통계({actual})가 모델 학습 때 쓴 통계({spec.registry_version})와 다릅니다. "
+                "학습 데이터셋의 scaler.json을 사용하거나 모델을 다시 학습하세요."
+            )
@@ -0,0 +1,177 @@
+# ai/app/services/obd_engine_anomaly/lstm_ae_core.py
+"""
+LSTM Autoencoder 모델 정의 + 배치 추론 엔진 (OBD 엔진 이상 탐지 Core)
+
+[역할]
+1. 모델 정의: 학습 스크립트(ai/scripts/obd_engine/train_lstm_ae.py)와 서빙이 같은 LSTMAutoencoder를 사용합니다.
+2. 배치 추론: 60초 윈도우 여러 개를 한 번의 forward로 재구성하고,
+   윈도우별 재구성 오차(score)와 신호별 오차(top_signals 계산용)를 반환합니다.
+
+[최적화]
+- 모델은 프로세스당 한 번만 로드하고 TorchScript(script → freeze → optimize_for_inference)로 컴파일합니다.
+  (컴파일이 실패하면 eager 모델로 동작)
+- 오차 계산(제곱 → 시간축 평균)까지 같은 inference_mode 블록에서 텐서 연산으로 처리하여
+  재구성 결과 (B, T, F) 전체를 numpy로 복사하지 않습니다.
+- max_batch보다 많은 윈도우는 나눠서 forward (메모리 상한)
+- scaler를 넘기면 정규화를 모델에 합쳐(fold_normalization) 컴파일합니다.
+  입력 (x - mean) / std → encoder 첫 층 입력 가중치/편향, 출력 역정규화 → 출력층
+  → 서빙 입력은 원본 단위 그대로, 재구성 오차는 신호별 (1 / std^2)만 곱해 정규화 공간 오차와 같게 맞춤
+
+[가중치]
+ai/weights/lstm_ae_v0.pt (state_dict, 학습 스크립트 출력)
+"""
+import copy
+import threading
+import time
+import warnings
+from typing import Optional, Tuple
+
+import numpy as np
+import torch
+import torch.nn as nn
+
+
+# =============================================================================
+# 모델 정의
+# =============================================================================
+class LSTMAutoencoder(nn.Module):
+    def __init__(self, input_dim: int, hidden_dim: int = 64, latent_dim: int = 16, num_layers: int = 1):
+        super().__init__()
+        self.encoder = nn.LSTM(input_dim, hidden_dim, num_layers, batch_first=True)
+        self.to_latent = nn.Linear(hidden_dim, latent_dim)
+
+        self.from_latent = nn.Linear(latent_dim, hidden_dim)
+        self.decoder = nn.LSTM(hidden_dim, hidden_dim, num_layers, batch_first=True)
+        self.out = nn.Linear(hidden_dim, input_dim)
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        enc_out, _ = self.encoder(x)
+        h_last = enc_out[:, -1, :]
+        z = self.to_latent(h_last)
+
+        h = self.from_latent(z).unsqueeze(1).repeat(1, x.size(1), 1)
+        dec_out, _ = self.decoder(h)
+        return self.out(dec_out)
+
+
+def fold_normalization(model: LSTMAutoencoder, mean: np.ndarray, std: np.ndarray) -> LSTMAutoencoder:
+    """
+    정규화를 합친 모델 복사본 (원본 단위 입력 → 원본 단위 재구성)
+
+    encoder: W·((x - m) / s) + b = (W / s)·x + (b - W·(m / s))
+    out:     y·s + m = (s ⊙ W_out)·h + (s ⊙ b_out + m)
+    """
+    fused = copy.deepcopy(model).cpu()
+    mean = torch.as_tensor(np.asarray(mean, dtype=np.float32))
+    std = torch.as_tensor(np.asarray(std, dtype=np.float32))
+    with torch.no_grad():
+        w_ih = fused.encoder.weight_ih_l0
+        fused.encoder.bias_ih_l0.sub_(w_ih @ (mean / std))
+        w_ih.div_(std)
+        fused.out.weight.mul_(std[:, None])
+        fused.out.bias.mul_(std).add_(mean)
+    return fused
+
+
+# =============================================================================
+# 배치 추론 엔진
+# =============================================================================
+class LSTMAEEngine:
+    def __init__(
+        self,
+        model: LSTMAutoencoder,
+        window_len: int,
+        device: str = "cpu",
+        max_batch: int = 64,
+        compile: bool = True,
+        scaler=None
+    ):
+        self.device = torch.device(device)
+        self.window_len = window_len
+        self.input_dim = model.out.out_features
+        self.max_batch = max_batch
+        self.compiled = False
+        self._lock = threading.Lock()
+
+        # 정규화 fold: 입력은 원본 단위, 신호별 오차는 1 / std^2 배 (정규화 공간 오차)
+        self.fused = scaler is not None
+        self.scaler = scaler
+        self._error_scale: Optional[np.ndarray] = None
+        if self.fused:
+            model = fold_normalization(model, scaler.mean, scaler.std)
+            self._error_scale = (1.0 / np.square(scaler.std.astype(np.float64))).astype(np.float32)
+
+        model = model.to(self.device).eval()
+        self.model: nn.Module = model
+        if compile:
+            try:
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", FutureWarning)  # torch.jit deprecation 안내
+                    scripted = torch.jit.freeze(torch.jit.script(model))
+                    self.model = torch.jit.optimize_for_inference(scripted)
+                self.compiled = True
+            except Exception as e:
+                print(f"[LSTM-AE] TorchScript 컴파일 실패, eager 모드로 동작: {e}")
+        self._warmup()
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        weights_path: str,
+        input_dim: int,
+        window_len: int,
+        device: str = "cpu",
+        **kwargs
+    ) -> "LSTMAEEngine":
+        model = LSTMAutoencoder(input_dim)
+        model.load_state_dict(torch.load(weights_path, map_location="cpu"))
+        return cls(model, window_len=window_len, device=device, **kwargs)
+
+    def _warmup(self):
+        # TorchScript 프로파일링 실행(첫 1~2회 호출)이 사용자 요청 지연에 포함되지 않도록 미리 실행
+        dummy = np.zeros((1, self.window_len, self.input_dim), dtype=np.float32)
+        for _ in range(2):
+            self.score(dummy)
+
+    def score(self, windows: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Args:
+            windows: 정규화된 윈도우 (B, T, F) float32 (scaler를 합친 엔진이면 원본 단위)
+
+        Returns:
+            (scores, signal_errors): 윈도우별 평균 재구성 오차 (B,), 신호별 평균 재구성 오차 (B, F)
+        """
+        if windows.ndim != 3 or windows.shape[2] != self.input_dim:
+            raise ValueError(f"입력 shape 오류: {windows.shape} (기대: (B, T, {self.input_dim}))")
+
+        signal_errors = np.empty((windows.shape[0], self.input_dim), dtype=np.float32)
+        with self._lock, torch.inference_mode():
+            for start in range(0, windows.shape[0], self.max_batch):
+                x = torch.from_numpy(np.ascontiguousarray(windows[start:start + self.max_batch], dtype=np.float32))
+                x = x.to(self.device)
+                err = (self.model(x) - x).pow_(2).mean(dim=1)
+                signal_errors[start:start + x.shape[0]] = err.cpu().numpy()
+        if self._error_scale is not None:
+            signal_errors *= self._error_scale
+        return signal_errors.mean(axis=1), signal_errors
+
+
+def benchmark(engine: LSTMAEEngine, batch_sizes=(1, 32, 256), iterations: int = 50, seed: int = 0) -> dict:
+    """배치 크기별 score() 지연 시간 (ms, p50 / p99, 윈도우당 처리량)"""
+    rng = np.random.default_rng(seed)
+    results = {}
+    for batch in batch_sizes:
+        x = rng.standard_normal((batch, engine.window_len, engine.input_dim), dtype=np.float32)
+        engine.score(x)
+        elapsed = []
+        for _ in range(iterations):
+            start = time.perf_counter()
+            engine.score(x)
+            elapsed.append((time.perf_counter() - start) * 1000)
+        p50 = float(np.percentile(elapsed, 50))
+        results[batch] = {
+            "p50_ms": round(p50, 2),
+            "p99_ms": round(float(np.percentile(elapsed, 99)), 2),
+            "windows_per_sec": round(batch * 1000 / p50, 1),
+        }
+    return results
@@ -0,0 +1,263 @@
+# ai/app/services/obd_engine_anomaly/lstm_preprocess.py
+"""
+LSTM-AE 학습 데이터 윈도우 구성 (Windowing Layer)
+
+[역할]
+1. 격자 정렬: 컬럼 주행 저장소(trip_store)의 주행마다 time_aligner로 (T, F) 격자 배열을 만들어
+   .npy로 한 번만 저장합니다. (주행 해시 + 정렬 설정이 같으면 재사용)
+2. 윈도우 색인: 윈도우 자체는 저장하지 않고 "주행별 시작 위치"만 저장합니다.
+   관측 비율(min_coverage)은 time_aligner의 누적합(prefix sum)으로 윈도우 개수와 무관하게 계산합니다.
+3. 정규화 통계: 사용 윈도우가 덮는 격자 칸의 신호별 평균/표준편차를 주행 단위로 병합(RunningStats) → scaler.json
+4. WindowDataset: 격자 배열을 memmap으로 열고 sliding_window_view로 윈도우를 복사 없이 만든 뒤,
+   요청된 윈도우만 정규화하여 텐서로 반환합니다. (선택: 에폭별 셔플 색인)
+
+→ 주행이 늘어나도 메모리에 올라가는 것은 윈도우 시작 위치 배열뿐입니다. (예전 train.npz는 전체 윈도우를 RAM에 적재)
+
+[저장 구조]
+ai/data/processed/lstm_ae/
+  ├── aligned/{category}/{주행}-{hash12}-{설정8}.npy   (T_trip, F) float32 원본 단위 (+ .observed.npy 관측 마스크)
+  ├── windows.npz     (trip_ids, files, offsets, starts)
+  ├── scaler.json     (ZScoreScaler)
+  └── meta.json       (signals, sampling_hz, window_sec, stride_sec, T, F, num_windows, registry_version, threshold는 학습 후 기록)
+
+[사용법]
+python -m ai.scripts.obd_engine.build_lstm_dataset
+ds = WindowDataset("ai/data/processed/lstm_ae", shuffle=True)
+"""
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import torch
+from numpy.lib.stride_tricks import sliding_window_view
+from torch.utils.data import Dataset
+
+from ai.app.services.obd_engine_anomaly.feature_registry import feature_version, registry_version
+from ai.app.services.obd_engine_anomaly.scaler import RunningStats, ZScoreScaler
+from ai.app.services.obd_engine_anomaly.time_aligner import AlignConfig, align
+from ai.app.services.obd_engine_anomaly.trip_store import TripStore
+
+DATASET_ROOT = os.path.join("ai", "data", "processed", "lstm_ae")
+PREPROCESS_YAML = os.path.join("ai", "config", "obd", "preprocess_obd.yaml")
+
+
+# =============================================================================
+# 설정
+# =============================================================================
+@dataclass(frozen=True)
+class PreprocessConfig:
+    sampling_hz: float = 10.0
+    window_sec: int = 60
+    stride_sec: float = 5.0
+    min_coverage: float = 0.8
+    resample: str = "nearest_grid"
+    fill_policy: str = "ffill"
+    max_ffill_sec: float = 5.0
+
+    @classmethod
+    def from_yaml(cls, path: str = PREPROCESS_YAML, **overrides) -> "PreprocessConfig":
+        """정렬 관련 값(resample, fill_policy, min_coverage)은 서빙과 같은 preprocess_obd.yaml에서 읽음"""
+        align_config = AlignConfig.from_yaml(path)
+        fields = {
+            "resample": align_config.resample,
+            "fill_policy": align_config.fill_policy,
+            "min_coverage": align_config.min_coverage,
+            "max_ffill_sec": align_config.max_ffill_sec,
+        }
+        fields.update(overrides)
+        return cls(**fields)
+
+    @property
+    def window_len(self) -> int:
+        return int(round(self.window_sec * self.sampling_hz))
+
+    def align_config(self) -> AlignConfig:
+        return AlignConfig(
+            rate_hz=self.sampling_hz, resample=self.resample, fill_policy=self.fill_policy,
+            min_coverage=self.min_coverage, max_ffill_sec=self.max_ffill_sec,
+        )
+
+    def signature(self, signals: Sequence[str]) -> str:
+        """격자 배열에 영향을 주는 설정 (윈도우 길이/stride는 색인만 바꾸므로 제외)"""
+        align_fields = asdict(self.align_config())
+        payload = json.dumps({"signals": list(signals), **align_fields}, sort_keys=True)
+        return hashlib.sha1(payload.encode()).hexdigest()[:8]
+
+
+# =============================================================================
+# 데이터셋 생성
+# =============================================================================
+def _aligned_path(out_dir: str, entry: Dict, signature: str) -> str:
+    return os.path.join(out_dir, "aligned", f"{entry['trip_id']}-{entry['hash'][:12]}-{signature}.npy")
+
+
+def build_lstm_ae_dataset(
+    store: TripStore,
+    out_dir: str = DATASET_ROOT,
+    signals: Sequence[str] = ("rpm", "speed", "coolant", "map"),
+    cfg: PreprocessConfig = PreprocessConfig(),
+    categories: Sequence[str] = ("normal",),
+) -> Tuple[str, str, str]:
+    """
+    주행 저장소 → 격자 배열(.npy) + 윈도우 색인 + scaler.json + meta.json
+
+    한 번에 주행 1개만 메모리에 올립니다. 이미 정렬된 주행(같은 해시/설정)은 다시 계산하지 않습니다.
+
+    Returns:
+        (windows.npz, scaler.json, meta.json) 경로
+    """
+    signals = list(signals)
+    signature = cfg.signature(signals)
+    align_config = cfg.align_config()
+    T, F = cfg.window_len, len(signals)
+
+    trip_ids: List[str] = []
+    files: List[str] = []
+    starts: List[np.ndarray] = []
+    stats = RunningStats(F)
+    reused = 0
+
+    for entry in store.trips():
+        if entry["category"] not in categories:
+            continue
+        path = _aligned_path(out_dir, entry, signature)
+        observed_path = path[:-len(".npy")] + ".observed.npy"
+        if os.path.exists(path) and os.path.exists(observed_path):
+            values = np.load(path, mmap_mode="r")
+            observed = np.load(observed_path, mmap_mode="r")
+            reused += 1
+        else:
+            aligned = align(store.load(entry["trip_id"], signals), align_config)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            np.save(observed_path, aligned.observed)
+            np.save(path, aligned.values)
+            values, observed = aligned.values, aligned.observed
+
+        trip_starts = window_starts(values, observed, cfg)
+        if trip_starts.size == 0:
+            continue
+        trip_ids.append(entry["trip_id"])
+        files.append(os.path.relpath(path, out_dir))
+        starts.append(trip_starts)
+
+        # 정규화 통계: 사용 윈도우가 덮는 격자 칸 (겹치는 칸은 한 번만)
+        edges = np.zeros(values.shape[0] + 1, dtype=np.int32)
+        np.add.at(edges, trip_starts, 1)
+        np.add.at(edges, trip_starts + T, -1)
+        covered = np.cumsum(edges[:-1]) > 0
+        stats.update(values[covered])
+
+    if not starts:
+        raise ValueError(f"사용 가능한 윈도우가 없습니다. (categories={list(categories)}, min_coverage={cfg.min_coverage})")
+
+    os.makedirs(out_dir, exist_ok=True)
+    lengths = np.array([s.size for s in starts], dtype=np.int64)
+    index_path = os.path.join(out_dir, "windows.npz")
+    np.savez(
+        index_path,
+        trip_ids=np.array(trip_ids), files=np.array(files),
+        offsets=np.concatenate([[0], np.cumsum(lengths)]), starts=np.concatenate(starts),
+    )
+
+    scaler = stats.to_scaler(signals)
+    scaler_path = scaler.to_json(os.path.join(out_dir, "scaler.json"))
+
+    meta_path = os.path.join(out_dir, "meta.json")
+    meta = {
+        "signals": signals, "sampling_hz": cfg.sampling_hz, "window_sec": cfg.window_sec,
+        "stride_sec": cfg.stride_sec, "T": T, "F": F, "num_windows": int(lengths.sum()),
+        "num_trips": len(trip_ids), "categories": list(categories), "preprocess": asdict(cfg),
+        "feature_version": feature_version(signals),
+        # 학습(WindowDataset)이 쓰는 scaler 통계 → 서빙 로드 시 check_scaler가 비교 (다른 통계로 fold 방지)
+        "registry_version": registry_version(signals, scaler.mean, scaler.std),
+    }
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2)
+
+    print(f"[LSTM Preprocess] trips={len(trip_ids)} (재사용 {reused}) windows={int(lengths.sum())} T={T} F={F}")
+    return index_path, scaler_path, meta_path
+
+
+def window_starts(values: np.ndarray, observed: np.ndarray, cfg: PreprocessConfig) -> np.ndarray:
+    """사용 가능한 윈도우 시작 위치 (모든 신호 관측 비율 >= min_coverage, NaN 없음)"""
+    T = cfg.window_len
+    n = values.shape[0]
+    if n < T:
+        return np.empty(0, dtype=np.int64)
+    stride = max(1, int(round(cfg.stride_sec * cfg.sampling_hz)))
+    starts = np.arange(0, n - T + 1, stride)
+
+    observed_sum = np.zeros((n + 1, values.shape[1]), dtype=np.int64)
+    np.cumsum(observed, axis=0, out=observed_sum[1:])
+    coverage = (observed_sum[starts + T] - observed_sum[starts]) / T
+    nan_sum = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.isnan(values).any(axis=1), out=nan_sum[1:])
+    usable = ((nan_sum[starts + T] - nan_sum[starts]) == 0) & (coverage >= cfg.min_coverage).all(axis=1)
+    return starts[usable]
+
+
+# =============================================================================
+# Dataset (memmap + sliding_window_view)
+# =============================================================================
+class WindowDataset(Dataset):
+    """
+    Usage:
+        ds = WindowDataset(DATASET_ROOT, shuffle=True, seed=0)
+        for epoch in range(epochs):
+            ds.set_epoch(epoch)                      # 셔플 색인 갱신
+            for x in DataLoader(ds, batch_size=64):  # (B, T, F) 정규화된 윈도우
+                ...
+    """
+
+    def __init__(self, data_dir: str = DATASET_ROOT, normalize: bool = True, shuffle: bool = False, seed: int = 0):
+        self.data_dir = data_dir
+        with open(os.path.join(data_dir, "meta.json"), "r", encoding="utf-8") as f:
+            self.meta = json.load(f)
+        index = np.load(os.path.join(data_dir, "windows.npz"))
+        self.trip_ids: List[str] = index["trip_ids"].tolist()
+        self.files: List[str] = index["files"].tolist()
+        self.offsets: np.ndarray = index["offsets"]
+        self.starts: np.ndarray = index["starts"]
+        self.window_len = int(self.meta["T"])
+        self.scaler: Optional[ZScoreScaler] = (
+            ZScoreScaler.from_json(os.path.join(data_dir, "scaler.json")) if normalize else None
+        )
+        self.shuffle = shuffle
+        self.seed = seed
+        self._order: Optional[np.ndarray] = None
+        self._views: Dict[int, np.ndarray] = {}
+        self.set_epoch(0)
+
+    def set_epoch(self, epoch: int):
+        self._order = np.random.default_rng(self.seed + epoch).permutation(len(self)) if self.shuffle else None
+
+    def _view(self, trip: int) -> np.ndarray:
+        """주행 격자 배열 (T_trip, F) → (T_trip - T + 1, F, T) 읽기 전용 윈도우 view (복사 없음)"""
+        if trip not in self._views:
+            values = np.load(os.path.join(self.data_dir, self.files[trip]), mmap_mode="r")
+            self._views[trip] = sliding_window_view(values, self.window_len, axis=0)
+        return self._views[trip]
+
+    def __len__(self) -> int:
+        return int(self.starts.size)
+
+    def window(self, idx: int) -> np.ndarray:
+        """원본 단위 (T, F) view (셔플 순서와 무관한 색인)"""
+        trip = int(np.searchsorted(self.offsets, idx, side="right")) - 1
+        return self._view(trip)[self.starts[idx]].T
+
+    def __getitem__(self, idx: int) -> torch.Tensor:
+        if self._order is not None:
+            idx = int(self._order[idx])
+        window = self.window(idx)
+        x = self.scaler.transform(window) if self.scaler is not None else np.array(window, dtype=np.float32)
+        return torch.from_numpy(np.ascontiguousarray(x))
+
+    def iter_batches(self, batch_size: int = 256) -> Iterator[np.ndarray]:
+        """색인 순서대로 (B, T, F) 배치 (임계값 보정 등 전체 채점용, 한 배치만 메모리에 유지)"""
+        for start in range(0, len(self), batch_size):
+            batch = np.stack([self.window(i) for i in range(start, min(start + batch_size, len(self)))])
+            yield self.scaler.transform(batch) if self.scaler is not None else batch.astype(np.float32)
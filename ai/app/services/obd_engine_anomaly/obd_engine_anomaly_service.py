@@ -0,0 +1,569 @@
+# ai/app/services/obd_engine_anomaly/obd_engine_anomaly_service.py
+"""
+OBD 엔진 이상 탐지 서비스 (LSTM Autoencoder Core)
+
+[역할]
+1. 입력 검증/보정: 60초 윈도우마다 필수 신호, 결측 비율, 길이를 점검하여 data_quality를 판정하고
+   채점 가능한 윈도우는 결측 보간(앞값 → 뒷값), 길이 보정(최근 구간 사용 / 앞쪽 패딩)을 합니다.
+2. 배치 채점: 채점 가능한 윈도우를 모두 모아 LSTMAEEngine으로 한 번에 재구성합니다.
+   (기본 로드는 scaler를 모델 첫 층에 합친 엔진 → 원본 단위를 그대로 입력, 별도 정규화 없음)
+3. 결과 구성: 재구성 오차(score) vs 임계값, 신호별 오차 비중(top_signals)
+   + 확장 진단(electrical / brake / tire / idle): extensions/*_rules.py 규칙을 RuleEngine으로 전체 윈도우에 한 번에 평가
+4. 스트리밍 채점(StreamingScorer): 차량별 고정 크기 링 버퍼에 샘플을 누적하고,
+   stride마다 채점 시점이 된 모든 차량의 윈도우를 모아 한 번의 배치 forward로 채점합니다.
+
+[data_quality.status]
+- OK: 보정 없이 채점
+- DEGRADED: 결측 보간(DEGRADED_MISSING_RATIO 초과) / 길이 보정 / 리샘플링 후 채점
+- INSUFFICIENT: 필수 신호 누락, 결측 과다(MAX_MISSING_RATIO 초과), 길이 부족 → 채점하지 않음
+
+[환경 변수]
+- OBD_LSTM_AE_WEIGHTS (기본 ai/weights/lstm_ae_v0.pt)
+- OBD_LSTM_AE_META (기본 ai/data/processed/lstm_ae/meta.json)
+- OBD_LSTM_AE_SCALER (기본 ai/data/processed/lstm_ae/scaler.json)
+- OBD_LSTM_AE_THRESHOLD (미지정 시 meta.json의 threshold, 그것도 없으면 0.5)
+- OBD_LSTM_AE_DEVICE (기본 cpu), OBD_LSTM_AE_MAX_BATCH (기본 64, forward 1회 최대 윈도우 수)
+- OBD_LSTM_AE_FUSE_SCALER (기본 1, 0이면 정규화를 모델에 합치지 않고 입력마다 scaler.transform)
+- OBD_STREAM_STRIDE_SEC (기본 5), OBD_STREAM_MAX_VEHICLES (기본 10000), OBD_STREAM_IDLE_TTL_SEC (기본 600)
+- OBD_STREAM_FLUSH_MS (기본 20, 채점 요청을 모으는 시간창)
+"""
+import asyncio
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ai.app.schemas.obd_engine_anomaly_schema import (
+    AnomalyCore, DataQuality, ObdAnomalyResponse, ObdWindow, SignalContribution, WindowResult
+)
+from ai.app.services.obd_engine_anomaly.extensions.rule_engine import RuleEngine
+from ai.app.services.obd_engine_anomaly.feature_registry import (
+    FeatureSpec, canonical_signal, check_scaler, load_feature_spec, registry_version
+)
+from ai.app.services.obd_engine_anomaly.lstm_ae_core import LSTMAEEngine
+from ai.app.services.obd_engine_anomaly.scaler import ZScoreScaler
+
+DEFAULT_THRESHOLD = 0.5
+MAX_MISSING_RATIO = 0.3       # 이보다 많이 비어 있는 신호가 있으면 채점하지 않음
+DEGRADED_MISSING_RATIO = 0.05
+MIN_LENGTH_RATIO = 0.9        # 윈도우 길이의 90% 미만이면 채점하지 않음
+TOP_SIGNALS = 3
+
+EXTENSIONS_SKIPPED = {"electrical": "SKIPPED", "brake": "SKIPPED", "tire": "SKIPPED", "idle": "SKIPPED"}
+
+
+# =============================================================================
+# 전처리
+# =============================================================================
+def _fill_missing(x: np.ndarray) -> np.ndarray:
+    """(T, F) 결측(NaN)을 신호별 앞값으로, 맨 앞 결측은 첫 관측값으로 채움"""
+    mask = np.isnan(x)
+    if not mask.any():
+        return x
+    idx = np.where(~mask, np.arange(x.shape[0])[:, None], 0)
+    np.maximum.accumulate(idx, axis=0, out=idx)
+    filled = x[idx, np.arange(x.shape[1])]
+    first_valid = np.argmax(~mask, axis=0)
+    leading = np.arange(x.shape[0])[:, None] < first_valid[None, :]
+    return np.where(leading, x[first_valid, np.arange(x.shape[1])], filled)
+
+
+def _resample(x: np.ndarray, src_hz: float, dst_hz: float) -> np.ndarray:
+    n_dst = int(round(x.shape[0] * dst_hz / src_hz))
+    src_t = np.arange(x.shape[0]) / src_hz
+    dst_t = np.arange(n_dst) / dst_hz
+    return np.stack([np.interp(dst_t, src_t, x[:, j]) for j in range(x.shape[1])], axis=1)
+
+
+def extension_windows(windows: List[ObdWindow], signals: List[str], window_len: int,
+                      sampling_hz: float) -> np.ndarray:
+    """
+    확장 진단 입력 (W, T, len(signals)) 원본 단위, 규칙 엔진 주기(sampling_hz)로 리샘플
+    신호별로 결측 보간 + 최근 T개 사용, 짧은 윈도우의 앞쪽과 요청에 없는 신호는 NaN
+    (NaN 샘플은 어떤 조건도 만족하지 않으므로 패딩 구간이 지속 시간에 더해지지 않음)
+    """
+    out = np.full((len(windows), window_len, len(signals)), np.nan, dtype=np.float32)
+    index = {s: j for j, s in enumerate(signals)}
+    for i, window in enumerate(windows):
+        for name, values in window.signals.items():
+            j = index.get(canonical_signal(name))
+            if j is None or not values:
+                continue
+            x = np.array(values, dtype=np.float64)[:, None]
+            if np.isnan(x).all():
+                continue
+            x = _fill_missing(x)
+            if window.sampling_hz != sampling_hz:
+                x = _resample(x, window.sampling_hz, sampling_hz)
+            x = x[-window_len:, 0]
+            out[i, window_len - len(x):, j] = x
+    return out
+
+
+def prepare_window(window: ObdWindow, spec: FeatureSpec) -> Tuple[Optional[np.ndarray], DataQuality]:
+    """
+    윈도우 1개 → 모델 입력 (T, F) 원본 단위
+
+    Returns:
+        (배열 또는 None(채점 불가), DataQuality)
+    """
+    T = spec.window_len
+    quality = DataQuality(status="OK", expected_length=T)
+
+    quality.missing_signals = [s for s in spec.signals if s not in window.signals]
+    if quality.missing_signals:
+        quality.status = "INSUFFICIENT"
+        quality.reasons.append("missing_signals")
+        return None, quality
+
+    lengths = {len(window.signals[s]) for s in spec.signals}
+    if len(lengths) != 1:
+        quality.status = "INSUFFICIENT"
+        quality.reasons.append("length_mismatch")
+        return None, quality
+
+    x = np.array([window.signals[s] for s in spec.signals], dtype=np.float64).T  # None → NaN
+    quality.length = x.shape[0]
+    missing = np.isnan(x).mean(axis=0) if x.shape[0] else np.ones(len(spec.signals))
+    quality.missing_ratio = {s: round(float(r), 4) for s, r in zip(spec.signals, missing)}
+    if (missing > MAX_MISSING_RATIO).any():
+        quality.status = "INSUFFICIENT"
+        quality.reasons.append("too_many_missing")
+        return None, quality
+    if (missing > DEGRADED_MISSING_RATIO).any():
+        quality.reasons.append("filled_missing")
+    x = _fill_missing(x)
+
+    if window.sampling_hz != spec.sampling_hz:
+        x = _resample(x, window.sampling_hz, spec.sampling_hz)
+        quality.reasons.append("resampled")
+
+    n = x.shape[0]
+    if n < T * MIN_LENGTH_RATIO:
+        quality.status = "INSUFFICIENT"
+        quality.reasons.append("too_short")
+        return None, quality
+    if n > T:
+        x = x[-T:]  # 가장 최근 구간 사용
+        quality.reasons.append("truncated")
+    elif n < T:
+        x = np.concatenate([np.repeat(x[:1], T - n, axis=0), x])
+        quality.reasons.append("padded")
+
+    if quality.reasons:
+        quality.status = "DEGRADED"
+    return x.astype(np.float32), quality
+
+
+# =============================================================================
+# Service
+# =============================================================================
+class ObdEngineAnomalyService:
+    def __init__(self, engine: LSTMAEEngine, scaler: ZScoreScaler, spec: FeatureSpec,
+                 threshold: float = DEFAULT_THRESHOLD, model_version: str = "lstm_ae",
+                 rule_engine: Optional[RuleEngine] = None):
+        if tuple(scaler.signals) != tuple(spec.signals):
+            raise ValueError(f"scaler 신호 순서 {scaler.signals}가 모델 입력 {spec.signals}와 다릅니다.")
+        if engine.window_len != spec.window_len or engine.input_dim != spec.num_signals:
+            raise ValueError("모델 입력 크기가 feature spec과 다릅니다.")
+        if engine.fused and not (np.allclose(engine.scaler.mean, scaler.mean) and np.allclose(engine.scaler.std, scaler.std)):
+            raise ValueError("엔진에 합쳐진 정규화 통계가 scaler와 다릅니다.")
+        self.engine = engine
+        self.scaler = scaler
+        # 모델 입력 공간에서 "학습 평균" (결측을 채울 값)
+        self.fill_value = scaler.mean.copy() if engine.fused else np.zeros(spec.num_signals, dtype=np.float32)
+        self.spec = spec
+        self.threshold = threshold
+        self.model_version = model_version
+        self.rule_engine = rule_engine if rule_engine is not None else RuleEngine.from_extensions(spec.sampling_hz)
+
+    def score_windows(self, windows: List[ObdWindow]) -> List[WindowResult]:
+        """동기 버전 (전처리 + 한 번의 배치 forward)"""
+        prepared = [prepare_window(w, self.spec) for w in windows]
+        scorable = [i for i, (x, _) in enumerate(prepared) if x is not None]
+
+        scores, signal_errors = np.empty(0), np.empty((0, self.spec.num_signals))
+        if scorable:
+            batch = self.model_input(np.stack([prepared[i][0] for i in scorable]))
+            scores, signal_errors = self.engine.score(batch)
+        position = {i: k for k, i in enumerate(scorable)}
+        extensions = self._evaluate_extensions(windows)
+
+        results = []
+        for i, (window, (_, quality)) in enumerate(zip(windows, prepared)):
+            core = AnomalyCore(threshold=self.threshold, data_quality=quality)
+            if i in position:
+                k = position[i]
+                core.score = round(float(scores[k]), 6)
+                core.is_anomaly = bool(scores[k] > self.threshold)
+                core.top_signals = self._top_signals(signal_errors[k])
+            results.append(WindowResult(window_id=window.window_id, core=core, extensions=extensions(i)))
+        return results
+
+    def model_input(self, x: np.ndarray) -> np.ndarray:
+        """원본 단위 → 엔진 입력 (정규화를 합친 엔진이면 그대로)"""
+        return np.asarray(x, dtype=np.float32) if self.engine.fused else self.scaler.transform(x)
+
+    def _evaluate_extensions(self, windows: List[ObdWindow]):
+        """전체 윈도우 x 전체 규칙을 한 번에 평가 → 윈도우 번호별 결과 조회 함수"""
+        if not self.rule_engine.rules or not windows:
+            return lambda i: dict(EXTENSIONS_SKIPPED)
+        signals = self.rule_engine.required_signals
+        hz = self.rule_engine.sampling_hz
+        window_len = int(round(self.spec.window_len * hz / self.spec.sampling_hz))
+        result = self.rule_engine.evaluate(extension_windows(windows, signals, window_len, hz), signals)
+        return lambda i: self.rule_engine.summarize(result, i)
+
+    def _top_signals(self, errors: np.ndarray) -> List[SignalContribution]:
+        total = float(errors.sum()) or 1.0
+        order = np.argsort(-errors, kind="stable")[:TOP_SIGNALS]
+        return [
+            SignalContribution(signal=self.spec.signals[j], error=round(float(errors[j]), 6),
+                               contribution=round(float(errors[j]) / total, 4))
+            for j in order
+        ]
+
+    async def predict(self, windows: List[ObdWindow]) -> ObdAnomalyResponse:
+        start = time.perf_counter()
+        # 전처리와 forward 모두 CPU 작업이므로 이벤트 루프 밖에서 실행
+        results = await asyncio.to_thread(self.score_windows, windows)
+        return ObdAnomalyResponse(
+            results=results,
+            model_version=self.model_version,
+            batch_size=sum(1 for r in results if r.core.score is not None),
+            latency_ms=round((time.perf_counter() - start) * 1000, 2),
+        )
+
+
+_service: Optional[ObdEngineAnomalyService] = None
+_service_lock = threading.Lock()
+
+
+def load_obd_anomaly_service() -> ObdEngineAnomalyService:
+    weights_path = os.getenv("OBD_LSTM_AE_WEIGHTS", os.path.join("ai", "weights", "lstm_ae_v0.pt"))
+    meta_path = os.getenv("OBD_LSTM_AE_META", os.path.join("ai", "data", "processed", "lstm_ae", "meta.json"))
+    scaler_path = os.getenv("OBD_LSTM_AE_SCALER", os.path.join("ai", "data", "processed", "lstm_ae", "scaler.json"))
+    for path in (weights_path, meta_path, scaler_path):
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"OBD LSTM-AE 파일 없음: {path}")
+
+    spec = load_feature_spec(meta_path)
+    scaler = ZScoreScaler.from_json(scaler_path)
+    check_scaler(spec, scaler)
+    fuse = os.getenv("OBD_LSTM_AE_FUSE_SCALER", "1") != "0"
+    threshold = float(os.getenv("OBD_LSTM_AE_THRESHOLD", spec.threshold if spec.threshold is not None else DEFAULT_THRESHOLD))
+    engine = LSTMAEEngine.from_checkpoint(
+        weights_path, input_dim=spec.num_signals, window_len=spec.window_len,
+        device=os.getenv("OBD_LSTM_AE_DEVICE", "cpu"), scaler=scaler if fuse else None,
+        max_batch=int(os.getenv("OBD_LSTM_AE_MAX_BATCH", "64")),
+    )
+    version = registry_version(spec.signals, scaler.mean, scaler.std)
+    print(f"[OBD Anomaly] LSTM-AE 로드: {weights_path} (TorchScript: {engine.compiled}, "
+          f"scaler fused: {engine.fused}, threshold: {threshold}, features: {version})")
+    return ObdEngineAnomalyService(
+        engine, scaler, spec,
+        threshold=threshold, model_version=f"{os.path.splitext(os.path.basename(weights_path))[0]}+{version}",
+    )
+
+
+def get_obd_anomaly_service() -> ObdEngineAnomalyService:
+    """모델은 프로세스당 한 번만 로드 (첫 요청 또는 Eager Loading 시)"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = load_obd_anomaly_service()
+    return _service
+
+
+# =============================================================================
+# 스트리밍 채점 (차량별 링 버퍼 + 배치 forward)
+# =============================================================================
+@dataclass
+class StreamScore:
+    vehicle_id: str
+    score: Optional[float]              # 결측 과다로 채점하지 않으면 None
+    is_anomaly: Optional[bool]
+    missing_ratio: float                # 윈도우 안에서 앞값으로 채운 샘플 비율
+    top_signals: List[SignalContribution] = field(default_factory=list)
+
+
+class StreamingScorer:
+    """
+    차량별 최근 window_sec 샘플을 링 버퍼로 유지하고 stride마다 점수를 냅니다.
+
+    - 버퍼: (슬롯 수, T, F) float32 풀 하나를 슬롯 단위로 나눠 쓰며, 정규화된 값으로 저장
+      (채점 시 별도 정규화 없음, 슬롯은 차량 수에 맞춰 두 배씩 늘림, 메모리 상한 = max_vehicles x T x F x 4 bytes)
+    - 샘플 추가: 위치 (written + i) % T에 덮어쓰기만 하므로 새 데이터 양에 비례하는 비용
+    - 채점: 채점 시점이 된 차량의 윈도우를 한 번의 gather로 모아 한 번의 배치 forward
+      (LSTM-AE는 윈도우 전체를 다시 인코딩해야 하므로 forward 자체는 증분 계산이 불가능,
+       대신 "새 샘플마다 재채점" 대신 "stride마다 한 번, 여러 차량을 한 배치로" 채점)
+    - 슬롯이 부족하면 가장 오래 갱신되지 않은 차량을 내보내고(LRU), idle_ttl_sec 동안 샘플이 없던 차량도 정리
+    - 결측(NaN)은 차량별 직전 값으로 채우고, 채운 비율이 MAX_MISSING_RATIO를 넘는 윈도우는 채점하지 않음
+
+    Usage:
+        scorer = StreamingScorer(service, stride_sec=5)
+        scorer.push_many(["car-1", "car-2"], samples)   # (V, n, F) 원본 단위, spec.signals 순서
+        results = scorer.score_due()                    # 채점 시점이 된 차량 전체를 한 번에
+        result = await scorer.submit("car-1", samples)  # API: 채점 시점이면 다음 flush 결과를 기다림
+    """
+
+    def __init__(
+        self,
+        service: ObdEngineAnomalyService,
+        stride_sec: float = 5.0,
+        max_vehicles: int = 10000,
+        idle_ttl_sec: float = 600.0,
+        flush_wait_ms: float = 20.0,
+    ):
+        self.service = service
+        self.window_len = service.spec.window_len
+        self.num_signals = service.spec.num_signals
+        self.stride_len = max(1, int(round(stride_sec * service.spec.sampling_hz)))
+        self.max_vehicles = max_vehicles
+        self.idle_ttl_sec = idle_ttl_sec
+        self.flush_wait = flush_wait_ms / 1000.0
+
+        self.capacity = 0
+        self._pool = np.zeros((0, self.window_len, self.num_signals), dtype=np.float32)
+        self._imputed = np.zeros((0, self.window_len), dtype=bool)
+        self._last = np.zeros((0, self.num_signals), dtype=np.float32)
+        self._written = np.zeros(0, dtype=np.int64)
+        self._since = np.zeros(0, dtype=np.int64)
+        self._seen = np.zeros(0, dtype=np.float64)
+        self._active = np.zeros(0, dtype=bool)
+        self._ids: List[Optional[str]] = []
+        self._slots: "OrderedDict[str, int]" = OrderedDict()
+        self._free: List[int] = []
+        # submit()은 push와 대기 등록을, flush는 채점 대상 선정과 대기 목록 교체를 같은 잠금 안에서 수행
+        self._lock = threading.RLock()
+
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+        self._flush_handle = None
+        self.stats = {"samples": 0, "forwards": 0, "windows": 0, "evicted": 0, "skipped": 0}
+
+    # -------------------------------------------------------------------------
+    # 슬롯 관리 (LRU)
+    # -------------------------------------------------------------------------
+    def _grow(self):
+        """슬롯 풀 확장 (min(2배, max_vehicles)), 기존 슬롯 번호와 내용은 그대로"""
+        old, new = self.capacity, min(max(2 * self.capacity, 64), self.max_vehicles)
+
+        def extend(a: np.ndarray, fill) -> np.ndarray:
+            out = np.full((new,) + a.shape[1:], fill, dtype=a.dtype)
+            out[:old] = a
+            return out
+
+        self._pool = extend(self._pool, 0.0)
+        self._imputed = extend(self._imputed, False)
+        self._last = extend(self._last, np.nan)
+        self._written = extend(self._written, 0)
+        self._since = extend(self._since, 0)
+        self._seen = extend(self._seen, 0.0)
+        self._active = extend(self._active, False)
+        self._ids.extend([None] * (new - old))
+        self._free = list(range(new - 1, old - 1, -1)) + self._free
+        self.capacity = new
+
+    def _slot(self, vehicle_id: str, now: float) -> int:
+        slot = self._slots.get(vehicle_id)
+        if slot is None:
+            if not self._free and self.capacity < self.max_vehicles:
+                self._grow()
+            if not self._free:
+                old_id, old_slot = self._slots.popitem(last=False)
+                self._release(old_slot)
+                self.stats["evicted"] += 1
+            slot = self._free.pop()
+            self._slots[vehicle_id] = slot
+            self._ids[slot] = vehicle_id
+            self._active[slot] = True
+        else:
+            self._slots.move_to_end(vehicle_id)
+        self._seen[slot] = now
+        return slot
+
+    def _release(self, slot: int):
+        self._ids[slot] = None
+        self._active[slot] = False
+        self._written[slot] = self._since[slot] = 0
+        self._last[slot] = np.nan
+        self._free.append(slot)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        now = time.time() if now is None else now
+        with self._lock:
+            expired = [vid for vid, slot in self._slots.items() if self._seen[slot] < now - self.idle_ttl_sec]
+            for vid in expired:
+                self._release(self._slots.pop(vid))
+        self.stats["evicted"] += len(expired)
+        return len(expired)
+
+    @property
+    def num_vehicles(self) -> int:
+        return len(self._slots)
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(a.nbytes for a in (self._pool, self._imputed, self._last, self._written, self._since, self._seen))
+
+    # -------------------------------------------------------------------------
+    # 샘플 추가
+    # -------------------------------------------------------------------------
+    def push(self, vehicle_id: str, samples: np.ndarray, now: Optional[float] = None) -> bool:
+        """차량 1대의 (n, F) 샘플 추가, 채점 시점이 되었으면 True"""
+        return bool(self.push_many([vehicle_id], np.asarray(samples, dtype=np.float32)[None], now)[0])
+
+    def push_many(self, vehicle_ids: Sequence[str], samples: np.ndarray, now: Optional[float] = None) -> np.ndarray:
+        """
+        Args:
+            vehicle_ids: 서로 다른 차량 V대
+            samples: (V, n, F) 원본 단위 (spec.sampling_hz 격자, 결측 NaN)
+        Returns:
+            (V,) 채점 시점 여부
+        """
+        samples = np.asarray(samples, dtype=np.float32)
+        if samples.ndim != 3 or samples.shape[0] != len(vehicle_ids) or samples.shape[2] != self.num_signals:
+            raise ValueError(f"샘플 shape 오류: {samples.shape} (기대: ({len(vehicle_ids)}, n, {self.num_signals}))")
+        n = samples.shape[1]
+        if n == 0:
+            return np.zeros(len(vehicle_ids), dtype=bool)
+        now = time.time() if now is None else now
+        x = self.service.model_input(samples[:, -self.window_len:])
+        m = x.shape[1]
+
+        with self._lock:
+            slots = np.array([self._slot(v, now) for v in vehicle_ids], dtype=np.int64)
+
+            # 결측: 직전 값(이전 배치 마지막 값 포함)으로 채움, 직전 값도 없으면 학습 평균
+            missing = np.isnan(x)
+            if missing.any():
+                seeded = np.concatenate([self._last[slots][:, None], x], axis=1)
+                idx = np.where(~np.isnan(seeded), np.arange(m + 1)[None, :, None], 0)
+                np.maximum.accumulate(idx, axis=1, out=idx)
+                x = np.take_along_axis(seeded, idx, axis=1)[:, 1:]
+            self._last[slots] = x[:, -1]  # 한 번도 관측되지 않은 신호는 NaN 유지
+            if missing.any():
+                x = np.where(np.isnan(x), self.service.fill_value, x)
+
+            pos = (self._written[slots, None] + np.arange(m)[None, :]) % self.window_len
+            self._pool[slots[:, None], pos] = x
+            self._imputed[slots[:, None], pos] = missing.any(axis=2)
+            self._written[slots] += m
+            self._since[slots] += n
+            self.stats["samples"] += len(vehicle_ids) * n
+            return (self._written[slots] >= self.window_len) & (self._since[slots] >= self.stride_len)
+
+    # -------------------------------------------------------------------------
+    # 채점
+    # -------------------------------------------------------------------------
+    def score_due(self) -> List[StreamScore]:
+        """채점 시점이 된 모든 차량을 한 번의 배치 forward로 채점"""
+        return self._score_due()[0]
+
+    def _score_due(self, take_waiters: bool = False) -> Tuple[List[StreamScore], Dict[str, List[asyncio.Future]]]:
+        """take_waiters: 채점 대상 선정과 같은 잠금 안에서 대기 목록을 가져감 (이후 등록된 대기는 다음 flush 몫)"""
+        with self._lock:
+            waiters = {}
+            if take_waiters:
+                waiters, self._waiters = self._waiters, {}
+            due = np.nonzero(self._active & (self._written >= self.window_len) & (self._since >= self.stride_len))[0]
+            if due.size == 0:
+                return [], waiters
+            order = (self._written[due, None] + np.arange(self.window_len)[None, :]) % self.window_len  # 오래된 순
+            batch = self._pool[due[:, None], order]
+            missing = self._imputed[due[:, None], order].mean(axis=1)
+            vehicle_ids = [self._ids[s] for s in due]
+            self._since[due] = 0
+
+        ok = missing <= MAX_MISSING_RATIO
+        scores, signal_errors = np.empty(0), np.empty((0, self.num_signals))
+        if ok.any():
+            scores, signal_errors = self.service.engine.score(batch[ok])
+            self.stats["forwards"] += 1
+            self.stats["windows"] += int(ok.sum())
+        self.stats["skipped"] += int((~ok).sum())
+
+        results, k = [], 0
+        for vehicle_id, usable, ratio in zip(vehicle_ids, ok, missing):
+            if not usable:
+                results.append(StreamScore(vehicle_id, None, None, round(float(ratio), 4)))
+                continue
+            score = float(scores[k])
+            results.append(StreamScore(
+                vehicle_id, round(score, 6), bool(score > self.service.threshold), round(float(ratio), 4),
+                self.service._top_signals(signal_errors[k]),
+            ))
+            k += 1
+        return results, waiters
+
+    async def submit(self, vehicle_id: str, samples: np.ndarray) -> Tuple[bool, Optional[StreamScore]]:
+        """
+        API용: 샘플 추가 후 채점 시점이면 flush_wait 동안 모인 다른 차량과 함께 배치 채점
+
+        Returns:
+            (채점 여부, 결과)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        with self._lock:
+            if not self.push(vehicle_id, samples):
+                return False, None
+            self._waiters.setdefault(vehicle_id, []).append(future)
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.flush_wait, lambda: asyncio.ensure_future(self._flush()))
+        result = await future
+        return result is not None, result
+
+    async def _flush(self):
+        self._flush_handle = None
+        try:
+            results, waiters = await asyncio.to_thread(self._score_due, True)
+        except Exception as e:
+            with self._lock:
+                waiters, self._waiters = self._waiters, {}
+            for futures in waiters.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        by_vehicle = {r.vehicle_id: r for r in results}
+        for vehicle_id, futures in waiters.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(by_vehicle.get(vehicle_id))
+        if self.idle_ttl_sec:
+            self.evict_idle()
+
+    def metrics(self) -> Dict:
+        return {
+            **self.stats,
+            "vehicles": self.num_vehicles,
+            "max_vehicles": self.max_vehicles,
+            "capacity": self.capacity,
+            "memory_mb": round(self.memory_bytes / 2**20, 1),
+            "avg_batch": round(self.stats["windows"] / max(self.stats["forwards"], 1), 1),
+        }
+
+
+_scorer: Optional[StreamingScorer] = None
+_scorer_lock = threading.Lock()
+
+
+def get_streaming_scorer() -> StreamingScorer:
+    global _scorer
+    if _scorer is None:
+        with _scorer_lock:
+            if _scorer is None:
+                _scorer = StreamingScorer(
+                    get_obd_anomaly_service(),
+                    stride_sec=float(os.getenv("OBD_STREAM_STRIDE_SEC", "5")),
+                    max_vehicles=int(os.getenv("OBD_STREAM_MAX_VEHICLES", "10000")),
+                    idle_ttl_sec=float(os.getenv("OBD_STREAM_IDLE_TTL_SEC", "600")),
+                    flush_wait_ms=float(os.getenv("OBD_STREAM_FLUSH_MS", "20")),
+                )
+    return _scorer
@@ -0,0 +1,184 @@
+# ai/app/services/obd_engine_anomaly/scaler.py
+"""
+OBD 신호 정규화 (Z-Score Scaler)
+
+[역할]
+1. 통계 계산(RunningStats): 신호별 (count, mean, M2)를 Welford 방식으로 누적하고,
+   부분 통계는 Chan 병합 공식으로 합칩니다. → 데이터를 한 번만 읽고, 파일 단위로 나눠 병렬 계산 가능
+2. fit_trip_store: 컬럼 주행 저장소(trip_store)의 주행별 memmap을 구간(chunk_rows) 단위로 읽어
+   주행마다 통계를 만들고(프로세스 병렬) 주행 id 순서로 병합합니다.
+3. ZScoreScaler: scaler.json을 불러와 서빙 입력을 학습과 같은 기준으로 정규화합니다.
+   서빙에서는 LSTMAEEngine이 평균/표준편차를 모델 첫 층에 합쳐(fold) 별도 정규화 없이 원본 단위를 입력합니다.
+
+[scaler.json]
+{"type": "zscore", "signals": [...], "mean": [...], "std": [...], "count": [...],
+ "feature_set": "common", "feature_version": "..."}
+(count가 있으면 RunningStats로 되살려 새 주행 통계를 이어서 병합할 수 있음)
+
+[사용법]
+scaler = fit_trip_store(TripStore(), ["rpm", "speed", "coolant", "map"], workers=4)
+scaler.to_json("ai/data/processed/lstm_ae/scaler.json")
+"""
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from ai.app.services.obd_engine_anomaly.feature_registry import feature_set_for, feature_version
+from ai.app.services.obd_engine_anomaly.trip_store import TripStore, resolve_signal
+
+MIN_STD = 1e-6
+CHUNK_ROWS = 1 << 16
+
+
+# =============================================================================
+# Welford / Chan 통계
+# =============================================================================
+class RunningStats:
+    """신호별 개수 / 평균 / 편차 제곱합(M2), NaN은 건너뜀"""
+
+    def __init__(self, num_features: int):
+        self.count = np.zeros(num_features, dtype=np.int64)
+        self.mean = np.zeros(num_features, dtype=np.float64)
+        self.m2 = np.zeros(num_features, dtype=np.float64)
+
+    def update(self, x: np.ndarray) -> "RunningStats":
+        """(N, F) 묶음 추가: 묶음 통계를 구한 뒤 병합"""
+        x = np.asarray(x, dtype=np.float64)
+        valid = ~np.isnan(x)
+        n = valid.sum(axis=0)
+        if not n.any():
+            return self
+        batch = RunningStats(x.shape[1])
+        batch.count = n
+        batch.mean = np.where(valid, x, 0.0).sum(axis=0) / np.maximum(n, 1)
+        batch.m2 = np.where(valid, (x - batch.mean) ** 2, 0.0).sum(axis=0)
+        return self.merge(batch)
+
+    def merge(self, other: "RunningStats") -> "RunningStats":
+        """Chan 병합: M2 = M2_a + M2_b + delta^2 * n_a * n_b / n"""
+        n = self.count + other.count
+        safe = np.maximum(n, 1)
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * other.count / safe
+        self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * other.count / safe
+        self.count = n
+        return self
+
+    @property
+    def std(self) -> np.ndarray:
+        """모표준편차 (np.nanstd와 같은 ddof=0)"""
+        return np.sqrt(self.m2 / np.maximum(self.count, 1))
+
+    def to_scaler(self, signals: Sequence[str]) -> "ZScoreScaler":
+        empty = [s for s, c in zip(signals, self.count) if c == 0]
+        if empty:
+            raise ValueError(f"관측값이 없는 신호: {empty}")
+        return ZScoreScaler(self.mean, self.std, signals, count=self.count)
+
+    @classmethod
+    def from_scaler(cls, scaler: "ZScoreScaler") -> "RunningStats":
+        if scaler.count is None:
+            raise ValueError("count가 없는 scaler는 이어서 병합할 수 없습니다.")
+        stats = cls(len(scaler.signals))
+        stats.count = scaler.count.copy()
+        stats.mean = scaler.mean.astype(np.float64)
+        stats.m2 = scaler.std.astype(np.float64) ** 2 * stats.count
+        return stats
+
+
+# =============================================================================
+# Scaler
+# =============================================================================
+class ZScoreScaler:
+    def __init__(self, mean: Sequence[float], std: Sequence[float], signals: Sequence[str],
+                 count: Optional[Sequence[int]] = None):
+        if not (len(mean) == len(std) == len(signals)):
+            raise ValueError("scaler mean/std/signals 길이가 다릅니다.")
+        self.signals: List[str] = list(signals)
+        self.mean = np.asarray(mean, dtype=np.float32)
+        self.std = np.maximum(np.asarray(std, dtype=np.float32), MIN_STD)
+        self.count = np.asarray(count, dtype=np.int64) if count is not None else None
+        self.feature_version: Optional[str] = None   # scaler.json에 기록된 값 (from_json)
+
+    @classmethod
+    def from_json(cls, path: str) -> "ZScoreScaler":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("type", "zscore") != "zscore":
+            raise ValueError(f"지원하지 않는 scaler 형식: {data.get('type')}")
+        scaler = cls(data["mean"], data["std"], data["signals"], count=data.get("count"))
+        scaler.feature_version = data.get("feature_version")
+        return scaler
+
+    def to_json(self, path: str) -> str:
+        data = {"type": "zscore", "signals": self.signals, "mean": self.mean.tolist(), "std": self.std.tolist()}
+        if self.count is not None:
+            data["count"] = self.count.tolist()
+        data["feature_set"] = feature_set_for(self.signals)
+        data["feature_version"] = feature_version(self.signals)
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        return path
+
+    def transform(self, x: np.ndarray) -> np.ndarray:
+        """(..., F) 원본 단위 → 정규화 (마지막 축이 self.signals 순서)"""
+        return ((x - self.mean) / self.std).astype(np.float32, copy=False)
+
+    def inverse_transform(self, x: np.ndarray) -> np.ndarray:
+        return (x * self.std + self.mean).astype(np.float32, copy=False)
+
+
+# =============================================================================
+# 주행 저장소 스트리밍 fit
+# =============================================================================
+def _trip_stats(job) -> RunningStats:
+    """주행 1개 통계 (프로세스 작업 단위, 주행에 없는 신호는 count 0)"""
+    root, trip_id, signals, chunk_rows = job
+    store = TripStore(root)
+    stats = RunningStats(len(signals))
+    columns = []
+    for name in signals:
+        try:
+            columns.append(store.columns(trip_id, [name])[resolve_signal(name)])
+        except KeyError:
+            columns.append(None)
+    rows = next((c.shape[0] for c in columns if c is not None), 0)
+    for start in range(0, rows, chunk_rows):
+        chunk = np.full((min(chunk_rows, rows - start), len(signals)), np.nan)
+        for j, col in enumerate(columns):
+            if col is not None:
+                chunk[:, j] = col[start:start + chunk_rows]
+        stats.update(chunk)
+    return stats
+
+
+def fit_trip_store(store: TripStore, signals: Sequence[str], categories: Sequence[str] = ("normal",),
+                   workers: int = 0, chunk_rows: int = CHUNK_ROWS) -> ZScoreScaler:
+    """
+    주행 저장소 전체를 한 번 읽어 신호별 평균/표준편차 계산 (메모리: 주행당 chunk_rows x F)
+
+    Args:
+        workers: 프로세스 수 (0: CPU 수, 1: 현재 프로세스에서 순차 실행)
+    """
+    signals = list(signals)
+    jobs = [(store.root, e["trip_id"], signals, chunk_rows) for e in store.trips() if e["category"] in categories]
+    if not jobs:
+        raise ValueError(f"통계를 계산할 주행이 없습니다. (categories={list(categories)})")
+
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            parts = list(pool.map(_trip_stats, jobs, chunksize=max(1, len(jobs) // (workers * 4))))
+    else:
+        parts = [_trip_stats(job) for job in jobs]
+
+    # 주행 id 순서로 병합 (병렬 여부와 무관하게 같은 결과)
+    total = RunningStats(len(signals))
+    for part in parts:
+        total.merge(part)
+    print(f"[Scaler] trips={len(jobs)} samples={total.count.tolist()} (workers={min(workers, len(jobs))})")
+    return total.to_scaler(signals)
@@ -0,0 +1,345 @@
+# ai/app/services/obd_engine_anomaly/time_aligner.py
+"""
+OBD 다중 주기 샘플 → 고정 격자(Grid) 정렬기 (Time Aligner)
+
+[역할]
+원본 OBD 로그는 행마다 타임스탬프가 하나씩 있고, PID마다 응답 주기가 달라 한 행에 한두 개 컬럼만 채워져 있습니다.
+    19:09:16.202,17,,,,,...
+이를 rate_hz 간격의 격자 위 (T, F) float32 배열과 "실제 관측 여부" 마스크로 변환합니다.
+
+[정렬 방식 (ai/config/obd/preprocess_obd.yaml)]
+- resample: nearest_grid → 격자 시각에서 tolerance(기본 반 칸) 이내의 가장 가까운 관측값 사용 (관측으로 인정)
+- fill_policy: ffill → 관측이 없는 칸은 직전 관측값으로 채움 (max_ffill_sec 이내, bfill은 하지 않음)
+- min_coverage: 윈도우 안에서 "실제 관측" 칸 비율이 모든 신호에서 이 값 이상이어야 사용 가능한 윈도우
+
+[구현]
+- 컬럼마다 관측 시각 배열에 격자 전체를 np.searchsorted로 한 번에 조회 (O((N + T) log N), 파이썬 루프는 컬럼 수만큼)
+- 타임스탬프 HH:MM:SS.fff는 고정 폭 바이트 배열로 보고 숫자 자릿값을 벡터 연산으로 계산
+- 자정 넘김: 시각이 12시간 이상 뒤로 가면 다음 날로 보고 86400초를 더함
+- 윈도우별 관측 비율은 누적합(prefix sum)으로 윈도우 개수와 무관하게 계산
+
+[사용법]
+trip = load_trip_csv(path, columns={"Engine RPM [RPM]": "rpm", ...})
+aligned = align(trip, AlignConfig.from_yaml("ai/config/obd/preprocess_obd.yaml"))
+starts, coverage, usable = aligned.windows(window_sec=60, stride_sec=5)
+
+스트리밍: StreamingAligner.push(times, values)가 더 이상 바뀌지 않는 격자 칸만 내보냅니다.
+"""
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+SECONDS_PER_DAY = 86400.0
+ROLLOVER_JUMP_SEC = 12 * 3600.0   # 이보다 크게 뒤로 가면 자정 넘김으로 판단
+_EPS = 1e-9
+TIME_WIDTH = 16                   # CSV 시각 컬럼을 고정 폭 바이트로 읽음 (object 문자열보다 빠름)
+
+
+# =============================================================================
+# 설정
+# =============================================================================
+@dataclass(frozen=True)
+class AlignConfig:
+    rate_hz: float = 10.0
+    resample: str = "nearest_grid"          # nearest_grid | ffill (ffill: 격자 시각 이전 마지막 관측만 사용)
+    fill_policy: str = "ffill"              # ffill | none
+    min_coverage: float = 0.8
+    tolerance_sec: Optional[float] = None   # nearest_grid 관측 인정 거리 (기본 0.5 / rate_hz)
+    max_ffill_sec: float = 5.0              # 이보다 오래된 값으로는 채우지 않음 (NaN 유지)
+
+    @property
+    def tolerance(self) -> float:
+        return self.tolerance_sec if self.tolerance_sec is not None else 0.5 / self.rate_hz
+
+    @classmethod
+    def from_yaml(cls, path: str, **overrides) -> "AlignConfig":
+        import yaml
+        with open(path, "r", encoding="utf-8") as f:
+            data = yaml.safe_load(f) or {}
+        fields = {k: data[k] for k in ("rate_hz", "resample", "fill_policy", "min_coverage",
+                                       "tolerance_sec", "max_ffill_sec") if k in data}
+        fields.update(overrides)
+        config = cls(**fields)
+        if config.resample not in ("nearest_grid", "ffill") or config.fill_policy not in ("ffill", "none"):
+            raise ValueError(f"지원하지 않는 정렬 설정: resample={config.resample}, fill_policy={config.fill_policy}")
+        return config
+
+
+# =============================================================================
+# 타임스탬프
+# =============================================================================
+def parse_clock(times: Sequence) -> np.ndarray:
+    """
+    "HH:MM:SS[.fff]" 배열 → 자정 기준 초 (float64)
+    모든 값이 같은 폭이면 바이트 배열로 벡터 파싱, 아니면 문자열 분해로 처리
+    """
+    raw = np.asarray(times)
+    if raw.dtype.kind == "O":
+        raw = raw.astype("S")
+    elif raw.dtype.kind == "U":
+        raw = np.char.encode(raw, "ascii")
+    if raw.size == 0:
+        return np.empty(0, dtype=np.float64)
+    lengths = np.char.str_len(raw)
+    if lengths.min() == lengths.max() and lengths.max() < raw.dtype.itemsize:
+        raw = raw.astype(f"S{lengths.max()}")  # 고정 폭 바이트 배열로 (뒤쪽 NUL 패딩 제거)
+    width = raw.dtype.itemsize
+
+    digits = np.frombuffer(raw.tobytes(), dtype=np.uint8).reshape(-1, width).astype(np.int64) - ord("0")
+    fixed = width >= 8 and (digits[:, 2] == ord(":") - ord("0")).all() and (digits[:, 5] == ord(":") - ord("0")).all()
+    if fixed and (width == 8 or (digits[:, 8] == ord(".") - ord("0")).all()):
+        frac_digits = digits[:, 9:width]
+        if ((frac_digits >= 0) & (frac_digits <= 9)).all():
+            seconds = (digits[:, 0] * 10 + digits[:, 1]) * 3600 + (digits[:, 3] * 10 + digits[:, 4]) * 60 \
+                + digits[:, 6] * 10 + digits[:, 7]
+            frac = frac_digits @ (10.0 ** -np.arange(1, frac_digits.shape[1] + 1)) if frac_digits.size else 0.0
+            return seconds + frac
+
+    out = np.empty(raw.size, dtype=np.float64)
+    for i, value in enumerate(raw):
+        h, m, s = value.decode("ascii").strip().split(":")
+        out[i] = int(h) * 3600 + int(m) * 60 + float(s)
+    return out
+
+
+def unwrap_midnight(seconds: np.ndarray, last: Optional[float] = None, day_offset: float = 0.0) -> Tuple[np.ndarray, float]:
+    """
+    자정 넘김 보정 (23:59:59.9 → 00:00:00.1은 +86400)
+
+    Args:
+        last: 직전 배치의 마지막 원본 시각 (스트리밍), day_offset: 직전까지 누적된 보정값
+    Returns:
+        (보정된 초, 마지막 보정값)
+    """
+    if seconds.size == 0:
+        return seconds, day_offset
+    prev = np.concatenate([[seconds[0] if last is None else last], seconds[:-1]])
+    rollovers = np.cumsum(seconds - prev < -ROLLOVER_JUMP_SEC)
+    offsets = day_offset + SECONDS_PER_DAY * rollovers
+    return seconds + offsets, float(offsets[-1])
+
+
+# =============================================================================
+# 정렬 핵심 (배치 / 스트리밍 공용)
+# =============================================================================
+def _align_column(obs_t: np.ndarray, obs_v: np.ndarray, grid: np.ndarray, config: AlignConfig) -> Tuple[np.ndarray, np.ndarray]:
+    """관측 (시각 오름차순) → 격자 값 (NaN = 값 없음), 관측 인정 마스크"""
+    T = grid.size
+    if obs_t.size == 0:
+        return np.full(T, np.nan, dtype=np.float32), np.zeros(T, dtype=bool)
+
+    # 격자 시각 이하의 마지막 관측 (ffill 기준)
+    last = np.searchsorted(obs_t, grid, side="right") - 1
+    has_last = last >= 0
+    last_c = np.clip(last, 0, obs_t.size - 1)
+    age = np.where(has_last, grid - obs_t[last_c], np.inf)
+
+    if config.resample == "nearest_grid":
+        nxt = np.clip(last + 1, 0, obs_t.size - 1)
+        ahead = np.where(last + 1 < obs_t.size, obs_t[nxt] - grid, np.inf)
+        use_next = ahead < age
+        nearest = np.where(use_next, nxt, last_c)
+        distance = np.minimum(age, ahead)
+        observed = distance <= config.tolerance + _EPS
+        values = np.where(observed, obs_v[nearest], np.nan)
+    else:
+        observed = age <= config.tolerance + _EPS
+        values = np.where(observed, obs_v[last_c], np.nan)
+
+    if config.fill_policy == "ffill":
+        fillable = ~observed & (age <= config.max_ffill_sec + _EPS)
+        values = np.where(fillable, obs_v[last_c], values)
+    return values.astype(np.float32), observed
+
+
+def _align_all(times: np.ndarray, values: np.ndarray, grid: np.ndarray, config: AlignConfig) -> Tuple[np.ndarray, np.ndarray]:
+    out = np.empty((grid.size, values.shape[1]), dtype=np.float32)
+    observed = np.empty((grid.size, values.shape[1]), dtype=bool)
+    for j in range(values.shape[1]):
+        valid = ~np.isnan(values[:, j])
+        out[:, j], observed[:, j] = _align_column(times[valid], values[valid, j], grid, config)
+    return out, observed
+
+
+def _grid_range(t_start: float, t_end: float, rate_hz: float) -> Tuple[int, int]:
+    """[t_start, t_end] 안의 격자 인덱스 범위 (격자는 절대 시각 k / rate_hz에 고정)"""
+    return math.ceil(t_start * rate_hz - _EPS), math.floor(t_end * rate_hz + _EPS)
+
+
+# =============================================================================
+# 배치 정렬
+# =============================================================================
+@dataclass
+class Trip:
+    times: np.ndarray           # (N,) 초 (자정 넘김 보정 완료, 오름차순)
+    values: np.ndarray          # (N, F) float32, 결측 NaN
+    columns: List[str]
+
+
+@dataclass
+class AlignedTrip:
+    grid: np.ndarray            # (T,) 격자 시각 (초)
+    values: np.ndarray          # (T, F) float32 (채울 수 없는 칸은 NaN)
+    observed: np.ndarray        # (T, F) bool, 실제 관측(nearest) 여부
+    columns: List[str]
+    config: AlignConfig
+
+    def windows(self, window_sec: float, stride_sec: float, anchored: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        anchored=True: 윈도우 끝 시각이 stride의 배수(격자 절대 시각 기준)에 오도록 시작 위치를 맞춤
+                       → 구간을 조금 다르게 잘라 다시 정렬해도 같은 윈도우 (배치 재실행 / 증분 채점)
+
+        Returns:
+            starts: (W,) 윈도우 시작 격자 인덱스
+            coverage: (W, F) 신호별 실제 관측 비율
+            usable: (W,) 모든 신호가 min_coverage 이상이고 NaN이 없는 윈도우
+        """
+        length = int(round(window_sec * self.config.rate_hz))
+        stride = max(1, int(round(stride_sec * self.config.rate_hz)))
+        T = self.grid.size
+        if T < length:
+            F = len(self.columns)
+            return np.empty(0, dtype=np.int64), np.empty((0, F)), np.empty(0, dtype=bool)
+        first = 0
+        if anchored:
+            first = -(int(round(self.grid[0] * self.config.rate_hz)) + length) % stride
+        starts = np.arange(first, T - length + 1, stride)
+
+        observed_sum = np.vstack([np.zeros((1, self.observed.shape[1])), np.cumsum(self.observed, axis=0)])
+        coverage = (observed_sum[starts + length] - observed_sum[starts]) / length
+        nan_rows = np.concatenate([[0], np.cumsum(np.isnan(self.values).any(axis=1))])
+        complete = (nan_rows[starts + length] - nan_rows[starts]) == 0
+        usable = complete & (coverage >= self.config.min_coverage - _EPS).all(axis=1)
+        return starts, coverage, usable
+
+    def window(self, start: int, window_sec: float) -> np.ndarray:
+        return self.values[start:start + int(round(window_sec * self.config.rate_hz))]
+
+
+def align(trip: Trip, config: AlignConfig = AlignConfig()) -> AlignedTrip:
+    if trip.times.size == 0:
+        F = len(trip.columns)
+        return AlignedTrip(np.empty(0), np.empty((0, F), dtype=np.float32), np.empty((0, F), dtype=bool),
+                           trip.columns, config)
+    k0, k1 = _grid_range(trip.times[0], trip.times[-1], config.rate_hz)
+    grid = np.arange(k0, k1 + 1) / config.rate_hz
+    values, observed = _align_all(trip.times, trip.values, grid, config)
+    return AlignedTrip(grid, values, observed, trip.columns, config)
+
+
+def make_trip(times: Sequence, values: np.ndarray, columns: Sequence[str]) -> Trip:
+    """원본 시각(HH:MM:SS.fff 문자열 또는 초) + 값 → Trip (자정 넘김 보정, 시각순 정렬)"""
+    raw = np.asarray(times)
+    seconds = raw.astype(np.float64) if raw.dtype.kind in "fiu" else parse_clock(raw)
+    seconds, _ = unwrap_midnight(seconds)
+    values = np.asarray(values, dtype=np.float32).reshape(len(seconds), len(columns))
+    if seconds.size and np.any(np.diff(seconds) < 0):
+        order = np.argsort(seconds, kind="stable")
+        seconds, values = seconds[order], values[order]
+    return Trip(seconds, values, list(columns))
+
+
+def normalize_header(name: str) -> str:
+    # 일부 CSV는 "°C"가 이중 인코딩되어 "Â°C"로 저장되어 있음
+    return name.replace("Â°", "°").strip()
+
+
+def load_trip_csv(path: str, columns: Dict[str, str], time_column: str = "Time") -> Trip:
+    """
+    OBD 로그 CSV → Trip
+
+    Args:
+        columns: 원본 헤더 → 신호명 (예: {"Engine RPM [RPM]": "rpm"}), 순서대로 F 축 구성
+    """
+    import pandas as pd
+
+    header = [normalize_header(h) for h in pd.read_csv(path, nrows=0).columns]
+    missing = [c for c in [time_column, *columns] if c not in header]
+    if missing:
+        raise KeyError(f"{path}: 컬럼 없음 {missing}")
+    positions = [header.index(time_column)] + [header.index(c) for c in columns]
+    df = pd.read_csv(
+        path,
+        usecols=positions,
+        header=0,
+        names=header,
+        dtype={header[p]: (f"S{TIME_WIDTH}" if p == positions[0] else np.float32) for p in positions},
+        engine="c",
+    )
+    values = df[list(columns)].to_numpy(dtype=np.float32)
+    return make_trip(df[time_column].to_numpy(), values, list(columns.values()))
+
+
+# =============================================================================
+# 스트리밍 정렬
+# =============================================================================
+class StreamingAligner:
+    """
+    증분 샘플 배치 → 확정된 격자 칸
+
+    격자 칸 k는 시각 k / rate_hz + tolerance 이후의 샘플이 도착하면 확정됩니다.
+    (그 뒤에 오는 샘플은 그 칸의 nearest 후보가 될 수 없으므로 배치 정렬과 같은 결과)
+    샘플은 시각순으로 도착한다고 가정합니다.
+    """
+
+    def __init__(self, columns: Sequence[str], config: AlignConfig = AlignConfig()):
+        self.columns = list(columns)
+        self.config = config
+        self._times = np.empty(0, dtype=np.float64)
+        self._values = np.empty((0, len(self.columns)), dtype=np.float32)
+        self._next_k: Optional[int] = None
+        self._last_raw: Optional[float] = None
+        self._day_offset = 0.0
+
+    def push(self, times: Sequence, values: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Args:
+            times: 원본 시각 (HH:MM:SS.fff 문자열 또는 자정 기준 초), values: (n, F) 결측 NaN
+        Returns:
+            (grid, values, observed): 이번에 확정된 격자 칸 (없으면 길이 0)
+        """
+        raw = np.asarray(times)
+        seconds = raw.astype(np.float64) if raw.dtype.kind in "fiu" else parse_clock(raw)
+        if seconds.size:
+            last_raw = float(seconds[-1])
+            seconds, self._day_offset = unwrap_midnight(seconds, self._last_raw, self._day_offset)
+            self._last_raw = last_raw
+            values = np.asarray(values, dtype=np.float32).reshape(seconds.size, len(self.columns))
+            self._times = np.concatenate([self._times, seconds])
+            self._values = np.concatenate([self._values, values])
+            if self._next_k is None:
+                self._next_k = _grid_range(seconds[0], seconds[0], self.config.rate_hz)[0]
+        if self._next_k is None or self._times.size == 0:
+            return self._empty()
+
+        _, k_final = _grid_range(0.0, self._times[-1] - self.config.tolerance, self.config.rate_hz)
+        return self._emit(k_final)
+
+    def flush(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """스트림 종료: 마지막 샘플 시각까지의 칸을 모두 확정"""
+        if self._next_k is None or self._times.size == 0:
+            return self._empty()
+        return self._emit(_grid_range(0.0, self._times[-1], self.config.rate_hz)[1])
+
+    def _emit(self, k_final: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if k_final < self._next_k:
+            return self._empty()
+        grid = np.arange(self._next_k, k_final + 1) / self.config.rate_hz
+        values, observed = _align_all(self._times, self._values, grid, self.config)
+        self._next_k = k_final + 1
+        self._trim()
+        return grid, values, observed
+
+    def _trim(self):
+        """다음 격자 칸 계산에 필요한 샘플만 유지 (ffill / tolerance 범위 밖의 과거 샘플은 결과에 영향 없음)"""
+        horizon = self._next_k / self.config.rate_hz - max(self.config.tolerance, self.config.max_ffill_sec) - _EPS
+        start = int(np.searchsorted(self._times, horizon, side="left"))
+        if start:
+            self._times = self._times[start:]
+            self._values = self._values[start:]
+
+    def _empty(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        F = len(self.columns)
+        return np.empty(0), np.empty((0, F), dtype=np.float32), np.empty((0, F), dtype=bool)
@@ -0,0 +1,314 @@
+# ai/app/services/obd_engine_anomaly/trip_store.py
+"""
+OBD 주행(Trip) 컬럼 저장소 (Columnar Trip Store)
+
+[역할]
+1. 1회 변환: 원본 CSV(ai/data/obd/raw/{frei,normal,stau})를 한 번만 파싱하여
+   주행별 컬럼 파일(int64 나노초 타임스탬프 + 신호별 float32)로 저장합니다.
+2. 카탈로그: 주행 목록(category, 길이, 신호별 관측 비율)을 catalog.json 하나로 조회합니다.
+3. 증분 갱신: 파일 내용 해시(SHA-1)가 같은 CSV는 다시 변환하지 않습니다. (크기/수정시각이 같으면 해시 계산도 생략)
+4. 병렬 변환: 파일 단위로 프로세스 풀에서 변환합니다.
+5. 조회: np.load(mmap_mode="r")로 복사 없이 메모리 매핑된 배열을 반환합니다.
+
+[저장 구조]
+ai/data/obd/store/
+  ├── catalog.json              (trip_id → 메타데이터, 원본 경로 → 해시/크기/수정시각)
+  └── trips/{category}/{파일명}-{sha1[:12]}/
+        ├── time_ns.npy          (int64, 파일명 날짜 자정 기준 epoch 나노초, 자정 넘김 보정)
+        └── {signal}.npy         (float32, 결측 NaN, 신호명은 feature_engine_common.json 기준)
+
+[사용처]
+- csv_to_wear_factor.py --store: 주행 습관 특징 추출
+- lstm_preprocess / scaler: LSTM-AE 학습 데이터 윈도우, 정규화 통계
+
+[사용법]
+python -m ai.scripts.obd_engine.build_trip_store --workers 4
+store = TripStore()
+for entry in store.trips(category="normal"):
+    cols = store.columns(entry["trip_id"], ["rpm", "speed"])   # memmap
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ai.app.services.obd_engine_anomaly.feature_registry import SIGNAL_ALIASES
+from ai.app.services.obd_engine_anomaly.time_aligner import (
+    TIME_WIDTH, Trip, normalize_header, parse_clock, unwrap_midnight
+)
+
+STORE_ROOT = os.path.join("ai", "data", "obd", "store")
+RAW_ROOT = os.path.join("ai", "data", "obd", "raw")
+CATEGORIES = ("frei", "normal", "stau")
+STORE_VERSION = 1
+TIME_COLUMN = "Time"
+
+# 원본 CSV 헤더 → 저장 신호명 (ai/config/obd/feature_engine_common.json)
+RAW_COLUMNS: Dict[str, str] = {
+    "Engine Coolant Temperature [°C]": "engine_coolant_temp_c",
+    "Intake Manifold Absolute Pressure [kPa]": "imap_kpa",
+    "Engine RPM [RPM]": "engine_rpm",
+    "Vehicle Speed Sensor [km/h]": "vehicle_speed_kmh",
+    "Intake Air Temperature [°C]": "intake_air_temp_c",
+    "Air Flow Rate from Mass Flow Sensor [g/s]": "maf_gps",
+    "Absolute Throttle Position [%]": "throttle_pos_pct",
+    "Ambient Air Temperature [°C]": "ambient_air_temp_c",
+    "Accelerator Pedal Position D [%]": "acc_pedal_pos_d_pct",
+    "Accelerator Pedal Position E [%]": "acc_pedal_pos_e_pct",
+}
+
+_DATE_PREFIX = re.compile(r"^(\d{4})-(\d{2})-(\d{2})")
+
+
+def resolve_signal(name: str) -> str:
+    """짧은 이름(rpm) / 원본 헤더 / 저장 신호명 → 저장 신호명"""
+    return SIGNAL_ALIASES.get(name) or RAW_COLUMNS.get(normalize_header(name)) or name
+
+
+def file_sha1(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def list_trip_csvs(raw_root: str = RAW_ROOT, categories: Sequence[str] = CATEGORIES) -> List[str]:
+    files = []
+    for category in categories:
+        folder = os.path.join(raw_root, category)
+        if os.path.isdir(folder):
+            files.extend(os.path.join(folder, name) for name in sorted(os.listdir(folder)) if name.endswith(".csv"))
+    return files
+
+
+def detect_category(path: str) -> str:
+    parts = [p.lower() for p in os.path.normpath(path).split(os.sep)]
+    for category in CATEGORIES:
+        if category in parts:
+            return category
+    return "unknown"
+
+
+def _day_epoch_ns(path: str) -> int:
+    """파일명 앞의 YYYY-MM-DD를 주행 날짜로 사용 (없으면 1970-01-01)"""
+    match = _DATE_PREFIX.match(os.path.basename(path))
+    if not match:
+        return 0
+    days = (date(*map(int, match.groups())) - date(1970, 1, 1)).days
+    return days * 86400 * 10**9
+
+
+# =============================================================================
+# 변환 (프로세스 풀 작업 단위)
+# =============================================================================
+def convert_csv(path: str, digest: str, trip_dir: str) -> Dict:
+    """CSV 1개 → trip_dir 아래 컬럼 파일, 카탈로그 항목 반환"""
+    import pandas as pd
+
+    header = [normalize_header(h) for h in pd.read_csv(path, nrows=0).columns]
+    if TIME_COLUMN not in header:
+        raise ValueError(f"{TIME_COLUMN} 컬럼 없음: {header}")
+    signals = {i: RAW_COLUMNS[h] for i, h in enumerate(header) if h in RAW_COLUMNS}
+    time_pos = header.index(TIME_COLUMN)
+    df = pd.read_csv(
+        path, header=0, names=header, usecols=[time_pos, *signals],
+        dtype={header[time_pos]: f"S{TIME_WIDTH}", **{header[i]: np.float32 for i in signals}},
+    )
+
+    seconds, _ = unwrap_midnight(parse_clock(df[TIME_COLUMN].to_numpy()))
+    order = np.argsort(seconds, kind="stable") if np.any(np.diff(seconds) < 0) else None
+    time_ns = np.rint(seconds * 1e6).astype(np.int64) * 1000 + _day_epoch_ns(path)
+
+    tmp_dir = trip_dir + ".tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    np.save(os.path.join(tmp_dir, "time_ns.npy"), time_ns if order is None else time_ns[order])
+    coverage = {}
+    for i, name in signals.items():
+        values = df[header[i]].to_numpy(dtype=np.float32)
+        np.save(os.path.join(tmp_dir, f"{name}.npy"), values if order is None else values[order])
+        coverage[name] = round(float((~np.isnan(values)).mean()) if values.size else 0.0, 4)
+    shutil.rmtree(trip_dir, ignore_errors=True)
+    os.replace(tmp_dir, trip_dir)
+
+    rows = int(time_ns.size)
+    return {
+        "category": detect_category(path),
+        "source": path,
+        "hash": digest,
+        "rows": rows,
+        "start_ns": int(time_ns.min()) if rows else 0,
+        "duration_sec": round(float(time_ns.max() - time_ns.min()) / 1e9, 3) if rows else 0.0,
+        "signals": list(signals.values()),
+        "coverage": coverage,
+    }
+
+
+def _convert_job(job):
+    path, digest, trip_dir = job
+    try:
+        return path, convert_csv(path, digest, trip_dir), None
+    except Exception as e:
+        return path, None, str(e)
+
+
+# =============================================================================
+# 저장소
+# =============================================================================
+class TripStore:
+    """
+    Usage:
+        store = TripStore()
+        store.sync(list_trip_csvs(), workers=4)          # 신규/변경 CSV만 변환
+        cols = store.columns(trip_id, ["rpm", "speed"])  # {"time_ns", "engine_rpm", ...} memmap
+        trip = store.load(trip_id, ["rpm", "speed"])     # time_aligner.Trip
+    """
+
+    def __init__(self, root: str = STORE_ROOT):
+        self.root = root
+        self.catalog_path = os.path.join(root, "catalog.json")
+        self.catalog = self._load_catalog()
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    # -------------------------------------------------------------------------
+    # Catalog
+    # -------------------------------------------------------------------------
+    def _load_catalog(self) -> Dict:
+        if os.path.exists(self.catalog_path):
+            with open(self.catalog_path, "r", encoding="utf-8") as f:
+                catalog = json.load(f)
+            if catalog.get("version") == STORE_VERSION:
+                return catalog
+            print(f"[Trip Store] 저장소 버전 변경 ({catalog.get('version')} → {STORE_VERSION}), 전체 재변환")
+        return {"version": STORE_VERSION, "trips": {}, "files": {}}
+
+    def _save_catalog(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.catalog_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.catalog, f, ensure_ascii=False, indent=1)
+        os.replace(tmp_path, self.catalog_path)
+
+    def _hash_for(self, path: str) -> str:
+        """크기/수정시각이 그대로면 기존 해시 재사용 (파일을 다시 읽지 않음)"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.catalog["files"].get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime:
+            return cached["hash"]
+        digest = file_sha1(path)
+        self.catalog["files"][key] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": digest}
+        return digest
+
+    def _trip_dir(self, trip_id: str, digest: str) -> str:
+        return os.path.join(self.root, "trips", f"{trip_id}-{digest[:12]}")
+
+    @staticmethod
+    def trip_id_for(path: str) -> str:
+        return f"{detect_category(path)}/{os.path.splitext(os.path.basename(path))[0]}"
+
+    # -------------------------------------------------------------------------
+    # 변환
+    # -------------------------------------------------------------------------
+    def sync(self, paths: Sequence[str], workers: int = 0, prune: bool = False) -> Dict[str, float]:
+        """
+        CSV 목록을 저장소와 동기화 (신규/변경 파일만 변환)
+
+        Args:
+            workers: 변환 프로세스 수 (0: CPU 수, 1: 현재 프로세스에서 순차 실행)
+            prune: paths에 없는 주행을 카탈로그와 디스크에서 제거
+        Returns:
+            {"total", "cached", "converted", "failed", "elapsed_sec"}
+        """
+        start = time.perf_counter()
+        trips = self.catalog["trips"]
+
+        jobs = []
+        for path in paths:
+            digest = self._hash_for(path)
+            entry = trips.get(self.trip_id_for(path))
+            trip_dir = self._trip_dir(self.trip_id_for(path), digest)
+            if entry and entry["hash"] == digest and os.path.isdir(trip_dir):
+                continue
+            os.makedirs(os.path.dirname(trip_dir), exist_ok=True)
+            jobs.append((path, digest, trip_dir))
+
+        converted = failed = 0
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                results = list(pool.map(_convert_job, jobs))
+        else:
+            results = [_convert_job(job) for job in jobs]
+
+        for path, entry, error in results:
+            if error is not None:
+                failed += 1
+                print(f"[Trip Store] 변환 실패: {path} - {error}")
+                continue
+            trip_id = self.trip_id_for(path)
+            previous = trips.get(trip_id)
+            if previous and previous["hash"] != entry["hash"]:
+                shutil.rmtree(self._trip_dir(trip_id, previous["hash"]), ignore_errors=True)
+            trips[trip_id] = {"trip_id": trip_id, **entry}
+            converted += 1
+
+        if prune:
+            keep = {self.trip_id_for(p) for p in paths}
+            for trip_id in [t for t in trips if t not in keep]:
+                shutil.rmtree(self._trip_dir(trip_id, trips.pop(trip_id)["hash"]), ignore_errors=True)
+
+        self._arrays.clear()
+        self._save_catalog()
+        stats = {
+            "total": len(paths),
+            "cached": len(paths) - len(jobs),
+            "converted": converted,
+            "failed": failed,
+            "elapsed_sec": round(time.perf_counter() - start, 2),
+        }
+        print(f"[Trip Store] total={stats['total']} cached={stats['cached']} "
+              f"converted={stats['converted']} failed={stats['failed']} ({stats['elapsed_sec']}s)")
+        return stats
+
+    # -------------------------------------------------------------------------
+    # 조회 (Zero-copy memmap)
+    # -------------------------------------------------------------------------
+    def trips(self, category: Optional[str] = None) -> List[Dict]:
+        return [e for _, e in sorted(self.catalog["trips"].items()) if category in (None, e["category"])]
+
+    def entry(self, trip_id: str) -> Dict:
+        if trip_id not in self.catalog["trips"]:
+            raise KeyError(f"저장소에 없는 주행: {trip_id}")
+        return self.catalog["trips"][trip_id]
+
+    def _array(self, trip_id: str, name: str) -> np.ndarray:
+        path = os.path.join(self._trip_dir(trip_id, self.entry(trip_id)["hash"]), f"{name}.npy")
+        if path not in self._arrays:
+            if not os.path.exists(path):
+                raise KeyError(f"{trip_id}: 신호 없음 {name}")
+            self._arrays[path] = np.load(path, mmap_mode="r")
+        return self._arrays[path]
+
+    def columns(self, trip_id: str, signals: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """{"time_ns": int64, 신호명: float32} 읽기 전용 memmap (signals 미지정 시 전체)"""
+        names = [resolve_signal(s) for s in signals] if signals is not None else self.entry(trip_id)["signals"]
+        return {"time_ns": self._array(trip_id, "time_ns"), **{n: self._array(trip_id, n) for n in names}}
+
+    def load(self, trip_id: str, signals: Sequence[str]) -> Trip:
+        """time_aligner 입력 (시각: 주행 날짜 자정 기준 초, 값: (N, F) float32 복사본)"""
+        cols = self.columns(trip_id, signals)
+        time_ns = cols["time_ns"]
+        day_ns = (int(time_ns[0]) // (86400 * 10**9)) * 86400 * 10**9 if time_ns.size else 0
+        values = np.empty((time_ns.size, len(signals)), dtype=np.float32)
+        for j, name in enumerate(signals):
+            values[:, j] = cols[resolve_signal(name)]
+        return Trip((time_ns - day_ns) / 1e9, values, list(signals))
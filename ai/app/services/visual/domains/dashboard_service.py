@@ -20,10 +20,14 @@ YOLO로 10종 경고등을 감지하고, LLM으로 의미와 조치 사항을 
   }
 }
 """
+import asyncio
 from typing import List, Optional, Union, Dict, Any
 from PIL import Image
 from ai.app.services.common.llm_service import analyze_general_image, interpret_dashboard_warnings
 from ai.app.services.visual.router_service import CONFIDENCE_THRESHOLD
+from ai.app.services.common.progress_events import emit
+from ai.app.services.common.active_learning_pipeline import ALCandidate, submit_al_candidate
+from ai.app.services.common.near_duplicate_index import image_fingerprint
 
 FAST_PATH_YOLO_CONF = 0.85  # 이 값 이상이면서 NORMAL이면 LLM 건너뜀
 
@@ -100,7 +104,7 @@ async def analyze_dashboard_image(
     # Step 0: YOLO 모델 없으면 LLM Fallback
     if yolo_model is None:
         print("[Dashboard] YOLO 모델 없음, LLM Fallback")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         return {
             "status": llm_result.status if hasattr(llm_result, 'status') else "ERROR",
             "analysis_type": "SCENE_DASHBOARD",
@@ -121,11 +125,12 @@ async def analyze_dashboard_image(
     
     # Step 1: YOLO 감지
     detections = await run_dashboard_yolo(image, yolo_model)
+    emit("detections", {"source": "yolo", "detections": detections})
     
     # Step 1-1: 감지된 경고등이 없으면, LLM으로 '진짜 계기판인지' + '다른 문제는 없는지' 2차 확인 (Safety Net)
     if len(detections) == 0:
         print("[Dashboard] 감지된 경고등 없음. LLM Safety Check 진행.")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         
         # 기본 상태는 UNKNOWN (YOLO가 아무것도 못 찾았으므로, 정상인지 모델 실패인지 엉뚱한 사진인지 모름)
         # LLM 분석 결과에 따라 상태를 결정함
@@ -143,7 +148,7 @@ async def analyze_dashboard_image(
         if status in ["WARNING", "CRITICAL"]:
             print(f"[Dashboard] YOLO Miss detected (Status: {status}). Requesting LLM Labeling...")
             from ai.app.services.common.llm_service import generate_training_labels
-            label_result = await generate_training_labels(s3_url, "dashboard")
+            label_result = await generate_training_labels(s3_url, "dashboard", image=image)
             
             for lbl in label_result.get("labels", []):
                 # LLM 라벨을 API detection 포맷으로 변환
@@ -152,28 +157,6 @@ async def analyze_dashboard_image(
                 # normalize_bbox 내부에서 ratio/pixel 판단하여 변환
                 pixel_bbox = normalize_bbox(bbox, image.width, image.height)
 
-                # [Active Learning] YOLO는 놓쳤지만 LLM이 찾은 경우 -> 매우 귀중한 '학습 데이터'로 기록
-                try:
-                    from ai.app.services.common.active_learning_service import get_active_learning_service
-                    al_service = get_active_learning_service()
-                    
-                    # 이미 위에서 generate_training_labels 결과를 label_result로 가지고 있음
-                    # label_result 구조: {"status":..., "labels": [...]}
-                    
-                    label_key = al_service.save_oracle_label(s3_url, label_result, "dashboard")
-                    if label_key:
-                        al_service.record_manifest(
-                            s3_url=s3_url,
-                            category="DASHBOARD",
-                            label_key=label_key,
-                            status=status,
-                            confidence=0.1, # YOLO는 못 찾았으므로 낮은 신뢰도 부여 (우선순위 상향)
-                            analysis_type="LLM_ORACLE_d_MISS", # YOLO Miss 특수 마킹
-                            domain="visual"
-                        )
-                except Exception as e:
-                    print(f"[Dashboard AL] Miss-detection 기록 실패: {e}")
-
                 fallback_detections.append({
                     "label": lbl.get("class", "Unknown"),
                     "color_severity": "RED" if status == "CRITICAL" else "YELLOW",
@@ -183,6 +166,19 @@ async def analyze_dashboard_image(
                     "bbox": pixel_bbox # [Fix] 이미 변환된 좌표 사용
                 })
 
+            # [Active Learning] YOLO는 놓쳤지만 LLM이 찾은 경우 -> 매우 귀중한 '학습 데이터'로 기록
+            # (라벨은 위 generate_training_labels 결과를 그대로 사용, 저장은 백그라운드 파이프라인이 처리)
+            await submit_al_candidate(ALCandidate(
+                s3_url=s3_url,
+                domain="dashboard",
+                category="DASHBOARD",
+                confidence=0.1,  # YOLO는 못 찾았으므로 낮은 신뢰도 부여 (우선순위 상향)
+                status=status,
+                analysis_type="LLM_ORACLE_d_MISS",  # YOLO Miss 특수 마킹
+                oracle_labels=label_result,
+                fingerprint=image_fingerprint(image),
+            ))
+
         return {
             "status": status,
             "analysis_type": "SCENE_DASHBOARD",
@@ -204,7 +200,7 @@ async def analyze_dashboard_image(
     max_confidence = max(d["confidence"] for d in detections)
     if max_confidence < CONFIDENCE_THRESHOLD:
         print(f"[Dashboard] 낮은 신뢰도({max_confidence:.2f}), LLM Fallback")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         return {
             "status": llm_result.status if hasattr(llm_result, 'status') else "WARNING",
             "analysis_type": "SCENE_DASHBOARD",
@@ -257,7 +253,17 @@ async def analyze_dashboard_image(
                 "description": label_info.get("description", "알 수 없는 경고등")
             })
         
-        llm_result = await interpret_dashboard_warnings(warning_list)
+        # [Optimization] 경고등 조합별 사전 생성 해석 테이블 우선 조회 (없는 조합만 LLM 호출 후 Write-back)
+        from ai.app.services.visual.domains.dashboard_table import get_dashboard_table
+        table = get_dashboard_table()
+        mask = table.mask_for(w["name"] for w in warning_list)
+        llm_result = table.get(mask)
+        if llm_result is not None:
+            print(f"[Dashboard] 해석 테이블 적중 (mask={mask}). LLM 스킵.")
+        else:
+            llm_result = await interpret_dashboard_warnings(warning_list)
+            if mask and not llm_result.get("is_mock"):
+                await asyncio.to_thread(table.write_back, mask, llm_result)
         
         integrated_analysis = {
             "severity_score": severity_score,
@@ -268,35 +274,19 @@ async def analyze_dashboard_image(
             "primary_action": llm_result.get("recommendation", None)
         }
     
-    # [Active Learning] 공통 서비스 활용
-    # max_confidence가 0.85 미만이고, 0보다는 큰 경우 (완전 실패는 아님)
-    if detections and max_confidence < FAST_PATH_YOLO_CONF: 
-         try:
-             from ai.app.services.common.active_learning_service import get_active_learning_service
-             from ai.app.services.common.llm_service import generate_training_labels
-             
-             al_service = get_active_learning_service()
-             print(f"[Dashboard] Active Learning 대상 감지 (Conf: {max_confidence})")
-             
-             oracle_labels = await generate_training_labels(s3_url, "dashboard")
-             
-             if not oracle_labels or not oracle_labels.get("labels"):
-                 return
-             
-             # [Fix] 안전한 Key 사용 (추정이 아닌 반환값 사용)
-             label_key = al_service.save_oracle_label(s3_url, oracle_labels, "dashboard")
-             if label_key:
-                 al_service.record_manifest(
-                     s3_url=s3_url,
-                     category="DASHBOARD",
-                     label_key=label_key,
-                     status=oracle_labels.get("status", "UNKNOWN"),
-                     confidence=max_confidence,
-                     analysis_type="LLM_ORACLE_DASHBOARD",
-                     domain="visual"
-                     )
-         except Exception as e:
-             print(f"AL Fail: {e}")
+    # [Active Learning] 애매한 신뢰도의 탐지 결과는 재학습 후보로만 등록 (Oracle 호출은 백그라운드)
+    if detections and max_confidence < FAST_PATH_YOLO_CONF:
+        print(f"[Dashboard] Active Learning 후보 등록 (Conf: {max_confidence})")
+        await submit_al_candidate(ALCandidate(
+            s3_url=s3_url,
+            domain="dashboard",
+            category="DASHBOARD",
+            confidence=max_confidence,
+            status=max_severity,
+            analysis_type="LLM_ORACLE_DASHBOARD",
+            model_output={"labels": [{"class": d["label"], "confidence": d["confidence"]} for d in detections]},
+            fingerprint=image_fingerprint(image),
+        ))
 
     # API 명세서 형식에 맞춤
     return {
@@ -0,0 +1,177 @@
+# ai/app/services/visual/domains/dashboard_table.py
+"""
+계기판 경고등 조합 해석 테이블 (Bitmask Interpretation Table)
+
+[역할]
+1. 조합 인덱싱: 10종 경고등의 점등 집합을 10bit 마스크(0~1023)로 표현하여 O(1)로 해석을 조회합니다.
+2. 사전 생성: build_dashboard_table.py가 관측된(또는 전체 2^10) 조합의 해석을 미리 생성/검수하여 저장합니다.
+3. Write-back: 테이블에 없는 조합은 LLM 결과를 받아 테이블에 추가 저장합니다.
+
+[파일 형식] ai/config/dashboard_interpretations.json
+{
+  "version": 1,
+  "classes": ["Anti Lock Braking System", ...],   # 비트 순서 (index i → 1 << i)
+  "entries": {
+    "9": {"description": "...", "recommendation": "...", "source": "offline", "reviewed": true}
+  }
+}
+
+[참고]
+- interpret_dashboard_warnings의 입력은 경고등별 고정 정보(name/severity/description)뿐이므로
+  같은 조합이면 같은 해석을 재사용할 수 있습니다.
+- classes가 서버의 DASHBOARD_CLASSES와 다르면 비트 의미가 달라지므로 테이블 전체를 무시합니다.
+"""
+import json
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional
+
+TABLE_PATH = os.getenv("DASHBOARD_TABLE_PATH", "ai/config/dashboard_interpretations.json")
+TABLE_VERSION = 1
+
+
+class DashboardInterpretationTable:
+    """경고등 조합(bitmask) → 해석(description/recommendation)"""
+
+    def __init__(self, class_names: List[str], path: str = TABLE_PATH):
+        if len(class_names) > 16:
+            raise ValueError("Too many classes for a bitmask table")
+        self.classes = list(class_names)
+        self.bit_of = {name: i for i, name in enumerate(self.classes)}
+        self.path = path
+        self._entries: List[Optional[Dict[str, Any]]] = [None] * (1 << len(self.classes))
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writebacks = 0
+        self.load()
+
+    # -------------------------------------------------------------------------
+    # 마스크 변환
+    # -------------------------------------------------------------------------
+    def mask_for(self, labels: Iterable[str]) -> Optional[int]:
+        """라벨 집합 → 마스크 (테이블에 없는 라벨이 섞여 있으면 None)"""
+        mask = 0
+        for label in labels:
+            bit = self.bit_of.get(label)
+            if bit is None:
+                return None
+            mask |= 1 << bit
+        return mask
+
+    def labels_for(self, mask: int) -> List[str]:
+        return [name for i, name in enumerate(self.classes) if mask & (1 << i)]
+
+    # -------------------------------------------------------------------------
+    # 조회 / 저장
+    # -------------------------------------------------------------------------
+    def get(self, mask: Optional[int]) -> Optional[Dict[str, Any]]:
+        entry = self._entries[mask] if mask else None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, mask: int, description: str, recommendation: str, source: str, reviewed: bool = False):
+        self._entries[mask] = {
+            "description": description,
+            "recommendation": recommendation,
+            "source": source,
+            "reviewed": reviewed,
+        }
+
+    def write_back(self, mask: int, result: Dict[str, Any]):
+        """온라인 LLM 결과를 테이블에 추가하고 파일에 반영 (검수 전 상태)"""
+        if not mask or self._entries[mask] is not None:
+            return
+        if not result.get("description") or not result.get("recommendation"):
+            return
+        self.put(mask, result["description"], result["recommendation"], source="online")
+        self.writebacks += 1
+        try:
+            self.save()
+        except OSError as e:
+            print(f"[Dashboard Table] 저장 실패 (메모리에만 유지): {e}")
+
+    def items(self):
+        for mask, entry in enumerate(self._entries):
+            if entry is not None:
+                yield mask, entry
+
+    def __len__(self) -> int:
+        return sum(1 for e in self._entries if e is not None)
+
+    # -------------------------------------------------------------------------
+    # 파일 I/O
+    # -------------------------------------------------------------------------
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"[Dashboard Table] 로드 실패 (빈 테이블로 시작): {e}")
+            return
+
+        if data.get("classes") != self.classes:
+            print("[Dashboard Table] 클래스 구성이 서버와 달라 테이블을 무시합니다. build_dashboard_table.py로 재생성하세요.")
+            return
+
+        for key, entry in data.get("entries", {}).items():
+            mask = int(key)
+            if 0 < mask < len(self._entries):
+                self._entries[mask] = entry
+        print(f"[Dashboard Table] {len(self)}개 조합 로드 ({self.path})")
+
+    def save(self):
+        """
+        원자적 저장 (임시 파일 → os.replace)
+        다른 워커가 먼저 추가한 항목이 있으면 합쳐서 저장합니다.
+        """
+        with self._lock:
+            on_disk = {}
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                    if data.get("classes") == self.classes:
+                        on_disk = data.get("entries", {})
+                except (OSError, json.JSONDecodeError):
+                    pass
+
+            entries = dict(on_disk)
+            entries.update({str(mask): entry for mask, entry in self.items()})
+            payload = {
+                "version": TABLE_VERSION,
+                "classes": self.classes,
+                "entries": {k: entries[k] for k in sorted(entries, key=int)},
+            }
+
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp.{os.getpid()}"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self),
+            "capacity": len(self._entries) - 1,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writebacks": self.writebacks,
+        }
+
+
+_table: Optional[DashboardInterpretationTable] = None
+
+
+def get_dashboard_table() -> DashboardInterpretationTable:
+    """싱글톤 (DASHBOARD_CLASSES 순서로 비트 고정)"""
+    global _table
+    if _table is None:
+        from ai.app.services.visual.domains.dashboard_service import DASHBOARD_CLASSES
+        _table = DashboardInterpretationTable(list(DASHBOARD_CLASSES.keys()))
+    return _table
@@ -36,6 +36,10 @@ from ai.app.services.visual.utils.crop_service import crop_detected_parts
 from ai.app.services.visual.domains.engine.anomaly_service import AnomalyDetector
 from ai.app.services.visual.utils.heatmap_service import generate_heatmap_overlay
 from ai.app.services.common.llm_service import suggest_anomaly_label_with_base64, analyze_general_image
+from ai.app.services.common.vision_input import prepare_image
+from ai.app.services.common.progress_events import emit
+from ai.app.services.common.active_learning_pipeline import ALCandidate, submit_al_candidate
+from ai.app.services.common.near_duplicate_index import image_fingerprint
 from ai.app.schemas.visual_schema import VisualResponse
 
 # =============================================================================
@@ -131,13 +135,17 @@ class EngineAnomalyPipeline:
 
         # 2. YOLO 추론
         yolo_result = await run_yolo_inference(s3_url, image=image, model=yolo_model)
+        emit("detections", {
+            "source": "yolo",
+            "detections": [d.model_dump() if hasattr(d, "model_dump") else d.dict() for d in (yolo_result.detections or [])],
+        })
         
         # =================================================================
         # Path B: YOLO가 부품을 감지하지 못한 경우
         # =================================================================
         if yolo_result.detected_count == 0:
             print(f"[Pipeline] Path B: No parts detected. LLM Fallback.")
-            llm_result = await analyze_general_image(s3_url)
+            llm_result = await analyze_general_image(s3_url, image=image)
             
             # API 명세서 형식에 맞춤
             # [보정 로직] Router가 엔진룸으로 잘못 분류했지만 LLM이 계기판으로 판단한 경우
@@ -153,7 +161,7 @@ class EngineAnomalyPipeline:
             if status in ["WARNING", "CRITICAL"]:
                 print(f"[Engine] YOLO Miss detected (Status: {status}). Requesting LLM Labeling...")
                 from ai.app.services.common.llm_service import generate_training_labels
-                label_result = await generate_training_labels(s3_url, "engine")
+                label_result = await generate_training_labels(s3_url, "engine", image=image)
                 
                 for lbl in label_result.get("labels", []):
                     # LLM 라벨을 PartAnalysisResult (dict) 포맷으로 변환
@@ -212,7 +220,14 @@ class EngineAnomalyPipeline:
                 self._analyze_single_part(part_name, crop_img, bbox, conf, request_id, s3_url)
             )
         
-        part_results = await asyncio.gather(*tasks)
+        # [Streaming] 부품별 PatchCore(+LLM) 결과는 완료되는 순서대로 전달 (최종 집계 순서는 유지)
+        async def _emit_when_done(task):
+            res = await task
+            if res:
+                emit("part", asdict(res))
+            return res
+
+        part_results = await asyncio.gather(*[_emit_when_done(t) for t in tasks])
         
         # 결과 집계
         results = []
@@ -259,7 +274,7 @@ class EngineAnomalyPipeline:
         
         [파라미터 설명]
         - s3_url: 원본 이미지의 S3 경로. Active Learning 시 라벨 JSON 저장 경로 생성에 사용.
-                  예: s3://bucket/images/abc123.jpg → dataset/engine/llm_confirmed/abc123_Battery.json
+                  예: s3://bucket/images/abc123.jpg → dataset/llm_confirmed/visual/engine/abc123_Battery.json
         """
         async with SEMAPHORE:
             # Anomaly Detection
@@ -275,13 +290,13 @@ class EngineAnomalyPipeline:
                     # 히트맵 생성 (PatchCore 학습 전이면 에러가 날 수 있으므로 예외 처리)
                     if anomaly_result.heatmap is not None:
                         heatmap_overlay = generate_heatmap_overlay(crop_img, anomaly_result.heatmap)
-                        heatmap_b64 = self._image_to_base64(heatmap_overlay)
+                        heatmap_b64 = await self._image_to_base64(heatmap_overlay, profile="heatmap")
                 except Exception as e:
                     print(f"[Engine Warning] Heatmap generation failed (Model might be untrained): {e}")
                     heatmap_b64 = None
                 
                 # 이미지를 Base64로 변환
-                crop_b64 = self._image_to_base64(crop_img)
+                crop_b64 = await self._image_to_base64(crop_img)
                 
                 # LLM에게 Base64 + Heatmap(Optional) + BBox 정보 전달 (Robust Hybrid)
                 llm_res = await suggest_anomaly_label_with_base64(
@@ -306,21 +321,9 @@ class EngineAnomalyPipeline:
                      # LLM도 이상 동의 시, 또는 LLM이 Mock 모드일 때는 PatchCore의 감지 결과(True)를 그대로 유지합니다.
                      pass
                 
-                # [Active Learning] 엔진룸 이상탐지 정답(Oracle) S3 저장
+                # [Active Learning] 엔진룸 이상탐지 정답(Oracle)을 재학습 후보로 등록
+                # (부품별 라벨: label_suffix=부품명 → dataset/llm_confirmed/visual/engine/{file_id}_{part_name}.json)
                 try:
-                    import boto3
-                    s3 = boto3.client('s3')
-                    bucket = os.getenv("S3_BUCKET_NAME", "car-sentry-data")
-                    # 부품별 고유 ID 생성 (이미지ID + 부품명)
-                    # 파일 ID 추출: s3_url이 base64인 경우 처리
-                    if s3_url.startswith("data:"):
-                        import hashlib
-                        file_id = hashlib.md5(s3_url.encode()).hexdigest()[:10]
-                    else:
-                        file_id = os.path.basename(s3_url).split('.')[0]
-                        
-                    label_key = f"dataset/engine/llm_confirmed/{file_id}_{part_name}.json"
-                    
                     oracle_data = {
                         "domain": "engine",
                         "source_url": s3_url,
@@ -331,13 +334,21 @@ class EngineAnomalyPipeline:
                         "status": llm_res.get("severity")
                     }
                     
-                    s3.put_object(
-                        Bucket=bucket,
-                        Key=label_key,
-                        Body=json.dumps(oracle_data, ensure_ascii=False, indent=2),
-                        ContentType='application/json'
-                    )
-                    print(f"[Active Learning] 엔진 부품 정답지 저장 완료: {label_key}")
+                    await submit_al_candidate(ALCandidate(
+                        s3_url=s3_url,
+                        domain="engine",
+                        category="ENGINE",
+                        confidence=confidence,
+                        status=llm_res.get("severity") or "UNKNOWN",
+                        analysis_type="LLM_ORACLE_ENGINE",
+                        # PatchCore 점수/임계값 → 선별 점수 (임계값 근처일수록 가치 높음)
+                        model_output={"labels": [{"class": part_name, "confidence": confidence}],
+                                      "anomaly_score": anomaly_result.score,
+                                      "anomaly_threshold": anomaly_result.threshold},
+                        oracle_labels=oracle_data,
+                        fingerprint=image_fingerprint(crop_img, with_embedding=False),
+                        label_suffix=part_name,
+                    ))
                 except Exception as e:
                     print(f"[Active Learning Engine] 저장 실패: {e}")
 
@@ -358,7 +369,7 @@ class EngineAnomalyPipeline:
                 else:
                     # 정상 범위지만 확신도가 낮으면 LLM 확인 (Dual-Check)
                     print(f"[Engine] 낮은 확신도 정상({normal_confidence:.2f}), LLM 확인 요청: {part_name}")
-                    crop_b64 = self._image_to_base64(crop_img)
+                    crop_b64 = await self._image_to_base64(crop_img)
                     llm_res = await suggest_anomaly_label_with_base64(
                         crop_base64=crop_b64,
                         heatmap_base64=None, # 정상일 땐 히트맵 생략 가능
@@ -383,14 +394,10 @@ class EngineAnomalyPipeline:
 
     # _load_image_async 제거 (visual_service 피쳐 활용)
 
-    def _image_to_base64(self, image: Image.Image, format: str = "JPEG") -> str:
-        """PIL Image를 Base64 문자열로 변환 (RGB 변환 및 JPEG 포합 보장)"""
-        buffer = io.BytesIO()
-        # RGBA 등을 RGB로 변환 (OpenAI JPEG 호환성)
-        if image.mode != "RGB":
-            image = image.convert("RGB")
-        image.save(buffer, format=format, quality=85)
-        return base64.b64encode(buffer.getvalue()).decode('utf-8')
+    async def _image_to_base64(self, image: Image.Image, profile: str = "engine_crop") -> str:
+        """PIL Image를 Base64 문자열로 변환 (프로필별 해상도/품질/용량 예산 적용, 인코딩은 이벤트 루프 밖에서)"""
+        prepared = await asyncio.to_thread(prepare_image, image, profile)
+        return prepared.base64_data
 
     async def close(self):
         """HTTP 클라이언트 종료 (필요시)"""
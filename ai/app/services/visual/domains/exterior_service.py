@@ -24,6 +24,7 @@ from PIL import Image
 from ai.app.services.common.llm_service import analyze_general_image, generate_exterior_report
 from ai.app.services.visual.router_service import CONFIDENCE_THRESHOLD
 from ai.app.services.visual.yolo_utils import normalize_bbox
+from ai.app.services.common.progress_events import emit
 
 # =============================================================================
 # Reliability Thresholds
@@ -140,7 +141,7 @@ async def analyze_exterior_image(
     # Step 0: 모델 없으면 LLM Fallback
     if exterior_model is None:
         print("[Exterior] YOLO 모델 없음, LLM Fallback")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         return {
             "status": llm_result.status if hasattr(llm_result, 'status') else "ERROR",
             "analysis_type": "SCENE_EXTERIOR",
@@ -156,12 +157,13 @@ async def analyze_exterior_image(
     
     # Step 1: YOLO 추론
     detections = await run_exterior_yolo(image, exterior_model)
+    emit("detections", {"source": "yolo", "detections": detections})
     
     # Step 1-1: 파손이 감지되지 않으면, LLM으로 '진짜 외관인지' + '미세 파손은 없는지' 2차 확인 (Safety Net)
     # Step 1-1: 파손이 감지되지 않으면, LLM으로 '진짜 외관인지' + '미세 파손은 없는지' 2차 확인 (Safety Net)
     if len(detections) == 0:
         print("[Exterior] 감지된 파손 없음. LLM Safety Check 진행.")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         
         status = "UNKNOWN"
         description = "파손이 감지되지 않았으나, 명확한 상태 판단을 위해 AI 정밀 분석이 수행되었습니다."
@@ -177,7 +179,7 @@ async def analyze_exterior_image(
         if status in ["WARNING", "CRITICAL"]:
             print(f"[Exterior] YOLO Miss detected (Status: {status}). Requesting LLM Labeling...")
             from ai.app.services.common.llm_service import generate_training_labels
-            label_result = await generate_training_labels(s3_url, "exterior")
+            label_result = await generate_training_labels(s3_url, "exterior", image=image)
             
             for lbl in label_result.get("labels", []):
                 # LLM 라벨을 API detection 포맷으로 변환
@@ -220,7 +222,7 @@ async def analyze_exterior_image(
     max_confidence = max(d["confidence"] for d in detections)
     if max_confidence < CONFIDENCE_THRESHOLD:
         print(f"[Exterior] 낮은 신뢰도({max_confidence:.2f}), LLM Fallback")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         return {
             "status": llm_result.status if hasattr(llm_result, 'status') else "WARNING",
             "analysis_type": "SCENE_EXTERIOR",
@@ -38,9 +38,12 @@
 }
 """
 import os
-from typing import List, Union, Dict, Any
+from typing import List, Union, Dict, Any, Optional
 from PIL import Image
 from ai.app.services.visual.router_service import CONFIDENCE_THRESHOLD
+from ai.app.services.common.progress_events import emit
+from ai.app.services.common.active_learning_pipeline import ALCandidate, submit_al_candidate
+from ai.app.services.common.near_duplicate_index import image_fingerprint
 
 # =============================================================================
 # Reliability Thresholds
@@ -116,7 +119,7 @@ async def run_tire_yolo(
         return {"is_worn": None, "confidence": 0.0, "label": None}
 
 
-async def get_tire_analysis_from_llm(s3_url: str) -> Dict[str, Any]:
+async def get_tire_analysis_from_llm(s3_url: str, image: Optional[Image.Image] = None) -> Dict[str, Any]:
     """
     [LLM 역할] 마모도(%) + 위험 상태 전부 측정
     
@@ -184,7 +187,7 @@ async def get_tire_analysis_from_llm(s3_url: str) -> Dict[str, Any]:
 - false: 그 외"""
 
         # LLM 호출
-        result = await call_openai_vision(s3_url, PROMPT)
+        result = await call_openai_vision(s3_url, PROMPT, profile="tire_wear", image=image)
         
         # critical_issues가 빈 배열이면 null로 변환
         if result.get("critical_issues") == []:
@@ -237,6 +240,7 @@ async def analyze_tire_image(
     if yolo_model is not None:
         yolo_result = await run_tire_yolo(image, yolo_model)
         print(f"[Tire] YOLO 1차 판단: {yolo_result}")
+        emit("detections", {"source": "yolo", "detections": [yolo_result]})
     
     # 신뢰도가 매우 높으면 로컬 결과만으로 리포트 생성 (LLM 비용 절감 및 속도)
     if yolo_result and yolo_result.get("confidence", 0) >= FAST_PATH_THRESHOLD:
@@ -278,7 +282,7 @@ async def analyze_tire_image(
     # Step 2: LLM으로 마모도(%) + 위험상태 정밀 측정 (저신뢰 데이터 등)
     # =================================================================
     print(f"[Tire] LLM 정밀 분석 시작 (신뢰도 낮음)...")
-    llm_result = await get_tire_analysis_from_llm(s3_url)
+    llm_result = await get_tire_analysis_from_llm(s3_url, image=image)
     
     wear_level_pct = llm_result.get("wear_level_pct")
     wear_status = llm_result.get("wear_status", "UNKNOWN")
@@ -315,7 +319,7 @@ async def analyze_tire_image(
     # 이 데이터가 축적되면:
     # 1. Tire YOLO 다중클래스 재학습 (crack/flat/bulge/uneven 추가)
     # 2. Regression 모델 학습 (마모도 % 직접 예측)
-    await _save_tire_analysis_data(s3_url, llm_result, yolo_result)
+    await _save_tire_analysis_data(s3_url, llm_result, yolo_result, image=image)
     
     # =================================================================
     # 응답 반환 (API 명세서 형식)
@@ -338,7 +342,8 @@ async def analyze_tire_image(
 async def _save_tire_analysis_data(
     s3_url: str, 
     llm_result: Dict[str, Any],
-    yolo_result: Dict[str, Any] = None
+    yolo_result: Dict[str, Any] = None,
+    image: Optional[Image.Image] = None
 ):
     """
     [Active Learning] 타이어 분석 데이터를 S3에 저장
@@ -351,69 +356,30 @@ async def _save_tire_analysis_data(
     └─────────────────────────────────────────────────────────────┘
     
     [저장 경로]
-    dataset/tire/llm_confirmed/{file_id}.json
+    dataset/llm_confirmed/visual/tire/{file_id}_{timestamp}.json
     """
-    try:
-        import boto3
-        import json
-        
-        # 품질 필터링: LLM 측정 실패한 경우 저장 안 함
-        if llm_result.get("wear_level_pct") is None:
-            print("[Active Learning Tire] 배제: 마모도 측정 실패")
-            return
-        
-        if llm_result.get("wear_status") == "UNKNOWN":
-            print("[Active Learning Tire] 배제: 상태 불명")
-            return
-        
-        # S3에 저장
-        s3 = boto3.client('s3')
-        bucket = os.getenv("S3_BUCKET_NAME", "car-sentry-data")
-        
-        # 파일 ID 추출: s3_url이 base64인 경우 처리
-        if s3_url.startswith("data:"):
-            import hashlib
-            file_id = hashlib.md5(s3_url.encode()).hexdigest()[:10]
-        else:
-            file_id = os.path.basename(s3_url).split('.')[0]
-            
-        label_key = f"dataset/llm_confirmed/visual/tire/{file_id}.json"
-        
-        # 저장할 데이터 구조
-        training_data = {
-            "source_url": s3_url,
-            # 마모도 관련 (Regression 학습용)
-            "wear_level_pct": llm_result.get("wear_level_pct"),
-            "wear_status": llm_result.get("wear_status"),
-            # 위험 상태 관련 (YOLO 다중클래스 재학습용)
-            "critical_issues": llm_result.get("critical_issues"),
-            # 기타
-            "is_replacement_needed": llm_result.get("is_replacement_needed"),
-            "labeled_by": "LLM_ORACLE",
-            # YOLO 결과 (비교 분석용)
-            "yolo_result": yolo_result
-        }
-        
-        s3.put_object(
-            Bucket=bucket,
-            Key=label_key,
-            Body=json.dumps(training_data, ensure_ascii=False, indent=2),
-            ContentType='application/json'
-        )
-        print(f"[Active Learning Tire] 분석 데이터 저장 완료: {label_key}")
-        
-        # Manifest에도 기록
-        from ai.app.services.common.manifest_service import add_visual_entry
-        add_visual_entry(
-            original_url=s3_url,
-            category="TIRE",
-            label_key=label_key,
-            status=llm_result.get("wear_status", "UNKNOWN"),
-            analysis_type="LLM_TIRE_ANALYSIS",
-            detections=None,
-            confidence=1.0  # LLM 측정값이므로 신뢰도 100%
-        )
-        
-    except Exception as e:
-        # Active Learning 실패해도 메인 분석에는 영향 없음
-        print(f"[Active Learning Tire] 저장 실패 (무시): {e}")
+    # 저장할 데이터 구조
+    training_data = {
+        "source_url": s3_url,
+        # 마모도 관련 (Regression 학습용)
+        "wear_level_pct": llm_result.get("wear_level_pct"),
+        "wear_status": llm_result.get("wear_status"),
+        # 위험 상태 관련 (YOLO 다중클래스 재학습용)
+        "critical_issues": llm_result.get("critical_issues"),
+        # 기타
+        "is_replacement_needed": llm_result.get("is_replacement_needed"),
+        # YOLO 결과 (비교 분석용)
+        "yolo_result": yolo_result
+    }
+
+    # 품질 필터링(마모도 측정 실패/상태 불명 배제)과 S3 저장, Manifest 기록은 백그라운드 파이프라인이 처리
+    await submit_al_candidate(ALCandidate(
+        s3_url=s3_url,
+        domain="tire",
+        category="TIRE",
+        confidence=1.0,  # LLM 측정값이므로 신뢰도 100%
+        status=llm_result.get("wear_status", "UNKNOWN"),
+        analysis_type="LLM_TIRE_ANALYSIS",
+        oracle_labels=training_data,
+        fingerprint=image_fingerprint(image),
+    ))
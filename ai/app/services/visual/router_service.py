@@ -18,8 +18,11 @@ from enum import Enum
 from typing import Optional, Union, Tuple
 from io import BytesIO
 from PIL import Image
+import numpy as np
 import torch
 
+from ai.app.services.common.active_learning_selector import normalized_entropy, record_uncertainty_signal
+
 # =============================================================================
 # Scene Type Enum
 # =============================================================================
@@ -120,6 +123,16 @@ class RouterService:
         Returns:
             (SceneType, confidence): 분류된 장면과 신뢰도 (0.0~1.0)
         """
+        scene_type, confidence, _ = await self.classify_with_embedding(image)
+        return scene_type, confidence
+
+    async def classify_with_embedding(
+        self, image: Union[str, Image.Image]
+    ) -> Tuple[SceneType, float, Optional[np.ndarray]]:
+        """
+        classify + 분류기 마지막 은닉층 임베딩 (L2 정규화, Mock 모드에서는 None)
+        같은 forward 결과를 재사용하므로 추가 추론 비용이 없습니다. (Active Learning 근접 중복 필터용)
+        """
         start_time = time.time()
         
         # URL이 들어오면 내부적으로 로드 (하위 호환성)
@@ -131,7 +144,7 @@ class RouterService:
             url_context = "pre-loaded-image"
         
         if self.mock_mode:
-            result = self._mock_classify(url_context)
+            result = (*self._mock_classify(url_context), None)
         else:
             result = await self._real_classify(image_obj)
         
@@ -160,7 +173,7 @@ class RouterService:
             # 기본값: 가장 일반적인 EXTERIOR로 분류
             return (SceneType.SCENE_EXTERIOR, 0.5)
     
-    async def _real_classify(self, image: Image.Image) -> Tuple[SceneType, float]:
+    async def _real_classify(self, image: Image.Image) -> Tuple[SceneType, float, np.ndarray]:
         """
         실제 MobileNetV3 모델로 분류 (pre-loaded image 사용)
         """
@@ -179,15 +192,21 @@ class RouterService:
         input_tensor = preprocess(image).unsqueeze(0).to(self.device)
         
         # 3. 추론
+        # MobileNetV3.forward와 동일한 순서로 실행하되, 마지막 Linear 입력(은닉층)을 임베딩으로 보관
         with torch.no_grad():
-            outputs = self.model(input_tensor)
+            pooled = torch.flatten(self.model.avgpool(self.model.features(input_tensor)), 1)
+            hidden = self.model.classifier[:-1](pooled)
+            outputs = self.model.classifier[-1](hidden)
             probabilities = torch.nn.functional.softmax(outputs, dim=1)
             confidence, predicted = torch.max(probabilities, 1)
+            embedding = torch.nn.functional.normalize(hidden, dim=1)[0].cpu().numpy()
         
         scene_type = self.class_names[predicted.item()]
         conf_value = confidence.item()
+        # Active Learning 선별용 불확실성 (softmax 정규화 엔트로피, 후보 등록 시 자동 첨부)
+        record_uncertainty_signal("router_entropy", normalized_entropy(probabilities[0].cpu().numpy()))
         
-        return (scene_type, conf_value)
+        return (scene_type, conf_value, embedding)
     
     async def _load_image_from_url(self, url: str) -> Image.Image:
         """S3 URL에서 이미지 로드"""
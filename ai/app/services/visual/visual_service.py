@@ -26,8 +26,10 @@ from urllib.parse import urlparse
 
 from ai.app.services.visual.router_service import RouterService, SceneType, get_router_service
 from ai.app.services.visual.router_service import RouterService, SceneType, get_router_service
-from ai.app.services.common.llm_service import analyze_general_image, generate_training_labels
-from ai.app.services.common.llm_guard import validate_llm_label_result, sanitize_confidence
+from ai.app.services.common.llm_service import analyze_general_image, diagnose_and_localize
+from ai.app.services.common.progress_events import emit
+from ai.app.services.common.active_learning_pipeline import ALCandidate, submit_al_candidate
+from ai.app.services.common.near_duplicate_index import image_fingerprint, set_request_embedding
 from ai.app.services.visual.domains.dashboard_service import analyze_dashboard_image
 from ai.app.services.visual.domains.exterior_service import analyze_exterior_image
 from ai.app.services.visual.domains.tire_service import analyze_tire_image
@@ -156,164 +158,26 @@ async def get_smart_visual_diagnosis(
         router = get_router_service()
     
     try:
-        scene_type, confidence = await router.classify(image)
+        scene_type, confidence, embedding = await router.classify_with_embedding(image)
+        set_request_embedding(embedding)  # Active Learning 근접 중복 필터용 (추가 추론 없음)
         print(f"[Visual Service] Router 분류: {scene_type.value} (신뢰도: {confidence:.2f})")
+        # [Streaming] 장면 분류 결과 즉시 전달
+        emit("scene", {"scene_type": scene_type.value, "confidence": round(confidence, 4), "llm_fallback": confidence < 0.85})
         
         # 신뢰도가 낮으면 LLM에게 직접 판단 요청 (Fallback)
         if confidence < 0.85:
             print(f"[Visual Service] Router 신뢰도 낮음, LLM Fallback 실행")
-            # [Fix] llm_result 먼저 생성 (NameError 방지)
-            llm_result = await analyze_general_image(s3_url)
-            
-            # Map LLM result to VisualResponse (llm_result is VisualResponse object)
-            # IRRELEVANT 처리 -> SCENE_ETC로 통합하되 Status로 구분
-            if llm_result.category == "IRRELEVANT":
-                 return {
-                    "status": "ERROR",
-                    "analysis_type": "SCENE_ETC",
-                    "category": "IRRELEVANT",
-                    "data": llm_result.data
-                }
-
-            # Mapping sub_type (category) to SceneType string
-            sub_type = llm_result.category
-            mapped_type = f"SCENE_{sub_type}" if sub_type in ["DASHBOARD", "EXTERIOR", "TIRE", "ENGINE"] else "SCENE_ETC"
-            
-            # [Fix] Standardize Response Format (Schema Mapping)
-            standardized_data = llm_result.data
-            
-            # Additional: Generate BBoxes if domain allows
-            llm_detections = []
-            if sub_type in ["ENGINE", "DASHBOARD", "EXTERIOR", "TIRE"]:
-                try:
-                    print(f"[Visual Service] LLM Fallback: Requesting BBox for {sub_type}...")
-                    label_result = await generate_training_labels(s3_url, sub_type.lower())
-                    
-                    # [Guard] Validate LLM Result
-                    if not validate_llm_label_result(label_result):
-                        print(f"[Visual Service] LLM Label Generation Failed or Invalid: {label_result.get('status')}")
-                        # Skip processing, llm_detections remains []
-                    else:
-                        for lbl in label_result.get("labels", []):
-                            # [Sanitize] Add source check
-                            lbl = sanitize_confidence(lbl)
-                            
-                            # BBox Conversion: Ratio (0..1) -> Pixel (w, h)
-                            bbox = lbl.get("bbox", [0, 0, 0, 0])
-                        if image:
-                            width, height = image.size
-                            pixel_bbox = [
-                                int(bbox[0] * width),
-                                int(bbox[1] * height),
-                                int(bbox[2] * width),
-                                int(bbox[3] * height)
-                            ]
-                        else:
-                            pixel_bbox = [0, 0, 0, 0]
-
-                        # Schema에 맞는 Dict 생성
-                        if sub_type == "ENGINE":
-                            llm_detections.append({
-                                "part_name": lbl.get("class", "Unknown"),
-                                "bbox": pixel_bbox,
-                                "is_anomaly": True, # LLM이 찾은건 보통 문제있는 것일 확률 높음 (가정)
-                                "anomaly_score": 0.5,
-                                "threshold": 0.5,
-                                "defect_label": "LLM_Detected",
-                                "severity": "WARNING",
-                                "description": "AI 정밀 분석으로 식별된 부품입니다."
-                            })
-                        elif sub_type == "DASHBOARD":
-                            llm_detections.append({
-                                "label": lbl.get("class", "Unknown"),
-                                "color_severity": "YELLOW",
-                                "confidence": 0.9,
-                                "bbox": pixel_bbox,
-                                "is_blinking": None,
-                                "meaning": "LLM 감지"
-                            })
-                        elif sub_type == "EXTERIOR":
-                            llm_detections.append({
-                                "part": "차체", 
-                                "damage_type": lbl.get("class", "Destruction"),
-                                "severity": "WARNING",
-                                "confidence": 0.9,
-                                "bbox": pixel_bbox
-                            })
-                        elif sub_type == "TIRE":
-                            # Note: TireData schema uses flat fields, but if there's a list for issues:
-                            # TireData usually doesn't output a list of bboxes in 'data' root.
-                            # But we can try to fit it if Schema allows.
-                            pass
-                            
-                except Exception as e:
-                    print(f"[Visual Service] LLM BBox Gen Error: {e}")
-
-            # [Logic] analysis_status 결정
-            # - 기본적으로 LLM Fallback은 'PARTIAL' (YOLO 미사용)로 볼 수도 있으나, 
-            # - BBox를 성공적으로 찾았거나(detections > 0), 
-            # - 애초에 문제가 없다고 판단된 경우(damage_found=False / normal)는 'SUCCESS'로 표기 가능.
-            # - "손상 있음(damage=True)인데 박스 없음(detections=0)"인 경우만 'PARTIAL' (사용자 요청 사항)
-            
-            status_val = "SUCCESS"
-            has_damage = (llm_result.status != "NORMAL")
-            has_detections = (len(llm_detections) > 0)
-            
-            if has_damage and not has_detections:
-                status_val = "PARTIAL"
-
-            if sub_type == "ENGINE":
-                standardized_data = {
-                    "analysis_status": status_val,
-                    "vehicle_type": "UNKNOWN",
-                    "parts_detected": len(llm_detections),
-                    "anomalies_found": len(llm_detections),
-                    "results": llm_detections 
-                }
-            elif sub_type == "DASHBOARD":
-                standardized_data = {
-                    "analysis_status": status_val,
-                    "vehicle_context": {"inferred_model": None, "dashboard_type": None},
-                    "detected_count": len(llm_detections),
-                    "detections": llm_detections,
-                    "integrated_analysis": {
-                        "severity_score": 5 if llm_detections else 0,
-                        "description": llm_result.data.get("description", "분석 불가"),
-                        "short_term_risk": None
-                    },
-                    "recommendation": {
-                        "primary_action": llm_result.data.get("recommendation", "점검 권장")
-                    }
-                }
-            elif sub_type == "EXTERIOR":
-                standardized_data = {
-                    "analysis_status": status_val,
-                    "damage_found": (llm_result.status != "NORMAL") or (len(llm_detections) > 0),
-                    "detections": llm_detections,
-                    "description": llm_result.data.get("description", ""),
-                    "repair_estimate": llm_result.data.get("recommendation", "")
-                }
-            elif sub_type == "TIRE":
-                standardized_data = {
-                    "analysis_status": status_val,
-                    "wear_status": "UNKNOWN",
-                    "wear_level_pct": None,
-                    "critical_issues": [],
-                    "description": llm_result.data.get("description", ""),
-                    "recommendation": llm_result.data.get("recommendation", ""),
-                    "is_replacement_needed": False
-                }
-
-            return {
-                "status": llm_result.status,
-                "analysis_type": mapped_type,
-                "category": sub_type,
-                "data": standardized_data
-            }
+            # [Optimization] 분류/진단 + BBox를 JSON Schema 구조화 출력 1회 호출로 통합
+            # (기존: analyze_general_image + generate_training_labels 2회 Vision 호출)
+            fused_result = await diagnose_and_localize(s3_url, image=image)
+            response = _standardize_fused_result(fused_result, image, s3_url)
+            await _submit_fused_candidate(s3_url, fused_result, confidence, image)
+            emit("detections", {"source": "llm", "detections": response["data"].get("detections") or response["data"].get("results") or []})
+            return response
             
     except Exception as e:
         print(f"[Visual Service] Router 실패, LLM Fallback: {e}")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         return llm_result
     
     # Step 2: 장면별 분기
@@ -357,85 +221,164 @@ async def get_smart_visual_diagnosis(
         else:
             # Unknown scene → LLM Fallback
             print(f"[Visual Service] Unknown scene: {scene_type}, LLM Fallback")
-            llm_result = await analyze_general_image(s3_url)
+            llm_result = await analyze_general_image(s3_url, image=image)
             return llm_result
             
     except Exception as e:
         print(f"[Visual Service] 분석 오류, LLM Fallback: {e}")
-        llm_result = await analyze_general_image(s3_url)
+        llm_result = await analyze_general_image(s3_url, image=image)
         return llm_result
-    
-    finally:
-        # =================================================================
-        # [Active Learning] 모델 재학습을 위한 데이터 수집
-        # =================================================================
-        # [Fix] confidence 변수가 정의되지 않았을 경우(예외 발생 시) 방지
-        if 'confidence' in locals() and confidence < 0.85:
-            await _record_for_active_learning(s3_url, scene_type, confidence)
 
 
-async def _record_for_active_learning(
-    s3_url: str, 
-    scene_type: SceneType, 
-    confidence: float
-):
+def _standardize_fused_result(fused: Dict[str, Any], image: Optional[Image.Image], s3_url: str) -> Dict[str, Any]:
     """
-    [Active Learning] 중앙 집중식 서비스 사용
+    diagnose_and_localize 결과 → 도메인별 API 응답 형식(standardized_data)으로 매핑
+
+    - BBox: 정규화 [x1, y1, x2, y2] → 픽셀 [x1, y1, x2, y2]
+    - analysis_status: "손상 있음인데 박스 없음"인 경우만 PARTIAL
     """
-    try:
-        from ai.app.services.common.active_learning_service import get_active_learning_service
-        from ai.app.services.llm_service import generate_training_labels
+    sub_type = fused["category"]
+    description = fused.get("description", "")
+    recommendation = fused.get("recommendation", "")
+    processed_image_url = s3_url if not s3_url.startswith("data:") else "data:image/jpeg;base64,...(truncated)"
 
-        if scene_type == SceneType.SCENE_DASHBOARD:
-             # Dashboard는 자체 서비스 내에서 Active Learning을 수행하므로 중복 수집 방지
-             return
+    # IRRELEVANT 처리 -> SCENE_ETC로 통합하되 Status로 구분
+    if fused.get("relevance") == "IRRELEVANT":
+        return {
+            "status": "ERROR",
+            "analysis_type": "SCENE_ETC",
+            "category": "IRRELEVANT",
+            "data": {
+                "description": "차량과 관련 없는 이미지입니다.",
+                "recommendation": "차량 사진을 업로드해주세요.",
+                "processed_image_url": processed_image_url
+            }
+        }
 
-        # 장면 타입 → 도메인 이름 변환
-        domain_map = {
-            SceneType.SCENE_ENGINE: "engine",
-            SceneType.SCENE_DASHBOARD: "dashboard",
-            SceneType.SCENE_TIRE: "tire",
-            SceneType.SCENE_EXTERIOR: "exterior"
+    mapped_type = f"SCENE_{sub_type}" if sub_type in ["DASHBOARD", "EXTERIOR", "TIRE", "ENGINE"] else "SCENE_ETC"
+
+    width, height = image.size if image else (0, 0)
+    llm_detections = []
+    for obj in fused.get("objects", []):
+        x1, y1, x2, y2 = obj["bbox"]
+        pixel_bbox = [int(x1 * width), int(y1 * height), int(x2 * width), int(y2 * height)]
+
+        if sub_type == "ENGINE":
+            llm_detections.append({
+                "part_name": obj["class"],
+                "bbox": pixel_bbox,
+                "is_anomaly": True, # LLM이 찾은건 보통 문제있는 것일 확률 높음 (가정)
+                "anomaly_score": 0.5,
+                "threshold": 0.5,
+                "defect_label": "LLM_Detected",
+                "severity": "WARNING",
+                "description": "AI 정밀 분석으로 식별된 부품입니다."
+            })
+        elif sub_type == "DASHBOARD":
+            llm_detections.append({
+                "label": obj["class"],
+                "color_severity": "YELLOW",
+                "confidence": obj["confidence"],
+                "bbox": pixel_bbox,
+                "is_blinking": None,
+                "meaning": "LLM 감지"
+            })
+        elif sub_type == "EXTERIOR":
+            llm_detections.append({
+                "part": "차체",
+                "damage_type": obj["class"],
+                "severity": "WARNING",
+                "confidence": obj["confidence"],
+                "bbox": pixel_bbox
+            })
+        # TIRE: TireData는 BBox 목록 필드가 없으므로 상태 필드만 사용
+
+    status_val = "SUCCESS"
+    if fused["status"] != "NORMAL" and not llm_detections:
+        status_val = "PARTIAL"
+
+    if sub_type == "ENGINE":
+        standardized_data = {
+            "analysis_status": status_val,
+            "vehicle_type": "UNKNOWN",
+            "parts_detected": len(llm_detections),
+            "anomalies_found": len(llm_detections),
+            "results": llm_detections
+        }
+    elif sub_type == "DASHBOARD":
+        standardized_data = {
+            "analysis_status": status_val,
+            "vehicle_context": {"inferred_model": None, "dashboard_type": None},
+            "detected_count": len(llm_detections),
+            "detections": llm_detections,
+            "integrated_analysis": {
+                "severity_score": 5 if llm_detections else 0,
+                "description": description or "분석 불가",
+                "short_term_risk": None
+            },
+            "recommendation": {
+                "primary_action": recommendation or "점검 권장"
+            }
+        }
+    elif sub_type == "EXTERIOR":
+        standardized_data = {
+            "analysis_status": status_val,
+            "damage_found": (fused["status"] != "NORMAL") or (len(llm_detections) > 0),
+            "detections": llm_detections,
+            "description": description,
+            "repair_estimate": recommendation
+        }
+    elif sub_type == "TIRE":
+        standardized_data = {
+            "analysis_status": status_val,
+            "wear_status": "UNKNOWN",
+            "wear_level_pct": None,
+            "critical_issues": [],
+            "description": description,
+            "recommendation": recommendation,
+            "is_replacement_needed": False
+        }
+    else:
+        standardized_data = {
+            "description": description,
+            "recommendation": recommendation,
+            "processed_image_url": processed_image_url
         }
-        domain = domain_map.get(scene_type)
-        if not domain:
-            # 매핑되지 않는 도메인(ETC 등)은 수집하지 않음
-            return
-        
-        print(f"[Active Learning] 저신뢰 데이터 감지 ({confidence:.2f} < 0.85). LLM 라벨링 시작...")
-        
-        # Step 1: Oracle
-        oracle_labels = await generate_training_labels(s3_url, domain)
-        status = oracle_labels.get("status")
 
-        if status in ["IRRELEVANT", "ERROR"]:
-            return
+    return {
+        "status": fused["status"],
+        "analysis_type": mapped_type,
+        "category": sub_type,
+        "data": standardized_data
+    }
 
-        if status not in ["WARNING", "CRITICAL"]:
-            return
 
-        if not oracle_labels.get("labels"):
-            return
-        
-        # Step 2: Quality Filter
-        if status == "IRRELEVANT" or status == "ERROR" or not oracle_labels.get("labels"):
-            print(f"[Active Learning] 배제: 품질 미달 ({status})")
-            return
+async def _submit_fused_candidate(s3_url: str, fused: Dict[str, Any], confidence: float, image: Optional[Image.Image]):
+    """
+    [Active Learning] Router 저신뢰 → 통합 LLM 진단 결과를 재학습 후보로 등록
+    (diagnose_and_localize가 이미 BBox를 반환했으므로 Oracle을 다시 호출하지 않음)
+    """
+    domain = fused.get("category", "").lower()
+    if fused.get("is_mock") or fused.get("relevance") != "VEHICLE" or domain not in ("engine", "dashboard", "tire", "exterior"):
+        return
 
-        # Step 3: Save & Manifest
-        al_service = get_active_learning_service()
-        label_key = al_service.save_oracle_label(s3_url, oracle_labels, domain)
-        
-        if label_key:
-            al_service.record_manifest(
-                s3_url=s3_url,
-                category=scene_type.name.replace("SCENE_", ""), # SCENE_ENGINE -> ENGINE
-                label_key=label_key,
-                status=status,
-                confidence=confidence,
-                analysis_type="LLM_ORACLE_VISUAL",
-                domain="visual"
-            )
-        
-    except Exception as e:
-        print(f"[Active Learning] 기록 실패 (무시): {e}")
+    # 정규화 [x1, y1, x2, y2] → 학습 라벨 형식 [x_center, y_center, width, height]
+    labels = [
+        {
+            "class": obj["class"],
+            "bbox": [(obj["bbox"][0] + obj["bbox"][2]) / 2, (obj["bbox"][1] + obj["bbox"][3]) / 2,
+                     obj["bbox"][2] - obj["bbox"][0], obj["bbox"][3] - obj["bbox"][1]],
+        }
+        for obj in fused.get("objects", [])
+    ]
+    await submit_al_candidate(ALCandidate(
+        s3_url=s3_url,
+        domain=domain,
+        category=fused["category"],
+        confidence=confidence,
+        status=fused["status"],
+        analysis_type="LLM_ORACLE_VISUAL",
+        model_output={"router_confidence": confidence},
+        oracle_labels={"status": fused["status"], "labels": labels},
+        fingerprint=image_fingerprint(image),
+    ))
@@ -0,0 +1,290 @@
+# ai/scripts/audio/audio_feature_store.py
+"""
+AST 입력 특징 캐시 (Audio Feature Store)
+
+[역할]
+1. 1회 디코딩: 오디오 클립을 한 번만 디코딩하여 AST 입력 특징(input_values, 1024x128)을 계산합니다.
+2. 샤드 저장: 계산된 특징을 고정 크기 .npy 샤드에 기록하고, 메모리 매핑(mmap)으로 읽습니다.
+3. 증분 갱신: 파일 내용 해시(SHA-1)를 키로 사용하여 새로 추가/변경된 파일만 다시 계산합니다.
+   (경로/크기/수정시각이 같으면 해시 계산도 생략)
+
+[사용처]
+- train_audio.py: 학습/검증/테스트 데이터 (로컬 + S3 Active Learning 다운로드분)
+- evaluate_audio.py: 평가 데이터
+- sync_active_learning.py: 오디오 도메인 동기화 직후 특징 사전 계산
+
+[저장 구조]
+ai/data/processed/ast_features/{variant}/
+  ├── index.json          (해시 → [샤드 번호, 행], 경로 → 해시/크기/수정시각)
+  └── shard_00000.npy ... (float32, shape=(N, 1024, 128))
+
+[사용법]
+python -m ai.scripts.audio.audio_feature_store --paths ./ai/data/ast ./ai/data/s3_audio --benchmark
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+STORE_ROOT = "./ai/data/processed/ast_features"
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.ogg', '.flac')
+SHARD_SIZE = 256          # 샤드당 클립 수 (1024x128 float32 기준 약 128MB)
+SAMPLE_RATE = 16000
+
+
+def file_sha1(path: str, chunk_size: int = 1 << 20) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def extractor_signature(feature_extractor) -> str:
+    """Feature Extractor 설정(샘플레이트, mel bin, 정규화 값 등)이 바뀌면 캐시도 분리"""
+    config = feature_extractor.to_dict() if hasattr(feature_extractor, "to_dict") else {}
+    config = {k: v for k, v in config.items() if isinstance(v, (int, float, str, bool, type(None)))}
+    return hashlib.sha1(json.dumps(config, sort_keys=True).encode()).hexdigest()[:8]
+
+
+def list_audio_files(base_paths: List[str]) -> List[str]:
+    files = []
+    for base_path in base_paths:
+        if not os.path.exists(base_path):
+            continue
+        for root, dirs, names in os.walk(base_path):
+            for name in names:
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    files.append(os.path.join(root, name))
+    return sorted(files)
+
+
+class AudioFeatureStore:
+    """
+    파일 해시 기반 AST 특징 저장소
+
+    Usage:
+        store = AudioFeatureStore(feature_extractor, denoise=True)
+        store.sync(paths)                 # 신규/변경 파일만 계산
+        features = store.get(path)        # (1024, 128) memmap view
+    """
+
+    def __init__(
+        self,
+        feature_extractor,
+        denoise: bool = False,
+        root: str = STORE_ROOT,
+        shard_size: int = SHARD_SIZE,
+    ):
+        self.feature_extractor = feature_extractor
+        self.denoise = denoise
+        self.shard_size = shard_size
+
+        # 전처리 설정이 다르면 다른 디렉토리에 저장 (학습: denoise, 평가: raw)
+        self.variant = f"ast_{extractor_signature(feature_extractor)}_{'denoise' if denoise else 'raw'}"
+        self.store_dir = os.path.join(root, self.variant)
+        os.makedirs(self.store_dir, exist_ok=True)
+
+        self.index_path = os.path.join(self.store_dir, "index.json")
+        self.index = self._load_index()
+        self._shards: Dict[int, np.ndarray] = {}
+
+    # -------------------------------------------------------------------------
+    # Index
+    # -------------------------------------------------------------------------
+    def _load_index(self) -> Dict:
+        if os.path.exists(self.index_path):
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {"variant": self.variant, "entries": {}, "files": {}, "num_shards": 0}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False)
+        os.replace(tmp_path, self.index_path)
+
+    def _shard_path(self, shard_id: int) -> str:
+        return os.path.join(self.store_dir, f"shard_{shard_id:05d}.npy")
+
+    def _hash_for(self, path: str) -> str:
+        """크기/수정시각이 그대로면 기존 해시 재사용 (파일을 다시 읽지 않음)"""
+        stat = os.stat(path)
+        key = os.path.abspath(path)
+        cached = self.index["files"].get(key)
+        if cached and cached["size"] == stat.st_size and cached["mtime"] == stat.st_mtime:
+            return cached["hash"]
+        digest = file_sha1(path)
+        self.index["files"][key] = {"size": stat.st_size, "mtime": stat.st_mtime, "hash": digest}
+        return digest
+
+    # -------------------------------------------------------------------------
+    # Feature 계산
+    # -------------------------------------------------------------------------
+    def _compute(self, path: str) -> Optional[np.ndarray]:
+        import librosa
+
+        try:
+            audio_array, _ = librosa.load(path, sr=SAMPLE_RATE)
+        except Exception as e:
+            print(f"[Warning] 오디오 로드 실패: {path} - {e}")
+            return None
+
+        if self.denoise:
+            import asyncio
+            from ai.app.services.audio.audio_enhancement import denoise_audio
+            audio_array = asyncio.run(denoise_audio(audio_array))
+
+        inputs = self.feature_extractor(
+            audio_array, sampling_rate=SAMPLE_RATE, return_tensors="np", padding="max_length"
+        )
+        return np.asarray(inputs["input_values"][0], dtype=np.float32)
+
+    def sync(self, paths: List[str]) -> Dict[str, float]:
+        """
+        경로 목록의 특징을 저장소와 동기화 (신규/변경 파일만 계산)
+
+        Returns:
+            {"total", "cached", "computed", "failed", "elapsed_sec"}
+        """
+        start = time.perf_counter()
+        entries = self.index["entries"]
+
+        pending: List[Tuple[str, str]] = []
+        seen_hashes = set()
+        for path in paths:
+            digest = self._hash_for(path)
+            if digest in entries or digest in seen_hashes:
+                continue
+            seen_hashes.add(digest)
+            pending.append((path, digest))
+
+        computed = failed = 0
+        for offset in range(0, len(pending), self.shard_size):
+            chunk = pending[offset:offset + self.shard_size]
+            features, hashes = [], []
+            for path, digest in chunk:
+                feat = self._compute(path)
+                if feat is None:
+                    failed += 1
+                    continue
+                features.append(feat)
+                hashes.append(digest)
+
+            if not features:
+                continue
+
+            # 샤드는 한 번 쓰고 나면 수정하지 않음 (immutable)
+            shard_id = self.index["num_shards"]
+            shard = np.lib.format.open_memmap(
+                self._shard_path(shard_id), mode="w+", dtype=np.float32,
+                shape=(len(features),) + features[0].shape
+            )
+            for row, feat in enumerate(features):
+                shard[row] = feat
+            shard.flush()
+            del shard
+
+            for row, digest in enumerate(hashes):
+                entries[digest] = [shard_id, row]
+            self.index["num_shards"] = shard_id + 1
+            computed += len(features)
+            self._save_index()
+
+        self._save_index()
+        stats = {
+            "total": len(paths),
+            "cached": len(paths) - len(pending),
+            "computed": computed,
+            "failed": failed,
+            "elapsed_sec": round(time.perf_counter() - start, 2),
+        }
+        print(f"[Feature Store] {self.variant}: total={stats['total']} cached={stats['cached']} "
+              f"computed={stats['computed']} failed={stats['failed']} ({stats['elapsed_sec']}s)")
+        return stats
+
+    # -------------------------------------------------------------------------
+    # 조회 (Zero-copy memmap)
+    # -------------------------------------------------------------------------
+    def _shard(self, shard_id: int) -> np.ndarray:
+        if shard_id not in self._shards:
+            self._shards[shard_id] = np.load(self._shard_path(shard_id), mmap_mode="r")
+        return self._shards[shard_id]
+
+    def has(self, path: str) -> bool:
+        return self._hash_for(path) in self.index["entries"]
+
+    def get(self, path: str) -> np.ndarray:
+        shard_id, row = self.index["entries"][self._hash_for(path)]
+        return self._shard(shard_id)[row]
+
+
+class FeatureStoreDataset:
+    """
+    HuggingFace Trainer용 Dataset (torch Dataset 인터페이스)
+    특징은 memmap에서 필요할 때만 읽습니다.
+    """
+
+    def __init__(self, store: AudioFeatureStore, data_list: List[Dict], label2id: Dict[str, int]):
+        self.store = store
+        # 로드 실패 등으로 저장소에 없는 파일은 제외
+        self.items = [x for x in data_list if store.has(x["audio"])]
+        self.label2id = label2id
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, idx):
+        import torch
+
+        item = self.items[idx]
+        return {
+            "input_values": torch.from_numpy(np.array(self.store.get(item["audio"]))),
+            "labels": self.label2id[item["label"]],
+        }
+
+
+# =============================================================================
+# CLI: 사전 계산 및 Before/After 시간 비교
+# =============================================================================
+if __name__ == "__main__":
+    from transformers import ASTFeatureExtractor
+
+    parser = argparse.ArgumentParser(description="AST Feature Store Builder")
+    parser.add_argument("--paths", nargs="+", default=["./ai/data/ast", "./ai/data/s3_audio"])
+    parser.add_argument("--model", type=str, default="MIT/ast-finetuned-audioset-10-10-0.4593")
+    parser.add_argument("--denoise", action="store_true", help="train_audio.py와 동일하게 U-Net Denoising 적용")
+    parser.add_argument("--benchmark", action="store_true", help="기존 방식(매번 디코딩+추출)과 시간 비교")
+    args = parser.parse_args()
+
+    extractor = ASTFeatureExtractor.from_pretrained(args.model)
+    store = AudioFeatureStore(extractor, denoise=args.denoise)
+    files = list_audio_files(args.paths)
+    print(f"[Info] 대상 파일 {len(files)}개")
+
+    store.sync(files)
+
+    if args.benchmark and files:
+        import librosa
+
+        t0 = time.perf_counter()
+        for path in files:
+            audio_array, _ = librosa.load(path, sr=SAMPLE_RATE)
+            extractor(audio_array, sampling_rate=SAMPLE_RATE, return_tensors="np", padding="max_length")
+        legacy_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for path in files:
+            np.array(store.get(path))
+        store_sec = time.perf_counter() - t0
+
+        print("\n" + "="*50)
+        print(f"📊 Epoch당 특징 준비 시간 ({len(files)} clips)")
+        print("="*50)
+        print(f"   기존(디코딩+추출): {legacy_sec:.2f}s")
+        print(f"   Feature Store:     {store_sec:.2f}s  (x{legacy_sec / max(store_sec, 1e-9):.1f})")
+        print("="*50 + "\n")
@@ -15,11 +15,12 @@ python ai/scripts/evaluate_audio.py
 - MODEL_PATH: 평가 대상 모델 가중치 경로 (ai/weights/audio/best_ast_model)
 """
 import os
+import time
 import torch
 import numpy as np
 import evaluate
 from transformers import ASTForAudioClassification, ASTFeatureExtractor, Trainer, TrainingArguments
-from datasets import Dataset, Audio
+from ai.scripts.audio.audio_feature_store import AudioFeatureStore, FeatureStoreDataset
 
 # -----------------------------------------------------------------------------
 # [설정] 평가할 데이터 소스 경로
@@ -90,16 +91,14 @@ if len(data_list) == 0:
     print("EVAL_DATA_PATHS 리스트에 올바른 경로를 추가해주세요.")
     exit()
 
-# Dataset 생성
-eval_ds = Dataset.from_list(data_list).cast_column("audio", Audio(sampling_rate=16000))
-
-def preprocess_function(examples):
-    audio_arrays = [x["array"] for x in examples["audio"]]
-    inputs = feature_extractor(audio_arrays, sampling_rate=16000, return_tensors="pt", padding="max_length")
-    return inputs
-
-print("[Info] 데이터 전처리 중...")
-eval_dataset = eval_ds.map(preprocess_function, batched=True)
+# [고도화 로직] Feature Store 사용 (이미 계산된 클립은 memmap에서 바로 읽음)
+# 기존: Dataset.from_list(...).cast_column("audio", ...).map(preprocess_function) → 매번 디코딩/추출
+print("[Info] 특징 동기화 중 (신규/변경 파일만 계산)...")
+_start = time.perf_counter()
+feature_store = AudioFeatureStore(feature_extractor, denoise=False)
+feature_store.sync([x["audio"] for x in data_list])
+eval_dataset = FeatureStoreDataset(feature_store, data_list, label2id)
+print(f"[Info] 특징 준비 시간: {time.perf_counter() - _start:.2f}s ({len(eval_dataset)} clips)")
 
 # -----------------------------------------------------------------------------
 # 3. 평가 실행
@@ -130,3 +129,61 @@ metrics = trainer.evaluate()
 print("\n" + "="*30)
 print(f"🎯 최종 정확도(Accuracy): {metrics['eval_accuracy']:.4f}")
 print("="*30 + "\n")
+
+# -----------------------------------------------------------------------------
+# 4. 경량 CNN Cascade 비교 (정확도 동등성 + p50/p99 지연시간)
+# -----------------------------------------------------------------------------
+# ast_service의 서빙 Cascade와 동일한 규칙: 경량 CNN 신뢰도가 임계값 이상이면 확정, 아니면 AST.
+# CPU 단일 클립(batch=1) 기준으로 측정합니다. (서빙 지연 측정이므로 Feature Store를 쓰지 않고 직접 디코딩)
+import librosa
+from ai.app.services.audio.ast_service import get_category_from_label
+from ai.app.services.audio.lite_audio_service import load_lite_audio_model, predict_lite, LITE_CONFIDENCE_THRESHOLD
+
+lite_payload = load_lite_audio_model()
+
+if lite_payload is None:
+    print("[Info] 경량 CNN 가중치가 없어 Cascade 비교를 건너뜁니다. (train_audio_distill.py 실행 필요)")
+else:
+    model.eval()
+    ast_latencies, cascade_latencies = [], []
+    ast_correct = cascade_correct = ast_cat_correct = cascade_cat_correct = 0
+    fast_path_count = 0
+
+    for item in data_list:
+        audio_array, _ = librosa.load(item["audio"], sr=16000)
+        true_category = get_category_from_label(item["label"])
+
+        # (a) AST 단독
+        t0 = time.perf_counter()
+        inputs = feature_extractor(audio_array, sampling_rate=16000, return_tensors="pt", padding="max_length")
+        with torch.no_grad():
+            ast_label = id2label[int(model(**inputs).logits.argmax(-1).item())]
+        ast_ms = (time.perf_counter() - t0) * 1000
+
+        # (b) Cascade: 경량 CNN → (불확실할 때만) AST
+        t0 = time.perf_counter()
+        lite_label, lite_conf = predict_lite(audio_array, lite_payload)
+        lite_ms = (time.perf_counter() - t0) * 1000
+        if lite_conf >= LITE_CONFIDENCE_THRESHOLD:
+            cascade_label, cascade_ms = lite_label, lite_ms
+            fast_path_count += 1
+        else:
+            cascade_label, cascade_ms = ast_label, lite_ms + ast_ms
+
+        ast_latencies.append(ast_ms)
+        cascade_latencies.append(cascade_ms)
+        ast_correct += int(ast_label == item["label"])
+        cascade_correct += int(cascade_label == item["label"])
+        ast_cat_correct += int(get_category_from_label(ast_label) == true_category)
+        cascade_cat_correct += int(get_category_from_label(cascade_label) == true_category)
+
+    n = len(data_list)
+    print("\n" + "="*50)
+    print(f"📊 AST 단독 vs Cascade (임계값 {LITE_CONFIDENCE_THRESHOLD}, {n} clips)")
+    print("="*50)
+    print(f"   정확도        AST={ast_correct/n:.4f}  Cascade={cascade_correct/n:.4f}")
+    print(f"   카테고리 정확도 AST={ast_cat_correct/n:.4f}  Cascade={cascade_cat_correct/n:.4f}")
+    print(f"   p50 지연(ms)  AST={np.percentile(ast_latencies, 50):.1f}  Cascade={np.percentile(cascade_latencies, 50):.1f}")
+    print(f"   p99 지연(ms)  AST={np.percentile(ast_latencies, 99):.1f}  Cascade={np.percentile(cascade_latencies, 99):.1f}")
+    print(f"   Fast Path 비율: {fast_path_count/n:.2%} (AST 생략)")
+    print("="*50 + "\n")
@@ -5,6 +5,7 @@ AST 기계 소음 분류 모델 학습 도구 (Audio Trainer)
 [역할]
 1. 소리 기반 진단: 차량에서 발생하는 오디오 데이터를 분석하여 기계적 고장(노킹, 실화 등)을 분류하는 AST 모델을 학습합니다.
 2. 전처리 자동화: 오디오 파일을 스펙트로그램 특징(Feature)으로 자동 변환하며, Windows 환경에서의 librosa 로딩 이슈를 해결했습니다.
+   변환 결과는 Feature Store(audio_feature_store.py)에 캐시되어 신규/변경 파일만 다시 계산합니다.
 3. 성능 리포트: 학습 전(Baseline)과 학습 후(Final)의 정확도를 비교하여 모델의 개선 정도를 측정합니다.
 
 [사용법]
@@ -12,15 +13,15 @@ python ai/scripts/train_audio.py --mode all --epochs 10
 """
 import argparse
 import os
+import time
 import torch
 import numpy as np
 import boto3
 import evaluate
 from transformers import ASTForAudioClassification, ASTFeatureExtractor, Trainer, TrainingArguments
-from datasets import Dataset, Audio
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import f1_score, precision_recall_fscore_support
-from ai.app.services.audio_enhancement import denoise_audio, calculate_si_sdr
+from ai.scripts.audio.audio_feature_store import AudioFeatureStore, FeatureStoreDataset
 
 # =============================================================================
 # [설정] 경로 및 하이퍼파라미터
@@ -53,13 +54,11 @@ feature_extractor = None
 # =============================================================================
 # 1. 데이터 준비
 # =============================================================================
-def prepare_data():
-    global train_dataset, eval_dataset, test_dataset, label2id, id2label, labels, feature_extractor
-    
-    print("\n" + "="*50)
-    print("[Step 1] 데이터 준비 시작...")
-    print("="*50)
-    
+def collect_data_list():
+    """
+    로컬 데이터 폴더 + S3 수집 데이터 → [{"audio": 경로, "label": 라벨}]
+    (증류 스크립트 train_audio_distill.py도 같은 목록을 사용, 데이터 폴더가 없으면 None)
+    """
     # =============================================================================
     # 로컬 데이터 폴더에서 불러오기
     # 폴더 구조:
@@ -77,7 +76,7 @@ def prepare_data():
         print(f"[Warning] 데이터 폴더가 없어서 생성했습니다: {LOCAL_DATA_DIR}")
         print(f"         여기에 라벨별 하위 폴더(normal, knocking 등)를 만들고 오디오 파일을 넣어주세요.")
         print(f"         지원 형식: .wav, .mp3, .m4a, .ogg, .flac")
-        return False
+        return None
     
     DATA_SOURCE_PATHS = [LOCAL_DATA_DIR]
     
@@ -125,19 +124,11 @@ def prepare_data():
                     label = LABEL_MAP.get(folder_name, folder_name)
                     full_path = os.path.join(root, file)
                     data_list.append({"audio": full_path, "label": label})
-    
-    print(f"[Info] 총 {len(data_list)}개의 오디오 파일 발견")
-    
-    if len(data_list) == 0:
-        print("[Error] 데이터가 없습니다.")
-        return False
-    
-    # 라벨 인코딩
-    labels = list(set([x['label'] for x in data_list]))
-    label2id = {label: i for i, label in enumerate(labels)}
-    id2label = {i: label for i, label in enumerate(labels)}
-    print(f"[Info] 감지된 라벨({len(labels)}개): {labels}")
-    
+    return data_list
+
+
+def split_data(data_list):
+    """Train/Valid/Test 분할 (70/10/20, 증류 스크립트도 같은 분할을 사용해야 Test 비교가 공정함)"""
     # [기존 로직 주석 처리]
     # train_val, test_data = train_test_split(
     #     data_list, test_size=0.2, stratify=[x['label'] for x in data_list], random_state=42
@@ -154,75 +145,52 @@ def prepare_data():
     train_data, val_data = train_test_split(
         train_val, test_size=0.125, stratify=[x['label'] for x in train_val], random_state=42
     )
+    return train_data, val_data, test_data
+
+
+def prepare_data():
+    global train_dataset, eval_dataset, test_dataset, label2id, id2label, labels, feature_extractor
     
-    print(f"[Info] 데이터 분할: Train={len(train_data)}, Valid={len(val_data)}, Test={len(test_data)}")
+    print("\n" + "="*50)
+    print("[Step 1] 데이터 준비 시작...")
+    print("="*50)
     
-    # Feature Extractor 로드
-    feature_extractor = ASTFeatureExtractor.from_pretrained(MODEL_NAME)
+    data_list = collect_data_list()
+    if data_list is None:
+        return False
+    print(f"[Info] 총 {len(data_list)}개의 오디오 파일 발견")
     
-    # librosa로 직접 오디오 로딩 (torchcodec 우회!)
-    import librosa
-    
-    def load_audio_with_librosa(file_path, target_sr=16000):
-        """librosa로 오디오 로드 (Windows 호환)"""
-        try:
-            audio_array, _ = librosa.load(file_path, sr=target_sr)
-            return audio_array
-        except Exception as e:
-            print(f"[Warning] 오디오 로드 실패: {file_path} - {e}")
-            return None
-    
-    async def preprocess_batch_async(data_list, desc="Processing"):
-        """배치 전처리 (librosa + U-Net Denoising)"""
-        processed_data = []
-        
-        for item in data_list:
-            audio_array = load_audio_with_librosa(item["audio"])
-            if audio_array is None:
-                continue
-            
-            # [고도화 로직] U-Net Denoising 적용
-            # 기존: audio_array_input = audio_array
-            audio_array_clean = await denoise_audio(audio_array)
-            
-            # Feature extraction
-            inputs = feature_extractor(
-                audio_array_clean, 
-                sampling_rate=16000, 
-                return_tensors="pt", 
-                padding="max_length"
-            )
-            
-            processed_data.append({
-                "input_values": inputs["input_values"].squeeze(0).numpy(),
-                "labels": label2id[item["label"]]
-            })
-        
-        return processed_data
-
-    # [기존 함수 보존을 위해 새 이름으로 래핑함]
-    def preprocess_batch(data_list, desc="Processing"):
-        import asyncio
-        return asyncio.run(preprocess_batch_async(data_list, desc))
+    if len(data_list) == 0:
+        print("[Error] 데이터가 없습니다.")
+        return False
     
-    # Dataset 생성 및 전처리
-    print("[Info] 데이터 전처리 중 (librosa 사용)...")
+    # 라벨 인코딩
+    labels = list(set([x['label'] for x in data_list]))
+    label2id = {label: i for i, label in enumerate(labels)}
+    id2label = {i: label for i, label in enumerate(labels)}
+    print(f"[Info] 감지된 라벨({len(labels)}개): {labels}")
     
-    train_processed = preprocess_batch(train_data, "Train")
-    val_processed = preprocess_batch(val_data, "Valid")
-    test_processed = preprocess_batch(test_data, "Test")
+    train_data, val_data, test_data = split_data(data_list)
     
-    print(f"[Info] 전처리 완료: Train={len(train_processed)}, Valid={len(val_processed)}, Test={len(test_processed)}")
+    print(f"[Info] 데이터 분할: Train={len(train_data)}, Valid={len(val_data)}, Test={len(test_data)}")
     
-    # HuggingFace Dataset으로 변환
-    train_dataset = Dataset.from_list(train_processed)
-    eval_dataset = Dataset.from_list(val_processed)
-    test_dataset = Dataset.from_list(test_processed)
+    # Feature Extractor 로드
+    feature_extractor = ASTFeatureExtractor.from_pretrained(MODEL_NAME)
     
-    # Tensor 형식 설정
-    train_dataset.set_format(type="torch", columns=["input_values", "labels"])
-    eval_dataset.set_format(type="torch", columns=["input_values", "labels"])
-    test_dataset.set_format(type="torch", columns=["input_values", "labels"])
+    # [고도화 로직] Feature Store: 클립당 1회 디코딩 + U-Net Denoising 후 memmap 샤드에 저장
+    # 기존: 실행할 때마다 librosa 디코딩 → denoise → feature_extractor 반복
+    print("[Info] 특징 동기화 중 (신규/변경 파일만 계산)...")
+    start = time.perf_counter()
+    feature_store = AudioFeatureStore(feature_extractor, denoise=True)
+    feature_store.sync([x["audio"] for x in data_list])
+    print(f"[Info] 특징 준비 시간: {time.perf_counter() - start:.2f}s")
+
+    # HuggingFace Trainer는 torch Dataset 인터페이스를 그대로 받음
+    train_dataset = FeatureStoreDataset(feature_store, train_data, label2id)
+    eval_dataset = FeatureStoreDataset(feature_store, val_data, label2id)
+    test_dataset = FeatureStoreDataset(feature_store, test_data, label2id)
+
+    print(f"[Info] 전처리 완료: Train={len(train_dataset)}, Valid={len(eval_dataset)}, Test={len(test_dataset)}")
     
     print("[✓] 데이터 준비 완료!")
     return True
@@ -0,0 +1,235 @@
+# ai/scripts/audio/train_audio_distill.py
+"""
+AST → 경량 CNN 지식 증류 도구 (Audio Distiller)
+
+[역할]
+1. 지식 증류: 학습된 AST(Teacher)의 Soft Label을 이용해 Log-Mel CNN(Student)을 학습합니다.
+2. 라벨 체계 유지: train_audio.py와 동일한 파일 목록(S3 수집 폴더 포함) / 데이터 분할을 사용하고,
+   Teacher의 id2label을 그대로 물려받아 get_category_from_label 카테고리가 서빙과 일치합니다.
+3. 서빙 연동: 결과물은 ast_service의 Cascade(경량 CNN → AST)에서 바로 사용됩니다.
+
+[사용법]
+python -m ai.scripts.audio.train_audio_distill --epochs 30
+"""
+import argparse
+import json
+import os
+import time
+
+import librosa
+import numpy as np
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+from transformers import ASTForAudioClassification, ASTFeatureExtractor
+
+from ai.scripts.audio.train_audio import SAVE_PATH as TEACHER_PATH, collect_data_list, split_data
+from ai.app.services.audio.ast_service import get_category_from_label
+from ai.app.services.audio.lite_audio_service import (
+    LiteAudioCNN, compute_log_mel, LITE_MODEL_DIR,
+    SAMPLE_RATE, N_FFT, HOP_LENGTH, N_MELS, MAX_FRAMES,
+)
+
+# =============================================================================
+# [설정] 경로 및 하이퍼파라미터
+# =============================================================================
+TEMPERATURE = 4.0   # Soft Label 온도
+ALPHA = 0.7         # KD Loss 비중 (1-ALPHA: 정답 라벨 CE)
+BASE_CHANNELS = 16
+
+
+# =============================================================================
+# 1. 데이터 준비 (train_audio.py와 동일한 수집/분할 규칙)
+# =============================================================================
+def collect_data(label2id):
+    """
+    train_audio.py와 같은 파일 목록(로컬 + S3 수집 폴더) / 같은 분할을 사용
+    분할 후 Teacher에 없는 라벨만 제외하므로 Test 세트가 Teacher 학습 때와 같습니다.
+    """
+    data_list = collect_data_list() or []
+    if not data_list:
+        return [], [], []
+
+    def _known(items):
+        unknown = {x["label"] for x in items if x["label"] not in label2id}
+        for label in sorted(unknown):
+            print(f"[Warning] Teacher에 없는 라벨: {label} (무시됨)")
+        return [x for x in items if x["label"] in label2id]
+
+    return tuple(_known(split) for split in split_data(data_list))
+
+
+def extract_features(data_list, teacher, feature_extractor, label2id, batch_size=8):
+    """
+    클립별 1회 디코딩 → (Student Log-Mel, Teacher logits, 정답 id)
+    """
+    mels, teacher_logits, targets = [], [], []
+    batch_audio, batch_targets = [], []
+
+    def _flush():
+        if not batch_audio:
+            return
+        inputs = feature_extractor(batch_audio, sampling_rate=SAMPLE_RATE, return_tensors="pt", padding="max_length")
+        with torch.no_grad():
+            teacher_logits.append(teacher(**inputs).logits.cpu().numpy())
+        targets.extend(batch_targets)
+        batch_audio.clear()
+        batch_targets.clear()
+
+    for item in data_list:
+        try:
+            audio_array, _ = librosa.load(item["audio"], sr=SAMPLE_RATE)
+        except Exception as e:
+            print(f"[Warning] 오디오 로드 실패: {item['audio']} - {e}")
+            continue
+        mels.append(compute_log_mel(audio_array))
+        batch_audio.append(audio_array)
+        batch_targets.append(label2id[item["label"]])
+        if len(batch_audio) >= batch_size:
+            _flush()
+    _flush()
+
+    return (
+        np.stack(mels).astype(np.float32),
+        np.concatenate(teacher_logits).astype(np.float32),
+        np.array(targets, dtype=np.int64),
+    )
+
+
+# =============================================================================
+# 2. 증류 학습
+# =============================================================================
+def distillation_loss(student_logits, teacher_logits, targets):
+    soft_teacher = F.softmax(teacher_logits / TEMPERATURE, dim=-1)
+    log_soft_student = F.log_softmax(student_logits / TEMPERATURE, dim=-1)
+    kd = F.kl_div(log_soft_student, soft_teacher, reduction="batchmean") * (TEMPERATURE ** 2)
+    ce = F.cross_entropy(student_logits, targets)
+    return ALPHA * kd + (1 - ALPHA) * ce
+
+
+def evaluate_student(model, mels, teacher_logits, targets, id2label):
+    """정답 정확도 / Teacher 일치율 / 카테고리 일치율"""
+    model.eval()
+    with torch.no_grad():
+        logits = model(torch.from_numpy(mels).unsqueeze(1))
+    preds = logits.argmax(-1).numpy()
+    teacher_preds = teacher_logits.argmax(-1)
+
+    pred_categories = [get_category_from_label(id2label[int(p)]) for p in preds]
+    true_categories = [get_category_from_label(id2label[int(t)]) for t in targets]
+
+    return {
+        "accuracy": float((preds == targets).mean()),
+        "teacher_accuracy": float((teacher_preds == targets).mean()),
+        "teacher_agreement": float((preds == teacher_preds).mean()),
+        "category_accuracy": float(np.mean([p == t for p, t in zip(pred_categories, true_categories)])),
+    }
+
+
+def train_student(train_set, val_set, id2label, epochs=30, batch_size=32, lr=1e-3):
+    train_mels, train_teacher, train_targets = train_set
+    val_mels, val_teacher, val_targets = val_set
+
+    model = LiteAudioCNN(num_labels=len(id2label), base_channels=BASE_CHANNELS)
+    opt = torch.optim.AdamW(model.parameters(), lr=lr, weight_decay=1e-4)
+    sched = torch.optim.lr_scheduler.CosineAnnealingLR(opt, T_max=epochs)
+
+    x_all = torch.from_numpy(train_mels).unsqueeze(1)
+    t_all = torch.from_numpy(train_teacher)
+    y_all = torch.from_numpy(train_targets)
+
+    best_state, best_score = None, -1.0
+    for ep in range(1, epochs + 1):
+        model.train()
+        perm = torch.randperm(len(x_all))
+        total = 0.0
+        for i in range(0, len(perm), batch_size):
+            idx = perm[i:i + batch_size]
+            loss = distillation_loss(model(x_all[idx]), t_all[idx], y_all[idx])
+            opt.zero_grad()
+            loss.backward()
+            opt.step()
+            total += loss.item() * len(idx)
+        sched.step()
+
+        metrics = evaluate_student(model, val_mels, val_teacher, val_targets, id2label)
+        print(f"[epoch {ep:02d}] loss={total/len(perm):.4f} "
+              f"val_acc={metrics['accuracy']:.4f} agree={metrics['teacher_agreement']:.4f}")
+
+        if metrics["accuracy"] > best_score:
+            best_score = metrics["accuracy"]
+            best_state = {k: v.detach().clone() for k, v in model.state_dict().items()}
+
+    model.load_state_dict(best_state)
+    return model
+
+
+def save_student(model, id2label):
+    os.makedirs(LITE_MODEL_DIR, exist_ok=True)
+    torch.save(model.state_dict(), os.path.join(LITE_MODEL_DIR, "model.pt"))
+    config = {
+        "id2label": {str(k): v for k, v in id2label.items()},
+        "base_channels": BASE_CHANNELS,
+        "sample_rate": SAMPLE_RATE,
+        "n_fft": N_FFT,
+        "hop_length": HOP_LENGTH,
+        "n_mels": N_MELS,
+        "max_frames": MAX_FRAMES,
+        "teacher": TEACHER_PATH,
+    }
+    with open(os.path.join(LITE_MODEL_DIR, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(config, f, ensure_ascii=False, indent=2)
+    print(f"[✓] 경량 모델 저장 완료: {LITE_MODEL_DIR}")
+
+
+# =============================================================================
+# Main
+# =============================================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="AST → Lite CNN Distillation")
+    parser.add_argument("--epochs", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--lr", type=float, default=1e-3)
+    args = parser.parse_args()
+
+    if not os.path.exists(TEACHER_PATH):
+        print(f"[Error] Teacher(AST) 모델이 없습니다: {TEACHER_PATH}")
+        print("먼저 train_audio.py로 AST를 학습해주세요.")
+        exit(1)
+
+    print("\n" + "="*50)
+    print("[Step 1] Teacher 로드 및 특징 추출...")
+    print("="*50)
+    teacher = ASTForAudioClassification.from_pretrained(TEACHER_PATH).eval()
+    feature_extractor = ASTFeatureExtractor.from_pretrained(TEACHER_PATH)
+    id2label = {int(k): v for k, v in teacher.config.id2label.items()}
+    label2id = {v: k for k, v in id2label.items()}
+
+    train_data, val_data, test_data = collect_data(label2id)
+    if not train_data:
+        print("[Error] 학습 데이터가 없습니다. (ai/data/ast 또는 S3 수집 폴더 확인)")
+        exit(1)
+    print(f"[Info] 데이터 분할: Train={len(train_data)}, Valid={len(val_data)}, Test={len(test_data)}")
+
+    start = time.perf_counter()
+    train_set = extract_features(train_data, teacher, feature_extractor, label2id)
+    val_set = extract_features(val_data, teacher, feature_extractor, label2id)
+    test_set = extract_features(test_data, teacher, feature_extractor, label2id)
+    print(f"[Info] 특징 추출 완료 ({time.perf_counter() - start:.1f}s)")
+
+    print("\n" + "="*50)
+    print(f"[Step 2] 증류 학습 ({args.epochs} epochs, T={TEMPERATURE}, alpha={ALPHA})...")
+    print("="*50)
+    student = train_student(train_set, val_set, id2label, epochs=args.epochs, batch_size=args.batch_size, lr=args.lr)
+    save_student(student, id2label)
+
+    print("\n" + "="*50)
+    print("📊 Test 정확도 비교 (Teacher vs Student)")
+    print("="*50)
+    metrics = evaluate_student(student, *test_set, id2label)
+    print(f"   AST(Teacher) 정확도:    {metrics['teacher_accuracy']:.4f}")
+    print(f"   Lite CNN 정확도:        {metrics['accuracy']:.4f}")
+    print(f"   Teacher 일치율:         {metrics['teacher_agreement']:.4f}")
+    print(f"   카테고리 정확도:        {metrics['category_accuracy']:.4f}")
+    print("="*50)
+    print("지연시간(p50/p99) 비교는 evaluate_audio.py를 실행하세요.\n")
@@ -0,0 +1,38 @@
+# ai/scripts/obd_engine/benchmark_lstm_ae.py
+"""
+LSTM-AE 배치 채점 지연 시간 측정 (p50 / p99)
+
+[사용법]
+python -m ai.scripts.obd_engine.benchmark_lstm_ae
+python -m ai.scripts.obd_engine.benchmark_lstm_ae --weights ai/weights/lstm_ae_v0.pt --iterations 100 --eager
+
+가중치가 없으면 무작위 초기화 모델로 측정합니다. (지연 시간은 가중치 값과 무관)
+"""
+import argparse
+import os
+
+import torch
+
+from ai.app.services.obd_engine_anomaly.lstm_ae_core import LSTMAEEngine, LSTMAutoencoder, benchmark
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LSTM-AE Batch Scoring Benchmark")
+    parser.add_argument("--weights", type=str, default=os.path.join("ai", "weights", "lstm_ae_v0.pt"))
+    parser.add_argument("--signals", type=int, default=4)
+    parser.add_argument("--window-len", type=int, default=600, help="60초 x 10Hz")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 32, 256])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--eager", action="store_true", help="TorchScript 컴파일 없이 측정 (비교용)")
+    args = parser.parse_args()
+
+    model = LSTMAutoencoder(args.signals)
+    if os.path.exists(args.weights):
+        model.load_state_dict(torch.load(args.weights, map_location="cpu"))
+    else:
+        print(f"[Info] 가중치 없음 ({args.weights}), 무작위 초기화 모델로 측정")
+
+    engine = LSTMAEEngine(model, window_len=args.window_len, compile=not args.eager)
+    print(f"[Benchmark] TorchScript={engine.compiled}, threads={torch.get_num_threads()}, T={args.window_len}, F={args.signals}")
+    print(f"{'batch':>6} {'p50(ms)':>10} {'p99(ms)':>10} {'windows/s':>10}")
+    for batch, r in benchmark(engine, args.batch_sizes, args.iterations).items():
+        print(f"{batch:>6} {r['p50_ms']:>10} {r['p99_ms']:>10} {r['windows_per_sec']:>10}")
@@ -0,0 +1,123 @@
+# ai/scripts/obd_engine/benchmark_streaming.py
+"""
+스트리밍 채점 부하 측정 (차량 N대가 1Hz로 OBD 샘플 전송)
+
+[시나리오]
+- 원본 주행(컬럼 저장소, normal)을 10Hz 격자로 정렬한 뒤, 차량마다 임의의 주행/시작 위치를 배정
+- 매 초 모든 차량이 새 10개 샘플을 보냄 (차량별 시작 시각을 stride 안에서 분산)
+- StreamingScorer: push_many → score_due (채점 시점 차량 전체를 한 번에)
+- 비교(기존 방식): 새 샘플이 올 때마다 60초 윈도우 전체를 ObdWindow로 보내 다시 채점 (표본 차량으로 측정 후 환산)
+
+[사용법]
+python -m ai.scripts.obd_engine.benchmark_streaming
+python -m ai.scripts.obd_engine.benchmark_streaming --vehicles 10000 --seconds 10
+
+가중치가 없으면 무작위 초기화 모델로 측정합니다. (연산량은 가중치 값과 무관)
+"""
+import argparse
+import os
+import time
+
+import numpy as np
+import torch
+
+from ai.app.schemas.obd_engine_anomaly_schema import ObdWindow
+from ai.app.services.obd_engine_anomaly.feature_registry import FeatureSpec
+from ai.app.services.obd_engine_anomaly.lstm_ae_core import LSTMAEEngine, LSTMAutoencoder
+from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import (
+    ObdEngineAnomalyService, StreamingScorer
+)
+from ai.app.services.obd_engine_anomaly.scaler import ZScoreScaler
+from ai.app.services.obd_engine_anomaly.time_aligner import AlignConfig, align
+from ai.app.services.obd_engine_anomaly.trip_store import TripStore, list_trip_csvs
+
+
+def load_fleet_source(spec: FeatureSpec, store_root: str):
+    """normal 주행 전체를 10Hz 격자로 정렬해 하나의 배열로 이어 붙임 → (values, trip_starts, trip_lengths)"""
+    store = TripStore(store_root)
+    store.sync(list_trip_csvs())
+    config = AlignConfig(rate_hz=spec.sampling_hz)
+    arrays = []
+    for entry in store.trips(category="normal"):
+        values = align(store.load(entry["trip_id"], spec.signals), config).values
+        values = values[~np.isnan(values).any(axis=1)]
+        if len(values) > spec.window_len * 2:
+            arrays.append(values)
+    lengths = np.array([len(a) for a in arrays])
+    return np.concatenate(arrays), np.concatenate([[0], np.cumsum(lengths)[:-1]]), lengths
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OBD Streaming Scorer Benchmark")
+    parser.add_argument("--vehicles", type=int, default=10000)
+    parser.add_argument("--seconds", type=int, default=10, help="측정 구간 (버퍼가 찬 이후)")
+    parser.add_argument("--stride-sec", type=float, default=5.0)
+    parser.add_argument("--weights", type=str, default=os.path.join("ai", "weights", "lstm_ae_v0.pt"))
+    parser.add_argument("--store", type=str, default=os.path.join("ai", "data", "obd", "store"))
+    parser.add_argument("--baseline-sample", type=int, default=256, help="기존 방식 측정 표본 차량 수")
+    args = parser.parse_args()
+
+    spec = FeatureSpec()
+    model = LSTMAutoencoder(spec.num_signals)
+    if os.path.exists(args.weights):
+        model.load_state_dict(torch.load(args.weights, map_location="cpu"))
+    else:
+        print(f"[Info] 가중치 없음 ({args.weights}), 무작위 초기화 모델로 측정")
+
+    source, trip_starts, trip_lengths = load_fleet_source(spec, args.store)
+    scaler = ZScoreScaler(np.nanmean(source, axis=0), np.nanstd(source, axis=0), spec.signals)
+    engine = LSTMAEEngine(model, window_len=spec.window_len, max_batch=512, scaler=scaler)  # 서빙과 같이 정규화 fold
+    service = ObdEngineAnomalyService(engine, scaler, spec)
+    scorer = StreamingScorer(service, stride_sec=args.stride_sec, max_vehicles=args.vehicles, idle_ttl_sec=0)
+
+    rng = np.random.default_rng(0)
+    V = args.vehicles
+    per_sec = int(spec.sampling_hz)
+    trip = rng.integers(0, len(trip_lengths), V)
+    base, length = trip_starts[trip], trip_lengths[trip]
+    offset = rng.integers(0, length)
+    join_sec = rng.integers(0, int(args.stride_sec), V)  # 차량별 전송 시작 시각 분산
+    vehicle_ids = np.array([f"car-{i:05d}" for i in range(V)])
+    print(f"[Benchmark] vehicles={V}, source rows={len(source)}, threads={torch.get_num_threads()}, "
+          f"TorchScript={engine.compiled}, buffer={scorer.memory_bytes / 2**20:.1f}MB")
+
+    warmup = spec.window_sec + int(args.stride_sec)
+    push_cpu = score_cpu = 0.0
+    scored = 0
+    for second in range(warmup + args.seconds):
+        active = join_sec <= second
+        sent = second - join_sec[active]
+        idx = base[active, None] + (offset[active, None] + sent[:, None] * per_sec + np.arange(per_sec)) % length[active, None]
+        measuring = second >= warmup
+
+        t0 = time.process_time()
+        scorer.push_many(vehicle_ids[active].tolist(), source[idx], now=float(second))
+        t1 = time.process_time()
+        results = scorer.score_due()
+        t2 = time.process_time()
+        if measuring:
+            push_cpu += t1 - t0
+            score_cpu += t2 - t1
+            scored += len(results)
+
+    vehicle_seconds = V * args.seconds
+    stream_ms = (push_cpu + score_cpu) * 1000 / vehicle_seconds
+
+    # 기존 방식: 매 초 차량마다 60초 윈도우 전체를 요청으로 보내 prepare_window + 채점
+    sample = min(args.baseline_sample, V)
+    windows = []
+    for v in range(sample):
+        idx = base[v] + (offset[v] + np.arange(spec.window_len)) % length[v]
+        windows.append(ObdWindow(window_id=str(v), signals={s: source[idx, j].tolist() for j, s in enumerate(spec.signals)}))
+    t0 = time.process_time()
+    service.score_windows(windows)
+    baseline_ms = (time.process_time() - t0) * 1000 / sample
+
+    print("\n" + "="*60)
+    print(f"📊 CPU 시간 / 차량·초 ({V} vehicles x {args.seconds}s, stride {args.stride_sec}s)")
+    print("="*60)
+    print(f"   StreamingScorer: {stream_ms:.3f} ms  (push {push_cpu * 1000 / vehicle_seconds:.3f} + "
+          f"score {score_cpu * 1000 / vehicle_seconds:.3f}), windows={scored}")
+    print(f"   기존(매 초 전체 윈도우 재채점): {baseline_ms:.3f} ms  (x{baseline_ms / max(stream_ms, 1e-9):.1f})")
+    print(f"   scorer metrics: {scorer.metrics()}")
+    print("="*60 + "\n")
@@ -1,39 +1,44 @@
-# ai/scripts/build_lstm_dataset.py
-from ai.app.services.lstm_preprocess import build_lstm_ae_dataset, PreprocessConfig
+# ai/scripts/obd_engine/build_lstm_dataset.py
+"""
+LSTM-AE 학습 데이터셋 생성 (주행 저장소 → 격자 배열 + 윈도우 색인 + scaler/meta)
 
+[사용법]
+python -m ai.scripts.obd_engine.build_lstm_dataset
+python -m ai.scripts.obd_engine.build_lstm_dataset --categories normal frei --stride-sec 2
 
-def main():
-    raw_dir = "ai/data/obd/raw/normal"
-    out_dir = "ai/data/processed/lstm_ae"
-
-    signals = ["rpm", "speed", "coolant", "map"]
-
-    cfg = PreprocessConfig(
-        sampling_hz=10.0,
-        window_sec=60,
-        stride_sec=5,
-        timestamp_col="timestamp",
-        timestamp_format="%H:%M:%S.%f",  # Time이 HH:MM:SS.mmm 형태면 추천 (경고 줄어듦)
-        fill_method="ffill_then_bfill",
-        normalize="zscore",
-        rename_map={
-            "Time": "timestamp",
-            "Engine RPM [RPM]": "rpm",
-            "Vehicle Speed Sensor [km/h]": "speed",
-            "Engine Coolant Temperature [°C]": "coolant",
-            "Intake Manifold Absolute Pressure [kPa]": "map",
-        },
-    )
+원본 CSV 변환(build_trip_store)이 먼저 실행되지 않았으면 여기서 증분 변환합니다.
+"""
+import argparse
+
+from ai.app.services.obd_engine_anomaly.lstm_preprocess import (
+    DATASET_ROOT, PreprocessConfig, build_lstm_ae_dataset
+)
+from ai.app.services.obd_engine_anomaly.trip_store import TripStore, list_trip_csvs
 
-    train_npz, scaler_path, meta_path = build_lstm_ae_dataset(
-        raw_dir=raw_dir,
-        out_dir=out_dir,
-        signals=signals,
+
+def main():
+    parser = argparse.ArgumentParser(description="LSTM-AE Window Dataset Builder")
+    parser.add_argument("--out-dir", type=str, default=DATASET_ROOT)
+    parser.add_argument("--signals", nargs="+", default=["rpm", "speed", "coolant", "map"])
+    parser.add_argument("--categories", nargs="+", default=["normal"])
+    parser.add_argument("--window-sec", type=int, default=60)
+    parser.add_argument("--stride-sec", type=float, default=5.0)
+    args = parser.parse_args()
+
+    store = TripStore()
+    store.sync(list_trip_csvs())
+
+    cfg = PreprocessConfig.from_yaml(sampling_hz=10.0, window_sec=args.window_sec, stride_sec=args.stride_sec)
+    index_path, scaler_path, meta_path = build_lstm_ae_dataset(
+        store,
+        out_dir=args.out_dir,
+        signals=args.signals,
         cfg=cfg,
+        categories=args.categories,
     )
 
     print("[OK]")
-    print("train_npz:", train_npz)
+    print("windows:", index_path)
     print("scaler:", scaler_path)
     print("meta:", meta_path)
 
@@ -0,0 +1,61 @@
+# ai/scripts/obd_engine/build_trip_store.py
+"""
+원본 OBD CSV → 컬럼 주행 저장소 변환 (1회, 이후 증분)
+
+[사용법]
+python -m ai.scripts.obd_engine.build_trip_store
+python -m ai.scripts.obd_engine.build_trip_store --workers 8 --prune --benchmark
+
+변경되지 않은 CSV는 건너뜁니다. (파일 해시 기준)
+--benchmark: 전체 주행을 pandas로 다시 읽는 시간 vs 저장소 memmap 조회 시간 비교
+"""
+import argparse
+import time
+
+import numpy as np
+
+from ai.app.services.obd_engine_anomaly.trip_store import (
+    RAW_ROOT, STORE_ROOT, TripStore, list_trip_csvs
+)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="OBD Columnar Trip Store Builder")
+    parser.add_argument("--raw-root", type=str, default=RAW_ROOT)
+    parser.add_argument("--root", type=str, default=STORE_ROOT)
+    parser.add_argument("--workers", type=int, default=0, help="변환 프로세스 수 (0: CPU 수)")
+    parser.add_argument("--prune", action="store_true", help="원본이 사라진 주행 삭제")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args()
+
+    files = list_trip_csvs(args.raw_root)
+    print(f"[Info] 대상 CSV {len(files)}개")
+    store = TripStore(args.root)
+    store.sync(files, workers=args.workers, prune=args.prune)
+
+    trips = store.trips()
+    for category in sorted({t["category"] for t in trips}):
+        subset = [t for t in trips if t["category"] == category]
+        hours = sum(t["duration_sec"] for t in subset) / 3600
+        print(f"   {category:<8} {len(subset):>4} trips, {hours:6.2f} h, {sum(t['rows'] for t in subset):>9} rows")
+
+    if args.benchmark and files:
+        import pandas as pd
+
+        t0 = time.perf_counter()
+        for path in files:
+            df = pd.read_csv(path)
+            pd.to_datetime(df["Time"], format="%H:%M:%S.%f", errors="coerce")
+        legacy_sec = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for entry in trips:
+            for array in store.columns(entry["trip_id"]).values():
+                np.nanmean(array)  # 실제로 페이지를 읽도록 전체 순회
+        store_sec = time.perf_counter() - t0
+
+        print("\n" + "="*50)
+        print(f"📊 전체 주행 로드 시간 ({len(files)} files)")
+        print("="*50)
+        print(f"   pandas read_csv + to_datetime: {legacy_sec:.2f}s")
+        print(f"   Trip Store (memmap):          {store_sec:.2f}s  (x{legacy_sec / max(store_sec, 1e-9):.1f})")
+        print("="*50 + "\n")
@@ -0,0 +1,71 @@
+# ai/scripts/obd_engine/fit_scaler.py
+"""
+주행 저장소 전체에서 신호별 정규화 통계(scaler.json) 계산
+
+[사용법]
+python -m ai.scripts.obd_engine.fit_scaler
+python -m ai.scripts.obd_engine.fit_scaler --signals rpm speed coolant map --workers 4 --out ai/data/processed/lstm_ae/scaler_trip_store.json
+
+주행마다 memmap을 구간 단위로 한 번만 읽어 (count, mean, M2)를 만들고 병렬로 병합합니다. (전체 데이터를 메모리에 올리지 않음)
+
+기본 출력은 별도 파일(scaler_trip_store.json)입니다.
+데이터셋의 scaler.json은 학습된 모델이 쓴 통계(meta.json registry_version)이므로,
+통계가 다른 scaler로 덮어쓰려 하면 거부합니다. (--force: 모델을 다시 학습할 때만)
+"""
+import argparse
+import json
+import os
+import time
+
+from ai.app.services.obd_engine_anomaly.feature_registry import registry_version
+from ai.app.services.obd_engine_anomaly.lstm_preprocess import DATASET_ROOT
+from ai.app.services.obd_engine_anomaly.scaler import fit_trip_store
+from ai.app.services.obd_engine_anomaly.trip_store import STORE_ROOT, TripStore, list_trip_csvs
+
+
+def check_overwrite(out_path: str, scaler) -> None:
+    """out_path가 학습된 모델의 scaler(같은 폴더 meta.json)이고 통계가 다르면 거부 (ValueError)"""
+    meta_path = os.path.join(os.path.dirname(os.path.abspath(out_path)), "meta.json")
+    if os.path.basename(out_path) != "scaler.json" or not os.path.exists(meta_path):
+        return
+    with open(meta_path, "r", encoding="utf-8") as f:
+        trained = json.load(f).get("registry_version")
+    if trained is None:
+        return
+    new = registry_version(scaler.signals, scaler.mean, scaler.std)
+    if new != trained:
+        raise ValueError(
+            f"{out_path}는 학습된 모델의 scaler({trained})입니다. 통계가 다른 scaler({new})로 덮어쓰지 않습니다. "
+            "다른 --out 경로를 쓰거나, 모델을 다시 학습할 경우에만 --force를 주세요."
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OBD Streaming Scaler Fit")
+    parser.add_argument("--store", type=str, default=STORE_ROOT)
+    parser.add_argument("--signals", nargs="+", default=["rpm", "speed", "coolant", "map"])
+    parser.add_argument("--categories", nargs="+", default=["normal"])
+    parser.add_argument("--workers", type=int, default=0, help="0: CPU 수")
+    parser.add_argument("--out", type=str, default=os.path.join(DATASET_ROOT, "scaler_trip_store.json"))
+    parser.add_argument("--force", action="store_true", help="학습된 모델의 scaler.json도 덮어쓰기")
+    args = parser.parse_args()
+
+    store = TripStore(args.store)
+    store.sync(list_trip_csvs())
+
+    start = time.perf_counter()
+    scaler = fit_trip_store(store, args.signals, categories=args.categories, workers=args.workers)
+    if not args.force:
+        try:
+            check_overwrite(args.out, scaler)
+        except ValueError as e:
+            raise SystemExit(f"[Error] {e}")
+    path = scaler.to_json(args.out)
+
+    print(f"[OK] {path} ({time.perf_counter() - start:.2f}s)")
+    for name, mean, std in zip(scaler.signals, scaler.mean, scaler.std):
+        print(f"   {name:>8}: mean={mean:.3f} std={std:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# ai/scripts/obd_engine/run_batch_scoring.py
+"""
+OBD 이상 탐지 배치 채점 1회 실행 (obd_logs 최근 N분 → anomaly_records)
+
+[사용법]
+python -m ai.scripts.obd_engine.run_batch_scoring
+python -m ai.scripts.obd_engine.run_batch_scoring --lookback-min 30 --partitions 16 --concurrency 4 --batch-size 512
+OBD_BATCH_DSN=postgresql://user:pw@localhost:5432/car_sentry python -m ai.scripts.obd_engine.run_batch_scoring
+
+cron / 스케줄러에서 lookback보다 짧은 주기로 실행합니다. 차량별 진행 위치가 있어 겹치는 구간은 다시 채점하지 않습니다.
+모델 / scaler / meta 경로는 서빙과 같은 OBD_LSTM_AE_* 환경 변수를 사용합니다.
+"""
+import argparse
+import asyncio
+import os
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OBD Fleet Batch Anomaly Scoring")
+    parser.add_argument("--dsn", type=str, default=None)
+    parser.add_argument("--lookback-min", type=float, default=None)
+    parser.add_argument("--partitions", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=512, help="LSTM-AE forward 1회 최대 윈도우 수")
+    args = parser.parse_args()
+
+    # 서비스 로드 전에 설정 (배치 작업은 서빙보다 큰 배치로 forward)
+    os.environ.setdefault("OBD_LSTM_AE_MAX_BATCH", str(args.batch_size))
+
+    from ai.app.services.obd_engine_anomaly.batch_scoring import BatchJobConfig, BatchScoringJob
+    from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import load_obd_anomaly_service
+
+    config = BatchJobConfig.from_env(
+        dsn=args.dsn, lookback_min=args.lookback_min, partitions=args.partitions, concurrency=args.concurrency,
+    )
+    job = BatchScoringJob(load_obd_anomaly_service(), config)
+    stats = asyncio.run(job.run())
+    print("[OK]", stats)
+
+
+if __name__ == "__main__":
+    main()
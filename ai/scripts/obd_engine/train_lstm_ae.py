@@ -1,46 +1,18 @@
-# ai/scripts/train_lstm_ae.py
+# ai/scripts/obd_engine/train_lstm_ae.py
 import os
 import json
 import numpy as np
 import torch
 import torch.nn as nn
-from torch.utils.data import Dataset, DataLoader
+from torch.utils.data import DataLoader
 
-
-class NpzSequenceDataset(Dataset):
-    def __init__(self, npz_path: str):
-        data = np.load(npz_path)
-        self.X = data["X"]
-
-    def __len__(self):
-        return int(self.X.shape[0])
-
-    def __getitem__(self, idx):
-        return torch.from_numpy(self.X[idx])
-
-
-class LSTMAutoencoder(nn.Module):
-    def __init__(self, input_dim, hidden_dim=64, latent_dim=16, num_layers=1):
-        super().__init__()
-        self.encoder = nn.LSTM(input_dim, hidden_dim, num_layers, batch_first=True)
-        self.to_latent = nn.Linear(hidden_dim, latent_dim)
-
-        self.from_latent = nn.Linear(latent_dim, hidden_dim)
-        self.decoder = nn.LSTM(hidden_dim, hidden_dim, num_layers, batch_first=True)
-        self.out = nn.Linear(hidden_dim, input_dim)
-
-    def forward(self, x):
-        enc_out, _ = self.encoder(x)
-        h_last = enc_out[:, -1, :]
-        z = self.to_latent(h_last)
-
-        h = self.from_latent(z).unsqueeze(1).repeat(1, x.size(1), 1)
-        dec_out, _ = self.decoder(h)
-        return self.out(dec_out)
+from ai.app.services.obd_engine_anomaly.feature_registry import registry_version
+from ai.app.services.obd_engine_anomaly.lstm_ae_core import LSTMAEEngine, LSTMAutoencoder
+from ai.app.services.obd_engine_anomaly.lstm_preprocess import DATASET_ROOT, WindowDataset
 
 
 def main():
-    npz_path = "data/processed/lstm_ae/train.npz"
+    data_dir = DATASET_ROOT
     out_dir = "ai/weights"
     os.makedirs(out_dir, exist_ok=True)
 
@@ -51,8 +23,9 @@ def main():
     device = "cuda" if torch.cuda.is_available() else "cpu"
     print("[device]", device)
 
-    ds = NpzSequenceDataset(npz_path)
-    dl = DataLoader(ds, batch_size=batch_size, shuffle=True, drop_last=True)
+    # 윈도우는 memmap에서 배치마다 읽음 (셔플은 Dataset의 에폭별 색인으로)
+    ds = WindowDataset(data_dir, shuffle=True)
+    dl = DataLoader(ds, batch_size=batch_size, shuffle=False, drop_last=True)
 
     input_dim = ds[0].shape[-1]
     model = LSTMAutoencoder(input_dim).to(device)
@@ -61,6 +34,7 @@ def main():
     loss_fn = nn.MSELoss()
 
     for ep in range(1, epochs + 1):
+        ds.set_epoch(ep)
         total = 0.0
         for x in dl:
             x = x.to(device)
@@ -74,6 +48,21 @@ def main():
     torch.save(model.state_dict(), f"{out_dir}/lstm_ae_v0.pt")
     print("[OK] model saved")
 
+    # 이상 판정 임계값 보정: 정상 학습 윈도우 재구성 오차의 p99 → meta.json (서빙 기본 임계값, 학습 scaler 통계 버전과 함께)
+    engine = LSTMAEEngine(model.cpu(), window_len=ds.window_len)
+    scores = np.concatenate([engine.score(batch)[0] for batch in ds.iter_batches()])
+    threshold = float(np.percentile(scores, 99))
+    meta_path = os.path.join(data_dir, "meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        meta["threshold"] = threshold
+        # 이 모델이 학습한 scaler 통계 → 서빙 로드 시 check_scaler가 비교
+        meta["registry_version"] = registry_version(ds.scaler.signals, ds.scaler.mean, ds.scaler.std)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f, ensure_ascii=False, indent=2)
+    print(f"[OK] threshold(p99)={threshold:.6f}")
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,54 @@
+# ai/scripts/utils/compact_manifest.py
+"""
+Manifest 세그먼트 컴팩션 / 마이그레이션 도구 (Manifest Compactor)
+
+[역할]
+1. 컴팩션: 배치마다 생긴 작은 JSONL 세그먼트를 카테고리별로 병합합니다. (주기 실행: cron 등)
+2. 마이그레이션: 기존 단일 manifest.json(visual_manifest.json / audio_manifest.json)을 세그먼트로 옮깁니다.
+3. 현황: 카테고리별 세그먼트 수를 출력합니다.
+
+[사용법]
+python -m ai.scripts.utils.compact_manifest --manifest visual
+python -m ai.scripts.utils.compact_manifest --manifest audio --category ENGINE --target 2000
+python -m ai.scripts.utils.compact_manifest --manifest visual --migrate
+python -m ai.scripts.utils.compact_manifest --manifest al_selection   (Active Learning 선별 기록)
+"""
+import argparse
+from collections import Counter
+
+from dotenv import load_dotenv
+
+from ai.app.services.common.manifest_service import (
+    AUDIO_MANIFEST_KEY, COMPACT_TARGET_ENTRIES, VISUAL_MANIFEST_KEY, get_manifest
+)
+
+LEGACY_KEYS = {"visual": VISUAL_MANIFEST_KEY, "audio": AUDIO_MANIFEST_KEY}
+
+
+def print_segment_counts(manifest):
+    counts = Counter(key[len(manifest.root) + 1:].split("/", 1)[0] for key in manifest.list_segments())
+    for category, count in sorted(counts.items()):
+        print(f"   {category}: {count} segments")
+
+
+if __name__ == "__main__":
+    load_dotenv("ai/.env")
+    parser = argparse.ArgumentParser(description="Manifest Segment Compactor")
+    parser.add_argument("--manifest", choices=["visual", "audio", "al_selection"], required=True)
+    parser.add_argument("--category", type=str, default=None, help="특정 카테고리만 컴팩션")
+    parser.add_argument("--target", type=int, default=COMPACT_TARGET_ENTRIES, help="세그먼트당 목표 항목 수")
+    parser.add_argument("--migrate", action="store_true", help="기존 manifest.json을 세그먼트로 이전")
+    args = parser.parse_args()
+
+    manifest = get_manifest(args.manifest)
+
+    if args.migrate and args.manifest in LEGACY_KEYS:
+        moved = manifest.migrate_legacy(LEGACY_KEYS[args.manifest])
+        print(f"[Migrate] {moved}건 이전 (기존 파일은 확인 후 직접 삭제하세요)")
+
+    print("[Before]")
+    print_segment_counts(manifest)
+    result = manifest.compact(category=args.category, target_entries=args.target)
+    print("[After]")
+    print_segment_counts(manifest)
+    print(f"[Done] {result['merged_segments']}개 세그먼트 → {result['written_segments']}개로 병합 ({result['entries']}건)")
@@ -0,0 +1,97 @@
+# ai/scripts/utils/compare_fused_diagnosis.py
+"""
+Router 저신뢰 Fallback 호출 방식 비교 도구 (2회 호출 vs 통합 호출)
+
+[역할]
+Held-out 이미지 폴더에 대해
+- 기존 방식: analyze_general_image → generate_training_labels (Vision 2회, 순차)
+- 통합 방식: diagnose_and_localize (JSON Schema 구조화 출력 1회)
+를 각각 실행하여 지연시간(p50/p99), 카테고리/상태 일치율, BBox 개수, 스키마 검증 실패율을 비교합니다.
+
+[사용법]
+python -m ai.scripts.utils.compare_fused_diagnosis --images ./ai/data/router/test --limit 50
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+from PIL import Image
+
+from ai.app.services.common.llm_service import (
+    analyze_general_image, generate_training_labels, diagnose_and_localize, should_use_fallback
+)
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+BBOX_DOMAINS = ("ENGINE", "DASHBOARD", "EXTERIOR", "TIRE")
+
+
+async def run_two_calls(path, image):
+    general = await analyze_general_image(path, image=image)
+    labels = {"labels": []}
+    if general.category in BBOX_DOMAINS:
+        labels = await generate_training_labels(path, general.category.lower(), image=image)
+    return general, labels
+
+
+async def compare(image_paths):
+    latencies = {"two_calls": [], "fused": []}
+    category_match = status_match = fused_errors = 0
+    boxes = {"two_calls": 0, "fused": 0}
+
+    for path in image_paths:
+        image = Image.open(path).convert("RGB")
+
+        t0 = time.perf_counter()
+        general, labels = await run_two_calls(path, image)
+        latencies["two_calls"].append((time.perf_counter() - t0) * 1000)
+
+        t0 = time.perf_counter()
+        fused = await diagnose_and_localize(path, image=image)
+        latencies["fused"].append((time.perf_counter() - t0) * 1000)
+
+        category_match += int(general.category == fused["category"])
+        status_match += int(general.status == fused["status"])
+        fused_errors += int(fused["status"] == "ERROR")
+        boxes["two_calls"] += len(labels.get("labels") or [])
+        boxes["fused"] += len(fused["objects"])
+
+    n = len(image_paths)
+    print("\n" + "="*50)
+    print(f"📊 Fallback 호출 비교 (two_calls vs fused, {n} images)")
+    print("="*50)
+    print(f"   카테고리 일치율: {category_match/n:.2%}")
+    print(f"   상태 일치율:     {status_match/n:.2%}")
+    print(f"   통합 호출 실패(스키마/호출 오류): {fused_errors}건")
+    for mode in ("two_calls", "fused"):
+        print(f"   [{mode:9s}] p50={np.percentile(latencies[mode], 50):.0f}ms "
+              f"p99={np.percentile(latencies[mode], 99):.0f}ms "
+              f"avg_boxes={boxes[mode] / n:.2f}")
+    speedup = np.percentile(latencies["two_calls"], 50) / max(np.percentile(latencies["fused"], 50), 1e-6)
+    print(f"   p50 속도 향상: x{speedup:.2f}")
+    print("="*50 + "\n")
+
+
+if __name__ == "__main__":
+    load_dotenv("ai/.env")
+    parser = argparse.ArgumentParser(description="Fused Diagnosis Latency Comparison")
+    parser.add_argument("--images", type=str, required=True, help="Held-out 이미지 폴더")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    if should_use_fallback("diagnose_and_localize"):
+        print("[Error] OpenAI API Key가 없거나 MOCK_LLM=true 입니다. 실제 호출이 필요합니다.")
+        exit(1)
+
+    paths = []
+    for root, dirs, files in os.walk(args.images):
+        for file in sorted(files):
+            if file.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(root, file))
+    paths = paths[:args.limit]
+    print(f"[Info] 비교 대상 {len(paths)}개")
+
+    if paths:
+        asyncio.run(compare(paths))
@@ -0,0 +1,77 @@
+# ai/scripts/utils/compare_vision_inputs.py
+"""
+Vision 입력 프로필 품질/비용 비교 도구
+
+[역할]
+Held-out 이미지 폴더에 대해 analyze_general_image를 두 번 호출하여
+원본 해상도(original) 대비 축소 프로필(general)의 진단 일치율, 지연시간, 업로드 용량, 예상 토큰을 비교합니다.
+
+[사용법]
+python -m ai.scripts.utils.compare_vision_inputs --images ./ai/data/router/test --limit 50
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import numpy as np
+from dotenv import load_dotenv
+from PIL import Image
+
+from ai.app.services.common.llm_service import analyze_general_image, should_use_fallback
+from ai.app.services.common.vision_input import get_vision_input_stats
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+
+
+async def compare(image_paths):
+    latencies = {"original": [], "general": []}
+    category_match = status_match = 0
+
+    for path in image_paths:
+        image = Image.open(path).convert("RGB")
+        results = {}
+        for profile in ("original", "general"):
+            t0 = time.perf_counter()
+            results[profile] = await analyze_general_image(path, image=image, profile=profile)
+            latencies[profile].append((time.perf_counter() - t0) * 1000)
+
+        category_match += int(results["original"].category == results["general"].category)
+        status_match += int(results["original"].status == results["general"].status)
+
+    n = len(image_paths)
+    stats = get_vision_input_stats()
+    print("\n" + "="*50)
+    print(f"📊 Vision 입력 비교 (original vs general, {n} images)")
+    print("="*50)
+    print(f"   카테고리 일치율: {category_match/n:.2%}")
+    print(f"   상태 일치율:     {status_match/n:.2%}")
+    for profile in ("original", "general"):
+        s = stats.get(profile, {"bytes": 0, "tokens": 0})
+        print(f"   [{profile:8s}] p50={np.percentile(latencies[profile], 50):.0f}ms "
+              f"p99={np.percentile(latencies[profile], 99):.0f}ms "
+              f"avg_upload={s['bytes'] / n / 1024:.0f}KB avg_tokens={s['tokens'] / n:.0f}")
+    print("="*50 + "\n")
+
+
+if __name__ == "__main__":
+    load_dotenv("ai/.env")
+    parser = argparse.ArgumentParser(description="Vision Input Profile Comparison")
+    parser.add_argument("--images", type=str, required=True, help="Held-out 이미지 폴더")
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+
+    if should_use_fallback():
+        print("[Error] OpenAI API Key가 없거나 MOCK_LLM=true 입니다. 실제 호출이 필요합니다.")
+        exit(1)
+
+    paths = []
+    for root, dirs, files in os.walk(args.images):
+        for file in sorted(files):
+            if file.lower().endswith(IMAGE_EXTENSIONS):
+                paths.append(os.path.join(root, file))
+    paths = paths[:args.limit]
+    print(f"[Info] 비교 대상 {len(paths)}개")
+
+    if paths:
+        asyncio.run(compare(paths))
@@ -0,0 +1,95 @@
+# ai/scripts/utils/replay_al_selection.py
+"""
+Active Learning 선별 재현 / 오프라인 평가 도구 (Selection Replay)
+
+[역할]
+파이프라인이 구간마다 al_selection manifest에 남긴 후보 기록(불확실성, pHash, 예산, 가중치)으로
+선별을 다시 실행합니다.
+1. 재현: 옵션 없이 실행하면 기록 당시 설정으로 다시 골라 운영 결과와 같은지 확인합니다.
+2. 비교: --budget / --diversity-weight로 다른 설정을 주면 운영 선택과의 겹침,
+   선택 집합의 평균 불확실성 / 평균 pHash 유사도(낮을수록 다양)를 비교합니다.
+
+[사용법]
+python -m ai.scripts.utils.replay_al_selection
+python -m ai.scripts.utils.replay_al_selection --since 2026-10-01 --diversity-weight 0.2
+python -m ai.scripts.utils.replay_al_selection --budget 5
+"""
+import argparse
+from collections import defaultdict
+from itertools import combinations
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from dotenv import load_dotenv
+
+from ai.app.services.common.active_learning_pipeline import SELECTION_MANIFEST
+from ai.app.services.common.active_learning_selector import PHASH_SIMILARITY_BITS, replay_window
+from ai.app.services.common.manifest_service import get_training_data
+
+
+def _mean_uncertainty(entries: Sequence[Dict[str, Any]]) -> Optional[float]:
+    return float(np.mean([e["uncertainty"] for e in entries])) if entries else None
+
+
+def _mean_similarity(entries: Sequence[Dict[str, Any]]) -> Optional[float]:
+    phashes = [int(e["phash"], 16) for e in entries if e.get("phash")]
+    pairs = [1.0 - min(bin(a ^ b).count("1"), PHASH_SIMILARITY_BITS) / PHASH_SIMILARITY_BITS
+             for a, b in combinations(phashes, 2)]
+    return float(np.mean(pairs)) if pairs else None
+
+
+def _mean(values: List[Optional[float]]) -> Optional[float]:
+    values = [v for v in values if v is not None]
+    return round(float(np.mean(values)), 4) if values else None
+
+
+def replay_selection(
+    entries: Sequence[Dict[str, Any]],
+    budget: Optional[int] = None,
+    diversity_weight: Optional[float] = None
+) -> Dict[str, Any]:
+    """기록된 선별 항목을 구간별로 다시 선별하고 운영 결과와 비교"""
+    windows: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    for e in entries:
+        windows[e["window_id"]].append(e)
+
+    identical, overlaps = 0, []
+    recorded_u, replayed_u, recorded_sim, replayed_sim = [], [], [], []
+    for window_id in sorted(windows):
+        window = windows[window_id]
+        by_key = {e["candidate_key"]: e for e in window}
+        recorded = {e["candidate_key"] for e in window if e["status"] == "SELECTED"}
+        replayed = {d.key for d in replay_window(window, budget, diversity_weight) if d.reason == "selected"}
+
+        identical += recorded == replayed
+        if recorded:
+            overlaps.append(len(recorded & replayed) / len(recorded))
+        recorded_u.append(_mean_uncertainty([by_key[k] for k in recorded]))
+        replayed_u.append(_mean_uncertainty([by_key[k] for k in replayed]))
+        recorded_sim.append(_mean_similarity([by_key[k] for k in recorded]))
+        replayed_sim.append(_mean_similarity([by_key[k] for k in replayed]))
+
+    return {
+        "windows": len(windows),
+        "identical_windows": identical,
+        "mean_overlap": _mean(overlaps),
+        "recorded": {"mean_uncertainty": _mean(recorded_u), "mean_similarity": _mean(recorded_sim)},
+        "replayed": {"mean_uncertainty": _mean(replayed_u), "mean_similarity": _mean(replayed_sim)},
+    }
+
+
+if __name__ == "__main__":
+    load_dotenv("ai/.env")
+    parser = argparse.ArgumentParser(description="Active Learning Selection Replay")
+    parser.add_argument("--since", type=str, default=None, help="이 시각(ISO) 이후 구간만")
+    parser.add_argument("--budget", type=int, default=None, help="구간별 예산 (기본: 기록 당시 값)")
+    parser.add_argument("--diversity-weight", type=float, default=None, help="다양성 가중치 (기본: 기록 당시 값)")
+    args = parser.parse_args()
+
+    # 구간 하나는 여러 도메인 후보를 함께 고르므로 카테고리 구분 없이 전체를 읽음
+    summary = replay_selection(get_training_data(SELECTION_MANIFEST, since=args.since),
+                               budget=args.budget, diversity_weight=args.diversity_weight)
+    print(f"[Replay] 구간 {summary['windows']}개, 운영 결과와 동일 {summary['identical_windows']}개 "
+          f"(평균 겹침 {summary['mean_overlap']})")
+    print(f"   운영 선택: {summary['recorded']}")
+    print(f"   재현 선택: {summary['replayed']}")
@@ -1,4 +1,4 @@
-# ai/scripts/sync_active_learning.py
+# ai/scripts/utils/sync_active_learning.py
 """
 LLM 티처 기반 Active Learning 데이터 동기화 도구 (Active Learning Synchronizer)
 
@@ -7,21 +7,39 @@ LLM 티처 기반 Active Learning 데이터 동기화 도구 (Active Learning Sy
 2. 학습셋 자동 변환: LLM이 내린 정답(JSON)을 YOLO 표준 포맷(.txt)으로 자동 변환합니다.
 3. 데이터셋 병합: 변환된 데이터와 이미지를 로컬 `ai/data/{domain}/retrain` 디렉토리에 자동으로 분류하여 저장합니다.
 
+[동기화 엔진]
+- 목록: list_objects_v2 Paginator로 prefix 전체를 조회 (1,000개 제한 없음)
+- 다운로드: 하나의 S3 클라이언트를 공유하는 스레드 풀에서 병렬 처리
+- 체크포인트: 로컬 SQLite에 Key별 ETag를 기록하여, 재실행 시 새로 생기거나 바뀐 객체만 받음
+- 변환: YOLO/COCO/분류 라벨 변환(이미지 크기 확인 포함)은 프로세스 풀에서 처리
+- 리포트: 진행률, 처리량(files/s, MB/s), 건너뛴 사유별 건수
+
 [사용법]
-python ai/scripts/sync_active_learning.py --domain tire --limit 100
+python -m ai.scripts.utils.sync_active_learning --domain tire --limit 100
+python -m ai.scripts.utils.sync_active_learning --domain exterior --workers 16 --process-workers 4
+python -m ai.scripts.utils.sync_active_learning --domain engine --full   # 체크포인트 무시하고 전체 재동기화
 """
 import os
 import json
-import boto3
+import time
+import sqlite3
+import threading
 import argparse
-import httpx
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
 
 # =============================================================================
 # [Configuration] 
 # =============================================================================
-BASE_DIR = Path(__file__).parent.parent  # ai/
+BASE_DIR = Path(__file__).resolve().parents[2]  # ai/
 S3_BUCKET = os.getenv("S3_BUCKET_NAME", "car-sentry-data")
+DEFAULT_COCO_SIZE = 1024  # 이미지 크기를 읽지 못한 경우 사용
+STAT_FIELDS = ["listed", "skipped_unchanged", "skipped_no_source", "downloaded", "synced",
+               "failed_json", "failed_download", "failed_convert", "bytes"]
 
 # 도메인별 클래스 매핑 (실제 모델의 names 리스트와 일치해야 함)
 DOMAIN_CLASSES = {
@@ -38,217 +56,438 @@ DOMAIN_CLASSES = {
     "exterior": ["dent", "scratch", "crack", "glass_shatter", "lamp_broken", "tire_flat"], # CarDD (파손)
     "audio": ["Normal", "Engine_Knocking", "Engine_Misfire", "Belt_Issue", "Abnormal_Noise", "Brake_Squeal", "Suspension_Clunk", "Exhaust_Leak", "Wheel_Bearing_Hum"] # 서비스 키워드 중심
 }
-async def download_file(s3_url, target_path):
-    """S3 URL에서 파일을 다운로드하여 로컬에 저장"""
-    # boto3를 사용하는 것이 더 안정적임 (인증 문제)
-    s3 = boto3.client('s3')
-    bucket_name = S3_BUCKET
-    
-    # s3://bucket/key -> key 추출
-    if s3_url.startswith(f"s3://{bucket_name}/"):
-        key = s3_url.replace(f"s3://{bucket_name}/", "")
-    else:
-        # HTTP URL인 경우 (Presigned URL 등)
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(s3_url)
-                response.raise_for_status()
-                with open(target_path, "wb") as f:
-                    f.write(response.content)
-                return True
-            except Exception as e:
-                print(f"      [Error] HTTP 다운로드 실패: {e}")
-                return False
 
-    try:
-        s3.download_file(bucket_name, key, str(target_path))
-        return True
-    except Exception as e:
-        print(f"      [Error] S3 다운로드 실패: {e}")
-        return False
 
-async def sync_data(domain, limit):
-    print(f"\n[Active Learning] {domain.upper()} 도메인 데이터 동기화 시작 (최대 {limit}개)...")
-    
-    # 1. S3 연결
-    s3 = boto3.client('s3')
-    bucket_name = S3_BUCKET
-    
-    # 2. 사용자 제안 S3 구조에 맞춘 경로 설정
+def label_prefix(domain: str) -> str:
+    """서버(ActiveLearningService.save_oracle_label)가 정답지를 저장하는 경로"""
+    return "dataset/llm_confirmed/audio/" if domain == "audio" else f"dataset/llm_confirmed/visual/{domain}/"
+
+
+# =============================================================================
+# 체크포인트 (Key → ETag)
+# =============================================================================
+class SyncCheckpoint:
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), check_same_thread=False)
+        self._lock = threading.Lock()
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS synced (key TEXT PRIMARY KEY, etag TEXT NOT NULL, outcome TEXT, synced_at REAL)"
+        )
+        self._conn.commit()
+
+    def etags(self) -> Dict[str, str]:
+        with self._lock:
+            return dict(self._conn.execute("SELECT key, etag FROM synced").fetchall())
+
+    def mark(self, key: str, etag: str, outcome: str):
+        self.mark_many([(key, etag)], outcome)
+
+    def mark_many(self, items: List[Tuple[str, str]], outcome: str):
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO synced (key, etag, outcome, synced_at) VALUES (?, ?, ?, ?)",
+                [(key, etag, outcome, now) for key, etag in items]
+            )
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+def _write_atomic(path: Path, text: str):
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+# =============================================================================
+# 라벨 변환 (프로세스 풀에서 실행 → 모듈 최상위 함수, 입력/출력은 직렬화 가능한 값만)
+# =============================================================================
+def convert_record(domain: str, class_list: List[str], file_id: str, file_path: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    정답지 JSON 1개 → 도메인별 학습 라벨
+
+    Returns:
+        {"new_classes": [...], "yolo_lines" | "coco" | "tire_class" | "audio_label": ...}
+    """
+    result: Dict[str, Any] = {"new_classes": []}
+
     if domain == "audio":
-        prefix = "dataset/llm_confirmed/audio/"
+        label = data.get("label", "NORMAL")
+        if label not in class_list:
+            result["new_classes"].append(label)
+        result["audio_label"] = label
+
+    elif domain == "exterior":
+        try:
+            from PIL import Image
+            with Image.open(file_path) as img:
+                width, height = img.size  # 헤더만 읽음
+        except Exception:
+            width = height = DEFAULT_COCO_SIZE
+        annotations = []
+        for lbl in data.get("labels", []):
+            cls_name = lbl.get("class")
+            if cls_name not in class_list:
+                result["new_classes"].append(cls_name)
+                continue
+            cx, cy, bw, bh = lbl.get("bbox", [0.5, 0.5, 0.1, 0.1])
+            w, h = bw * width, bh * height
+            annotations.append({
+                "category_id": class_list.index(cls_name),
+                "bbox": [(cx - bw / 2) * width, (cy - bh / 2) * height, w, h],
+                "area": w * h,
+                "iscrowd": 0
+            })
+        result["coco"] = {"width": width, "height": height, "annotations": annotations}
+
+    elif domain == "tire":
+        # 분류(Classification) 모델용: LLM이 판단한 critical_issues 중 class_list에 있는 첫 번째 요소 (없으면 normal)
+        issues = data.get("critical_issues") or []
+        target_class = next((issue for issue in issues if issue in class_list), "normal")
+        if issues and target_class == "normal":
+            result["new_classes"].append(issues[0])  # class_list에 없는 새로운 이슈
+        result["tire_class"] = target_class
+
     else:
-        prefix = f"dataset/llm_confirmed/visual/{domain}/"
-        
-    try:
-        response = s3.list_objects_v2(Bucket=bucket_name, Prefix=prefix)
-    except Exception as e:
-        print(f"[Error] S3 접근 실패: {e}")
-        return
+        # YOLO txt 포맷 생성 (Detection 모델용)
+        yolo_lines = []
+        for lbl in data.get("labels", []):
+            cls_name = lbl.get("class")
+            if cls_name in class_list:
+                bbox = lbl.get("bbox", [0.5, 0.5, 0.1, 0.1])
+                yolo_lines.append(f"{class_list.index(cls_name)} {' '.join(map(str, bbox))}")
+            else:
+                result["new_classes"].append(cls_name)
+        result["yolo_lines"] = yolo_lines
 
-    if 'Contents' not in response:
-        print(f"[Info] 새로운 정답지(JSON)가 없습니다. (Prefix: {prefix})")
-        return
+    return result
 
-    json_files = [obj['Key'] for obj in response['Contents'] if obj['Key'].endswith('.json')]
-    print(f"[Info] {len(json_files)}개의 정답지를 발견했습니다.")
 
-    # [수정] 디렉토리는 실제 파일 저장 직전에 생성하여 빈 폴더 방지
-    target_data_dir = BASE_DIR / "data" / domain / "retrain"
-    target_img_dir = target_data_dir / "images"
-    target_lbl_dir = target_data_dir / "labels"
-    target_wav_dir = target_data_dir / "wavs"
+# =============================================================================
+# 동기화 엔진
+# =============================================================================
+class ActiveLearningSyncer:
+    """
+    Paginator 목록 → 스레드 풀 다운로드 → 프로세스 풀 변환 → 체크포인트 기록
 
-    class_list = DOMAIN_CLASSES.get(domain, [])
-    success_count = 0
-    new_classes_found = set()
-    
-    # COCO 데이터 구조 (exterior 전용)
-    coco_data = {
-        "images": [],
-        "annotations": [],
-        "categories": [{"id": i, "name": name} for i, name in enumerate(class_list)]
-    }
-    ann_id_counter = 1
-    img_id_counter = 1
-
-    for key in json_files[:limit]:
+    Args:
+        s3_client: 공유 S3 클라이언트 (None이면 커넥션 풀을 워커 수에 맞춘 boto3 클라이언트 생성)
+        workers: 다운로드 스레드 수
+        process_workers: 라벨 변환 프로세스 수 (0이면 현재 프로세스에서 변환)
+    """
+
+    def __init__(
+        self,
+        domain: str,
+        s3_client=None,
+        bucket: str = S3_BUCKET,
+        data_root: Path = BASE_DIR / "data",
+        workers: int = 8,
+        process_workers: int = 2,
+        progress_every: int = 50
+    ):
+        self.domain = domain
+        self.bucket = bucket
+        self.workers = workers
+        self.process_workers = process_workers
+        self.progress_every = progress_every
+        if s3_client is None:
+            import boto3
+            from botocore.config import Config
+            s3_client = boto3.client("s3", config=Config(max_pool_connections=max(10, workers)))
+        self.s3 = s3_client
+        self.http = httpx.Client(timeout=30.0)
+
+        self.class_list = DOMAIN_CLASSES.get(domain, [])
+        self.target_dir = Path(data_root) / domain / "retrain"
+        self.checkpoint = SyncCheckpoint(self.target_dir / ".sync_checkpoint.sqlite3")
+
+        self.stats = Counter()
+        self.new_classes = set()
+        self.synced_audio_paths: List[str] = []
+        self.audio_labels: Optional[Dict[str, str]] = None   # labels.csv 파일명 → 라벨 (run에서 로드 / 저장)
+        # 장부 파일(retrain_coco.json / labels.csv)에 아직 쓰지 않은 항목의 (Key, ETag) → 장부 저장 후 체크포인트 기록
+        self._unsaved_marks: List[Tuple[str, str]] = []
+        self._stats_lock = threading.Lock()
+
+    # -------------------------------------------------------------------------
+    # 목록
+    # -------------------------------------------------------------------------
+    def list_label_objects(self) -> List[Dict[str, Any]]:
+        paginator = self.s3.get_paginator("list_objects_v2")
+        objects = []
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=label_prefix(self.domain)):
+            objects.extend(obj for obj in page.get("Contents", []) if obj["Key"].endswith(".json"))
+        return objects
+
+    # -------------------------------------------------------------------------
+    # 다운로드 (스레드 풀)
+    # -------------------------------------------------------------------------
+    def _count(self, field: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[field] += n
+
+    def _download_source(self, source_url: str, target_path: Path) -> int:
+        """원본(이미지/오디오) 다운로드 후 바이트 수 반환"""
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = target_path.with_name(target_path.name + ".part")
+        prefix = f"s3://{self.bucket}/"
+        if source_url.startswith(prefix):
+            self.s3.download_file(self.bucket, source_url[len(prefix):], str(tmp_path))
+        else:
+            # HTTP URL인 경우 (Presigned URL 등)
+            response = self.http.get(source_url)
+            response.raise_for_status()
+            tmp_path.write_bytes(response.content)
+        os.replace(tmp_path, target_path)
+        return target_path.stat().st_size
+
+    def fetch(self, obj: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """정답지 JSON + 원본 파일 다운로드 (실패/건너뜀이면 None)"""
+        key = obj["Key"]
         file_id = os.path.basename(key).split('.')[0]
-        
-        # JSON 다운로드
         try:
-            obj = s3.get_object(Bucket=bucket_name, Key=key)
-            data = json.loads(obj['Body'].read().decode('utf-8'))
+            body = self.s3.get_object(Bucket=self.bucket, Key=key)["Body"].read()
+            data = json.loads(body.decode("utf-8"))
         except Exception as e:
             print(f"  - [Error] JSON 로드 실패 ({key}): {e}")
-            continue
-        
-        # 원본 파일 URL 찾기
+            self._count("failed_json")
+            return None
+        self._count("bytes", len(body))
+
         source_url = data.get("source_url")
         if not source_url:
             print(f"  - [Skip] source_url 정보 없음 ({file_id})")
-            continue
+            self._count("skipped_no_source")
+            self.checkpoint.mark(key, obj.get("ETag", ""), "no_source")
+            return None
 
-        # 파일 다운로드 (이미지 또는 오디오)
-        ext = os.path.splitext(source_url)[1] or ('.wav' if domain == 'audio' else '.jpg')
-        sub_dir = 'wavs' if domain == 'audio' else 'images'
-        file_path = target_data_dir / sub_dir / f"{file_id}{ext}"
-        
+        ext = os.path.splitext(source_url)[1] or ('.wav' if self.domain == 'audio' else '.jpg')
+        sub_dir = 'wavs' if self.domain == 'audio' else 'images'
+        file_path = self.target_dir / sub_dir / f"{file_id}{ext}"
         if not file_path.exists():
-            file_path.parent.mkdir(parents=True, exist_ok=True) # 파일 저장 직전 폴더 생성
-            if not await download_file(source_url, file_path):
-                continue
+            try:
+                self._count("bytes", self._download_source(source_url, file_path))
+            except Exception as e:
+                print(f"  - [Error] 원본 다운로드 실패 ({source_url}): {e}")
+                self._count("failed_download")
+                return None
+        self._count("downloaded")
+        return {"key": key, "etag": obj.get("ETag", ""), "file_id": file_id, "file_path": str(file_path), "data": data}
 
-        # 라벨 저장 (YOLO vs AST vs COCO vs Classification)
-        if domain == "audio":
-            label = data.get("label", "NORMAL")
-            if label not in class_list:
-                new_classes_found.add(label)
-            with open(label_file, "a", encoding="utf-8") as f:
-                f.write(f"{file_id}{ext},{label}\n")
-        elif domain == "exterior":
-            # COCO 포맷 데이터 수집 (생략 - 이전과 동일)
-            coco_data["images"].append({
-                "id": img_id_counter,
-                "width": 1024,
-                "height": 1024,
-                "file_name": f"{file_id}{ext}"
-            })
-            labels = data.get("labels", [])
-            for lbl in labels:
-                cls_name = lbl.get("class")
-                if cls_name in class_list:
-                    cls_id = class_list.index(cls_name)
-                    bbox = lbl.get("bbox", [0.5, 0.5, 0.1, 0.1])
-                    cw, ch = 1024, 1024
-                    x = (bbox[0] - bbox[2]/2) * cw
-                    y = (bbox[1] - bbox[3]/2) * ch
-                    w = bbox[2] * cw
-                    h = bbox[3] * ch
-                    coco_data["annotations"].append({
-                        "id": ann_id_counter,
-                        "image_id": img_id_counter,
-                        "category_id": cls_id,
-                        "bbox": [x, y, w, h],
-                        "area": w * h,
-                        "iscrowd": 0
-                    })
-                    ann_id_counter += 1
-                else:
-                    new_classes_found.add(cls_name)
-            img_id_counter += 1
-        elif domain == "tire":
-            # 분류(Classification) 모델용: 폴더별 자동 분류
-            # LLM이 판단한 critical_issues 중 첫 번째 요소를 클래스로 선택 (없으면 normal)
-            issues = data.get("critical_issues", [])
-            target_class = "normal"
-            if issues:
-                # class_list에 있는 것 중 가장 우선순위 높은 것 선택
-                for issue in issues:
-                    if issue in class_list:
-                        target_class = issue
-                        break
-                if target_class == "normal": # class_list에 없는 새로운 이슈
-                    new_classes_found.add(issues[0])
-            
-            # 이미지를 해당 클래스 폴더로 이동/저장
-            class_dir = target_data_dir / target_class
+    # -------------------------------------------------------------------------
+    # 라벨 기록 (메인 프로세스, 순차)
+    # -------------------------------------------------------------------------
+    def _load_coco(self) -> Dict[str, Any]:
+        """재실행 시 이전 결과에 이어 붙이도록 기존 COCO 장부 로드"""
+        path = self.target_dir / "retrain_coco.json"
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        return {
+            "images": [],
+            "annotations": [],
+            "categories": [{"id": i, "name": name} for i, name in enumerate(self.class_list)]
+        }
+
+    def _load_audio_labels(self) -> Dict[str, str]:
+        """기존 labels.csv 로드 (같은 파일이 다시 동기화되면 행을 덮어쓰도록 파일명 기준)"""
+        labels: Dict[str, str] = {}
+        path = self.target_dir / "labels.csv"
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    name, _, label = line.rstrip("\n").rpartition(",")
+                    if name:
+                        labels[name] = label
+        return labels
+
+    def write_labels(self, record: Dict[str, Any], converted: Dict[str, Any], coco: Optional[Dict[str, Any]]):
+        file_id = record["file_id"]
+        file_path = Path(record["file_path"])
+        self.new_classes.update(c for c in converted["new_classes"] if c)
+
+        if self.domain == "audio":
+            self.synced_audio_paths.append(str(file_path))
+            if self.audio_labels is None:
+                self.audio_labels = self._load_audio_labels()
+            self.audio_labels[file_path.name] = converted["audio_label"]
+        elif self.domain == "exterior":
+            image_id = max((img["id"] for img in coco["images"]), default=0) + 1
+            ann_id = max((ann["id"] for ann in coco["annotations"]), default=0) + 1
+            # 다시 동기화된 이미지: 이전 이미지 항목과 그 annotation을 함께 교체
+            stale = {img["id"] for img in coco["images"] if img["file_name"] == file_path.name}
+            if stale:
+                coco["images"] = [img for img in coco["images"] if img["id"] not in stale]
+                coco["annotations"] = [ann for ann in coco["annotations"] if ann["image_id"] not in stale]
+            coco["images"].append({"id": image_id, "width": converted["coco"]["width"],
+                                   "height": converted["coco"]["height"], "file_name": file_path.name})
+            for i, ann in enumerate(converted["coco"]["annotations"]):
+                coco["annotations"].append(dict(ann, id=ann_id + i, image_id=image_id))
+        elif self.domain == "tire":
+            # 이미지를 해당 클래스 폴더로 이동
+            class_dir = self.target_dir / converted["tire_class"]
             class_dir.mkdir(parents=True, exist_ok=True)
-            
-            # 이미 다운로드된 파일을 클래스 폴더로 이동 (또는 처음부터 경로 지정)
-            final_file_path = class_dir / f"{file_id}{ext}"
-            if file_path.exists() and not final_file_path.exists():
-                os.replace(file_path, final_file_path)
-            
-            print(f"  - [✓] {file_id} ({target_class}) 분류 완료")
+            final_path = class_dir / file_path.name
+            if file_path.exists() and not final_path.exists():
+                os.replace(file_path, final_path)
+        elif converted["yolo_lines"]:
+            label_dir = self.target_dir / "labels"
+            label_dir.mkdir(parents=True, exist_ok=True)
+            with open(label_dir / f"{file_id}.txt", "w") as f:
+                f.write("\n".join(converted["yolo_lines"]))
+
+        if self.domain in ("audio", "exterior"):
+            # 장부는 메모리에서 갱신 → 디스크에 쓰기 전에 체크포인트를 남기면 중단 시 라벨 없이 "synced"로 건너뛰게 됨
+            self._unsaved_marks.append((record["key"], record["etag"]))
+            if len(self._unsaved_marks) >= self.progress_every:
+                self.save_ledgers(coco)
         else:
-            # YOLO txt 포맷 생성 (Detection 모델용)
-            labels = data.get("labels", [])
-            yolo_lines = []
-            for lbl in labels:
-                cls_name = lbl.get("class")
-                if cls_name in class_list:
-                    cls_id = class_list.index(cls_name)
-                    bbox = lbl.get("bbox", [0.5, 0.5, 0.1, 0.1])
-                    yolo_lines.append(f"{cls_id} {' '.join(map(str, bbox))}")
-                else:
-                    new_classes_found.add(cls_name)
-            
-            if yolo_lines:
-                with open(target_lbl_dir / f"{file_id}.txt", "w") as f:
-                    f.write("\n".join(yolo_lines))
-        
-        if domain != "tire": # 타이어는 위에서 별도 출력
-            print(f"  - [✓] {file_id} 동기화 완료")
-        success_count += 1
-
-    # 외관(exterior) 도메인인 경우 최종 COCO JSON 저장
-    if domain == "exterior":
-        coco_json_path = target_data_dir / "retrain_coco.json"
-        with open(coco_json_path, "w", encoding="utf-8") as f:
-            json.dump(coco_data, f, ensure_ascii=False, indent=2)
-        print(f"[Info] COCO 통합 장부 저장 완료: {coco_json_path}")
-
-    print(f"\n[✓] 총 {success_count}개의 데이터가 로컬 'retrain' 폴더에 성공적으로 저장되었습니다.")
-    
-    if new_classes_found:
-        print("\n[🚨 New Classes Discovered]")
-        for nc in new_classes_found:
-            print(f"  - {nc}")
+            self.checkpoint.mark(record["key"], record["etag"], "synced")
+        self._count("synced")
 
-    # 4. 빈 폴더 정리 (실수로 생성된 경우)
-    for root, dirs, files in os.walk(target_data_dir, topdown=False):
+    def save_ledgers(self, coco: Optional[Dict[str, Any]]):
+        """장부 파일을 tmp + replace로 원자적으로 저장한 뒤, 저장된 항목의 체크포인트를 기록"""
+        self.target_dir.mkdir(parents=True, exist_ok=True)
+        if coco is not None:
+            _write_atomic(self.target_dir / "retrain_coco.json", json.dumps(coco, ensure_ascii=False, indent=2))
+        if self.audio_labels is not None:
+            _write_atomic(self.target_dir / "labels.csv",
+                          "".join(f"{name},{label}\n" for name, label in self.audio_labels.items()))
+        if self._unsaved_marks:
+            self.checkpoint.mark_many(self._unsaved_marks, "synced")
+            self._unsaved_marks = []
+
+    # -------------------------------------------------------------------------
+    # 실행
+    # -------------------------------------------------------------------------
+    def _report_progress(self, done: int, total: int, started: float):
+        elapsed = max(time.time() - started, 1e-6)
+        print(f"  [Progress] {done}/{total} ({done / elapsed:.1f} files/s, "
+              f"{self.stats['bytes'] / elapsed / 1e6:.2f} MB/s)")
+
+    def run(self, limit: Optional[int] = None, full: bool = False) -> Dict[str, Any]:
+        started = time.time()
+        objects = self.list_label_objects()
+        self.stats["listed"] = len(objects)
+
+        known = {} if full else self.checkpoint.etags()
+        pending = [obj for obj in objects if known.get(obj["Key"]) != obj.get("ETag")]
+        self.stats["skipped_unchanged"] = len(objects) - len(pending)
+        if limit is not None:
+            pending = pending[:limit]
+        print(f"[Info] 정답지 {len(objects)}개 중 신규/변경 {len(pending)}개 처리 "
+              f"(변경 없음 {self.stats['skipped_unchanged']}개 건너뜀)")
+
+        coco = self._load_coco() if self.domain == "exterior" else None
+        if self.domain == "audio":
+            self.audio_labels = self._load_audio_labels()
+        pool = ProcessPoolExecutor(self.process_workers) if self.process_workers > 0 else None
+        try:
+            with ThreadPoolExecutor(self.workers) as downloads:
+                conversions = {}
+                fetch_futures = [downloads.submit(self.fetch, obj) for obj in pending]
+                for done, future in enumerate(as_completed(fetch_futures), 1):
+                    record = future.result()
+                    if record is not None:
+                        args = (self.domain, self.class_list, record["file_id"], record["file_path"], record["data"])
+                        if pool:
+                            conversions[pool.submit(convert_record, *args)] = record
+                        else:
+                            self.write_labels(record, convert_record(*args), coco)
+                    if done % self.progress_every == 0:
+                        self._report_progress(done, len(pending), started)
+
+                for future in as_completed(conversions):
+                    try:
+                        self.write_labels(conversions[future], future.result(), coco)
+                    except Exception as e:
+                        print(f"  - [Error] 라벨 변환 실패 ({conversions[future]['key']}): {e}")
+                        self._count("failed_convert")
+        finally:
+            if pool:
+                pool.shutdown()
+            # 예외/중단 시에도 처리된 항목까지는 장부 + 체크포인트 저장 (강제 종료 시에는 미기록 → 다음 실행에서 재처리)
+            self.save_ledgers(coco)
+
+        elapsed = time.time() - started
+        summary = {field: self.stats.get(field, 0) for field in STAT_FIELDS}
+        summary.update(
+            elapsed_sec=round(elapsed, 2),
+            files_per_sec=round(summary["synced"] / elapsed, 2) if elapsed else 0.0,
+            mb_per_sec=round(summary["bytes"] / elapsed / 1e6, 2) if elapsed else 0.0,
+            new_classes=sorted(self.new_classes),
+        )
+        return summary
+
+    def close(self):
+        self.http.close()
+        self.checkpoint.close()
+
+
+def precompute_audio_features(wav_paths):
+    """동기화된 오디오를 train_audio.py와 동일한 설정(U-Net Denoising)으로 Feature Store에 적재"""
+    from transformers import ASTFeatureExtractor
+    from ai.scripts.audio.audio_feature_store import AudioFeatureStore
+    from ai.scripts.audio.train_audio import MODEL_NAME
+
+    feature_extractor = ASTFeatureExtractor.from_pretrained(MODEL_NAME)
+    AudioFeatureStore(feature_extractor, denoise=True).sync(wav_paths)
+
+
+def remove_empty_dirs(target_dir: Path):
+    """빈 폴더 정리 (실수로 생성된 경우)"""
+    for root, dirs, files in os.walk(target_dir, topdown=False):
         for name in dirs:
             dir_path = os.path.join(root, name)
-            if not os.listdir(dir_path): # 비어있으면
+            if not os.listdir(dir_path):
                 os.rmdir(dir_path)
 
+
+def sync_data(domain, limit, precompute_features=False, workers=8, process_workers=2, full=False, s3_client=None):
+    print(f"\n[Active Learning] {domain.upper()} 도메인 데이터 동기화 시작 (최대 {limit}개)...")
+    syncer = ActiveLearningSyncer(domain, s3_client=s3_client, workers=workers, process_workers=process_workers)
+    try:
+        summary = syncer.run(limit=limit, full=full)
+    except Exception as e:
+        print(f"[Error] S3 접근 실패: {e}")
+        syncer.close()
+        return None
+
+    print(f"\n[✓] 총 {summary['synced']}개의 데이터가 로컬 'retrain' 폴더에 성공적으로 저장되었습니다.")
+    print(f"    목록 {summary['listed']} | 변경 없음 {summary['skipped_unchanged']} | "
+          f"source 없음 {summary['skipped_no_source']} | 실패 {summary['failed_json'] + summary['failed_download'] + summary['failed_convert']} | "
+          f"{summary['elapsed_sec']}s ({summary['files_per_sec']} files/s, {summary['mb_per_sec']} MB/s)")
+
+    # 오디오 도메인: 학습 때 다시 디코딩하지 않도록 Feature Store에 미리 적재
+    if domain == "audio" and precompute_features and syncer.synced_audio_paths:
+        precompute_audio_features(syncer.synced_audio_paths)
+
+    if summary["new_classes"]:
+        print("\n[🚨 New Classes Discovered]")
+        for nc in summary["new_classes"]:
+            print(f"  - {nc}")
+
+    syncer.close()
+    remove_empty_dirs(syncer.target_dir)
+    return summary
+
+
 if __name__ == "__main__":
-    import asyncio
     parser = argparse.ArgumentParser(description="LLM-Guided Active Learning Sync")
     parser.add_argument("--domain", type=str, required=True, 
                         choices=["engine", "dashboard", "tire", "exterior", "audio"])
-    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--limit", type=int, default=100, help="이번 실행에서 처리할 신규/변경 정답지 최대 개수")
+    parser.add_argument("--workers", type=int, default=8, help="다운로드 스레드 수")
+    parser.add_argument("--process-workers", type=int, default=2, help="라벨 변환 프로세스 수 (0: 현재 프로세스)")
+    parser.add_argument("--full", action="store_true", help="체크포인트를 무시하고 전체 재동기화")
+    parser.add_argument("--precompute-features", action="store_true",
+                        help="audio 도메인: 다운로드한 클립의 AST 특징을 Feature Store에 미리 계산")
     args = parser.parse_args()
     
-    asyncio.run(sync_data(args.domain, args.limit))
+    sync_data(args.domain, args.limit, args.precompute_features,
+              workers=args.workers, process_workers=args.process_workers, full=args.full)
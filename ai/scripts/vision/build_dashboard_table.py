@@ -0,0 +1,234 @@
+# ai/scripts/vision/build_dashboard_table.py
+"""
+계기판 경고등 조합 해석 테이블 생성 도구 (Dashboard Interpretation Table Builder)
+
+[역할]
+1. 조합 수집: YOLO 라벨(관측된 경고등 조합) 또는 전체 2^10 조합을 나열합니다.
+2. 해석 생성: 서버와 같은 interpret_dashboard_warnings로 조합별 해석을 한 번만 생성합니다.
+3. 자동 검수: 필수 필드/길이/위험 조합의 조치 문구를 검사하고, 실패 시 응답 캐시에서 지운 뒤 1회 재생성합니다.
+   재생성 후에도 실패한 조합은 테이블에 넣지 않고 검수 CSV로 내보냅니다.
+4. 수동 검수 반영: 검수 CSV를 다시 읽어 사람이 고친 해석을 reviewed=true로 반영합니다.
+
+[사용법]
+python -m ai.scripts.vision.build_dashboard_table --source observed --labels ai/data/yolo/dashboard
+python -m ai.scripts.vision.build_dashboard_table --source all --concurrency 8
+python -m ai.scripts.vision.build_dashboard_table --review-online --export-review dashboard_review.csv
+python -m ai.scripts.vision.build_dashboard_table --import-review dashboard_review.csv
+"""
+import argparse
+import asyncio
+import csv
+import os
+from collections import Counter
+from typing import Dict, List, Optional
+
+import yaml
+from dotenv import load_dotenv
+
+from ai.app.services.common.llm_service import interpret_dashboard_warnings, should_use_fallback
+from ai.app.services.visual.domains.dashboard_service import DASHBOARD_CLASSES
+from ai.app.services.visual.domains.dashboard_table import DashboardInterpretationTable, TABLE_PATH
+
+MIN_TEXT_LEN = 10
+URGENT_KEYWORDS = ("정차", "즉시", "중지", "견인", "점검")
+REVIEW_COLUMNS = ["mask", "labels", "description", "recommendation", "issues"]
+
+
+# =============================================================================
+# 조합 수집
+# =============================================================================
+def collect_observed_masks(table: DashboardInterpretationTable, labels_root: str) -> Counter:
+    """
+    YOLO 라벨 파일(*.txt)에서 이미지별 경고등 집합을 읽어 마스크 빈도를 셉니다.
+    클래스 인덱스 → 이름은 labels_root/data.yaml의 names를 사용합니다.
+    """
+    with open(os.path.join(labels_root, "data.yaml"), "r", encoding="utf-8") as f:
+        names = yaml.safe_load(f)["names"]
+    if isinstance(names, dict):
+        names = [names[k] for k in sorted(names)]
+
+    counts = Counter()
+    skipped = 0
+    for root, _, files in os.walk(labels_root):
+        for file in files:
+            if not file.endswith(".txt") or os.path.basename(root) != "labels":
+                continue
+            with open(os.path.join(root, file), "r", encoding="utf-8") as f:
+                class_ids = {int(line.split()[0]) for line in f if line.strip()}
+            mask = table.mask_for(names[i] for i in class_ids)
+            if mask is None:
+                skipped += 1
+            elif mask:
+                counts[mask] += 1
+
+    if skipped:
+        print(f"[Warning] DASHBOARD_CLASSES에 없는 라벨이 포함된 이미지 {skipped}개 제외")
+    return counts
+
+
+def all_masks(table: DashboardInterpretationTable) -> List[int]:
+    return list(range(1, 1 << len(table.classes)))
+
+
+# =============================================================================
+# 생성 / 검수
+# =============================================================================
+def warning_list_for(table: DashboardInterpretationTable, mask: int) -> List[Dict[str, str]]:
+    """서버(analyze_dashboard_image)와 같은 형식의 LLM 입력"""
+    return [
+        {
+            "name": name,
+            "severity": DASHBOARD_CLASSES[name]["severity"],
+            "description": DASHBOARD_CLASSES[name]["description"],
+        }
+        for name in table.labels_for(mask)
+    ]
+
+
+def review_entry(labels: List[str], result: Dict) -> List[str]:
+    """자동 검수: 문제 목록 반환 (빈 리스트면 통과)"""
+    issues = []
+    description = (result.get("description") or "").strip()
+    recommendation = (result.get("recommendation") or "").strip()
+
+    if result.get("is_mock"):
+        issues.append("mock/error 응답")
+    if len(description) < MIN_TEXT_LEN:
+        issues.append("description 누락/짧음")
+    if len(recommendation) < MIN_TEXT_LEN:
+        issues.append("recommendation 누락/짧음")
+
+    has_critical = any(DASHBOARD_CLASSES[name]["severity"] == "CRITICAL" for name in labels)
+    if has_critical and not any(k in recommendation for k in URGENT_KEYWORDS):
+        issues.append("CRITICAL 경고등 조합인데 즉시 조치 문구 없음")
+    return issues
+
+
+async def generate_entry(table: DashboardInterpretationTable, mask: int, sem: asyncio.Semaphore) -> Optional[Dict]:
+    labels = table.labels_for(mask)
+    issues: List[str] = []
+    async with sem:
+        warnings = warning_list_for(table, mask)
+        for attempt in range(2):
+            result = await interpret_dashboard_warnings(warnings)
+            issues = review_entry(labels, result)
+            if not issues:
+                table.put(mask, result["description"], result["recommendation"], source="offline", reviewed=True)
+                return None
+            print(f"   [Review] mask={mask} 시도 {attempt + 1} 실패: {', '.join(issues)}")
+            # 거절된 응답은 캐시에서 지움 → 재시도가 캐시 적중으로 같은 응답을 받지 않고, 서버도 재사용하지 않음
+            await interpret_dashboard_warnings.invalidate(warnings)
+
+    return {
+        "mask": mask,
+        "labels": " | ".join(labels),
+        "description": result.get("description", ""),
+        "recommendation": result.get("recommendation", ""),
+        "issues": "; ".join(issues),
+    }
+
+
+async def build(table: DashboardInterpretationTable, masks: List[int], concurrency: int) -> List[Dict]:
+    sem = asyncio.Semaphore(concurrency)
+    failed = []
+    done = 0
+    for coro in asyncio.as_completed([generate_entry(table, m, sem) for m in masks]):
+        row = await coro
+        if row:
+            failed.append(row)
+        done += 1
+        if done % 50 == 0 or done == len(masks):
+            print(f"   진행: {done}/{len(masks)} (검수 실패 {len(failed)})")
+            table.save()
+    return failed
+
+
+def review_online_entries(table: DashboardInterpretationTable) -> List[Dict]:
+    """서버가 Write-back한(source=online) 항목을 자동 검수: 통과 → reviewed, 실패 → 검수 CSV"""
+    rows = []
+    for mask, entry in list(table.items()):
+        if entry.get("source") != "online" or entry.get("reviewed"):
+            continue
+        labels = table.labels_for(mask)
+        issues = review_entry(labels, entry)
+        if issues:
+            rows.append({"mask": mask, "labels": " | ".join(labels), "description": entry["description"],
+                         "recommendation": entry["recommendation"], "issues": "; ".join(issues)})
+        else:
+            entry["reviewed"] = True
+    return rows
+
+
+# =============================================================================
+# 검수 CSV
+# =============================================================================
+def export_review(rows: List[Dict], path: str):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=REVIEW_COLUMNS)
+        writer.writeheader()
+        writer.writerows(sorted(rows, key=lambda r: r["mask"]))
+    print(f"[Review] 검수 대상 {len(rows)}개 → {path}")
+
+
+def import_review(table: DashboardInterpretationTable, path: str) -> int:
+    applied = 0
+    with open(path, "r", encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            mask = int(row["mask"])
+            description = (row.get("description") or "").strip()
+            recommendation = (row.get("recommendation") or "").strip()
+            if mask and description and recommendation:
+                table.put(mask, description, recommendation, source="human", reviewed=True)
+                applied += 1
+    return applied
+
+
+if __name__ == "__main__":
+    load_dotenv("ai/.env")
+    parser = argparse.ArgumentParser(description="Dashboard Interpretation Table Builder")
+    parser.add_argument("--source", choices=["observed", "all"], default=None, help="생성할 조합 범위")
+    parser.add_argument("--labels", type=str, default="ai/data/yolo/dashboard", help="YOLO 데이터셋 루트 (data.yaml 포함)")
+    parser.add_argument("--table", type=str, default=TABLE_PATH)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--overwrite", action="store_true", help="이미 있는 조합도 다시 생성")
+    parser.add_argument("--review-online", action="store_true", help="서버 Write-back 항목 자동 검수")
+    parser.add_argument("--export-review", type=str, default="dashboard_table_review.csv")
+    parser.add_argument("--import-review", type=str, default=None, help="수정한 검수 CSV 반영")
+    args = parser.parse_args()
+
+    table = DashboardInterpretationTable(list(DASHBOARD_CLASSES.keys()), path=args.table)
+    print(f"[Info] 현재 테이블: {len(table)}개 조합 ({args.table})")
+    review_rows = []
+
+    if args.import_review:
+        applied = import_review(table, args.import_review)
+        table.save()
+        print(f"[Review] {applied}개 조합 수동 검수 반영")
+
+    if args.source:
+        if should_use_fallback("interpret_dashboard_warnings"):
+            print("[Error] LLM 제공자가 준비되지 않았거나 MOCK_LLM=true 입니다. 실제 호출이 필요합니다.")
+            exit(1)
+
+        if args.source == "observed":
+            counts = collect_observed_masks(table, args.labels)
+            masks = [m for m, _ in counts.most_common()]
+            print(f"[Info] 관측된 조합 {len(masks)}개 (이미지 {sum(counts.values())}장)")
+        else:
+            masks = all_masks(table)
+
+        existing = {m for m, _ in table.items()}
+        if not args.overwrite:
+            masks = [m for m in masks if m not in existing]
+        print(f"[Info] 생성 대상 {len(masks)}개 조합")
+
+        if masks:
+            review_rows += asyncio.run(build(table, masks, args.concurrency))
+
+    if args.review_online:
+        review_rows += review_online_entries(table)
+
+    table.save()
+    if review_rows:
+        export_review(review_rows, args.export_review)
+    print(f"[Done] 테이블: {len(table)}개 조합 저장 ({args.table})")
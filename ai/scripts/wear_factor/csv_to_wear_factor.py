@@ -3,6 +3,7 @@ import argparse
 import json
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 
 WINDOW_SECONDS = 60
@@ -26,8 +27,8 @@ def find_col_startswith(columns, prefix: str):
 
 
 def project_root() -> Path:
-    # scripts/ 아래 파일 기준: scripts의 상위가 루트
-    return Path(__file__).resolve().parents[1]
+    # ai/scripts/wear_factor/ 아래 파일 기준: ai/가 루트
+    return Path(__file__).resolve().parents[2]
 
 
 def extract_features_from_csv(csv_path: Path, window_seconds: int) -> dict:
@@ -48,24 +49,41 @@ def extract_features_from_csv(csv_path: Path, window_seconds: int) -> dict:
 
     # Time 파싱 (HH:MM:SS.mmm)
     df["time"] = pd.to_datetime(df["time"], format="%H:%M:%S.%f", errors="coerce")
-    df = df.dropna(subset=["time"]).sort_values("time")
+    df = df.dropna(subset=["time"])
 
-    if df.empty:
+    time_ns = df["time"].to_numpy(dtype="datetime64[ns]").astype(np.int64)
+    return habit_features(time_ns, df["rpm"].to_numpy(np.float32), df["speed"].to_numpy(np.float32), window_seconds)
+
+
+def extract_features_from_store(store, trip_id: str, window_seconds: int) -> dict:
+    """컬럼 저장소(ai/app/services/obd_engine_anomaly/trip_store.py)에서 CSV 파싱 없이 추출"""
+    cols = store.columns(trip_id, ["rpm", "speed"])
+    return habit_features(cols["time_ns"], cols["engine_rpm"], cols["vehicle_speed_kmh"], window_seconds)
+
+
+def habit_features(time_ns: np.ndarray, rpm: np.ndarray, speed: np.ndarray, window_seconds: int) -> dict:
+    if time_ns.size == 0:
         raise ValueError("No valid time rows after parsing. Check 'Time' format in CSV.")
 
+    order = np.argsort(time_ns, kind="stable")
+    time_ns = time_ns[order]
+
     # 마지막 N초 윈도우
-    end_time = df["time"].iloc[-1]
-    start_time = end_time - pd.Timedelta(seconds=window_seconds)
-    w = df[df["time"] >= start_time].copy()
+    end_ns = int(time_ns[-1])
+    start_ns = end_ns - window_seconds * 10**9
+    first = int(np.searchsorted(time_ns, start_ns, side="left"))
+    rows = order[first:]
 
-    if len(w) < 5:
-        raise ValueError(f"Window too small. rows={len(w)}. Check your CSV/time parsing.")
+    if len(rows) < 5:
+        raise ValueError(f"Window too small. rows={len(rows)}. Check your CSV/time parsing.")
 
-    # ---- feature 계산 ----
-    avg_rpm = float(w["rpm"].mean())
-    idle_ratio = float((w["rpm"] < 800).mean())
+    # ---- feature 계산 (결측 NaN: 평균에서 제외, 비교 조건은 False) ----
+    w_rpm = np.asarray(rpm)[rows]
+    w_speed = np.asarray(speed)[rows]
+    avg_rpm = float(np.nanmean(w_rpm))
+    idle_ratio = float((w_rpm < 800).mean())
 
-    speed_diff = w["speed"].diff()
+    speed_diff = np.diff(w_speed)
     hard_accel_count = int((speed_diff > 5).sum())
     hard_brake_count = int((speed_diff < -5).sum())
 
@@ -76,9 +94,9 @@ def extract_features_from_csv(csv_path: Path, window_seconds: int) -> dict:
         "idle_ratio": round(idle_ratio, 2),
         "_debug_window": {
             "window_seconds": window_seconds,
-            "window_start": str(start_time.time()),
-            "window_end": str(end_time.time()),
-            "rows_in_window": int(len(w)),
+            "window_start": str(pd.Timestamp(start_ns).time()),
+            "window_end": str(pd.Timestamp(end_ns).time()),
+            "rows_in_window": int(len(rows)),
         },
     }
 
@@ -153,6 +171,11 @@ def main():
         default=None,
         help="변환할 CSV 개수 제한 (디버깅용)",
     )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="컬럼 주행 저장소(data/obd/store)를 거쳐 추출 (변경된 CSV만 1회 변환, python -m으로 실행)",
+    )
     args = parser.parse_args()
 
     window_seconds = int(args.window)
@@ -189,13 +212,24 @@ def main():
     if args.limit is not None:
         csv_list = csv_list[: max(0, int(args.limit))]
 
+    store = None
+    if args.store:
+        from ai.app.services.obd_engine_anomaly.trip_store import TripStore
+
+        store = TripStore(str(base_dir / "data" / "obd" / "store"))
+        store.sync([str(p) for p in csv_list])
+
     # ---- 변환 실행 ----
     ok = 0
     fail = 0
 
     for csv_path in csv_list:
         try:
-            features = extract_features_from_csv(csv_path, window_seconds=window_seconds)
+            if store is not None:
+                trip_id = store.trip_id_for(str(csv_path))
+                features = extract_features_from_store(store, trip_id, window_seconds=window_seconds)
+            else:
+                features = extract_features_from_csv(csv_path, window_seconds=window_seconds)
             payload = build_payload(features, csv_path)
 
             category = detect_category_from_path(csv_path)
@@ -135,6 +135,8 @@ SELECT create_hypertable (
 SELECT add_retention_policy (
         'obd_logs', INTERVAL '3 days', if_not_exists => TRUE
     );
+-- 차량별 최근 구간 조회 (배치 이상 탐지)
+CREATE INDEX IF NOT EXISTS idx_obd_logs_vehicle_time ON obd_logs (vehicles_id, time DESC);
 
 -- 클라우드 동기화 데이터 (2.2.2)
 CREATE TABLE IF NOT EXISTS cloud_telemetry (
@@ -382,6 +384,13 @@ CREATE TABLE IF NOT EXISTS anomaly_records (
     snapshot_data JSONB
 );
 
+-- OBD 이상 탐지 배치 채점 진행 위치 (차량별 high-water mark)
+CREATE TABLE IF NOT EXISTS obd_anomaly_watermarks (
+    vehicles_id UUID PRIMARY KEY REFERENCES vehicles (vehicles_id),
+    scored_until TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
 -- 개인화 인사이트 (2.8)
 CREATE TABLE IF NOT EXISTS user_insights (
     insight_id UUID PRIMARY KEY DEFAULT uuid_generate_v4 (),
@@ -0,0 +1,110 @@
+# tests/test_active_learning_pipeline.py
+"""
+Active Learning 백그라운드 라벨링 파이프라인 테스트
+
+[테스트 케이스]
+1. 같은 후보는 한 번만 등록 (중복 제거)
+2. 요청 중 받은 라벨이 있으면 Oracle 없이 저장 + Manifest 기록
+3. 정책 미달 후보는 Oracle 호출 없이 제외, 예산 소진 시 보류
+4. 통합 진단(Router Fallback) 엔진 후보는 anomaly_label 없이 일반 규칙으로 검사, PatchCore Oracle 후보는 anomaly_label 필요
+"""
+import io
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common import manifest_service, object_store_writer
+from ai.app.services.common.active_learning_pipeline import (
+    ActiveLearningPipeline, ALCandidate, CandidateStore, OracleBudget
+)
+from ai.app.services.common.manifest_service import ManifestIdGenerator, SegmentedManifest
+from ai.app.services.common.object_store_writer import ObjectStoreWriter
+
+
+class MemoryS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body if isinstance(Body, bytes) else Body.encode("utf-8")
+
+    def get_object(self, Bucket, Key):
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        return {"Contents": [{"Key": k} for k in sorted(self.objects) if k.startswith(Prefix)], "IsTruncated": False}
+
+
+@pytest.fixture
+def s3(tmp_path, monkeypatch):
+    store = MemoryS3()
+    writer = ObjectStoreWriter(s3_client=store, bucket="test", workers=1, journal_dir=str(tmp_path / "journal"))
+    monkeypatch.setattr(object_store_writer, "_writer", writer)
+    monkeypatch.setitem(manifest_service._manifests, "visual", SegmentedManifest(
+        "visual", s3_client=store, bucket="test", flush_interval_sec=0, id_generator=ManifestIdGenerator(1)))
+    yield store
+    writer.close()
+
+
+def dashboard_candidate(**overrides):
+    values = dict(s3_url="https://bucket/dash_001.jpg", domain="dashboard", category="DASHBOARD",
+                  confidence=0.6, status="WARNING", analysis_type="LLM_ORACLE_DASHBOARD")
+    values.update(overrides)
+    return ALCandidate(**values)
+
+
+class TestActiveLearningPipeline:
+    """ActiveLearningPipeline 단위 테스트"""
+
+    def test_dedupe(self, tmp_path):
+        store = CandidateStore(str(tmp_path / "al.sqlite3"))
+        assert store.add(dashboard_candidate())
+        assert not store.add(dashboard_candidate(confidence=0.5))
+        assert store.add(dashboard_candidate(s3_url="https://bucket/dash_002.jpg"))
+        assert store.counts() == {"pending": 2}
+        print("✅ 후보 중복 제거")
+
+    @pytest.mark.asyncio
+    async def test_prefetched_labels_saved(self, tmp_path, s3):
+        pipeline = ActiveLearningPipeline(str(tmp_path / "al.sqlite3"), budget=OracleBudget(per_minute=1, per_day=0))
+        candidate = dashboard_candidate(
+            analysis_type="LLM_ORACLE_d_MISS", confidence=0.1,
+            oracle_labels={"status": "WARNING", "labels": [{"class": "Check Engine", "bbox": [0.5, 0.5, 0.1, 0.1]}]},
+        )
+        state, label_key = await pipeline.process(candidate)
+        assert state == "done"
+        assert pipeline.metrics()["stats"]["oracle_calls"] == 0
+
+        object_store_writer.get_object_writer().flush(timeout=5)
+        assert json.loads(s3.objects[label_key])["labeled_by"] == "LLM_ORACLE"
+        entries = manifest_service.get_training_data("visual", category="DASHBOARD")
+        assert [e["label"] for e in entries] == [label_key]
+        print("✅ 요청 중 라벨 재사용 (Oracle 생략)")
+
+    @pytest.mark.asyncio
+    async def test_policy_and_budget(self, tmp_path):
+        pipeline = ActiveLearningPipeline(str(tmp_path / "al.sqlite3"), budget=OracleBudget(per_minute=1, per_day=0))
+        assert await pipeline.process(dashboard_candidate(status="NORMAL")) == ("skipped", "policy")
+        assert await pipeline.process(dashboard_candidate(confidence=0.2)) == ("skipped", "policy")
+        assert await pipeline.process(dashboard_candidate()) == ("deferred", "budget")
+        assert pipeline.metrics()["stats"]["oracle_calls"] == 0
+        print("✅ 정책 선별 / 예산 보류")
+
+    @pytest.mark.asyncio
+    async def test_fused_engine_candidate(self, tmp_path, s3):
+        pipeline = ActiveLearningPipeline(str(tmp_path / "al.sqlite3"), budget=OracleBudget(per_minute=1, per_day=0))
+        labels = {"status": "WARNING", "labels": [{"class": "Battery", "bbox": [0.5, 0.5, 0.2, 0.2]}]}
+        fused = dashboard_candidate(s3_url="https://bucket/engine_001.jpg", domain="engine", category="ENGINE",
+                                    analysis_type="LLM_ORACLE_VISUAL", confidence=0.1, oracle_labels=labels)
+        state, label_key = await pipeline.process(fused)
+        assert state == "done" and label_key
+
+        # PatchCore Oracle 경로는 이상 분류 라벨이 있어야 저장
+        patchcore = dashboard_candidate(s3_url="https://bucket/engine_002.jpg", domain="engine", category="ENGINE",
+                                        analysis_type="LLM_ORACLE_ENGINE", confidence=0.1, oracle_labels=labels)
+        assert await pipeline.process(patchcore) == ("skipped", "quality:WARNING")
+        print("✅ 통합 진단 엔진 후보 품질 검사")
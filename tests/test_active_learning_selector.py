@@ -0,0 +1,108 @@
+# tests/test_active_learning_selector.py
+"""
+Active Learning 후보 선별기 테스트
+
+[테스트 케이스]
+1. 불확실성 점수: softmax 엔트로피 / YOLO 박스 마진 / PatchCore 임계값 거리 / 신뢰도 대체값
+2. MMR: 거의 같은 사진 두 장보다 서로 다른 사진을 고르고, 입력 순서와 무관하게 같은 결과
+3. 파이프라인 구간 선별 → al_selection manifest 기록 → 오프라인 재현 결과 일치
+"""
+import os
+import random
+import sys
+from datetime import date, datetime
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common import manifest_service
+from ai.app.services.common.active_learning_pipeline import ActiveLearningPipeline, ALCandidate, OracleBudget
+from ai.app.services.common.active_learning_selector import (
+    SelectionItem, normalized_entropy, select_candidates, uncertainty_score, window_budget
+)
+from ai.app.services.common.manifest_service import ManifestIdGenerator, SegmentedManifest
+from ai.scripts.utils.replay_al_selection import replay_selection
+
+
+class MemoryS3:
+    def __init__(self):
+        self.objects = {}
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        self.objects[Key] = Body if isinstance(Body, bytes) else Body.encode("utf-8")
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        return {"Contents": [{"Key": k} for k in sorted(self.objects) if k.startswith(Prefix)], "IsTruncated": False}
+
+
+def dashboard_candidate(name: str, box_conf: float, phash: str) -> ALCandidate:
+    return ALCandidate(
+        s3_url=f"https://bucket/{name}.jpg", domain="dashboard", category="DASHBOARD",
+        confidence=box_conf, status="WARNING", analysis_type="LLM_ORACLE_DASHBOARD",
+        model_output={"labels": [{"class": "Check Engine", "confidence": box_conf}]},
+        fingerprint={"phash": phash},
+    )
+
+
+class TestActiveLearningSelector:
+    """선별기 단위 테스트"""
+
+    def test_uncertainty_components(self):
+        assert normalized_entropy([0.25, 0.25, 0.25, 0.25]) == pytest.approx(1.0)
+        assert normalized_entropy([1.0, 0.0, 0.0]) == pytest.approx(0.0)
+
+        score, components = uncertainty_score({"labels": [{"confidence": 0.9}, {"confidence": 0.55}]}, 0.9)
+        assert components == {"box_margin": 0.9} and score == 0.9
+
+        score, components = uncertainty_score({"anomaly_score": 0.45, "anomaly_threshold": 0.5,
+                                               "signals": {"router_entropy": 0.2}}, 0.8)
+        assert components == {"router_entropy": 0.2, "anomaly_margin": 0.9} and score == 0.9
+
+        assert uncertainty_score({}, 0.7)[1] == {"confidence": 0.3}
+        print("✅ 불확실성 점수")
+
+    def test_mmr_prefers_diverse_and_is_deterministic(self):
+        items = [
+            SelectionItem("a", 0.95, phash=f"{0:016x}"),
+            SelectionItem("b", 0.94, phash=f"{1:016x}"),            # a와 거의 같은 사진
+            SelectionItem("c", 0.80, phash=f"{(1 << 64) - 1:016x}"),
+            SelectionItem("d", 0.10, phash=f"{0xFFFFFFFF:016x}"),
+        ]
+        decisions = select_candidates(items, budget=2, diversity_weight=0.5)
+        assert [d.key for d in decisions if d.selected] == ["a", "c"]
+
+        # 라벨을 이미 받은 후보(예산 없음)와 비슷한 후보는 뒤로 밀림
+        prefetched = SelectionItem("p", 0.2, needs_oracle=False, phash=f"{0:016x}")
+        decisions = select_candidates(items + [prefetched], budget=1, diversity_weight=0.5)
+        assert {d.key: d.reason for d in decisions if d.selected} == {"c": "selected", "p": "prefetched"}
+
+        shuffled = items[:]
+        random.Random(7).shuffle(shuffled)
+        assert select_candidates(shuffled, 2) == select_candidates(items, 2)
+        assert window_budget(100, 3600, 900) == 25 and window_budget(0, 3600, 900) == 0
+        print("✅ MMR 다양성 / 결정성")
+
+    @pytest.mark.asyncio
+    async def test_window_selection_replay(self, tmp_path, monkeypatch):
+        monkeypatch.setitem(manifest_service._manifests, "al_selection", SegmentedManifest(
+            "al_selection", s3_client=MemoryS3(), bucket="test", flush_interval_sec=0,
+            id_generator=ManifestIdGenerator(1)))
+        pipeline = ActiveLearningPipeline(str(tmp_path / "al.sqlite3"), budget=OracleBudget(per_minute=10, per_day=2))
+        for i, (conf, phash) in enumerate([(0.55, 0), (0.56, 1), (0.6, (1 << 64) - 1), (0.5, 1 << 40)]):
+            pipeline.store.add(dashboard_candidate(f"dash_{i}", conf, f"{phash:016x}"))
+        pipeline.store.add(dashboard_candidate("old", 0.5, f"{7:016x}"))
+        pipeline.store._conn.execute("UPDATE al_candidates SET payload = json_set(payload, '$.created_at', 0) "
+                                     "WHERE payload LIKE '%old.jpg%'")
+
+        # 자정 직전 구간 → 남은 일일 예산 2개 전부 사용
+        now = datetime.combine(date.today(), datetime.min.time()).timestamp() + 24 * 3600 - 300
+        summary = await pipeline.run_selection(now=now)
+        assert summary["budget"] == 2 and summary["selected"] == 2 and summary["expired"] == 1
+        assert pipeline.store.counts() == {"pending": 2, "selected": 2, "skipped": 1}
+
+        entries = manifest_service.get_training_data("al_selection")
+        assert len(entries) == 4
+        assert replay_selection(entries)["identical_windows"] == 1
+        assert replay_selection(entries, diversity_weight=0.0)["identical_windows"] == 0
+        print("✅ 구간 선별 + 오프라인 재현")
@@ -0,0 +1,86 @@
+# tests/test_audio_cascade.py
+"""
+오디오 Cascade (경량 CNN → AST) 테스트
+
+[테스트 케이스]
+1. 경량 CNN 신뢰도 >= LITE_CONFIDENCE_THRESHOLD → AST_LITE로 확정, AST 모델은 호출하지 않음
+2. 경량 CNN 신뢰도 부족 → AST로 전환 (analysis_type=AST, 불확실성 신호 기록)
+3. 경량 모델 가중치 없음 → load_lite_audio_model()이 None (AST 단독 경로)
+   (transformers / librosa가 없으면 1, 2는 건너뜀)
+"""
+import io
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+import torch.nn as nn
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.audio.lite_audio_service import LITE_CONFIDENCE_THRESHOLD, load_lite_audio_model
+from ai.app.services.common.active_learning_selector import request_signals
+
+
+class CountingAST(nn.Module):
+    """호출 횟수를 세는 2-클래스 AST 대역 (Engine_Knocking 확신)"""
+
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+        self.config = SimpleNamespace(id2label={0: "Normal", 1: "Engine_Knocking"})
+
+    def forward(self, input_values):
+        self.calls += 1
+        logits = torch.tensor([[0.0, 4.0]]).repeat(input_values.shape[0], 1)
+        return SimpleNamespace(logits=logits)
+
+
+@pytest.fixture
+def ast_service(monkeypatch):
+    pytest.importorskip("librosa")
+    pytest.importorskip("transformers")
+    from ai.app.services.audio import ast_service
+
+    monkeypatch.setattr(ast_service.librosa, "load", lambda buf, sr: (np.zeros(sr, dtype=np.float32), sr))
+    return ast_service
+
+
+@pytest.fixture
+def ast_payload():
+    extractor_calls = []
+
+    def feature_extractor(audio, sampling_rate, return_tensors, padding):
+        extractor_calls.append(sampling_rate)
+        return {"input_values": torch.zeros(1, 8, 4)}
+
+    return {"model": CountingAST(), "feature_extractor": feature_extractor, "extractor_calls": extractor_calls}
+
+
+class TestAudioCascade:
+    """run_ast_inference Cascade 단위 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_confident_lite_skips_ast(self, ast_service, ast_payload, monkeypatch):
+        monkeypatch.setattr(ast_service, "predict_lite", lambda audio, payload: ("Belt_Issue", LITE_CONFIDENCE_THRESHOLD))
+        result = await ast_service.run_ast_inference(io.BytesIO(b"wav"), ast_payload, lite_model_payload={})
+        assert result.analysis_type == "AST_LITE" and result.detail.diagnosed_label == "Belt_Issue"
+        assert ast_payload["model"].calls == 0 and ast_payload["extractor_calls"] == []
+        print("✅ 경량 CNN 확신 → AST 생략")
+
+    @pytest.mark.asyncio
+    async def test_unsure_lite_falls_through(self, ast_service, ast_payload, monkeypatch):
+        monkeypatch.setattr(ast_service, "predict_lite", lambda audio, payload: ("Normal", LITE_CONFIDENCE_THRESHOLD - 0.2))
+        result = await ast_service.run_ast_inference(io.BytesIO(b"wav"), ast_payload, lite_model_payload={})
+        assert result.analysis_type == "AST" and result.detail.diagnosed_label == "Engine_Knocking"
+        assert ast_payload["model"].calls == 1 and ast_payload["extractor_calls"] == [16000]
+        assert "ast_entropy" in request_signals()
+        print("✅ 경량 CNN 신뢰도 부족 → AST 전환")
+
+    def test_missing_weights(self, tmp_path):
+        assert load_lite_audio_model(str(tmp_path)) is None
+        (tmp_path / "model.pt").write_bytes(b"")
+        assert load_lite_audio_model(str(tmp_path)) is None           # config.json 없음
+        print("✅ 가중치 없음 → AST 단독")
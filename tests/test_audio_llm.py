@@ -0,0 +1,162 @@
+# tests/test_audio_llm.py
+"""
+LLM 오디오 진단 + 라벨 단일 호출 / LLM 업로드용 오디오 압축 테스트
+
+[테스트 케이스]
+1. 한 번의 응답(JSON)에서 사용자용 진단(AudioResponse)과 학습용 라벨(oracle)을 함께 파생, 오디오는 한 번만 업로드
+2. RE_RECORD_REQUIRED 진단은 라벨 status에도 전파
+3. 일부 필드만 있는 JSON → 기본값으로 채움, JSON이 없거나 깨진 응답 → ERROR 응답
+4. compress_for_llm: 앞뒤 무음 제거, 10초 초과 시 RMS가 가장 큰 10초 구간만, MP3 미지원 시 16bit WAV
+   (librosa / soundfile이 없으면 4는 건너뜀)
+"""
+import io
+import json
+import os
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common import llm_service
+from ai.app.services.common.llm_service import analyze_and_label_audio_with_llm
+
+SR = 16000
+
+
+class FakeAudioClient:
+    """chat.completions.create 요청을 기록하고 정해진 content를 돌려주는 클라이언트"""
+
+    def __init__(self, content: str):
+        self.content = content
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def create(self, **kwargs):
+        self.requests.append(kwargs)
+        message = SimpleNamespace(content=self.content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+@pytest.fixture
+def llm_client(monkeypatch):
+    """응답 content를 받아 가짜 클라이언트를 연결 (Mock 모드 우회)"""
+    def connect(content: str) -> FakeAudioClient:
+        client = FakeAudioClient(content)
+        monkeypatch.setattr(llm_service, "should_use_fallback", lambda name=None: False)
+        monkeypatch.setattr(llm_service, "_get_client", lambda name=None: client)
+        return client
+    return connect
+
+
+class TestAudioCombinedCall:
+    """analyze_and_label_audio_with_llm / _split_audio_llm_result 단위 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_diagnosis_and_label_from_one_response(self, llm_client):
+        client = llm_client("분석 결과입니다.\n" + json.dumps({
+            "diagnosis": {"diagnosed_label": "엔진 노킹", "category": "ENGINE", "description": "금속성 타격음",
+                          "status": "FAULTY", "confidence": 0.82},
+            "training_label": {"label": "Engine_Knock", "category": "ENGINE", "status": "FAULTY", "confidence": 0.8},
+        }, ensure_ascii=False))
+        diagnosis, oracle = await analyze_and_label_audio_with_llm("s3://bucket/a.mp3", b"ID3-audio", "mp3")
+
+        assert diagnosis.status == "FAULTY" and diagnosis.is_critical and diagnosis.analysis_type == "LLM_AUDIO"
+        assert diagnosis.detail.diagnosed_label == "엔진 노킹" and diagnosis.confidence == pytest.approx(0.82)
+        assert oracle == {"label": "Engine_Knock", "category": "ENGINE", "status": "FAULTY", "confidence": 0.8}
+        assert len(client.requests) == 1
+        audio_part = client.requests[0]["messages"][0]["content"][1]["input_audio"]
+        assert audio_part["format"] == "mp3" and client.requests[0]["modalities"] == ["text"]
+        print("✅ 진단 + 라벨 단일 응답")
+
+    @pytest.mark.asyncio
+    async def test_re_record_propagates(self, llm_client):
+        llm_client(json.dumps({
+            "diagnosis": {"status": "RE_RECORD_REQUIRED", "category": "UNKNOWN_AUDIO"},
+            "training_label": {"label": "Noise", "category": "ENGINE", "status": "NORMAL"},
+        }))
+        diagnosis, oracle = await analyze_and_label_audio_with_llm("s3://bucket/b.wav", b"RIFF")
+        assert diagnosis.status == "RE_RECORD_REQUIRED" and not diagnosis.is_critical
+        assert oracle["status"] == "RE_RECORD_REQUIRED" and oracle["label"] == "Noise"
+        print("✅ 재녹음 판정 라벨 전파")
+
+    @pytest.mark.asyncio
+    async def test_partial_and_malformed(self, llm_client):
+        llm_client(json.dumps({"diagnosis": {"diagnosed_label": "벨트 소음", "status": "FAULTY"}}))
+        diagnosis, oracle = await analyze_and_label_audio_with_llm("s3://bucket/c.wav", b"RIFF")
+        assert diagnosis.category == "ENGINE" and diagnosis.confidence == pytest.approx(0.8)
+        assert oracle == {"label": "UNKNOWN", "category": "UNKNOWN", "status": "ERROR"}
+
+        for content in ("JSON 없이 설명만", '{"diagnosis": {"status": "FAULTY",'):
+            llm_client(content)
+            diagnosis, oracle = await analyze_and_label_audio_with_llm("s3://bucket/d.wav", b"RIFF")
+            assert diagnosis.status == "ERROR" and diagnosis.confidence == 0.0
+            assert oracle["status"] == "ERROR"
+        print("✅ 부분 / 깨진 JSON")
+
+
+@pytest.fixture
+def hertz():
+    pytest.importorskip("librosa")
+    sf = pytest.importorskip("soundfile")
+    from ai.app.services.audio import hertz
+    return hertz, sf
+
+
+@pytest.fixture
+def wav_only(hertz, monkeypatch):
+    """MP3 인코딩 미지원 환경 흉내 (길이를 정확히 비교하기 위해 WAV 경로 사용)"""
+    module, sf = hertz
+    write = sf.write
+
+    def no_mp3(buffer, y, sr, format=None, **kwargs):
+        if format == "MP3":
+            raise RuntimeError("MP3 not supported")
+        return write(buffer, y, sr, format=format, **kwargs)
+
+    monkeypatch.setattr(module.sf, "write", no_mp3)
+    return module, sf
+
+
+def to_wav_bytes(sf, y: np.ndarray) -> bytes:
+    buffer = io.BytesIO()
+    sf.write(buffer, y.astype(np.float32), SR, format="WAV")
+    return buffer.getvalue()
+
+
+def tone(seconds: float, amplitude: float) -> np.ndarray:
+    t = np.arange(int(seconds * SR)) / SR
+    return amplitude * np.sin(2 * np.pi * 220 * t)
+
+
+class TestCompressForLLM:
+    """hertz.compress_for_llm 단위 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_trims_silence(self, wav_only):
+        module, sf = wav_only
+        y = np.concatenate([np.zeros(SR), tone(3, 0.5), np.zeros(SR)])
+        encoded, fmt = await module.compress_for_llm(to_wav_bytes(sf, y))
+        out, _ = sf.read(io.BytesIO(encoded))
+        assert fmt == "wav" and abs(len(out) / SR - 3.0) < 0.2
+        print("✅ 앞뒤 무음 제거")
+
+    @pytest.mark.asyncio
+    async def test_top_rms_window(self, wav_only):
+        module, sf = wav_only
+        y = np.concatenate([tone(8, 0.05), tone(10, 0.8), tone(7, 0.05)])
+        encoded, fmt = await module.compress_for_llm(io.BytesIO(to_wav_bytes(sf, y)))
+        out, _ = sf.read(io.BytesIO(encoded))
+        assert len(out) == int(module.LLM_AUDIO_MAX_SECONDS * SR)
+        assert np.sqrt(np.mean(out ** 2)) > 0.5                             # 큰 소리 구간이 선택됨
+        print("✅ RMS 최대 10초 구간")
+
+    @pytest.mark.asyncio
+    async def test_wav_fallback(self, wav_only):
+        module, sf = wav_only
+        encoded, fmt = await module.compress_for_llm(to_wav_bytes(sf, tone(2, 0.5)))
+        assert fmt == "wav" and encoded[:4] == b"RIFF"
+        assert sf.info(io.BytesIO(encoded)).subtype == "PCM_16"
+        print("✅ MP3 미지원 → 16bit WAV")
@@ -0,0 +1,57 @@
+# tests/test_dashboard_table.py
+"""
+계기판 경고등 조합 해석 테이블 테스트
+
+[테스트 케이스]
+1. 라벨 집합 ↔ 마스크 변환 (순서/중복 무관, 미등록 라벨은 None)
+2. Write-back 후 파일 재로드
+3. 클래스 구성이 다르면 테이블 무시
+"""
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.visual.domains.dashboard_table import DashboardInterpretationTable
+
+CLASSES = ["Check Engine", "SRS-Airbag", "Low Tire Pressure Warning Light"]
+
+
+class TestDashboardTable:
+    """DashboardInterpretationTable 단위 테스트"""
+
+    def test_mask_roundtrip(self, tmp_path):
+        table = DashboardInterpretationTable(CLASSES, path=str(tmp_path / "table.json"))
+        mask = table.mask_for(["SRS-Airbag", "Check Engine", "Check Engine"])
+        assert mask == 0b011
+        assert table.labels_for(mask) == ["Check Engine", "SRS-Airbag"]
+        assert table.mask_for(["Unknown Light"]) is None
+        print("✅ 마스크 변환")
+
+    def test_write_back_and_reload(self, tmp_path):
+        path = str(tmp_path / "table.json")
+        table = DashboardInterpretationTable(CLASSES, path=path)
+        mask = table.mask_for(["Check Engine"])
+        assert table.get(mask) is None
+
+        table.write_back(mask, {"description": "엔진 점검 필요", "recommendation": "정비소 방문"})
+        table.write_back(table.mask_for(["SRS-Airbag"]), {"description": "mock", "recommendation": ""})
+
+        reloaded = DashboardInterpretationTable(CLASSES, path=path)
+        assert len(reloaded) == 1
+        assert reloaded.get(mask)["source"] == "online"
+        assert reloaded.stats()["hits"] == 1
+        print("✅ Write-back 후 재로드")
+
+    def test_class_mismatch_ignored(self, tmp_path):
+        path = tmp_path / "table.json"
+        path.write_text(json.dumps({
+            "version": 1,
+            "classes": list(reversed(CLASSES)),
+            "entries": {"1": {"description": "x", "recommendation": "y", "source": "offline", "reviewed": True}},
+        }), encoding="utf-8")
+
+        table = DashboardInterpretationTable(CLASSES, path=str(path))
+        assert len(table) == 0
+        print("✅ 클래스 구성 불일치 시 무시")
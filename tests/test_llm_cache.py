@@ -0,0 +1,133 @@
+# tests/test_llm_cache.py
+"""
+LLM 응답 캐시 (cached_llm_response) 테스트
+
+[테스트 케이스]
+1. 순서/공백만 다른 입력은 같은 키로 적중, 함수에는 정규화된 입력 전달
+2. is_mock 응답(Mock/오류 Fallback)은 저장하지 않음
+3. 프롬프트 버전을 올리면 이전 항목은 조회되지 않음, 오래된 버전 일괄 삭제 / 항목 단위 삭제(invalidate)
+4. 요청 컨텍스트 안의 동시 중복 호출은 한 번만 조회·호출 (memoize_in_request와 함께 사용)
+5. 라우팅된 제공자/모델이 바뀌면 다른 키 (다른 모델 응답을 재사용하지 않음), 되돌리면 이전 항목 적중
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common import llm_cache
+from ai.app.services.common.llm_cache import cached_llm_response, get_llm_cache
+from ai.app.services.common.llm_providers import build_provider_router
+from ai.app.services.common.request_context import llm_request_scope, memoize_in_request
+
+DAMAGES = [{"part": "앞범퍼", "damage": "스크래치"}, {"part": "헤드라이트", "damage": "파손"}]
+SHUFFLED = [{"damage": "파손", "part": " 헤드라이트 "}, {"part": "앞범퍼", "damage": "스크래치"}]
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+    monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite3"))
+    monkeypatch.setattr(llm_cache, "_cache", None)
+    return get_llm_cache()
+
+
+def make_report(version: str = "v1", mock: bool = False):
+    """호출된 입력을 기록하는 가짜 리포트 함수"""
+    calls = []
+
+    @cached_llm_response("generate_exterior_report", version)
+    async def report(damages):
+        calls.append(damages)
+        await asyncio.sleep(0.01)
+        result = {"description": f"{len(damages)}건", "recommendation": "정비소 방문"}
+        if mock:
+            result["is_mock"] = True
+        return result
+
+    return report, calls
+
+
+class TestLLMCache:
+    """cached_llm_response 단위 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_canonical_hit(self, cache):
+        report, calls = make_report()
+        assert await report(DAMAGES) == await report(SHUFFLED)
+        assert len(calls) == 1 and calls[0][1]["part"] == "헤드라이트"   # 정규화된 입력 전달
+        assert cache.metrics()["functions"]["generate_exterior_report"]["hits"] == 1
+        print("✅ 정규화 입력 적중")
+
+    @pytest.mark.asyncio
+    async def test_mock_not_cached(self, cache):
+        report, calls = make_report(mock=True)
+        await report(DAMAGES)
+        await report(DAMAGES)
+        assert len(calls) == 2
+        assert cache.metrics()["entries"] == {}
+        print("✅ Mock 응답 미저장")
+
+    @pytest.mark.asyncio
+    async def test_version_bump_and_invalidate(self, cache):
+        v1, v1_calls = make_report("v1")
+        await v1(DAMAGES)
+        v2, v2_calls = make_report("v2")
+        await v2(DAMAGES)
+        await v2(DAMAGES)
+        assert len(v1_calls) == 1 and len(v2_calls) == 1                  # 버전이 바뀌면 이전 항목 미적중
+        assert cache.metrics()["entries"]["generate_exterior_report"] == {"v1": 1, "v2": 1}
+
+        assert cache.invalidate(keep_versions={"generate_exterior_report": "v2"}) == 1
+        assert await v2.invalidate(SHUFFLED) is True                      # 정규화 후 같은 키
+        await v2(DAMAGES)
+        assert len(v2_calls) == 2
+        print("✅ 버전 / 항목 무효화")
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_in_request(self, cache):
+        calls = []
+
+        @memoize_in_request
+        @cached_llm_response("interpret_tire_status", "v1")
+        async def tire(statuses):
+            calls.append(statuses)
+            await asyncio.sleep(0.01)
+            return {"description": "ok", "recommendation": "r"}
+
+        async with llm_request_scope("tire"):
+            results = await asyncio.gather(*(tire([{"tire": "FL", "tread_mm": 2.0}]) for _ in range(3)))
+        assert len(calls) == 1 and results[0] == results[2]
+        stats = cache.metrics()["functions"]["interpret_tire_status"]
+        assert stats["misses"] == 1 and stats["stores"] == 1
+        print("✅ 요청 내 동시 중복 → 조회·호출 1회")
+
+    @pytest.mark.asyncio
+    async def test_provider_and_model_in_key(self, cache, monkeypatch):
+        monkeypatch.setenv("LOCAL_LLM_MODEL", "qwen2.5:3b")
+        monkeypatch.setenv("LLM_DEFAULT_PROVIDER", "openai")
+        monkeypatch.setenv("LLM_ROUTES", "")
+
+        def backend():
+            return build_provider_router().resolve("generate_exterior_report", "gpt-5")
+
+        calls = []
+
+        @cached_llm_response("generate_exterior_report", "v1", backend=backend)
+        async def report(damages):
+            calls.append(backend())
+            return {"description": "ok", "recommendation": "r"}
+
+        await report(DAMAGES)
+        monkeypatch.setenv("LLM_ROUTES", "generate_exterior_report=local")
+        await report(DAMAGES)
+        monkeypatch.setenv("LOCAL_LLM_MODEL", "llama3.1:8b")
+        await report(DAMAGES)
+        assert calls == ["openai:gpt-5", "local:qwen2.5:3b", "local:llama3.1:8b"]
+
+        monkeypatch.setenv("LLM_ROUTES", "")
+        await report(DAMAGES)                                              # openai 항목 재사용
+        assert len(calls) == 3 and await report.invalidate(SHUFFLED) is True
+        print("✅ 제공자/모델별 캐시 키")
@@ -0,0 +1,63 @@
+# tests/test_llm_guard.py
+"""
+LLM 응답 스키마 검증 테스트 (통합 진단 + BBox)
+
+[테스트 케이스]
+1. 정상 응답 통과 + BBox 정규화
+2. 최상위 필드 오류 시 전체 폐기
+3. 잘못된 objects 항목만 폐기
+"""
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common.llm_guard import validate_fused_diagnosis, validate_against_schema, FUSED_DIAGNOSIS_SCHEMA
+
+
+def make_result(**overrides):
+    result = {
+        "relevance": "VEHICLE",
+        "category": "EXTERIOR",
+        "status": "WARNING",
+        "description": "앞 범퍼 스크래치",
+        "recommendation": "도장 수리 권장",
+        "objects": [{"class": "scratch", "bbox": [0.6, 0.2, 0.1, 0.5], "confidence": 0.8}],
+    }
+    result.update(overrides)
+    return result
+
+
+class TestLLMGuard:
+    """validate_fused_diagnosis 단위 테스트"""
+
+    def test_valid_result(self):
+        assert validate_against_schema(make_result(), FUSED_DIAGNOSIS_SCHEMA) == []
+
+        clean, errors = validate_fused_diagnosis(make_result())
+        assert errors == []
+        assert clean["objects"][0]["bbox"] == [0.1, 0.2, 0.6, 0.5]
+        assert clean["objects"][0]["source"] == "LLM_GENERATED"
+        print("✅ 정상 응답 통과")
+
+    def test_invalid_top_level(self):
+        clean, errors = validate_fused_diagnosis(make_result(category="TIRE_WHEEL"))
+        assert clean is None
+        assert any("$.category" in e for e in errors)
+
+        clean, errors = validate_fused_diagnosis(make_result(status=None))
+        assert clean is None
+        print("✅ 최상위 필드 오류 시 폐기")
+
+    def test_invalid_objects_dropped(self):
+        objects = [
+            {"class": "dent", "bbox": [0.1, 0.1, 0.3, 0.3]},            # confidence 누락 → 기본값
+            {"class": "crack", "bbox": [0.1, 0.1, 0.1, 0.4], "confidence": 0.7},  # 면적 0
+            {"class": "scratch", "bbox": [0.1, 0.2, 0.3], "confidence": 0.7},     # 좌표 3개
+            {"class": "chip", "bbox": "0,0,1,1", "confidence": 0.7},              # 타입 오류
+        ]
+        clean, errors = validate_fused_diagnosis(make_result(objects=objects))
+        assert [o["class"] for o in clean["objects"]] == ["dent"]
+        assert clean["objects"][0]["confidence"] == 0.9
+        assert len(errors) == 3
+        print("✅ 잘못된 BBox 항목만 폐기")
@@ -0,0 +1,351 @@
+# tests/test_llm_resilience.py
+"""
+LLM 제공자 / 복원력 계층 테스트 (로컬 Fake OpenAI 서버 사용)
+
+[테스트 케이스]
+1. 정상 응답 통과
+2. 5xx 후 재시도 성공
+3. 연속 실패 시 Circuit Breaker OPEN → Mock/Fallback 응답
+4. 함수별 동시성 제한
+5. 함수별 라우팅 (local / mock)
+6. 로컬 텍스트 호출 배칭
+7. SSE 스트리밍 요청 중 LLM 토큰 이벤트 (JSON 모드는 description 값만), 이벤트 순서 단계 → llm_token → result → done,
+   캐시 적중 시 저장된 description을 이벤트 하나로, 오류 시 error → done
+8. 정규화 응답 캐시 (순서만 다른 입력 → 네트워크 호출 없이 적중, 버전 무효화)
+9. HALF_OPEN 시험 호출: 진행 중에는 열린 것으로 취급, 취소/과부하 거절 시 반납
+10. 검수에서 거절된 응답은 캐시에서 지워 재시도가 다시 생성 (계기판 해석 테이블 빌더)
+"""
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common import llm_service, llm_cache
+from ai.app.services.common.llm_resilience import CircuitBreaker, LLMOverloadedError, ResilientClient
+from ai.app.services.common.progress_events import emit, format_sse, run_with_events
+
+
+class FakeOpenAIServer:
+    """/v1/chat/completions만 흉내내는 HTTP 서버"""
+
+    def __init__(self):
+        self.statuses = []      # 요청마다 앞에서부터 꺼내 쓰는 상태 코드 (비면 200)
+        self.delay = 0.0
+        self.piece = 5          # 스트리밍 응답 조각 길이 (문자)
+        self.hits = 0
+        self.models = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                prompt = request["messages"][-1]["content"]
+                with fake.lock:
+                    fake.hits += 1
+                    fake.models.append(request.get("model"))
+                    fake.active += 1
+                    fake.max_active = max(fake.max_active, fake.active)
+                    status = fake.statuses.pop(0) if fake.statuses else 200
+                time.sleep(fake.delay)
+                with fake.lock:
+                    fake.active -= 1
+
+                answer = {"description": "ok", "recommendation": "r"}
+                if isinstance(prompt, str) and '{"results"' in prompt:
+                    answer = {"results": [answer] * prompt.count("[작업 ")}
+
+                if status == 200 and request.get("stream"):
+                    text = json.dumps(answer, ensure_ascii=False)
+                    pieces = [text[i:i + fake.piece] for i in range(0, len(text), fake.piece)]
+                    events = b"".join(
+                        b"data: " + json.dumps({
+                            "id": "chatcmpl-test", "object": "chat.completion.chunk", "created": 0, "model": "gpt-5",
+                            "choices": [{"index": 0, "delta": {"content": piece}, "finish_reason": None}],
+                        }).encode() + b"\n\n"
+                        for piece in pieces
+                    ) + b"data: [DONE]\n\n"
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/event-stream")
+                    self.send_header("Content-Length", str(len(events)))
+                    self.end_headers()
+                    self.wfile.write(events)
+                    return
+
+                if status == 200:
+                    body = {
+                        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "gpt-5",
+                        "choices": [{
+                            "index": 0, "finish_reason": "stop",
+                            "message": {"role": "assistant", "content": json.dumps(answer)},
+                        }],
+                        "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+                    }
+                else:
+                    body = {"error": {"message": "fake failure", "type": "server_error"}}
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.port = self.httpd.server_address[1]
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+
+
+def openai_metrics():
+    return llm_service.get_llm_metrics()["providers"]["openai"]["resilience"]
+
+
+class TestLLMResilience:
+    """ResilientClient + llm_service 연동 테스트"""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        fake = FakeOpenAIServer()
+        monkeypatch.setenv("OPENAI_API_KEY", "sk-test-0000000000000000000000")
+        monkeypatch.setenv("OPENAI_BASE_URL", f"http://127.0.0.1:{fake.port}/v1")
+        monkeypatch.setenv("LOCAL_LLM_BASE_URL", f"http://127.0.0.1:{fake.port}/v1")
+        monkeypatch.setenv("LOCAL_LLM_MODEL", "qwen2.5:3b")
+        monkeypatch.setenv("LLM_ROUTES", "")
+        monkeypatch.setenv("MOCK_LLM", "false")
+        monkeypatch.setenv("LLM_RETRY_BASE_SEC", "0.01")
+        monkeypatch.setenv("LLM_BREAKER_FAILURES", "3")
+        monkeypatch.setenv("LLM_BREAKER_COOLDOWN_SEC", "60")
+        monkeypatch.setenv("LLM_MAX_CONCURRENCY_PER_FN", "2")
+        monkeypatch.setenv("LLM_CACHE_ENABLED", "false")
+        monkeypatch.setattr(llm_service, "client", None)
+        monkeypatch.setattr(llm_cache, "_cache", None)
+        yield fake
+        fake.close()
+
+    @pytest.mark.asyncio
+    async def test_success(self, server):
+        """정상 응답이 그대로 파싱되는지 확인"""
+        result = await llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])
+        assert result["description"] == "ok"
+        assert openai_metrics()["functions"]["interpret_dashboard_warnings"]["calls"] == 1
+        print("✅ 정상 응답 통과")
+
+    @pytest.mark.asyncio
+    async def test_retry_then_success(self, server):
+        """5xx 두 번 후 성공 → 재시도 2회"""
+        server.statuses = [500, 503]
+        result = await llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])
+        assert result["description"] == "ok"
+        assert server.hits == 3
+        assert openai_metrics()["functions"]["interpret_dashboard_warnings"]["retries"] == 2
+        print("✅ 재시도 후 성공")
+
+    @pytest.mark.asyncio
+    async def test_breaker_opens_and_falls_back(self, server):
+        """연속 실패 시 회로가 열리고, 이후 호출은 서버에 닿지 않고 Fallback 응답"""
+        server.statuses = [500] * 10
+        result = await llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])
+        assert result["description"] != "ok"
+        assert openai_metrics()["breaker"]["state"] == "OPEN"
+        assert llm_service.should_use_fallback() is True
+
+        hits_before = server.hits
+        result = await llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])
+        assert "분석 모드" in result["description"]
+        assert server.hits == hits_before
+        print("✅ Circuit Breaker OPEN → Fallback")
+
+    @pytest.mark.asyncio
+    async def test_half_open_probe_released(self):
+        """시험 호출이 취소되거나 과부하로 거절돼도 다음 호출이 다시 시험할 수 있어야 함"""
+        client = ResilientClient(None)
+        client.breaker._open("test")
+        client.breaker.opened_at -= client.breaker.cooldown_sec
+        assert client.breaker.is_open() is False   # 시험 호출 대기 → 보낼 수 있음
+
+        started = asyncio.Event()
+
+        async def hang(name, stats, kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        client._attempt = hang
+        task = asyncio.create_task(client.create("probe"))
+        await started.wait()
+        assert client.breaker.state == CircuitBreaker.HALF_OPEN
+        assert client.breaker.is_open() is True    # 시험 호출 진행 중 → Fallback
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert client.breaker.is_open() is False
+
+        async def overloaded(name, stats, kwargs):
+            raise LLMOverloadedError("busy")
+
+        client._attempt = overloaded
+        with pytest.raises(LLMOverloadedError):
+            await client.create("probe")
+        assert client.breaker.allow() is True     # 반납된 시험 호출을 다시 잡을 수 있음
+        print("✅ HALF_OPEN 시험 호출 반납")
+
+    @pytest.mark.asyncio
+    async def test_per_function_concurrency_limit(self, server):
+        """함수별 동시 호출이 LLM_MAX_CONCURRENCY_PER_FN을 넘지 않는지 확인"""
+        server.delay = 0.2
+        detections = [[{"class": f"light_{i}"}] for i in range(6)]
+        results = await asyncio.gather(*[llm_service.interpret_dashboard_warnings(d) for d in detections])
+        assert all(r["description"] == "ok" for r in results)
+        assert server.max_active <= 2
+        assert openai_metrics()["in_flight"] == 0
+        print(f"✅ 동시성 제한 (최대 동시 {server.max_active})")
+
+    @pytest.mark.asyncio
+    async def test_route_to_local_and_mock(self, server, monkeypatch):
+        """local 라우팅은 로컬 모델명으로, mock 라우팅은 서버 호출 없이 Mock 응답"""
+        monkeypatch.setenv("LLM_ROUTES", "interpret_dashboard_warnings=local,generate_exterior_report=mock")
+        monkeypatch.setenv("LOCAL_LLM_BATCH", "false")
+        monkeypatch.setattr(llm_service, "client", None)
+
+        result = await llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])
+        assert result["description"] == "ok"
+        assert server.models == ["qwen2.5:3b"]
+
+        result = await llm_service.generate_exterior_report([{"part": "bumper", "damage": "scratch"}])
+        assert "분석 모드" in result["description"]
+        assert server.hits == 1
+
+        providers = llm_service.get_llm_metrics()["providers"]
+        assert providers["local"]["calls"] == 1 and providers["local"]["p50_ms"] is not None
+        print("✅ 함수별 제공자 라우팅")
+
+    @pytest.mark.asyncio
+    async def test_local_text_batching(self, server, monkeypatch):
+        """동시에 들어온 로컬 텍스트 호출이 한 번의 요청으로 합쳐지는지 확인"""
+        monkeypatch.setenv("LLM_ROUTES", "interpret_dashboard_warnings=local")
+        monkeypatch.setattr(llm_service, "client", None)
+
+        detections = [[{"class": f"light_{i}"}] for i in range(4)]
+        results = await asyncio.gather(*[llm_service.interpret_dashboard_warnings(d) for d in detections])
+        assert all(r["description"] == "ok" for r in results)
+        assert server.hits == 1
+
+        batching = llm_service.get_llm_metrics()["providers"]["local"]["resilience"]["batching"]
+        assert batching["batches"] == 1 and batching["batched_requests"] == 4
+        print("✅ 로컬 텍스트 호출 배칭")
+
+    @pytest.mark.asyncio
+    async def test_streaming_tokens(self, server):
+        """스트리밍 요청 안에서는 서술형 응답이 llm_token 이벤트로 나뉘어 오고, 최종 결과는 동일"""
+        server.piece = 1
+        events = []
+        async for event, data in run_with_events(llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])):
+            events.append((event, data))
+
+        tokens = [d["delta"] for e, d in events if e == "llm_token"]
+        assert tokens == ["o", "k"]                                      # JSON 조각이 아닌 description 값만
+        assert events[-2] == ("result", {"description": "ok", "recommendation": "r"})
+        assert events[-1] == ("done", {})
+        assert format_sse(*events[-2], 3).startswith("event: result\nid: 3\ndata: ")
+
+        # 스트리밍 요청 밖에서는 기존처럼 단일 응답
+        result = await llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])
+        assert result["description"] == "ok"
+        print(f"✅ 스트리밍 토큰 이벤트 ({len(tokens)}개)")
+
+    def test_json_description_field(self):
+        """JSON 모드 응답 조각 → description 값만 (조각 경계의 이스케이프 / 서로게이트 쌍, 다른 필드 무시)"""
+        answer = {"relevance": "VEHICLE", "description": "엔진 \"경고\"\n😀 확인\\", "recommendation": "r",
+                  "objects": [{"class": "Battery", "bbox": [0.1, 0.2, 0.3, 0.4]}]}
+        text = json.dumps(answer)                                       # ensure_ascii: \uXXXX 이스케이프 포함
+        for size in (1, 2, 3, 7):
+            field = llm_service._JsonStringField("description")
+            assert "".join(field.feed(text[i:i + size]) for i in range(0, len(text), size)) == answer["description"]
+        assert llm_service._JsonStringField("description").feed(json.dumps({"objects": []})) == ""
+        print("✅ JSON description 값 스트리밍")
+
+    @pytest.mark.asyncio
+    async def test_stream_event_order(self, server, monkeypatch, tmp_path):
+        """단계 이벤트 → llm_token → result → done, 캐시 적중 시 토큰 이벤트 1건, 오류 시 error → done"""
+        monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite3"))
+        monkeypatch.setattr(llm_cache, "_cache", None)
+
+        async def diagnose():
+            emit("scene", {"scene_type": "SCENE_DASHBOARD", "confidence": 0.97})
+            emit("detections", {"source": "yolo", "detections": []})
+            return await llm_service.interpret_dashboard_warnings([{"class": "Check Engine"}])
+
+        async def collect(coro):
+            return [(event, data) async for event, data in run_with_events(coro)]
+
+        events = await collect(diagnose())
+        names = [e for e, _ in events]
+        assert names[:2] == ["scene", "detections"] and names[-2:] == ["result", "done"]
+        assert set(names[2:-2]) == {"llm_token"}
+        assert "".join(d["delta"] for e, d in events if e == "llm_token") == "ok"
+
+        cached = await collect(diagnose())
+        assert [e for e, _ in cached] == ["scene", "detections", "llm_token", "result", "done"]
+        assert cached[2][1] == {"function": "interpret_dashboard_warnings", "delta": "ok", "cached": True}
+        assert server.hits == 1
+
+        async def fail():
+            emit("scene", {"scene_type": "SCENE_ENGINE", "confidence": 0.9})
+            raise RuntimeError("boom")
+
+        assert [e for e, _ in await collect(fail())] == ["scene", "error", "done"]
+        print("✅ 스트림 이벤트 순서 / 캐시 적중 단일 이벤트")
+
+    @pytest.mark.asyncio
+    async def test_response_cache(self, server, monkeypatch, tmp_path):
+        """순서/공백만 다른 입력은 같은 키로 적중하고, 버전 무효화 후에는 다시 호출"""
+        monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite3"))
+        monkeypatch.setattr(llm_cache, "_cache", None)
+
+        first = [{"part": "앞범퍼", "damage": "스크래치"}, {"part": "헤드라이트", "damage": "파손"}]
+        second = [{"damage": "파손", "part": " 헤드라이트 "}, {"part": "앞범퍼", "damage": "스크래치"}]
+        assert (await llm_service.generate_exterior_report(first))["description"] == "ok"
+        assert (await llm_service.generate_exterior_report(second))["description"] == "ok"
+        assert server.hits == 1
+
+        stats = llm_service.get_llm_cache_metrics()
+        assert stats["functions"]["generate_exterior_report"]["hit_rate"] == 0.5
+        assert stats["entries"]["generate_exterior_report"] == {"v1": 1}
+
+        assert llm_cache.get_llm_cache().invalidate("generate_exterior_report", "v1") == 1
+        await llm_service.generate_exterior_report(first)
+        assert server.hits == 2
+        print("✅ 정규화 응답 캐시")
+
+    @pytest.mark.asyncio
+    async def test_rejected_response_not_reused(self, server, monkeypatch, tmp_path):
+        """빌더 검수에서 거절된 응답("ok": 너무 짧음)은 캐시에서 지워 재시도가 실제로 다시 호출"""
+        from ai.scripts.vision.build_dashboard_table import generate_entry
+        from ai.app.services.visual.domains.dashboard_table import DashboardInterpretationTable
+
+        monkeypatch.setenv("LLM_CACHE_ENABLED", "true")
+        monkeypatch.setenv("LLM_CACHE_PATH", str(tmp_path / "llm_cache.sqlite3"))
+        monkeypatch.setattr(llm_cache, "_cache", None)
+
+        table = DashboardInterpretationTable(["Check Engine", "SRS-Airbag"], path=str(tmp_path / "table.json"))
+        row = await generate_entry(table, 0b01, asyncio.Semaphore(1))
+        assert row is not None and row["description"] == "ok"
+        assert server.hits == 2                                   # 재시도가 캐시 적중으로 끝나지 않음
+        assert llm_service.get_llm_cache_metrics()["entries"] == {}   # 거절된 응답은 남지 않음
+        print("✅ 거절 응답 캐시 제거 후 재시도")
@@ -0,0 +1,95 @@
+# tests/test_lstm_preprocess.py
+"""
+LSTM-AE 윈도우 구성 테스트
+
+[테스트 케이스]
+1. 주행 저장소 → 윈도우 색인: 관측 비율이 낮은 구간의 윈도우 제외 (누적합 결과 = 윈도우별 직접 계산)
+2. WindowDataset: memmap view (복사 없음), 정규화, 에폭별 셔플 색인
+3. meta.json registry_version = 학습에 쓰는 scaler.json 통계 (서빙 로드 시 check_scaler 통과)
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.obd_engine_anomaly.feature_registry import check_scaler, load_feature_spec, registry_version
+from ai.app.services.obd_engine_anomaly.lstm_preprocess import (
+    PreprocessConfig, WindowDataset, build_lstm_ae_dataset
+)
+from ai.app.services.obd_engine_anomaly.scaler import ZScoreScaler
+from ai.app.services.obd_engine_anomaly.trip_store import TripStore
+
+CFG = PreprocessConfig(sampling_hz=10.0, window_sec=2, stride_sec=0.5, min_coverage=0.8)  # T=20
+
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    """10Hz 30초 주행 2개 (두 번째 주행은 10~15초 구간 rpm 끊김)"""
+    raw = tmp_path / "raw" / "normal"
+    os.makedirs(raw)
+    paths = []
+    for i in range(2):
+        lines = ["Time,Engine RPM [RPM],Vehicle Speed Sensor [km/h]"]
+        for k in range(300):
+            t = 10 * 3600 + k / 10
+            gap = i == 1 and 100 <= k < 150
+            lines.append(f"{int(t // 3600):02d}:{int(t % 3600 // 60):02d}:{t % 60:06.3f},"
+                         f"{'' if gap else 800 + k},{k % 50}")
+        path = raw / f"2018-01-0{i + 1}_trip.csv"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        paths.append(str(path))
+
+    store = TripStore(str(tmp_path / "store"))
+    store.sync(paths, workers=1)
+    out_dir = str(tmp_path / "lstm_ae")
+    build_lstm_ae_dataset(store, out_dir, signals=["rpm", "speed"], cfg=CFG)
+    return out_dir
+
+
+class TestLstmPreprocess:
+    """build_lstm_ae_dataset / WindowDataset 단위 테스트"""
+
+    def test_window_index(self, dataset_dir):
+        ds = WindowDataset(dataset_dir, normalize=False)
+        assert ds.meta["T"] == 20 and ds.meta["F"] == 2
+        first, second = np.split(ds.starts, ds.offsets[1:-1])
+        assert first.tolist() == list(range(0, 281, 5))
+
+        # 두 번째 주행: 윈도우 안 rpm 실제 관측 비율 >= 0.8 인 시작 위치만 (직접 계산과 비교)
+        observed = np.ones(300, dtype=bool)
+        observed[100:150] = False
+        expected = [s for s in range(0, 281, 5) if observed[s:s + 20].mean() >= 0.8]
+        assert second.tolist() == expected
+        assert ds.meta["num_windows"] == len(first) + len(expected)
+        print("✅ 관측 비율 기준 윈도우 색인")
+
+    def test_dataset_views(self, dataset_dir):
+        raw = WindowDataset(dataset_dir, normalize=False)
+        window = raw.window(3)
+        assert window.shape == (20, 2) and not window.flags.writeable
+        assert isinstance(window.base, np.ndarray) and np.shares_memory(window, raw._view(0))
+        assert window[0, 0] == 800 + 15 and window[-1, 0] == 800 + 34
+
+        ds = WindowDataset(dataset_dir, shuffle=True, seed=7)
+        order = [ds._order.copy()]
+        ds.set_epoch(1)
+        order.append(ds._order.copy())
+        assert sorted(order[0].tolist()) == list(range(len(ds))) and not np.array_equal(*order)
+
+        x = ds[0]
+        assert tuple(x.shape) == (20, 2)
+        expected = ds.scaler.transform(np.asarray(ds.window(int(ds._order[0]))))
+        assert np.allclose(x.numpy(), expected)
+        batches = list(ds.iter_batches(batch_size=16))
+        assert sum(len(b) for b in batches) == len(ds) and batches[0].shape == (16, 20, 2)
+        print("✅ memmap 윈도우 view / 셔플 색인")
+
+    def test_meta_registry_version(self, dataset_dir):
+        spec = load_feature_spec(os.path.join(dataset_dir, "meta.json"))
+        scaler = ZScoreScaler.from_json(os.path.join(dataset_dir, "scaler.json"))
+        assert spec.registry_version == registry_version(["rpm", "speed"], scaler.mean, scaler.std)
+        check_scaler(spec, scaler)
+        print("✅ meta.json registry_version")
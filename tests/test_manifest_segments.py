@@ -0,0 +1,132 @@
+# tests/test_manifest_segments.py
+"""
+Append-only Segment Manifest 테스트 (로컬 S3 대역 사용)
+
+[테스트 케이스]
+1. 여러 워커가 동시에 추가해도 ID가 겹치지 않고 항목이 유실되지 않음
+2. 카테고리 조회는 해당 카테고리 세그먼트만 읽고, status 조회는 사이드카로 세그먼트를 건너뜀
+3. 컴팩션 후에도 같은 항목 (세그먼트 수만 감소)
+4. 기존 manifest.json 마이그레이션
+"""
+import io
+import json
+import os
+import sys
+import threading
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common.manifest_service import ManifestIdGenerator, SegmentedManifest
+
+
+class FakeS3:
+    """put/get/list(페이지네이션)/delete만 지원하는 메모리 S3"""
+
+    def __init__(self, page_size: int = 3):
+        self.objects = {}
+        self.page_size = page_size
+        self.gets = []
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body, **kwargs):
+        with self._lock:
+            self.objects[Key] = Body if isinstance(Body, bytes) else Body.encode("utf-8")
+
+    def get_object(self, Bucket, Key):
+        self.gets.append(Key)
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def list_objects_v2(self, Bucket, Prefix, ContinuationToken=None):
+        keys = sorted(k for k in self.objects if k.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + self.page_size]
+        truncated = start + self.page_size < len(keys)
+        response = {"Contents": [{"Key": k} for k in page], "IsTruncated": truncated}
+        if truncated:
+            response["NextContinuationToken"] = str(start + self.page_size)
+        return response
+
+    def delete_objects(self, Bucket, Delete):
+        with self._lock:
+            for obj in Delete["Objects"]:
+                self.objects.pop(obj["Key"], None)
+
+
+def make_manifest(s3, worker_id=1, batch_size=2):
+    return SegmentedManifest("visual", s3_client=s3, bucket="test", batch_size=batch_size,
+                             flush_interval_sec=0, id_generator=ManifestIdGenerator(worker_id))
+
+
+class TestSegmentedManifest:
+    """SegmentedManifest 단위 테스트"""
+
+    def test_concurrent_workers_no_lost_entries(self):
+        s3 = FakeS3()
+        workers = [make_manifest(s3, worker_id=i) for i in range(4)]
+
+        def run(manifest):
+            for i in range(25):
+                manifest.append({"category": "TIRE", "status": "NORMAL", "seq": i})
+            manifest.flush()
+
+        threads = [threading.Thread(target=run, args=(m,)) for m in workers]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        entries = make_manifest(s3).read(category="TIRE")
+        ids = [e["id"] for e in entries]
+        assert len(entries) == 100
+        assert ids == sorted(set(ids))
+        print("✅ 동시 추가 시 유실/충돌 없음")
+
+    def test_category_and_status_pruning(self):
+        s3 = FakeS3()
+        manifest = make_manifest(s3)
+        for _ in range(2):
+            manifest.append({"category": "DASHBOARD", "status": "NORMAL"})
+        for _ in range(2):
+            manifest.append({"category": "TIRE", "status": "NORMAL"})
+        manifest.append({"category": "TIRE", "status": "CRITICAL"})
+        manifest.append({"category": "TIRE", "status": "NORMAL"})
+
+        s3.gets.clear()
+        assert len(manifest.read(category="DASHBOARD")) == 2
+        assert all("/DASHBOARD/" in key for key in s3.gets)
+
+        s3.gets.clear()
+        critical = manifest.read(category="TIRE", status="CRITICAL")
+        assert [e["status"] for e in critical] == ["CRITICAL"]
+        segments_read = [key for key in s3.gets if key.endswith(".jsonl")]
+        assert len(segments_read) == 1  # NORMAL만 있는 세그먼트는 사이드카로 건너뜀
+        print("✅ 카테고리/상태별 세그먼트 선택")
+
+    def test_compaction_preserves_entries(self):
+        s3 = FakeS3()
+        manifest = make_manifest(s3)
+        for i in range(10):
+            manifest.append({"category": "EXTERIOR", "status": "WARNING", "seq": i})
+        before = manifest.read(category="EXTERIOR")
+        assert len(manifest.list_segments("EXTERIOR")) == 5
+
+        result = manifest.compact(target_entries=6)
+        assert result["entries"] == 10
+        assert len(manifest.list_segments("EXTERIOR")) == 2
+        assert manifest.read(category="EXTERIOR") == before
+        print("✅ 컴팩션 후 항목 유지")
+
+    def test_migrate_legacy(self):
+        s3 = FakeS3()
+        legacy = {"training_data": [
+            {"id": 1, "category": "DASHBOARD", "status": "WARNING"},
+            {"id": 2, "category": "TIRE", "status": "NORMAL"},
+        ]}
+        s3.put_object(Bucket="test", Key="legacy.json", Body=json.dumps(legacy))
+
+        manifest = make_manifest(s3, batch_size=100)
+        assert manifest.migrate_legacy("legacy.json") == 2
+        entries = manifest.read()
+        assert sorted(e["legacy_id"] for e in entries) == [1, 2]
+        assert len(manifest.read(category="TIRE")) == 1
+        print("✅ 기존 manifest 마이그레이션")
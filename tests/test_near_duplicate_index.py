@@ -0,0 +1,91 @@
+# tests/test_near_duplicate_index.py
+"""
+Active Learning 근접 중복 필터 테스트
+
+[테스트 케이스]
+1. pHash: 밝기만 살짝 다른 연사 사진은 가깝고, 다른 사진은 멂
+2. 근접 중복 후보 제외 / 등록 취소(release) 후 재허용
+3. 임베딩은 pHash가 어느 정도 가까울 때만 중복 근거로 사용
+4. 스냅샷 저장 → 재로드
+5. popcount: numpy<2(bitwise_count 없음) 대체 경로도 같은 해밍 거리
+"""
+import os
+import sys
+
+import numpy as np
+from PIL import Image, ImageEnhance
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common.near_duplicate_index import NearDuplicateIndex, compute_phash, popcount64
+
+
+def make_image(seed: int) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    pixels = rng.integers(0, 255, size=(12, 16, 3), dtype=np.uint8)
+    return Image.fromarray(pixels).resize((320, 240), Image.BILINEAR)
+
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+
+def unit(vector) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+class TestNearDuplicateIndex:
+    """NearDuplicateIndex 단위 테스트"""
+
+    def test_phash_distance(self):
+        base = make_image(0)
+        burst = ImageEnhance.Brightness(base).enhance(1.05)
+        assert hamming(compute_phash(base), compute_phash(burst)) <= 4
+        assert hamming(compute_phash(base), compute_phash(make_image(1))) > 12
+        print("✅ pHash 거리")
+
+    def test_admit_and_release(self):
+        index = NearDuplicateIndex(dim=4)
+        phash = f"{compute_phash(make_image(0)):016x}"
+
+        entry_id, reason = index.admit("dashboard", phash)
+        assert entry_id and reason == ""
+        assert index.admit("dashboard", phash) == (None, "phash")
+        assert index.admit("tire", phash)[0] is not None  # 도메인별 독립
+
+        index.release("dashboard", entry_id)
+        assert index.admit("dashboard", phash)[0] is not None
+        assert index.metrics()["saved_oracle_calls"] == 1
+        print("✅ 근접 중복 제외 / 등록 취소")
+
+    def test_embedding_requires_nearby_phash(self):
+        index = NearDuplicateIndex(dim=4)
+        emb = unit([1, 0.1, 0, 0])
+        index.admit("engine", f"{0:016x}", emb)
+
+        # pHash 8bit 차이(느슨한 반경 이내) + 임베딩 거의 동일 → 중복
+        assert index.admit("engine", f"{0xFF:016x}", unit([1, 0.11, 0, 0])) == (None, "embedding")
+        # 임베딩이 같아도 pHash가 멀면 다른 사진으로 취급
+        assert index.admit("engine", f"{(1 << 40) - 1:016x}", emb)[0] is not None
+        print("✅ 임베딩 단독 판정 없음")
+
+    def test_snapshot_roundtrip(self, tmp_path):
+        path = str(tmp_path / "dedup.npz")
+        index = NearDuplicateIndex(path=path, dim=4)
+        index.admit("exterior", f"{12345:016x}", unit([0, 1, 0, 0]))
+        index.save()
+
+        reloaded = NearDuplicateIndex(path=path, dim=4)
+        assert reloaded.size() == {"exterior": 1}
+        assert reloaded.admit("exterior", f"{12345:016x}") == (None, "phash")
+        print("✅ 스냅샷 재로드")
+
+    def test_popcount_fallback(self, monkeypatch):
+        rng = np.random.default_rng(0)
+        values = rng.integers(0, 2**63, size=(5, 7), dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        expected = [[hamming(int(v), 0) for v in row] for row in values]
+        assert popcount64(values).tolist() == expected
+        monkeypatch.delattr(np, "bitwise_count", raising=False)
+        assert popcount64(values).tolist() == expected
+        print("✅ popcount 대체 경로")
@@ -0,0 +1,145 @@
+# tests/test_obd_anomaly_service.py
+"""
+OBD 엔진 이상 탐지 (LSTM-AE) 서비스 테스트
+
+[테스트 케이스]
+1. data_quality 판정: 신호 누락 / 결측 과다 / 길이 부족 → 채점 제외, 결측 보간·패딩 → DEGRADED
+2. 배치 채점 결과가 윈도우별 단독 채점 결과와 일치 (TorchScript 엔진)
+3. 단일 윈도우 요청 형식 허용
+4. 스트리밍 채점: 링 버퍼 윈도우 점수 = 같은 구간 윈도우 채점 점수, stride 주기, LRU 퇴출, 요청 묶음 채점
+5. 스트리밍 슬롯 풀은 차량 수에 맞춰 확장, flush가 가져간 대기 요청은 모두 같은 flush 결과로 응답
+"""
+import asyncio
+import os
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.schemas.obd_engine_anomaly_schema import ObdAnomalyRequest, ObdWindow
+from ai.app.services.obd_engine_anomaly.feature_registry import FeatureSpec
+from ai.app.services.obd_engine_anomaly.lstm_ae_core import LSTMAEEngine, LSTMAutoencoder
+from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import (
+    ObdEngineAnomalyService, StreamingScorer
+)
+from ai.app.services.obd_engine_anomaly.scaler import ZScoreScaler
+
+SPEC = FeatureSpec(signals=("rpm", "speed", "coolant", "map"), sampling_hz=10.0, window_sec=6)  # T=60
+
+
+@pytest.fixture(scope="module")
+def service():
+    torch.manual_seed(0)
+    engine = LSTMAEEngine(LSTMAutoencoder(4), window_len=SPEC.window_len, max_batch=4)
+    scaler = ZScoreScaler([1500, 60, 85, 110], [500, 40, 15, 30], SPEC.signals)
+    return ObdEngineAnomalyService(engine, scaler, SPEC, threshold=0.5, model_version="test")
+
+
+def make_window(seed: int, length: int = 60, **overrides) -> ObdWindow:
+    rng = np.random.default_rng(seed)
+    signals = {
+        "rpm": (1500 + 300 * rng.standard_normal(length)).tolist(),
+        "speed": (60 + 10 * rng.standard_normal(length)).tolist(),
+        "coolant": (85 + rng.standard_normal(length)).tolist(),
+        "map": (110 + 5 * rng.standard_normal(length)).tolist(),
+    }
+    signals.update(overrides)
+    return ObdWindow(window_id=f"w{seed}", signals=signals)
+
+
+class TestObdEngineAnomalyService:
+    """ObdEngineAnomalyService 단위 테스트"""
+
+    def test_data_quality(self, service):
+        gappy = make_window(1).signals["rpm"]
+        gappy[:10] = [None] * 10
+        windows = [
+            make_window(0),
+            make_window(1, rpm=gappy),
+            make_window(2, length=57),
+            make_window(3, length=30),
+            ObdWindow(signals={"rpm": [1.0] * 60}),
+            make_window(5, coolant=[None] * 60),
+        ]
+        results = service.score_windows(windows)
+        statuses = [r.core.data_quality.status for r in results]
+        assert statuses == ["OK", "DEGRADED", "DEGRADED", "INSUFFICIENT", "INSUFFICIENT", "INSUFFICIENT"]
+        assert results[1].core.data_quality.reasons == ["filled_missing"]
+        assert results[2].core.data_quality.reasons == ["padded"]
+        assert results[4].core.data_quality.missing_signals == ["speed", "coolant", "map"]
+        assert all(r.core.score is None and r.core.top_signals == [] for r in results[3:])
+        assert results[0].core.top_signals[0].contribution >= results[0].core.top_signals[-1].contribution
+        print("✅ data_quality 판정")
+
+    @pytest.mark.asyncio
+    async def test_batch_matches_single(self, service):
+        windows = [make_window(i) for i in range(10)]
+        response = await service.predict(windows)
+        assert response.batch_size == 10 and service.engine.compiled
+        for window, result in zip(windows, response.results):
+            single = service.score_windows([window])[0]
+            assert result.window_id == window.window_id
+            assert result.core.score == pytest.approx(single.core.score, rel=1e-4)
+        print("✅ 배치 채점 = 단독 채점")
+
+    def test_single_window_request(self):
+        request = ObdAnomalyRequest.model_validate({"signals": {"rpm": [1.0]}, "window_id": "x"})
+        assert len(request.windows) == 1 and request.windows[0].window_id == "x"
+        print("✅ 단일 윈도우 요청")
+
+    @pytest.mark.asyncio
+    async def test_streaming_scorer(self, service):
+        rng = np.random.default_rng(0)
+        stream = (np.array([1500, 60, 85, 110]) + rng.standard_normal((100, 4)) * [300, 10, 1, 5]).astype(np.float32)
+        stream[70, 0] = np.nan
+        scorer = StreamingScorer(service, stride_sec=1.0, max_vehicles=2, idle_ttl_sec=0)
+
+        due = [scorer.push("car-a", stream[i:i + 5], now=i) for i in range(0, 100, 5)]
+        assert due[:11] == [False] * 11 and all(due[11:])  # 60개가 차기 전에는 채점하지 않음
+        [result] = scorer.score_due()
+        assert scorer.score_due() == [] and not scorer.push("car-a", stream[:5])  # stride(10개) 전
+
+        expected = stream[40:100].copy()
+        expected[30, 0] = expected[29, 0]  # 결측은 직전 값으로
+        window = ObdWindow(signals={s: expected[:, j].tolist() for j, s in enumerate(SPEC.signals)})
+        assert result.score == pytest.approx(service.score_windows([window])[0].core.score, rel=1e-4)
+        assert result.missing_ratio == pytest.approx(1 / 60, abs=1e-4)
+
+        scorer.push("car-b", stream[:60])
+        scorer.push("car-c", stream[:60])  # 슬롯 2개 → 가장 오래 갱신되지 않은 car-a 퇴출
+        assert scorer.num_vehicles == 2 and "car-a" not in scorer._slots and scorer.stats["evicted"] == 1
+
+        # 같은 시간창의 요청은 한 번의 forward로 채점
+        forwards = scorer.stats["forwards"]
+        scorer.score_due()
+        outcomes = await asyncio.gather(scorer.submit("car-b", stream[60:70]), scorer.submit("car-c", stream[60:70]))
+        assert [scored for scored, _ in outcomes] == [True, True]
+        assert scorer.stats["forwards"] == forwards + 2 and outcomes[0][1].score == outcomes[1][1].score
+        print("✅ 스트리밍 채점")
+
+    @pytest.mark.asyncio
+    async def test_streaming_capacity_and_waiters(self, service):
+        rng = np.random.default_rng(1)
+        stream = (np.array([1500, 60, 85, 110]) + rng.standard_normal((70, 4)) * [300, 10, 1, 5]).astype(np.float32)
+        scorer = StreamingScorer(service, stride_sec=1.0, max_vehicles=100, flush_wait_ms=1000)
+        assert scorer.capacity == 0 and scorer.memory_bytes == 0   # 차량이 오기 전에는 풀 없음
+
+        ids = [f"car-{i}" for i in range(70)]
+        scorer.push_many(ids, np.repeat(stream[None, :60], 70, axis=0))
+        assert scorer.capacity == 100 and scorer.num_vehicles == 70     # 64 → 100 (상한)
+        assert scorer.metrics()["capacity"] == 100
+        [first] = [r for r in scorer.score_due() if r.vehicle_id == "car-0"]
+
+        # flush 전에 등록된 대기는 그 flush가 채점 대상과 함께 가져가 응답 (None으로 끝나지 않음)
+        task = asyncio.ensure_future(scorer.submit("car-0", stream[60:70]))
+        await asyncio.sleep(0)
+        results, waiters = await asyncio.to_thread(scorer._score_due, True)
+        assert list(waiters) == ["car-0"] and [r.vehicle_id for r in results] == ["car-0"] and not scorer._waiters
+        waiters["car-0"][0].set_result(results[0])
+        scored, result = await task
+        assert scored and result.score is not None and result.score != first.score
+        scorer._flush_handle.cancel()
+        print("✅ 슬롯 풀 확장 / flush 대기 응답")
@@ -0,0 +1,180 @@
+# tests/test_obd_batch_scoring.py
+"""
+OBD 이상 탐지 배치 채점 테스트
+
+[테스트 케이스]
+1. COPY BINARY 해석: 고정 폭 행 → 차량 / 시각 / 값 배열, 형식 오류 검출
+2. 파티션 채점: 윈도우 끝 시각이 stride 배수, 진행 위치 이후 윈도우만 채점, 이상 윈도우만 anomaly_records 행,
+   같은 데이터로 다시 실행하면 채점 0건 (증분)
+3. (로컬 Postgres + TimescaleDB) obd_logs → anomaly_records 전체 흐름, 재실행 증분
+   OBD_BATCH_TEST_DSN이 없으면 건너뜀
+"""
+import json
+import os
+import struct
+import sys
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+import torch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.obd_engine_anomaly.batch_scoring import (
+    BatchJobConfig, BatchScoringJob, build_fetch_query, parse_copy_binary
+)
+from ai.app.services.obd_engine_anomaly.feature_registry import FeatureSpec
+from ai.app.services.obd_engine_anomaly.lstm_ae_core import LSTMAEEngine, LSTMAutoencoder
+from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import ObdEngineAnomalyService
+from ai.app.services.obd_engine_anomaly.scaler import ZScoreScaler
+
+SPEC = FeatureSpec(signals=("rpm", "speed", "coolant", "map"), sampling_hz=10.0, window_sec=6)  # T=60
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+PG_EPOCH_US = 946_684_800_000_000
+ORIGIN_US = 1_700_000_000 * 1_000_000   # stride(5초) 배수
+CAR_A = uuid.UUID("00000000-0000-0000-0000-00000000000a")
+CAR_B = uuid.UUID("00000000-0000-0000-0000-00000000000b")
+
+
+@pytest.fixture(scope="module")
+def service():
+    torch.manual_seed(0)
+    engine = LSTMAEEngine(LSTMAutoencoder(4), window_len=SPEC.window_len, max_batch=256)
+    scaler = ZScoreScaler([1500, 60, 85, 110], [500, 40, 15, 30], SPEC.signals)
+    return ObdEngineAnomalyService(engine, scaler, SPEC, threshold=5.0, model_version="test")
+
+
+def copy_binary(rows) -> bytes:
+    """(vehicle UUID, epoch µs, [값...]) → COPY BINARY 바이트"""
+    out = [b"PGCOPY\n\xff\r\n\x00", struct.pack(">II", 0, 0)]
+    for vehicle, t_us, values in rows:
+        out.append(struct.pack(">hi16siq", 2 + len(values), 16, vehicle.bytes, 8, t_us - PG_EPOCH_US))
+        out.extend(struct.pack(">id", 8, v) for v in values)
+    out.append(struct.pack(">h", -1))
+    return b"".join(out)
+
+
+def fleet_rows(seconds: float = 40.0, start_sec: float = 0.3):
+    """차량 A: 20~26초 rpm 급등, 차량 B: 정상 (10Hz, 둘 다 start_sec부터)"""
+    rng = np.random.default_rng(0)
+    rows = []
+    for vehicle in (CAR_A, CAR_B):
+        for k in range(int(seconds * 10)):
+            t = start_sec + k / 10
+            rpm = 20000.0 if vehicle == CAR_A and 20 <= t < 26 else 1500 + 100 * rng.standard_normal()
+            rows.append((vehicle, ORIGIN_US + int(round(t * 1e6)), [rpm, 60.0, 85.0, float("nan") if k % 10 == 0 else 110.0]))
+    return rows
+
+
+class TestBatchScoring:
+    """parse_copy_binary / BatchScoringJob.score_partition 단위 테스트"""
+
+    def test_parse_copy_binary(self):
+        rows = fleet_rows(seconds=1.0)
+        vehicles, times_us, values = parse_copy_binary(copy_binary(rows), 4)
+        assert vehicles.shape == (20,) and vehicles[0].tobytes() == CAR_A.bytes and vehicles[-1].tobytes() == CAR_B.bytes
+        assert times_us[0] == ORIGIN_US + 300_000 and np.all(np.diff(times_us[:10]) == 100_000)
+        assert values.dtype == np.float32 and np.isnan(values[0, 3]) and values[1, 3] == 110.0
+
+        with pytest.raises(ValueError):
+            parse_copy_binary(copy_binary(rows), 3)
+        with pytest.raises(ValueError):
+            parse_copy_binary(copy_binary(rows)[:-2], 4)
+
+        query = build_fetch_query(SPEC.signals)
+        assert "time_bucket($1::interval, l.time)" in query and "l.coolant_temp" in query
+        assert "(l.json_extra->>'imap_kpa')::float8" in query
+        print("✅ COPY BINARY 해석")
+
+    def test_score_partition(self, service):
+        job = BatchScoringJob(service, BatchJobConfig(dsn="", stride_sec=5.0))
+        buf = copy_binary(fleet_rows())
+        until_us = ORIGIN_US + 40 * 1_000_000
+        watermarks = {CAR_B: ORIGIN_US + 30 * 1_000_000}   # 차량 B는 30초까지 채점 완료
+
+        result = job.score_partition(buf, watermarks, ORIGIN_US, until_us)
+        ends = {v: t for v, t in result.watermarks.items()}
+        assert ends[CAR_A] == ends[CAR_B] == datetime.fromtimestamp(until_us / 1e6, tz=timezone.utc)
+
+        # 윈도우 끝: 10, 15, ..., 40초 (A: 7개), B: 35, 40초 (2개) — 0.3초 시작이라 5초 끝 윈도우는 없음
+        assert result.vehicles == 2 and result.windows == 7 + 2 and result.skipped == 0
+
+        # 이상: 급등 구간(20~26초)과 겹치는 A의 윈도우 (끝 25, 30초)
+        records = sorted(result.records, key=lambda r: r[1])
+        assert [r[0] for r in records] == [CAR_A, CAR_A]
+        assert [r[1] for r in records] == [
+            datetime.fromtimestamp(ORIGIN_US / 1e6 + s, tz=timezone.utc).replace(tzinfo=None) for s in (25, 30)
+        ]
+        snapshot = json.loads(records[0][4])
+        assert snapshot["score"] > 5.0 and snapshot["top_signals"][0]["signal"] == "rpm"
+        assert records[0][3] == "CRITICAL" and snapshot["model_version"] == "test"
+
+        # 재실행: 새 진행 위치 이후 윈도우 없음
+        marks = {v: int((t - EPOCH) / timedelta(microseconds=1)) for v, t in result.watermarks.items()}
+        again = job.score_partition(buf, marks, ORIGIN_US, until_us)
+        assert again.windows == 0 and not again.records and not again.watermarks
+        print("✅ 파티션 채점 / 증분")
+
+
+@pytest.mark.asyncio
+async def test_batch_job_postgres(service):
+    """로컬 Postgres(TimescaleDB) 대상 전체 흐름: OBD_BATCH_TEST_DSN=postgresql://... 로 실행"""
+    dsn = os.getenv("OBD_BATCH_TEST_DSN")
+    if not dsn:
+        pytest.skip("OBD_BATCH_TEST_DSN 미설정")
+    asyncpg = pytest.importorskip("asyncpg")
+
+    schema = f"obd_batch_test_{uuid.uuid4().hex[:8]}"
+    admin = await asyncpg.connect(dsn)
+    try:
+        await admin.execute("CREATE EXTENSION IF NOT EXISTS timescaledb")
+    except asyncpg.PostgresError as e:
+        await admin.close()
+        pytest.skip(f"TimescaleDB 확장 없음: {e}")
+    await admin.execute(f"""
+        CREATE SCHEMA {schema};
+        SET search_path TO {schema}, public;
+        CREATE TYPE risk_level AS ENUM ('LOW', 'MID', 'HIGH', 'CRITICAL');
+        CREATE TABLE vehicles (vehicles_id UUID PRIMARY KEY);
+        CREATE TABLE obd_logs (
+            time TIMESTAMPTZ NOT NULL, vehicles_id UUID NOT NULL REFERENCES vehicles (vehicles_id),
+            rpm FLOAT, speed FLOAT, voltage FLOAT, coolant_temp FLOAT, json_extra JSONB
+        );
+        SELECT create_hypertable('obd_logs', 'time');
+        CREATE TABLE anomaly_records (
+            anomaly_id UUID PRIMARY KEY DEFAULT gen_random_uuid(), vehicles_id UUID REFERENCES vehicles (vehicles_id),
+            recorded_at TIMESTAMP, anomaly_type VARCHAR(50), severity risk_level, snapshot_data JSONB
+        );
+    """)
+    try:
+        now = await admin.fetchval("SELECT NOW()")
+        await admin.executemany(f"INSERT INTO {schema}.vehicles VALUES ($1)", [(CAR_A,), (CAR_B,)])
+        records = []
+        for vehicle, t_us, (rpm, speed, coolant, imap) in fleet_rows(seconds=60.0):
+            t = now - timedelta(seconds=62) + timedelta(microseconds=t_us - ORIGIN_US)
+            records.append((t, vehicle, rpm, speed, coolant, None if np.isnan(imap) else json.dumps({"imap_kpa": imap})))
+        await admin.copy_records_to_table(
+            "obd_logs", schema_name=schema, records=records,
+            columns=["time", "vehicles_id", "rpm", "speed", "coolant_temp", "json_extra"],
+        )
+
+        pool = await asyncpg.create_pool(dsn, min_size=1, max_size=2, server_settings={"search_path": f"{schema},public"})
+        try:
+            job = BatchScoringJob(service, BatchJobConfig(dsn=dsn, lookback_min=5, partitions=4, concurrency=2))
+            first = await job.run(pool)
+            second = await job.run(pool)
+        finally:
+            await pool.close()
+
+        assert first["vehicles"] == 2 and first["windows"] > 0 and first["anomalies"] >= 1
+        assert second["windows"] == 0 and second["anomalies"] == 0
+        stored = await admin.fetch(f"SELECT vehicles_id, severity, snapshot_data FROM {schema}.anomaly_records")
+        assert len(stored) == first["anomalies"] and {r["vehicles_id"] for r in stored} == {CAR_A}
+        marks = await admin.fetchval(f"SELECT count(*) FROM {schema}.obd_anomaly_watermarks")
+        assert marks == 2
+        print("✅ Postgres 배치 채점 / 재실행 증분")
+    finally:
+        await admin.execute(f"DROP SCHEMA {schema} CASCADE")
+        await admin.close()
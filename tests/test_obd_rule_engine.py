@@ -0,0 +1,178 @@
+# tests/test_obd_rule_engine.py
+"""
+OBD 확장 진단 규칙 엔진 테스트
+
+[테스트 케이스]
+1. 지속 시간 + 전제 조건(when): 조건이 연속으로 유지된 구간만 판정
+2. 파생 시계열: spread(바퀴 속도 편차), delta(급제동), rolling_std
+3. 필요한 신호가 없는 규칙은 건너뜀 → 확장 전체가 건너뛰어지면 SKIPPED
+4. 기본 규칙(extensions/*_rules.py) 컴파일 + 서비스 결과의 extensions 채움
+5. 짧은 윈도우(앞쪽 NaN)는 조건을 만족하지 않음, 10Hz가 아닌 윈도우는 규칙 주기로 리샘플
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.schemas.obd_engine_anomaly_schema import ObdWindow
+from ai.app.services.obd_engine_anomaly.extensions import EXTENSION_RULES
+from ai.app.services.obd_engine_anomaly.extensions.rule_engine import RuleEngine
+from ai.app.services.obd_engine_anomaly.extensions.tire_rules import TIRE_PRESSURES
+from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import extension_windows
+
+HZ = 10.0
+T = 100  # 10초
+
+
+def make_windows(n: int, **signals) -> np.ndarray:
+    """신호명 → (n, T) 배열 (스칼라는 상수)"""
+    names = list(signals)
+    out = np.empty((n, T, len(names)), dtype=np.float32)
+    for j, name in enumerate(names):
+        out[:, :, j] = signals[name]
+    return out, names
+
+
+class TestRuleEngine:
+    """RuleEngine 단위 테스트"""
+
+    def test_duration_and_when(self):
+        engine = RuleEngine({"idle": [{
+            "id": "rpm_high", "signals": ["rpm"], "op": ">", "value": 1000, "duration_sec": 3,
+            "when": [{"signal": "speed", "op": "<", "value": 1}],
+        }]}, sampling_hz=HZ)
+
+        rpm = np.full((4, T), 800.0)
+        rpm[0, 10:50] = 1200    # 4초 연속 → 발생
+        rpm[1, 10:25] = 1200    # 1.5초씩 두 번 → 미발생
+        rpm[1, 30:45] = 1200
+        rpm[2, 10:50] = 1200    # 주행 중 → 전제 조건 불충족
+        rpm[3, :] = 1200        # 끝까지 유지 (10초)
+        speed = np.zeros((4, T))
+        speed[2] = 30
+        windows, names = make_windows(4, rpm=rpm, speed=speed)
+
+        result = engine.evaluate(windows, names)
+        assert result["fired"][:, 0].tolist() == [True, False, False, True]
+        assert np.allclose(result["longest_sec"][:, 0], [4.0, 1.5, 0.0, 10.0])
+
+        summary = engine.summarize(result, 0)["idle"]
+        assert summary["status"] == "WARNING"
+        assert summary["triggered"][0]["rule"] == "rpm_high" and summary["triggered"][0]["duration_sec"] == 4.0
+        print("✅ 지속 시간 + 전제 조건")
+
+    def test_derived_series(self):
+        engine = RuleEngine({
+            "brake": [
+                {"id": "lock", "signals": ["fl", "fr", "rl", "rr"], "reduce": "spread",
+                 "op": ">", "value": 15, "duration_sec": 1},
+                {"id": "spike", "signals": ["pressure"], "transform": "delta", "window_sec": 0.5,
+                 "op": ">", "value": 6000, "duration_sec": 0.1, "severity": "INFO"},
+            ],
+            "idle": [
+                {"id": "unstable", "signals": ["rpm"], "transform": "rolling_std", "window_sec": 2,
+                 "op": ">", "value": 80, "duration_sec": 1},
+            ],
+        }, sampling_hz=HZ)
+
+        wheel = np.full((2, T), 50.0)
+        fl = wheel.copy()
+        fl[0, 20:35] = 20       # 1.5초 동안 한 바퀴만 느림
+        pressure = np.zeros((2, T))
+        pressure[0, 50:] = 8000  # 순간 상승
+        pressure[1] = np.linspace(0, 8000, T)  # 천천히 상승 (0.5초에 400kPa)
+        rpm = np.full((2, T), 800.0)
+        rpm[0, ::2] = 1000      # 샘플마다 ±100 진동 → 표준편차 100
+        windows, names = make_windows(2, fl=fl, fr=wheel, rl=wheel, rr=wheel, pressure=pressure, rpm=rpm)
+
+        result = engine.evaluate(windows, names)
+        assert result["fired"].tolist() == [[True, True, True], [False, False, False]]
+        assert np.isclose(result["longest_sec"][0, 0], 1.5)
+
+        # rolling_std: 직접 계산과 비교
+        rolled = RuleEngine._rolling(windows[:, :, [names.index("rpm")]], 20, "rolling_std")[0, :, 0]
+        expected = np.array([rpm[0, k - 19:k + 1].std() for k in range(19, T)])
+        assert np.isnan(rolled[:19]).all() and np.allclose(rolled[19:], expected, atol=1e-2)
+
+        summary = engine.summarize(result, 0)
+        assert summary["brake"]["status"] == "WARNING" and len(summary["brake"]["triggered"]) == 2
+        assert engine.summarize(result, 1)["brake"]["status"] == "NORMAL"
+        print("✅ spread / delta / rolling_std 파생 시계열")
+
+    def test_missing_signal_skipped(self):
+        engine = RuleEngine({
+            "tire": [{"id": "low", "signals": ["tire_pressure_fl_kpa"], "op": "<", "value": 200}],
+            "idle": [{"id": "stop", "signals": ["speed"], "op": "<", "value": 1, "duration_sec": 1}],
+        }, sampling_hz=HZ)
+        speed = np.zeros((2, T))
+        speed[1] = np.nan       # 두 번째 윈도우는 속도 신호 전체 결측
+        windows, names = make_windows(2, speed=speed)
+
+        result = engine.evaluate(windows, names)
+        assert result["available"].tolist() == [[False, True], [False, False]]
+        first, second = engine.summarize(result, 0), engine.summarize(result, 1)
+        assert first["tire"] == {"status": "SKIPPED", "triggered": [], "skipped_rules": ["low"]}
+        assert first["idle"]["status"] == "WARNING"
+        assert second["idle"]["status"] == "SKIPPED"
+        print("✅ 신호 누락 규칙 건너뜀 → SKIPPED")
+
+    def test_invalid_rule(self):
+        with pytest.raises(ValueError):
+            RuleEngine({"x": [{"id": "a", "signals": ["rpm", "speed"], "op": ">", "value": 1}]})
+        with pytest.raises(ValueError):
+            RuleEngine({"x": [{"id": "a", "signals": ["rpm"], "op": "!=", "value": 1}]})
+        print("✅ 잘못된 규칙 컴파일 오류")
+
+    def test_default_rules(self):
+        engine = RuleEngine.from_extensions(sampling_hz=HZ)
+        assert set(engine.extensions) == set(EXTENSION_RULES) == {"electrical", "brake", "tire", "idle"}
+
+        # 정차 공회전 60초 (rpm/speed/coolant만 수집) → idle만 평가, 나머지 확장은 SKIPPED
+        window = ObdWindow(window_id="idle", signals={
+            "rpm": [750.0] * 600, "speed": [0.0] * 600, "coolant": [88.0] * 600,
+        })
+        signals = engine.required_signals
+        result = engine.evaluate(extension_windows([window], signals, 600, HZ), signals)
+        summary = engine.summarize(result, 0)
+        assert summary["idle"]["status"] == "INFO"
+        assert [t["rule"] for t in summary["idle"]["triggered"]] == ["long_idle"]
+        assert all(summary[ext]["status"] == "SKIPPED" for ext in ("electrical", "brake", "tire"))
+        print("✅ 기본 규칙 평가")
+
+    def test_short_and_resampled_windows(self):
+        engine = RuleEngine.from_extensions(sampling_hz=HZ)
+        signals = engine.required_signals
+
+        # 3초짜리 170 kPa 윈도우: 앞쪽 57초는 NaN → 10초 지속 조건(pressure_low) 미충족
+        short = ObdWindow(window_id="short", signals={name: [170.0] * 30 for name in TIRE_PRESSURES})
+        x = extension_windows([short], signals, 600, HZ)
+        assert np.isnan(x[0, :570]).all() and (x[0, 570:, signals.index(TIRE_PRESSURES[0])] == 170.0).all()
+        summary = engine.summarize(engine.evaluate(x, signals), 0)
+        assert summary["tire"]["status"] == "NORMAL"
+        assert "pressure_low" not in summary["tire"]["skipped_rules"]
+
+        # 같은 값이 15초면 판정
+        long = ObdWindow(window_id="long", signals={name: [170.0] * 150 for name in TIRE_PRESSURES})
+        summary = engine.summarize(engine.evaluate(extension_windows([long], signals, 600, HZ), signals), 0)
+        assert "pressure_low" in [t["rule"] for t in summary["tire"]["triggered"]]
+
+        # 1Hz 정차 공회전 60초 → 10Hz 600샘플로 리샘플되어 long_idle(50초) 판정
+        slow = ObdWindow(window_id="slow", sampling_hz=1.0, signals={
+            "rpm": [750.0] * 60, "speed": [0.0] * 60, "coolant": [88.0] * 60,
+        })
+        x = extension_windows([slow], signals, 600, HZ)
+        assert not np.isnan(x[0, :, signals.index("vehicle_speed_kmh")]).any()
+        summary = engine.summarize(engine.evaluate(x, signals), 0)
+        assert [t["rule"] for t in summary["idle"]["triggered"]] == ["long_idle"]
+        print("✅ 짧은 윈도우 NaN 패딩 / 비 10Hz 리샘플")
+
+    def test_rolling_with_padding(self):
+        x = np.full((1, T, 1), np.nan, dtype=np.float32)
+        x[0, 40:, 0] = np.arange(60, dtype=np.float32)
+        mean = RuleEngine._rolling(x, 10, "rolling_mean")[0, :, 0]
+        assert np.isnan(mean[:49]).all()                      # 구간에 패딩이 섞이면 NaN
+        assert np.allclose(mean[49:], np.arange(4.5, 55.5))   # 패딩 이후는 NaN에 오염되지 않음
+        print("✅ 패딩 구간 rolling")
@@ -0,0 +1,137 @@
+# tests/test_obd_scaler.py
+"""
+OBD 정규화 통계 / 모델 fold 테스트
+
+[테스트 케이스]
+1. RunningStats: 구간별 Welford 누적 + Chan 병합 = 전체 데이터 평균/표준편차 (NaN 제외)
+2. fit_trip_store: 주행 저장소 스트리밍 fit (순차 = 병렬), scaler.json 저장/로드 + feature_version 검사
+   학습 때 통계(meta.json registry_version)와 다른 scaler는 로드 거부, fit_scaler는 학습된 scaler.json 덮어쓰기 거부
+3. 정규화 fold: 원본 단위 입력 엔진 점수 = 정규화 입력 엔진 점수, 서비스 결과 동일
+"""
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+import torch
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.schemas.obd_engine_anomaly_schema import ObdWindow
+from ai.app.services.obd_engine_anomaly.feature_registry import FeatureSpec, check_scaler, feature_version, registry_version
+from ai.app.services.obd_engine_anomaly.lstm_ae_core import LSTMAEEngine, LSTMAutoencoder
+from ai.app.services.obd_engine_anomaly.obd_engine_anomaly_service import ObdEngineAnomalyService
+from ai.app.services.obd_engine_anomaly.scaler import RunningStats, ZScoreScaler, fit_trip_store
+from ai.app.services.obd_engine_anomaly.trip_store import TripStore
+from ai.scripts.obd_engine.fit_scaler import check_overwrite
+
+SIGNALS = ["rpm", "speed", "coolant"]
+
+
+@pytest.fixture
+def store(tmp_path):
+    """주행 3개 (마지막 주행은 speed 신호 없음)"""
+    rng = np.random.default_rng(0)
+    raw = tmp_path / "raw" / "normal"
+    os.makedirs(raw)
+    paths = []
+    for i in range(3):
+        header = "Time,Engine RPM [RPM],Engine Coolant Temperature [°C]" + (",Vehicle Speed Sensor [km/h]" if i < 2 else "")
+        lines = [header]
+        for k in range(500):
+            t = 8 * 3600 + k / 10
+            rpm = "" if k % 7 == 0 else f"{1000 * (i + 1) + 200 * rng.standard_normal():.3f}"
+            row = f"{int(t // 3600):02d}:{int(t % 3600 // 60):02d}:{t % 60:06.3f},{rpm},{80 + i + rng.standard_normal():.3f}"
+            lines.append(row + (f",{50 * rng.random():.3f}" if i < 2 else ""))
+        path = raw / f"2018-02-0{i + 1}_trip.csv"
+        path.write_text("\n".join(lines), encoding="utf-8")
+        paths.append(str(path))
+    store = TripStore(str(tmp_path / "store"))
+    store.sync(paths, workers=1)
+    return store
+
+
+class TestScaler:
+    """RunningStats / fit_trip_store / fold_normalization 단위 테스트"""
+
+    def test_running_stats_merge(self):
+        rng = np.random.default_rng(1)
+        x = (1e4 + rng.standard_normal((1000, 3)) * [1.0, 50.0, 0.01])  # 평균이 큰 신호 (sumsq 방식은 상쇄 오차)
+        x[rng.random(x.shape) < 0.1] = np.nan
+
+        parts = [RunningStats(3).update(chunk) for chunk in np.array_split(x, 7)]
+        stats = RunningStats(3)
+        for part in parts:
+            stats.merge(part)
+        assert stats.count.tolist() == (~np.isnan(x)).sum(axis=0).tolist()
+        assert np.allclose(stats.mean, np.nanmean(x, axis=0), rtol=0, atol=1e-9)
+        assert np.allclose(stats.std, np.nanstd(x, axis=0), rtol=1e-9)
+
+        restored = RunningStats.from_scaler(stats.to_scaler(SIGNALS))
+        assert np.allclose(restored.std, stats.std, rtol=1e-6)
+        print("✅ Welford 누적 + Chan 병합")
+
+    def test_fit_trip_store(self, store, tmp_path):
+        sequential = fit_trip_store(store, SIGNALS, workers=1, chunk_rows=64)
+        parallel = fit_trip_store(store, SIGNALS, workers=2)
+
+        values = [store.load(e["trip_id"], ["rpm", "coolant"]).values for e in store.trips()]
+        speed = [store.load(e["trip_id"], ["speed"]).values for e in store.trips()[:2]]
+        expected = np.concatenate(values).astype(np.float64)
+        assert sequential.count.tolist() == [3 * (500 - 72), 1000, 1500]  # rpm: 7번째 샘플마다 결측
+        assert np.allclose(sequential.mean[[0, 2]], np.nanmean(expected, axis=0), rtol=1e-6)
+        assert np.allclose(sequential.std[[0, 2]], np.nanstd(expected, axis=0), rtol=1e-6)
+        assert np.isclose(sequential.mean[1], np.concatenate(speed).astype(np.float64).mean(), rtol=1e-6)
+        assert np.array_equal(sequential.count, parallel.count)
+        assert np.allclose(sequential.mean, parallel.mean) and np.allclose(sequential.std, parallel.std)
+
+        path = sequential.to_json(str(tmp_path / "scaler.json"))
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        assert data["feature_set"] == "common" and data["feature_version"] == feature_version(SIGNALS)
+        loaded = ZScoreScaler.from_json(path)
+        check_scaler(FeatureSpec(signals=tuple(SIGNALS)), loaded)
+
+        # 학습 때 통계와 다른 scaler → 로드 거부 / fit_scaler 덮어쓰기 거부
+        trained = registry_version(SIGNALS, loaded.mean, loaded.std)
+        check_scaler(FeatureSpec(signals=tuple(SIGNALS), registry_version=trained), loaded)
+        other = ZScoreScaler(loaded.mean + 1.0, loaded.std, SIGNALS)
+        with pytest.raises(ValueError):
+            check_scaler(FeatureSpec(signals=tuple(SIGNALS), registry_version=trained), other)
+        with open(tmp_path / "meta.json", "w", encoding="utf-8") as f:
+            json.dump({"signals": SIGNALS, "registry_version": trained}, f)
+        check_overwrite(path, loaded)
+        with pytest.raises(ValueError):
+            check_overwrite(path, other)
+        check_overwrite(str(tmp_path / "scaler_trip_store.json"), other)
+
+        loaded.feature_version = "stale"
+        with pytest.raises(ValueError):
+            check_scaler(FeatureSpec(signals=tuple(SIGNALS)), loaded)
+        print("✅ 주행 저장소 스트리밍 fit / scaler.json 버전")
+
+    def test_fused_engine(self):
+        torch.manual_seed(0)
+        spec = FeatureSpec(signals=("rpm", "speed", "coolant", "map"), sampling_hz=10.0, window_sec=6)
+        scaler = ZScoreScaler([1500, 60, 85, 110], [500, 40, 15, 30], spec.signals)
+        model = LSTMAutoencoder(4)
+        plain = LSTMAEEngine(model, window_len=spec.window_len)
+        fused = LSTMAEEngine(model, window_len=spec.window_len, scaler=scaler)
+
+        rng = np.random.default_rng(2)
+        raw = (scaler.mean + scaler.std * rng.standard_normal((8, spec.window_len, 4))).astype(np.float32)
+        expected, expected_signals = plain.score(scaler.transform(raw))
+        scores, signal_errors = fused.score(raw)
+        assert fused.fused and np.allclose(scores, expected, rtol=1e-4)
+        assert np.allclose(signal_errors, expected_signals, rtol=1e-4)
+
+        # 서비스: 정규화를 합친 엔진이면 입력을 그대로 전달
+        windows = [ObdWindow(window_id=str(i), signals={s: raw[i, :, j].tolist() for j, s in enumerate(spec.signals)})
+                   for i in range(8)]
+        a = ObdEngineAnomalyService(plain, scaler, spec).score_windows(windows)
+        b = ObdEngineAnomalyService(fused, scaler, spec).score_windows(windows)
+        assert np.allclose([r.core.score for r in a], [r.core.score for r in b], rtol=1e-4)
+        with pytest.raises(ValueError):
+            ObdEngineAnomalyService(fused, ZScoreScaler([0, 0, 0, 0], [1, 1, 1, 1], spec.signals), spec)
+        print("✅ 정규화 fold (원본 단위 입력)")
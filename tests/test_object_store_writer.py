@@ -0,0 +1,110 @@
+# tests/test_object_store_writer.py
+"""
+Active Learning 비동기 업로더 테스트
+
+[테스트 케이스]
+1. enqueue 후 flush 시 업로드 완료 (같은 Key는 마지막 값만)
+2. S3 장애 시 디스크 저널 기록 → 복구 후 재업로드
+3. 여러 스레드가 동시에 재업로드해도 저널 항목은 한 번만 큐에 들어감, 남은 .replaying 파일 복구
+"""
+import json
+import os
+import sys
+import threading
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common.object_store_writer import CLAIM_SUFFIX, ObjectStoreWriter, PendingObject
+
+
+class FlakyS3:
+    """down=True인 동안 put_object 실패"""
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = 0
+        self.down = False
+        self._lock = threading.Lock()
+
+    def put_object(self, Bucket, Key, Body, ContentType):
+        with self._lock:
+            self.puts += 1
+            if self.down:
+                raise ConnectionError("S3 unavailable")
+            self.objects[Key] = Body
+
+
+def make_writer(s3, tmp_path):
+    return ObjectStoreWriter(s3_client=s3, bucket="test", workers=1, batch_size=10, batch_wait_sec=0.05,
+                             max_retries=1, backoff_base_sec=0.01, journal_dir=str(tmp_path / "journal"))
+
+
+class TestObjectStoreWriter:
+    """ObjectStoreWriter 단위 테스트"""
+
+    def test_enqueue_and_coalesce(self, tmp_path):
+        s3 = FlakyS3()
+        writer = make_writer(s3, tmp_path)
+        writer.enqueue("labels/a.json", {"v": 1})
+        writer.enqueue("labels/a.json", {"v": 2})
+        writer.enqueue("labels/b.json", {"v": 3})
+        assert writer.flush(timeout=5)
+
+        assert json.loads(s3.objects["labels/a.json"]) == {"v": 2}
+        assert "labels/b.json" in s3.objects
+        metrics = writer.metrics()
+        assert metrics["queue_depth"] == 0
+        assert metrics["uploaded"] + metrics["coalesced"] == 3
+        writer.close()
+        print("✅ enqueue / 배치 병합")
+
+    def test_journal_and_replay(self, tmp_path):
+        s3 = FlakyS3()
+        s3.down = True
+        writer = make_writer(s3, tmp_path)
+        writer.enqueue("labels/c.json", {"v": 1})
+        assert writer.flush(timeout=5)
+        assert s3.objects == {}
+        assert writer.metrics()["journal_files"] == 1
+
+        s3.down = False
+        assert writer.replay_journal() == 1
+        assert writer.flush(timeout=5)
+        assert "labels/c.json" in s3.objects
+        assert writer.metrics()["journal_files"] == 0
+        writer.close()
+        print("✅ 장애 시 저널 기록 후 재업로드")
+
+    def test_concurrent_replay(self, tmp_path):
+        s3 = FlakyS3()
+        writer = make_writer(s3, tmp_path)
+        for i in range(20):
+            writer._write_journal([PendingObject(f"labels/{i}.json", b"{}", "application/json")])
+        assert len(writer.journal_files()) == 20
+
+        # 워커 없이 여러 스레드가 동시에 재업로드 → 항목당 한 번만 큐에 들어감
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(writer.replay_journal())) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        replayed = sum(results) + writer.replay_journal()
+        assert replayed == 20 and writer.queue.qsize() == 20
+        assert sorted(i.key for i in writer.queue.queue) == sorted(f"labels/{i}.json" for i in range(20))
+        assert os.listdir(writer.journal_dir) == []
+
+        # 재업로드 도중 종료되어 남은 선점 파일 → 시작 시 첫 워커가 되돌려 업로드
+        writer2 = make_writer(s3, tmp_path / "second")
+        writer2._write_journal([PendingObject("labels/left.json", b"{}", "application/json")])
+        path = writer2.journal_files()[0]
+        os.rename(path, path + CLAIM_SUFFIX)
+        writer2.start()
+        deadline = time.time() + 5
+        while writer2.metrics()["replayed"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert writer2.flush(timeout=5)
+        assert "labels/left.json" in s3.objects and os.listdir(writer2.journal_dir) == []
+        writer2.close()
+        print("✅ 동시 재업로드 중복 없음 / 선점 파일 복구")
@@ -0,0 +1,103 @@
+# tests/test_request_context.py
+"""
+요청 단위 LLM 호출 중복 제거 (memoize_in_request) 테스트
+
+[테스트 케이스]
+1. 같은 요청 안의 동시 중복 호출 → in-flight Task 하나를 공유 (결과는 호출자별 사본)
+2. 서로 다른 요청 사이에는 공유하지 않음, 컨텍스트 밖에서는 매번 원래 함수 실행
+3. 예외로 끝난 호출은 테이블에서 제거 → 같은 요청 안에서 재시도 가능
+4. ignore 인자는 키에서 제외, 위치/키워드 인자 차이는 같은 키
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common.request_context import llm_request_scope, memoize_in_request
+
+
+class FakeLLM:
+    """호출 횟수를 세고, 응답 전에 잠깐 대기하는 가짜 LLM 함수 모음"""
+
+    def __init__(self):
+        self.calls = 0
+        self.fail_next = False
+
+        @memoize_in_request
+        async def label(s3_url: str, domain: str = "engine"):
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            if self.fail_next:
+                self.fail_next = False
+                raise RuntimeError("LLM failure")
+            return {"url": s3_url, "domain": domain, "labels": []}
+
+        @memoize_in_request(ignore=("image",))
+        async def describe(s3_url: str, image=None):
+            self.calls += 1
+            await asyncio.sleep(0.01)
+            return {"url": s3_url}
+
+        self.label = label
+        self.describe = describe
+
+
+class TestMemoizeInRequest:
+    """memoize_in_request / llm_request_scope 단위 테스트"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_duplicates_share_one_call(self):
+        llm = FakeLLM()
+        async with llm_request_scope("visual") as ctx:
+            first, second, third = await asyncio.gather(
+                llm.label("s3://b/a.jpg", "engine"),
+                llm.label(" s3://b/a.jpg ", domain="engine"),   # 공백/키워드 차이는 같은 키
+                llm.label("s3://b/a.jpg"),                       # 기본값 생략도 같은 키
+            )
+        assert llm.calls == 1
+        assert first == second == third
+        first["labels"].append("mutated")
+        assert second["labels"] == []                            # 호출자별 사본
+        assert ctx.stats()["per_function"]["label"] == {"issued": 1, "deduped": 2}
+        print("✅ 동시 중복 호출 공유")
+
+    @pytest.mark.asyncio
+    async def test_no_sharing_across_requests(self):
+        llm = FakeLLM()
+
+        async def one_request():
+            async with llm_request_scope("visual"):
+                return await llm.label("s3://b/a.jpg")
+
+        await asyncio.gather(one_request(), one_request())
+        assert llm.calls == 2
+
+        await llm.label("s3://b/a.jpg")
+        await llm.label("s3://b/a.jpg")
+        assert llm.calls == 4                                    # 컨텍스트 밖: 메모이제이션 없음
+        print("✅ 요청 간 비공유")
+
+    @pytest.mark.asyncio
+    async def test_failed_call_can_retry(self):
+        llm = FakeLLM()
+        llm.fail_next = True
+        async with llm_request_scope("visual"):
+            results = await asyncio.gather(llm.label("s3://b/a.jpg"), llm.label("s3://b/a.jpg"),
+                                           return_exceptions=True)
+            assert all(isinstance(r, RuntimeError) for r in results) and llm.calls == 1
+            assert (await llm.label("s3://b/a.jpg"))["url"] == "s3://b/a.jpg"
+        assert llm.calls == 2
+        print("✅ 실패 호출 재시도")
+
+    @pytest.mark.asyncio
+    async def test_ignored_arguments(self):
+        llm = FakeLLM()
+        async with llm_request_scope("visual"):
+            await asyncio.gather(llm.describe("s3://b/a.jpg", image=object()),
+                                 llm.describe("s3://b/a.jpg", image=object()))
+            await llm.describe("s3://b/other.jpg")
+        assert llm.calls == 2
+        print("✅ ignore 인자")
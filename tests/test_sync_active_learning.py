@@ -0,0 +1,204 @@
+# tests/test_sync_active_learning.py
+"""
+Active Learning 동기화 엔진 테스트 (로컬 S3 대역 사용)
+
+[테스트 케이스]
+1. 페이지가 여러 개여도 전체 정답지를 동기화 (YOLO 라벨 생성)
+2. 재실행 시 ETag가 바뀐 객체만 다시 받음
+3. exterior: 프로세스 풀 변환 + COCO 장부에 이어 붙이기 (실제 이미지 크기 사용)
+4. 다시 동기화된 파일은 이전 라벨을 교체 (COCO annotation / audio labels.csv 행 중복 없음)
+5. 중단 후 재실행: 장부에 기록된 항목만 체크포인트에 남고, 나머지는 다음 실행에서 처리
+"""
+import io
+import json
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.scripts.utils import sync_active_learning
+from ai.scripts.utils.sync_active_learning import ActiveLearningSyncer
+
+BUCKET = "test-bucket"
+
+
+class FakeS3:
+    """Paginator / get_object / download_file만 지원하는 메모리 S3"""
+
+    def __init__(self, page_size: int = 3):
+        self.objects = {}
+        self.etags = {}
+        self.page_size = page_size
+        self.get_calls = 0
+
+    def put(self, key: str, body: bytes, etag: str = "v1"):
+        self.objects[key] = body
+        self.etags[key] = etag
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                keys = sorted(k for k in fake.objects if k.startswith(Prefix))
+                for i in range(0, len(keys), fake.page_size):
+                    yield {"Contents": [{"Key": k, "ETag": fake.etags[k]} for k in keys[i:i + fake.page_size]]}
+
+        return Paginator()
+
+    def get_object(self, Bucket, Key):
+        self.get_calls += 1
+        return {"Body": io.BytesIO(self.objects[Key])}
+
+    def download_file(self, Bucket, Key, Filename):
+        with open(Filename, "wb") as f:
+            f.write(self.objects[Key])
+
+
+def image_bytes(width: int, height: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+def put_label(s3: FakeS3, domain: str, file_id: str, labels, etag: str = "v1", size=(64, 48)):
+    image_key = f"uploads/{file_id}.jpg"
+    s3.put(image_key, image_bytes(*size))
+    label = {"source_url": f"s3://{BUCKET}/{image_key}", "status": "WARNING", "labels": labels}
+    s3.put(f"dataset/llm_confirmed/visual/{domain}/{file_id}.json", json.dumps(label).encode(), etag)
+
+
+class TestActiveLearningSyncer:
+    """ActiveLearningSyncer 단위 테스트"""
+
+    def test_paginated_sync_and_resume(self, tmp_path):
+        s3 = FakeS3(page_size=3)
+        for i in range(7):
+            put_label(s3, "engine", f"img{i}", [{"class": "Battery", "bbox": [0.5, 0.5, 0.2, 0.2]}])
+        put_label(s3, "engine", "unknown", [{"class": "Flux_Capacitor", "bbox": [0.5, 0.5, 0.2, 0.2]}])
+
+        syncer = ActiveLearningSyncer("engine", s3_client=s3, bucket=BUCKET, data_root=tmp_path, process_workers=0)
+        summary = syncer.run()
+        syncer.close()
+        assert summary["listed"] == 8 and summary["synced"] == 8
+        assert summary["new_classes"] == ["Flux_Capacitor"]
+        assert (tmp_path / "engine" / "retrain" / "labels" / "img0.txt").read_text() == "1 0.5 0.5 0.2 0.2"
+
+        # 재실행: 변경 없음 → 전부 건너뜀 / ETag 변경 1건만 처리
+        put_label(s3, "engine", "img3", [{"class": "Radiator", "bbox": [0.4, 0.4, 0.1, 0.1]}], etag="v2")
+        s3.get_calls = 0
+        syncer = ActiveLearningSyncer("engine", s3_client=s3, bucket=BUCKET, data_root=tmp_path, process_workers=0)
+        summary = syncer.run()
+        syncer.close()
+        assert summary["skipped_unchanged"] == 7 and summary["synced"] == 1
+        assert s3.get_calls == 1
+        assert (tmp_path / "engine" / "retrain" / "labels" / "img3.txt").read_text().startswith("13 ")
+        print("✅ 페이지네이션 + ETag 체크포인트")
+
+    def test_exterior_coco_with_process_pool(self, tmp_path):
+        s3 = FakeS3()
+        put_label(s3, "exterior", "car1", [{"class": "dent", "bbox": [0.5, 0.5, 0.5, 0.5]}], size=(200, 100))
+        syncer = ActiveLearningSyncer("exterior", s3_client=s3, bucket=BUCKET, data_root=tmp_path, process_workers=2)
+        assert syncer.run()["synced"] == 1
+        syncer.close()
+
+        put_label(s3, "exterior", "car2", [{"class": "scratch", "bbox": [0.5, 0.5, 0.1, 0.1]}])
+        syncer = ActiveLearningSyncer("exterior", s3_client=s3, bucket=BUCKET, data_root=tmp_path, process_workers=2)
+        assert syncer.run()["synced"] == 1
+        syncer.close()
+
+        with open(tmp_path / "exterior" / "retrain" / "retrain_coco.json", encoding="utf-8") as f:
+            coco = json.load(f)
+        assert [img["file_name"] for img in coco["images"]] == ["car1.jpg", "car2.jpg"]
+        assert coco["images"][0]["width"] == 200
+        assert coco["annotations"][0]["bbox"] == [50.0, 25.0, 100.0, 50.0]
+        assert len({ann["id"] for ann in coco["annotations"]}) == 2
+        print("✅ COCO 변환 (프로세스 풀, 이어 붙이기)")
+
+    def test_resync_replaces_labels(self, tmp_path):
+        s3 = FakeS3()
+        put_label(s3, "exterior", "car1", [{"class": "dent", "bbox": [0.5, 0.5, 0.5, 0.5]}] * 2)
+        put_label(s3, "exterior", "car2", [{"class": "scratch", "bbox": [0.5, 0.5, 0.1, 0.1]}])
+        for etag in ("v1", "v2"):
+            if etag == "v2":   # car1 재검수: 박스 1개로 수정
+                put_label(s3, "exterior", "car1", [{"class": "scratch", "bbox": [0.5, 0.5, 0.2, 0.2]}], etag="v2")
+            syncer = ActiveLearningSyncer("exterior", s3_client=s3, bucket=BUCKET, data_root=tmp_path, process_workers=0)
+            syncer.run()
+            syncer.close()
+        with open(tmp_path / "exterior" / "retrain" / "retrain_coco.json", encoding="utf-8") as f:
+            coco = json.load(f)
+        images = {img["file_name"]: img["id"] for img in coco["images"]}
+        assert sorted(images) == ["car1.jpg", "car2.jpg"] and len(coco["annotations"]) == 2
+        assert {ann["image_id"] for ann in coco["annotations"]} == set(images.values())
+
+        # audio: 같은 파일의 라벨이 바뀌면 labels.csv 행을 교체
+        for i, label in enumerate(["NORMAL", "BELT_SQUEAL"]):
+            s3.put("uploads/a1.wav", b"RIFF")
+            s3.put("dataset/llm_confirmed/audio/a1.json",
+                   json.dumps({"source_url": f"s3://{BUCKET}/uploads/a1.wav", "label": label}).encode(), f"v{i}")
+            s3.put("uploads/a2.wav", b"RIFF")
+            s3.put("dataset/llm_confirmed/audio/a2.json",
+                   json.dumps({"source_url": f"s3://{BUCKET}/uploads/a2.wav", "label": "NORMAL"}).encode(), "v0")
+            syncer = ActiveLearningSyncer("audio", s3_client=s3, bucket=BUCKET, data_root=tmp_path, process_workers=0)
+            syncer.run()
+            syncer.close()
+        rows = (tmp_path / "audio" / "retrain" / "labels.csv").read_text(encoding="utf-8").splitlines()
+        assert sorted(rows) == ["a1.wav,BELT_SQUEAL", "a2.wav,NORMAL"]
+        print("✅ 재동기화 라벨 교체")
+
+    def test_interrupted_run_resumes(self, tmp_path, monkeypatch):
+        s3 = FakeS3()
+        for i in range(6):
+            put_label(s3, "exterior", f"car{i}", [{"class": "dent", "bbox": [0.5, 0.5, 0.2, 0.2]}])
+        coco_path = tmp_path / "exterior" / "retrain" / "retrain_coco.json"
+
+        def synced_keys():
+            syncer = ActiveLearningSyncer("exterior", s3_client=s3, bucket=BUCKET, data_root=tmp_path)
+            keys = set(syncer.checkpoint.etags())
+            syncer.close()
+            return keys
+
+        def ledger_files():
+            with open(coco_path, encoding="utf-8") as f:
+                return sorted(img["file_name"] for img in json.load(f)["images"])
+
+        # 1) 강제 종료: 장부 저장 전에 죽으면 체크포인트에도 남지 않음
+        convert = sync_active_learning.convert_record
+        calls = {"n": 0}
+
+        def crashing_convert(*args):
+            calls["n"] += 1
+            if calls["n"] == 4:
+                raise KeyboardInterrupt
+            return convert(*args)
+
+        monkeypatch.setattr(sync_active_learning, "convert_record", crashing_convert)
+        syncer = ActiveLearningSyncer("exterior", s3_client=s3, bucket=BUCKET, data_root=tmp_path,
+                                      workers=1, process_workers=0, progress_every=100)
+        monkeypatch.setattr(syncer, "save_ledgers", lambda coco: None)
+        with pytest.raises(KeyboardInterrupt):
+            syncer.run()
+        syncer.close()
+        assert not coco_path.exists() and synced_keys() == set()
+
+        # 2) Ctrl-C: 처리된 항목까지 장부 저장 후 체크포인트 기록
+        calls["n"] = 0
+        syncer = ActiveLearningSyncer("exterior", s3_client=s3, bucket=BUCKET, data_root=tmp_path,
+                                      workers=1, process_workers=0, progress_every=2)
+        with pytest.raises(KeyboardInterrupt):
+            syncer.run()
+        syncer.close()
+        assert len(ledger_files()) == 3
+        assert {k.rsplit("/", 1)[1].replace(".json", ".jpg") for k in synced_keys()} == set(ledger_files())
+
+        # 3) 재실행: 나머지만 처리, 장부에 6개 모두
+        monkeypatch.setattr(sync_active_learning, "convert_record", convert)
+        syncer = ActiveLearningSyncer("exterior", s3_client=s3, bucket=BUCKET, data_root=tmp_path, process_workers=0)
+        summary = syncer.run()
+        syncer.close()
+        assert summary["skipped_unchanged"] == 3 and summary["synced"] == 3
+        assert ledger_files() == [f"car{i}.jpg" for i in range(6)] and len(synced_keys()) == 6
+        print("✅ 중단 후 재실행")
@@ -0,0 +1,91 @@
+# tests/test_time_aligner.py
+"""
+OBD Time Aligner 테스트
+
+[테스트 케이스]
+1. CSV 로드 → 격자 정렬: 자정 넘김, 헤더 인코딩 보정, nearest/ffill, 윈도우 관측 비율
+2. 스트리밍 정렬 결과가 배치 정렬 결과와 일치
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.obd_engine_anomaly.time_aligner import (
+    AlignConfig, StreamingAligner, align, load_trip_csv, make_trip, parse_clock
+)
+
+COLUMNS = {"Engine RPM [RPM]": "rpm", "Engine Coolant Temperature [°C]": "coolant"}
+
+
+def clock(seconds: float) -> str:
+    seconds = seconds % 86400
+    h, rest = divmod(seconds, 3600)
+    m, s = divmod(rest, 60)
+    return f"{int(h):02d}:{int(m):02d}:{s:06.3f}"
+
+
+def synthetic_trip(seed: int = 0, duration: float = 120.0):
+    """23:59:00부터 rpm 약 5Hz, coolant 약 1Hz (한 행에 한 컬럼만 채워진 원본 형식)"""
+    rng = np.random.default_rng(seed)
+    start = 86400 - 60.0
+    rows = []
+    for t in np.arange(0, duration, 0.2) + rng.uniform(0, 0.05, int(duration / 0.2)):
+        rows.append((start + t, 1500 + t, np.nan))
+    for t in np.arange(0, duration, 1.0) + 0.03:
+        rows.append((start + t, np.nan, 80 + t / 10))
+    rows.sort(key=lambda r: r[0])
+    return rows
+
+
+class TestTimeAligner:
+    """time_aligner 단위 테스트"""
+
+    def test_csv_to_grid(self, tmp_path):
+        rows = synthetic_trip()
+        path = tmp_path / "trip.csv"
+        # 일부 원본 CSV처럼 "°C"가 "Â°C"로 깨진 헤더
+        lines = ["Time,Engine Coolant Temperature [Â°C],Engine RPM [RPM]"]
+        lines += [f"{clock(t)},{'' if np.isnan(c) else c},{'' if np.isnan(r) else r}" for t, r, c in rows]
+        path.write_text("\n".join(lines), encoding="utf-8")
+
+        trip = load_trip_csv(str(path), COLUMNS)
+        assert trip.columns == ["rpm", "coolant"]
+        assert np.all(np.diff(trip.times) >= 0) and trip.times[-1] > 86400  # 자정 넘김 보정
+
+        aligned = align(trip, AlignConfig(rate_hz=10.0, max_ffill_sec=2.0))
+        assert aligned.values.dtype == np.float32 and aligned.values.shape[1] == 2
+        assert np.allclose(aligned.grid[1:] - aligned.grid[:-1], 0.1)
+        # rpm(5Hz)은 격자의 약 절반, coolant(1Hz)는 약 1/10만 실제 관측, 나머지는 ffill
+        observed = aligned.observed.mean(axis=0)
+        assert 0.4 < observed[0] < 0.6 and 0.05 < observed[1] < 0.15
+        assert not np.isnan(aligned.values).any()
+        mid = np.searchsorted(aligned.grid, 86400 + 30.0)
+        assert aligned.values[mid, 0] == pytest.approx(1500 + 90, abs=0.5)
+
+        starts, coverage, usable = aligned.windows(window_sec=10, stride_sec=5)
+        assert coverage.shape == (len(starts), 2) and not usable.any()  # coolant 관측 비율 부족
+        relaxed = align(trip, AlignConfig(rate_hz=10.0, min_coverage=0.05))
+        assert relaxed.windows(window_sec=10, stride_sec=5)[2].all()
+        print("✅ CSV → 격자 정렬")
+
+    def test_streaming_matches_batch(self):
+        rows = synthetic_trip(seed=1)
+        times = np.array([clock(t) for t, _, _ in rows])
+        values = np.array([[r, c] for _, r, c in rows], dtype=np.float32)
+        assert parse_clock(times[:1])[0] == pytest.approx(rows[0][0] % 86400, abs=1e-3)
+        config = AlignConfig(rate_hz=10.0)
+
+        batch = align(make_trip(times, values, ["rpm", "coolant"]), config)
+        aligner = StreamingAligner(["rpm", "coolant"], config)
+        chunks = [aligner.push(times[i:i + 37], values[i:i + 37]) for i in range(0, len(times), 37)]
+        chunks.append(aligner.flush())
+
+        grid = np.concatenate([c[0] for c in chunks])
+        assert np.allclose(grid, batch.grid)
+        assert np.array_equal(np.concatenate([c[1] for c in chunks]), batch.values, equal_nan=True)
+        assert np.array_equal(np.concatenate([c[2] for c in chunks]), batch.observed)
+        print("✅ 스트리밍 = 배치 정렬")
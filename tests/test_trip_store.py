@@ -0,0 +1,80 @@
+# tests/test_trip_store.py
+"""
+OBD 컬럼 주행 저장소 테스트
+
+[테스트 케이스]
+1. CSV → 컬럼 파일 변환: 나노초 타임스탬프(파일명 날짜 + 자정 넘김), 깨진 헤더 보정, 카탈로그, memmap 조회
+2. 증분 갱신: 변경 없는 CSV는 건너뛰고, 내용이 바뀐 CSV만 다시 변환 (병렬 변환 포함)
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.obd_engine_anomaly.trip_store import TripStore
+
+HEADER = "Time,Engine Coolant Temperature [Â°C],Engine RPM [RPM],Vehicle Speed Sensor [km/h]"
+
+
+def write_trip(folder, name: str, rows) -> str:
+    os.makedirs(folder, exist_ok=True)
+    path = os.path.join(folder, name)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join([HEADER] + rows))
+    return path
+
+
+class TestTripStore:
+    """TripStore 단위 테스트"""
+
+    def test_convert_and_read(self, tmp_path):
+        raw = tmp_path / "raw"
+        path = write_trip(raw / "normal", "2017-07-06_Test_Normal.csv", [
+            "23:59:59.800,80,,",
+            "23:59:59.900,80,800.0,",
+            "00:00:00.100,81,810.0,12.5",
+            "00:00:00.200,81,820.0,13.0",
+        ])
+        store = TripStore(str(tmp_path / "store"))
+        stats = store.sync([path], workers=1)
+        assert stats["converted"] == 1 and stats["failed"] == 0
+
+        entry = store.trips(category="normal")[0]
+        assert entry["trip_id"] == "normal/2017-07-06_Test_Normal"
+        assert entry["rows"] == 4 and entry["duration_sec"] == 0.4
+        assert entry["coverage"] == {"engine_coolant_temp_c": 1.0, "engine_rpm": 0.75, "vehicle_speed_kmh": 0.5}
+
+        cols = store.columns(entry["trip_id"], ["rpm", "speed"])
+        assert isinstance(cols["engine_rpm"], np.memmap) and not cols["engine_rpm"].flags.writeable
+        assert cols["time_ns"].dtype == np.int64 and cols["engine_rpm"].dtype == np.float32
+        assert str(cols["time_ns"][0].astype("datetime64[ns]")) == "2017-07-06T23:59:59.800000000"
+        assert np.all(np.diff(cols["time_ns"]) == [100_000_000, 200_000_000, 100_000_000])  # 자정 넘김
+
+        trip = store.load(entry["trip_id"], ["rpm", "coolant"])
+        assert trip.values.shape == (4, 2) and np.isnan(trip.values[0, 0]) and trip.values[-1, 1] == 81
+        print("✅ CSV → 컬럼 저장소")
+
+    def test_incremental_sync(self, tmp_path):
+        raw = tmp_path / "raw"
+        rows = [f"10:00:0{i}.000,80,{800 + i}.0,0.0" for i in range(5)]
+        paths = [write_trip(raw / category, f"2018-01-0{i}_{category}.csv", rows)
+                 for i, category in enumerate(["frei", "normal", "stau"], start=1)]
+        store = TripStore(str(tmp_path / "store"))
+        assert store.sync(paths, workers=2)["converted"] == 3
+
+        reopened = TripStore(str(tmp_path / "store"))
+        assert reopened.sync(paths, workers=2)["cached"] == 3
+
+        old_dir = os.listdir(tmp_path / "store" / "trips" / "stau")
+        write_trip(raw / "stau", "2018-01-03_stau.csv", rows[:3])
+        stats = reopened.sync(paths, workers=2)
+        assert stats["converted"] == 1 and stats["cached"] == 2
+        assert reopened.entry("stau/2018-01-03_stau")["rows"] == 3
+        assert os.listdir(tmp_path / "store" / "trips" / "stau") != old_dir  # 이전 버전 디렉토리 삭제
+        assert len(os.listdir(tmp_path / "store" / "trips" / "stau")) == 1
+
+        assert reopened.sync(paths[:2], prune=True)["cached"] == 2
+        assert [e["category"] for e in reopened.trips()] == ["frei", "normal"]
+        print("✅ 증분 갱신")
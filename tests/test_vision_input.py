@@ -0,0 +1,85 @@
+# tests/test_vision_input.py
+"""
+GPT Vision 입력 이미지 준비 (prepare_image) 테스트
+
+[테스트 케이스]
+1. 프로필별 결과: 긴 변 <= max_side, detail 수준, 용량 예산 이내 (노이즈가 많은 고해상도 사진 포함)
+   품질 50으로도 예산을 넘으면 해상도를 줄여 예산을 맞춤 (토큰 추정도 줄어든 크기 기준)
+2. 여러 스레드에서 동시에 준비해도 프로필별 누적 통계가 빠짐없이 기록됨
+"""
+import base64
+import io
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from PIL import Image
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from ai.app.services.common import vision_input
+from ai.app.services.common.vision_input import (
+    VISION_PROFILES, VisionProfile, estimate_image_tokens, get_vision_input_stats, prepare_image
+)
+
+
+def photo(width: int, height: int, noise: float) -> Image.Image:
+    """그라데이션 + 노이즈 이미지 (noise가 클수록 JPEG 용량이 큼)"""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width)[None, :, None]
+    y = np.linspace(0, 255, height)[:, None, None]
+    base = np.concatenate([np.broadcast_to(x, (height, width, 1)), np.broadcast_to(y, (height, width, 1)),
+                           np.full((height, width, 1), 128.0)], axis=2)
+    pixels = base + noise * rng.standard_normal((height, width, 3))
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def to_jpeg(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=95)
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    monkeypatch.setattr(vision_input, "_stats", {})
+    return vision_input
+
+
+class TestPrepareImage:
+    """prepare_image 단위 테스트"""
+
+    @pytest.mark.parametrize("profile", [p for p in VISION_PROFILES if p != "original"])
+    @pytest.mark.parametrize("noise", [8.0, 80.0])
+    def test_profile_limits(self, stats, profile, noise):
+        spec = VISION_PROFILES[profile]
+        prepared = prepare_image(photo(3000, 2000, noise), profile)
+
+        assert max(prepared.width, prepared.height) <= spec.max_side
+        assert prepared.detail == spec.detail and prepared.as_content()["image_url"]["detail"] == spec.detail
+        assert prepared.num_bytes <= spec.max_bytes
+        decoded = Image.open(io.BytesIO(base64.b64decode(prepared.base64_data)))
+        assert decoded.format == "JPEG" and decoded.size == (prepared.width, prepared.height)
+        assert prepared.original_size == (3000, 2000)
+        print(f"✅ {profile} (noise={noise}): {prepared.width}x{prepared.height}, {prepared.num_bytes // 1024}KB")
+
+    def test_shrinks_to_budget(self, stats, monkeypatch):
+        monkeypatch.setitem(VISION_PROFILES, "tight", VisionProfile(max_side=1024, detail="high", quality=85,
+                                                                    max_bytes=40 * 1024))
+        prepared = prepare_image(photo(3000, 2000, 80.0), "tight")
+        assert prepared.num_bytes <= 40 * 1024 and max(prepared.width, prepared.height) < 1024
+        assert prepared.est_tokens == estimate_image_tokens(prepared.width, prepared.height, "high")
+        print(f"✅ 예산 초과 → 해상도 축소 ({prepared.width}x{prepared.height}, {prepared.num_bytes // 1024}KB)")
+
+    def test_concurrent_stats(self, stats):
+        images = [to_jpeg(photo(600, 400, 8.0)), to_jpeg(photo(900, 300, 8.0))]
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(lambda i: prepare_image(images[i % 2], "heatmap" if i % 2 else "engine_crop"),
+                                    range(64)))
+        recorded = get_vision_input_stats()
+        assert recorded["heatmap"]["calls"] == 32 and recorded["engine_crop"]["calls"] == 32
+        assert sum(v["bytes"] for v in recorded.values()) == sum(r.num_bytes for r in results)
+        assert sum(v["tokens"] for v in recorded.values()) == 64 * 85
+        print("✅ 동시 준비 누적 통계")